@@ -0,0 +1,111 @@
+import time
+
+import numpy as np
+import torch
+
+from pytorch_widedeep.models import (
+    SAINT,
+    Wide,
+    TabMlp,
+    TabNet,
+    WideDeep,
+    TabResnet,
+    TabPerceiver,
+    FTTransformer,
+    TabFastFormer,
+    TabTransformer,
+    SelfAttentionMLP,
+    ContextAttentionMLP,
+)
+from pytorch_widedeep.training import Trainer
+
+torch.set_num_threads(1)
+
+n_cat, n_cont, n_rows, batch_size, n_iter = 10, 5, 2048, 256, 50
+
+colnames = [f"cat_{i}" for i in range(n_cat)] + [f"cont_{i}" for i in range(n_cont)]
+column_idx = {k: v for v, k in enumerate(colnames)}
+continuous_cols = [f"cont_{i}" for i in range(n_cont)]
+
+X_tab = np.hstack(
+    [np.random.randint(1, 51, (n_rows, n_cat)), np.random.rand(n_rows, n_cont)]
+)
+X_wide = np.random.randint(1, 50, (n_rows, n_cat))
+target = np.random.choice(2, n_rows)
+
+
+def build_model(model_name: str) -> WideDeep:
+    params = dict(column_idx=column_idx, continuous_cols=continuous_cols)
+    if model_name in ["TabMlp", "TabResnet", "TabNet"]:
+        params["cat_embed_input"] = [(f"cat_{i}", 50, 8) for i in range(n_cat)]
+    else:
+        params["cat_embed_input"] = [(f"cat_{i}", 50) for i in range(n_cat)]
+        params["input_dim"] = 16
+    if model_name == "TabPerceiver":
+        params["n_latents"] = 4
+        params["latent_dim"] = 16
+    model_class = {
+        "TabMlp": TabMlp,
+        "TabResnet": TabResnet,
+        "TabNet": TabNet,
+        "TabTransformer": TabTransformer,
+        "SAINT": SAINT,
+        "FTTransformer": FTTransformer,
+        "TabFastFormer": TabFastFormer,
+        "TabPerceiver": TabPerceiver,
+        "ContextAttentionMLP": ContextAttentionMLP,
+        "SelfAttentionMLP": SelfAttentionMLP,
+    }[model_name]
+    return WideDeep(
+        wide=Wide(input_dim=50, pred_dim=1), deeptabular=model_class(**params)
+    )
+
+
+def fit_time(trainer: Trainer) -> float:
+    # the first epoch is a warm up (and, if compiled, the compilation)
+    trainer.fit(X_wide=X_wide, X_tab=X_tab, target=target, batch_size=batch_size)
+    start = time.perf_counter()
+    trainer.fit(
+        X_wide=X_wide, X_tab=X_tab, target=target, n_epochs=2, batch_size=batch_size
+    )
+    return (time.perf_counter() - start) / 2
+
+
+def latency(model: WideDeep) -> float:
+    X = {
+        "wide": torch.from_numpy(X_wide[:batch_size]),
+        "deeptabular": torch.from_numpy(X_tab[:batch_size]).float(),
+    }
+    model.eval()
+    with torch.no_grad():
+        for _ in range(5):
+            model(X)
+        start = time.perf_counter()
+        for _ in range(n_iter):
+            model(X)
+    return (time.perf_counter() - start) / n_iter * 1000
+
+
+if __name__ == "__main__":
+    for model_name in [
+        "TabMlp",
+        "TabResnet",
+        "TabNet",
+        "TabTransformer",
+        "SAINT",
+        "FTTransformer",
+        "TabFastFormer",
+        "TabPerceiver",
+        "ContextAttentionMLP",
+        "SelfAttentionMLP",
+    ]:
+        results = []
+        for compile in [False, "model", "components"]:
+            torch.manual_seed(0)
+            model = build_model(model_name)
+            trainer = Trainer(model, objective="binary", compile=compile, verbose=0)
+            results.append(
+                f"{str(compile):<10}: {fit_time(trainer):.2f} s/epoch, "
+                f"{latency(model):.2f} ms/batch"
+            )
+        print(f"{model_name:<20} " + " | ".join(results))
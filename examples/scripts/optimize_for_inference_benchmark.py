@@ -0,0 +1,92 @@
+import time
+
+import torch
+
+from pytorch_widedeep.models import (
+    Wide,
+    TabMlp,
+    TabNet,
+    Vision,
+    WideDeep,
+    TabResnet,
+)
+from pytorch_widedeep.inference import optimize_for_inference
+
+torch.set_num_threads(1)
+
+n_cat, n_cont, n_rows, n_iter = 20, 10, 1024, 50
+
+colnames = [f"cat_{i}" for i in range(n_cat)] + [f"cont_{i}" for i in range(n_cont)]
+column_idx = {k: v for v, k in enumerate(colnames)}
+cat_embed_input = [(f"cat_{i}", 100, 16) for i in range(n_cat)]
+continuous_cols = [f"cont_{i}" for i in range(n_cont)]
+
+
+def latency(model, X) -> float:
+    with torch.no_grad():
+        for _ in range(5):
+            model(X)
+        start = time.perf_counter()
+        for _ in range(n_iter):
+            model(X)
+    return (time.perf_counter() - start) / n_iter * 1000
+
+
+def report(name: str, model: WideDeep, X):
+    model.train()
+    with torch.no_grad():
+        model(X)
+    model.eval()
+    opt_model = optimize_for_inference(model)
+    print(
+        f"{name:<10} original: {latency(model, X):.2f} ms, "
+        f"optimised: {latency(opt_model, X):.2f} ms"
+    )
+
+
+if __name__ == "__main__":
+    X_tab = torch.cat(
+        [
+            torch.randint(1, 101, (n_rows, n_cat)).float(),
+            torch.rand(n_rows, n_cont),
+        ],
+        1,
+    )
+    X_wide = torch.randint(1, 100, (n_rows, n_cat))
+    X_img = torch.rand(64, 3, 64, 64)
+
+    tab_params = dict(
+        column_idx=column_idx,
+        cat_embed_input=cat_embed_input,
+        continuous_cols=continuous_cols,
+        cont_norm_layer="batchnorm",
+    )
+
+    report(
+        "TabMlp",
+        WideDeep(
+            wide=Wide(input_dim=100, pred_dim=1),
+            deeptabular=TabMlp(
+                mlp_hidden_dims=[512, 256, 128],
+                mlp_batchnorm=True,
+                mlp_dropout=0.1,
+                **tab_params,
+            ),
+        ),
+        {"wide": X_wide, "deeptabular": X_tab},
+    )
+    report(
+        "TabResnet",
+        WideDeep(
+            deeptabular=TabResnet(
+                blocks_dims=[256, 256, 128], blocks_dropout=0.1, **tab_params
+            )
+        ),
+        {"deeptabular": X_tab},
+    )
+    report("TabNet", WideDeep(deeptabular=TabNet(**tab_params)), {"deeptabular": X_tab})
+    report(
+        "Vision",
+        WideDeep(deepimage=Vision(channel_sizes=[32, 64, 128], kernel_sizes=3)),
+        {"deepimage": X_img},
+    )
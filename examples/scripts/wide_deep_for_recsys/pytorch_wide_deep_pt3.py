@@ -0,0 +1,100 @@
+# In this script I illustrate how to build the same model as in
+# 'pytorch_wide_deep_pt1.py' using multi-hot columns. In that script the
+# movies watched are turned into a dense (n_rows, n_movies) binary matrix for
+# the wide component and into padded sequences for the 'deeptext' component.
+# Here the list of movies watched is a multi-hot column, stored as values and
+# offsets, that is pooled via an EmbeddingBag both in the wide and the
+# deeptabular components. This is (much) cheaper, both in memory and time.
+
+from pathlib import Path
+
+import numpy as np
+import torch
+import pandas as pd
+from torch import nn
+
+from pytorch_widedeep import Trainer
+from pytorch_widedeep.models import Wide, TabMlp, WideDeep
+from pytorch_widedeep.preprocessing import TabPreprocessor, WidePreprocessor
+
+save_path = Path("prepared_data")
+
+PAD_IDX = 0
+
+id_cols = ["user_id", "movie_id"]
+
+df_train = pd.read_pickle(save_path / "df_train.pkl")
+df_valid = pd.read_pickle(save_path / "df_valid.pkl")
+df_test = pd.read_pickle(save_path / "df_test.pkl")
+df_test = pd.concat([df_valid, df_test], ignore_index=True)
+
+# same caveat as in the previous scripts
+max_movie_index = max(df_train.movie_id.max(), df_test.movie_id.max())
+
+y_train = np.array(df_train.target.values, dtype="int64")
+y_test = np.array(df_test.target.values, dtype="int64")
+
+# The wide component "activates" all the movies watched at once, which is
+# equivalent to the linear layer on top of the binary matrix in the Kaggle
+# notebook. Let's keep, at most, the last 50 movies watched.
+wide_preprocessor = WidePreprocessor(
+    wide_cols=["gender"], multi_hot_cols=["prev_movies"], multi_hot_max_len=50
+)
+X_train_wide = wide_preprocessor.fit_transform(df_train)
+X_test_wide = wide_preprocessor.transform(df_test)
+
+# and the deeptabular component averages the embeddings of the movies
+# watched, as the 'SimpleEmbed' model in 'pytorch_wide_deep_pt1.py'
+cat_cols = ["gender", "occupation", "zip_code"]
+cont_cols = [
+    c
+    for c in df_train.columns
+    if c not in id_cols + cat_cols + ["rating", "prev_movies", "target"]
+]
+tab_preprocessor = TabPreprocessor(
+    cat_embed_cols=cat_cols,
+    continuous_cols=cont_cols,
+    multi_hot_cols=[("prev_movies", 16)],
+    multi_hot_max_len=50,
+)
+X_train_tab = tab_preprocessor.fit_transform(df_train.fillna(0))
+X_test_tab = tab_preprocessor.transform(df_test.fillna(0))
+
+wide = Wide(
+    input_dim=wide_preprocessor.wide_dim, pred_dim=max_movie_index + 1, multi_hot=True
+)
+
+tab_mlp = TabMlp(
+    column_idx=tab_preprocessor.column_idx,
+    cat_embed_input=tab_preprocessor.cat_embed_input,
+    continuous_cols=tab_preprocessor.continuous_cols,
+    multi_hot_embed_input=tab_preprocessor.multi_hot_embed_input,
+    cont_norm_layer=None,
+    mlp_hidden_dims=[1024, 512, 256],
+    mlp_activation="relu",
+)
+
+wide_deep_model = WideDeep(wide=wide, deeptabular=tab_mlp, pred_dim=max_movie_index + 1)
+
+trainer = Trainer(
+    model=wide_deep_model,
+    objective="multiclass",
+    custom_loss_function=nn.CrossEntropyLoss(ignore_index=PAD_IDX),
+    optimizers=torch.optim.Adam(wide_deep_model.parameters(), lr=1e-3),
+)
+
+trainer.fit(
+    X_train={
+        "X_wide": X_train_wide,
+        "X_tab": X_train_tab,
+        "target": y_train,
+    },
+    X_val={
+        "X_wide": X_test_wide,
+        "X_tab": X_test_tab,
+        "target": y_test,
+    },
+    n_epochs=10,
+    batch_size=512,
+    shuffle=False,
+)
@@ -14,6 +14,12 @@ from torch.optim.lr_scheduler import ReduceLROnPlateau
 
 from pytorch_widedeep.metrics import MultipleMetrics
 from pytorch_widedeep.wdtypes import Any, Dict, List, Optional, Optimizer
+from pytorch_widedeep.distributed import (
+    rank_path,
+    is_main_process,
+    saves_per_process,
+)
+from pytorch_widedeep.models.tabular.embeddings_layers import MMapEmbedding
 
 
 def _get_current_time():
@@ -175,6 +181,10 @@ class LRShedulerCallback(Callback):
     """
 
     def on_batch_end(self, batch: int, logs: Optional[Dict] = None):
+        # with gradient accumulation the optimizer does not take a step
+        # after every batch
+        if not getattr(self.trainer, "optimizer_stepped", True):
+            return
         if self.trainer.lr_scheduler is not None:
             if self._multiple_scheduler():
                 for (
@@ -429,8 +439,8 @@ class ModelCheckpoint(Callback):
                 )
 
             root_dir = ("/").join(self.filepath.split("/")[:-1])
-            if not os.path.exists(root_dir):
-                os.makedirs(root_dir)
+            if not os.path.exists(root_dir) and is_main_process():
+                os.makedirs(root_dir, exist_ok=True)
 
         if self.max_save > 0:
             self.old_files: List[str] = []
@@ -480,7 +490,7 @@ class ModelCheckpoint(Callback):
                     )
                 else:
                     if self.monitor_op(current - self.min_delta, self.best):
-                        if self.verbose > 0:
+                        if self.verbose > 0 and is_main_process():
                             if self.filepath:
                                 print(
                                     f"\nEpoch {epoch + 1}: {self.monitor} improved from {self.best:.5f} to {current:.5f} "
@@ -494,33 +504,37 @@ class ModelCheckpoint(Callback):
                         self.best_epoch = epoch
                         self.best_state_dict = copy.deepcopy(self.model.state_dict())
                         if self.filepath:
-                            torch.save(self.best_state_dict, filepath)
-                            if self.max_save > 0:
-                                if len(self.old_files) == self.max_save:
-                                    try:
-                                        os.remove(self.old_files[0])
-                                    except FileNotFoundError:
-                                        pass
-                                    self.old_files = self.old_files[1:]
-                                self.old_files.append(filepath)
+                            self._save(self.best_state_dict, filepath)
                     else:
-                        if self.verbose > 0:
+                        if self.verbose > 0 and is_main_process():
                             print(
                                 f"\nEpoch {epoch + 1}: {self.monitor} did not improve from {self.best:.5f} "
                                 f" considering a 'min_delta' improvement of {self.min_delta:.5f}"
                             )
             if not self.save_best_only and self.filepath:
-                if self.verbose > 0:
+                if self.verbose > 0 and is_main_process():
                     print("\nEpoch %05d: saving model to %s" % (epoch + 1, filepath))
-                torch.save(self.model.state_dict(), filepath)
-                if self.max_save > 0:
-                    if len(self.old_files) == self.max_save:
-                        try:
-                            os.remove(self.old_files[0])
-                        except FileNotFoundError:
-                            pass
-                        self.old_files = self.old_files[1:]
-                    self.old_files.append(filepath)
+                self._save(self.model.state_dict(), filepath)
+
+    def _save(self, state_dict: Dict, filepath: str):
+        # in distributed training, only the process with rank 0 writes to
+        # disk (the weights are the same in all processes), unless the model
+        # has sharded embeddings, in which case each process saves its own
+        # shards in its own file
+        if saves_per_process(self.model):
+            filepath = rank_path(filepath)
+            os.makedirs(os.path.dirname(filepath), exist_ok=True)
+        elif not is_main_process():
+            return
+        torch.save(state_dict, filepath)
+        if self.max_save > 0:
+            if len(self.old_files) == self.max_save:
+                try:
+                    os.remove(self.old_files[0])
+                except FileNotFoundError:
+                    pass
+                self.old_files = self.old_files[1:]
+            self.old_files.append(filepath)
 
     def __getstate__(self):
         d = self.__dict__
@@ -566,7 +580,10 @@ class EarlyStopping(Callback):
     restore_best_weights: bool, default=None
         Whether to restore model weights from the epoch with the best
         value of the monitored quantity. If `False`, the model weights
-        obtained at the last step of training are used.
+        obtained at the last step of training are used. Note that this is
+        not supported for models with memory-mapped embedding tables (see
+        `pytorch_widedeep.models.tabular.embeddings_layers.MMapEmbedding`),
+        whose state dict does not contain the table.
 
     Attributes
     ----------
@@ -637,6 +654,14 @@ class EarlyStopping(Callback):
             self.min_delta *= -1
 
     def on_train_begin(self, logs: Optional[Dict] = None):
+        if self.restore_best_weights and any(
+            isinstance(m, MMapEmbedding) for m in self.model.modules()
+        ):
+            raise ValueError(
+                "'restore_best_weights' is not supported for models with "
+                "memory-mapped embedding tables, since their state dict only "
+                "contains the cache of the table"
+            )
         # Allow instances to be re-used
         self.wait = 0
         self.stopped_epoch = 0
@@ -665,12 +690,12 @@ class EarlyStopping(Callback):
                 self.trainer.early_stop = True
 
     def on_train_end(self, logs: Optional[Dict] = None):
-        if self.stopped_epoch > 0 and self.verbose > 0:
+        if self.stopped_epoch > 0 and self.verbose > 0 and is_main_process():
             print(
                 f"Best Epoch: {self.best_epoch + 1}. Best {self.monitor}: {self.best:.5f}"
             )
         if self.restore_best_weights and self.state_dict is not None:
-            if self.verbose > 0:
+            if self.verbose > 0 and is_main_process():
                 print("Restoring model weights from the end of the best epoch")
             self.model.load_state_dict(self.state_dict)
 
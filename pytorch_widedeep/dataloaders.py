@@ -1,8 +1,19 @@
+import math
 from typing import Tuple
 
 import numpy as np
-from torch.utils.data import DataLoader, WeightedRandomSampler
-
+import torch
+from torch.utils.data import (
+    DataLoader,
+    DistributedSampler,
+    WeightedRandomSampler,
+)
+
+from pytorch_widedeep.distributed import (
+    get_rank,
+    get_world_size,
+    is_distributed,
+)
 from pytorch_widedeep.training._wd_dataset import WideDeepDataset
 
 
@@ -38,10 +49,20 @@ def get_class_weights(dataset: WideDeepDataset) -> Tuple[np.ndarray, int, int]:
 
 
 class DataLoaderDefault(DataLoader):
+    r"""Default dataloader used by the `Trainer`. In distributed training,
+    and unless a `sampler` or a `batch_sampler` is passed, each process
+    loads a different shard of the dataset via a `DistributedSampler` (that
+    shuffles the dataset if `shuffle=True`)
+    """
+
     def __init__(
         self, dataset: WideDeepDataset, batch_size: int, num_workers: int, **kwargs
     ):
         self.with_lds = dataset.with_lds
+        if is_distributed() and not ("sampler" in kwargs or "batch_sampler" in kwargs):
+            kwargs["sampler"] = DistributedSampler(
+                dataset, shuffle=kwargs.pop("shuffle", False)
+            )
         super().__init__(
             dataset=dataset, batch_size=batch_size, num_workers=num_workers, **kwargs
         )
@@ -77,6 +98,9 @@ class DataLoaderImbalanced(DataLoader):
         $$
         minority \space class \space count \times number \space of \space classes \times oversample\_mul
         $$
+
+        In distributed training, each process draws `num_samples / world_size`
+        samples independently.
     """
 
     def __init__(
@@ -91,7 +115,16 @@ class DataLoaderImbalanced(DataLoader):
         weights, minor_cls_cnt, num_clss = get_class_weights(dataset)
         num_samples = int(minor_cls_cnt * num_clss * oversample_mul)
         samples_weight = list(np.array([weights[i] for i in dataset.Y]))
-        sampler = WeightedRandomSampler(samples_weight, num_samples, replacement=True)
+        generator = None
+        if is_distributed():
+            # sampling with replacement: each process draws its share of
+            # samples independently
+            num_samples = math.ceil(num_samples / get_world_size())
+            generator = torch.Generator()
+            generator.manual_seed((torch.initial_seed() + get_rank()) % 2**63)
+        sampler = WeightedRandomSampler(
+            samples_weight, num_samples, replacement=True, generator=generator
+        )
         super().__init__(
             dataset, batch_size, num_workers=num_workers, sampler=sampler, **kwargs
         )
@@ -0,0 +1,304 @@
+"""
+Utilities for multi-process data-parallel training.
+
+The `Trainer` runs in distributed mode whenever it is instantiated within a
+process group of more than one process, for example one started with
+`launch` or with `torchrun`. In that mode the model is wrapped with
+`DistributedDataParallel`, each process trains on a different shard of the
+training data and the losses and metrics are all-reduced at the end of
+every epoch, so that all processes share the same `History` and therefore
+take the same decisions (early stopping, learning rate schedule, best
+weights...). Only the process with rank 0 writes to disk, except for the
+checkpoints of models with sharded embeddings, which each process saves
+(see `rank_path` and `load_checkpoint`).
+"""
+
+import os
+import socket
+from itertools import chain
+
+import torch
+import torch.distributed as dist
+import torch.multiprocessing as mp
+from torch import nn
+
+from pytorch_widedeep.wdtypes import (
+    Any,
+    List,
+    Tuple,
+    Union,
+    Tensor,
+    Callable,
+    Optional,
+)
+
+_REDUCE_OPS = {"sum": dist.ReduceOp.SUM, "max": dist.ReduceOp.MAX}
+
+
+def is_distributed() -> bool:
+    r"""Returns `True` if the current process is part of a process group of
+    more than one process"""
+    return dist.is_available() and dist.is_initialized() and dist.get_world_size() > 1
+
+
+def get_rank() -> int:
+    r"""Returns the rank of the current process (0 if not distributed)"""
+    return dist.get_rank() if is_distributed() else 0
+
+
+def get_world_size() -> int:
+    r"""Returns the number of processes (1 if not distributed)"""
+    return dist.get_world_size() if is_distributed() else 1
+
+
+def is_main_process() -> bool:
+    r"""Returns `True` if the current process is the one with rank 0, which
+    is the only one that prints and writes to disk"""
+    return get_rank() == 0
+
+
+def all_reduce(value: Union[Tensor, float, int], op: str = "sum") -> Tensor:
+    r"""Reduces a value across all processes. If not distributed the value
+    is simply returned as a tensor
+
+    Parameters
+    ----------
+    value: Tensor, float or int
+        value to be reduced. It is not modified in place
+    op: str, default = "sum"
+        one of _'sum'_, _'mean'_ or _'max'_
+
+    Returns
+    -------
+    Tensor
+        the reduced value
+    """
+    if op not in ["sum", "mean", "max"]:
+        raise ValueError(f"'op' must be one of 'sum', 'mean' or 'max'. Got {op}")
+    tensor = torch.as_tensor(value).detach().clone()
+    if tensor.dtype == torch.bool:
+        tensor = tensor.long()
+    if not is_distributed():
+        return tensor
+    dist.all_reduce(tensor, op=_REDUCE_OPS["max" if op == "max" else "sum"])
+    return tensor / get_world_size() if op == "mean" else tensor
+
+
+def n_local_samples(n_samples: int) -> int:
+    r"""Returns the number of samples, out of `n_samples`, assigned to the
+    current process by a `DistributedSampler` with `shuffle=False`. The
+    sampler repeats samples so that all processes get the same number of
+    them, and these repeated samples (at most one per process, the last
+    one) are not included
+
+    Parameters
+    ----------
+    n_samples: int
+        size of the dataset
+    """
+    return len(range(get_rank(), n_samples, get_world_size()))
+
+
+def saves_per_process(model: nn.Module) -> bool:
+    r"""Returns `True` if each process must save (and load) its own
+    checkpoint of the model, i.e. if distributed and the model has
+    parameters that are different in each process (e.g. sharded
+    embeddings), and therefore are ignored by `DistributedDataParallel`"""
+    return is_distributed() and bool(
+        getattr(model, "_ddp_params_and_buffers_to_ignore", [])
+    )
+
+
+def rank_path(path: str, rank: Optional[int] = None) -> str:
+    r"""Returns the path of the checkpoint of a process, i.e. `path` with
+    the suffix `_rank{rank}` before the extension (e.g.
+    _'checkpoints/weights_out_3_rank1.p'_)
+
+    Parameters
+    ----------
+    path: str
+        path of the checkpoint
+    rank: int, Optional, default = None
+        rank of the process. If `None`, that of the current process
+    """
+    root, ext = os.path.splitext(path)
+    return f"{root}_rank{get_rank() if rank is None else rank}{ext}"
+
+
+def load_checkpoint(path: str, **kwargs) -> Any:
+    r"""Loads (with `torch.load`) a model or a state dict saved by the
+    `Trainer` (via its `save` method) or by the `ModelCheckpoint` callback.
+
+    The checkpoints of models with sharded embeddings are saved by each
+    process in its own file (see `rank_path`), with its shard of the
+    tables. In that case each process loads its own file, which requires
+    the same number of processes as when it was saved. Otherwise `path` is
+    loaded.
+
+    Parameters
+    ----------
+    path: str
+        path of the checkpoint, as passed to (or built by) `Trainer.save` or
+        `ModelCheckpoint`
+    kwargs:
+        keyword arguments passed to `torch.load`
+    """
+    own_path = rank_path(path)
+    return torch.load(own_path if os.path.exists(own_path) else path, **kwargs)
+
+
+def broadcast_model(model: nn.Module, src: int = 0):
+    r"""Overwrites (in place) the parameters and buffers of the model in all
+    processes with those of the process with rank `src`. Those ignored by
+    `DistributedDataParallel` (e.g. the sharded embeddings) are left as
+    they are"""
+    if not is_distributed():
+        return
+    ignore = set(getattr(model, "_ddp_params_and_buffers_to_ignore", []))
+    with torch.no_grad():
+        for name, tensor in chain(model.named_parameters(), model.named_buffers()):
+            if name not in ignore:
+                dist.broadcast(tensor, src)
+
+
+def launch(
+    fn: Callable,
+    n_workers: int,
+    args: Tuple = (),
+    backend: str = "gloo",
+    n_threads: Optional[int] = None,
+    master_addr: str = "127.0.0.1",
+    master_port: Optional[int] = None,
+) -> List[Any]:
+    r"""Runs `fn(*args)` in `n_workers` local processes that form a process
+    group, so that the `Trainer` instantiated within `fn` trains in
+    distributed mode. Each process can access its rank via `get_rank`.
+
+    :information_source: **NOTE**: the processes are started with the
+    _'spawn'_ method, therefore `fn` (and `args`) must be picklable, i.e.
+    `fn` must be defined at the top level of a module, and the script
+    calling `launch` must be guarded by `if __name__ == "__main__":`
+
+    Parameters
+    ----------
+    fn: Callable
+        function to run in each process
+    n_workers: int
+        number of processes
+    args: Tuple, default = ()
+        arguments passed to `fn`
+    backend: str, default = "gloo"
+        backend of the process group. _'gloo'_ runs on CPU
+    n_threads: int, Optional, default = None
+        number of (intra-op) threads per process. If `None` the cores of the
+        machine are divided among the processes
+    master_addr: str, default = "127.0.0.1"
+        address of the process with rank 0
+    master_port: int, Optional, default = None
+        port of the process with rank 0. If `None` a free port is used
+
+    Returns
+    -------
+    List
+        the values returned by `fn` in each process, ordered by rank
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> from pytorch_widedeep.models import Wide, WideDeep
+    >>> from pytorch_widedeep.training import Trainer
+    >>> from pytorch_widedeep.distributed import launch
+    >>>
+    >>> def train(X_wide, target):
+    ...     model = WideDeep(wide=Wide(input_dim=10, pred_dim=1))
+    ...     trainer = Trainer(model, objective="binary", verbose=0)
+    ...     trainer.fit(X_wide=X_wide, target=target, n_epochs=2, batch_size=8)
+    ...     return trainer.history
+    >>>
+    >>> if __name__ == "__main__":
+    ...     X_wide = np.random.choice(10, (64, 4))
+    ...     target = np.random.choice(2, 64)
+    ...     histories = launch(train, n_workers=2, args=(X_wide, target))
+    """
+    with mp.get_context("spawn").Manager() as manager:
+        results = manager.dict()
+        _spawn(
+            fn,
+            n_workers,
+            args,
+            results,
+            backend=backend,
+            n_threads=n_threads,
+            master_addr=master_addr,
+            master_port=master_port,
+        )
+        return [results[rank] for rank in range(n_workers)]
+
+
+def _spawn(
+    fn: Callable,
+    n_workers: int,
+    args: Tuple,
+    results: Optional[Any] = None,
+    join: bool = True,
+    backend: str = "gloo",
+    n_threads: Optional[int] = None,
+    master_addr: str = "127.0.0.1",
+    master_port: Optional[int] = None,
+) -> Optional[mp.ProcessContext]:
+    # with join=False the processes run in the background and their context
+    # is returned (see 'torch.multiprocessing.spawn')
+    if n_workers < 1:
+        raise ValueError(f"'n_workers' must be a positive integer. Got {n_workers}")
+    if n_threads is None:
+        n_threads = max(1, (os.cpu_count() or 1) // n_workers)
+    if master_port is None:
+        master_port = _free_port()
+
+    return mp.spawn(
+        _worker,
+        args=(
+            n_workers,
+            backend,
+            n_threads,
+            master_addr,
+            master_port,
+            fn,
+            args,
+            results,
+        ),
+        nprocs=n_workers,
+        join=join,
+    )
+
+
+def _worker(
+    rank: int,
+    world_size: int,
+    backend: str,
+    n_threads: int,
+    master_addr: str,
+    master_port: int,
+    fn: Callable,
+    args: Tuple,
+    results: Any,
+):
+    os.environ["MASTER_ADDR"] = master_addr
+    os.environ["MASTER_PORT"] = str(master_port)
+    os.environ["RANK"] = os.environ["LOCAL_RANK"] = str(rank)
+    os.environ["WORLD_SIZE"] = str(world_size)
+    torch.set_num_threads(n_threads)
+
+    dist.init_process_group(backend, rank=rank, world_size=world_size)
+    try:
+        result = fn(*args)
+        if results is not None:
+            results[rank] = result
+    finally:
+        dist.destroy_process_group()
+
+
+def _free_port() -> int:
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+        s.bind(("", 0))
+        return s.getsockname()[1]
@@ -0,0 +1,6 @@
+from pytorch_widedeep.inference.folding import FoldedTabModel, fold_embeddings
+from pytorch_widedeep.inference.optimization import optimize_for_inference
+from pytorch_widedeep.inference.quantization import (
+    quantize_embeddings,
+    quantization_drift_report,
+)
@@ -0,0 +1,286 @@
+"""
+Folding of the categorical embeddings of the `TabMlp` and `TabResnet` models
+into their first dense layer.
+
+The first dense layer of these models acts on the concatenation of the
+per-column embeddings, i.e. its output is the sum of per-column projections.
+For a given category these projections are constant, so they can be
+precomputed, turning the embedding lookups plus the (largest) matrix
+multiplication of the model into lookups into pre-projected tables.
+"""
+
+from copy import deepcopy
+
+import torch
+import einops
+import torch.nn.functional as F
+from torch import nn
+
+from pytorch_widedeep.wdtypes import List, Tuple, Union, Tensor, Optional
+from pytorch_widedeep.inference.optimization import batchnorm_scale_shift
+from pytorch_widedeep.models.tabular.mlp.tab_mlp import TabMlp
+from pytorch_widedeep.models.tabular.resnet.tab_resnet import TabResnet
+
+
+class FoldedTabModel(nn.Module):
+    r"""Inference-only version of a trained `TabMlp` or `TabResnet` model
+    where the categorical embeddings (plus their bias) are folded into the
+    first dense layer of the model.
+
+    Each categorical column becomes a direct lookup into a table of
+    `(n_categories + 1, first_layer_dim)` pre-projected vectors. The
+    continuous, multi-hot and the compositional or memory-mapped
+    categorical columns (if any) are projected as usual. The rest of the
+    model is unchanged. Note that, unless the embedding dims are larger
+    than the number of neurons of the first dense layer, the folded tables
+    take more memory than the original ones.
+
+    The model is folded in eval mode: dropout is ignored and, if the
+    first dense layer starts with batch normalisation (i.e.
+    `mlp_linear_first = False` and `mlp_batchnorm = True`), the running
+    statistics are folded too. The modules that are not folded are shared
+    with the original model.
+
+    Parameters
+    ----------
+    model: TabMlp or TabResnet
+        trained model. For the `TabResnet` the first dense layer only exists
+        if the input dim of the model (i.e. the sum of all the embedding
+        dims) is not equal to the first element of `blocks_dims`
+
+    Examples
+    --------
+    >>> import torch
+    >>> from pytorch_widedeep.models import TabMlp
+    >>> from pytorch_widedeep.inference import FoldedTabModel
+    >>> X_tab = torch.cat((torch.empty(5, 4).random_(4), torch.rand(5, 1)), axis=1)
+    >>> colnames = ["a", "b", "c", "d", "e"]
+    >>> cat_embed_input = [(u, i, j) for u, i, j in zip(colnames[:4], [4] * 4, [8] * 4)]
+    >>> column_idx = {k: v for v, k in enumerate(colnames)}
+    >>> model = TabMlp(mlp_hidden_dims=[8, 4], column_idx=column_idx, cat_embed_input=cat_embed_input,
+    ... continuous_cols=["e"])
+    >>> folded_model = FoldedTabModel(model.eval())
+    >>> torch.allclose(folded_model(X_tab), model(X_tab), atol=1e-6)
+    True
+    """
+
+    def __init__(self, model: Union[TabMlp, TabResnet]):
+        super(FoldedTabModel, self).__init__()
+
+        linear, batchnorm = self._check_model(model)
+
+        self.output_dim = model.output_dim
+
+        embeddings = model.cat_and_cont_embed
+        cat_embed = embeddings.cat_embed
+
+        weight, bias = self._fold_batchnorm(linear, batchnorm)
+
+        # the (column) positions of the embeddings in the input of the first
+        # dense layer
+        positions, pos = {}, 0
+        for col, _, dim in cat_embed.embed_input:
+            positions[col] = list(range(pos, pos + dim))
+            pos += dim
+
+        folded_tables: List[Tensor] = []
+        offsets: List[int] = []
+        n_rows = 0
+        for col, val, dim in cat_embed.fused_embed_input:
+            table = cat_embed._col_weight(col, dim)
+            if cat_embed.use_bias:
+                table = table + cat_embed._col_bias(col, dim)
+            folded_tables.append(table @ weight[:, positions[col]].t())
+            offsets.append(n_rows)
+            n_rows += val + 1
+        self.register_buffer("folded_embed", torch.cat(folded_tables))
+        self.register_buffer(
+            "cat_idx",
+            torch.tensor(
+                [model.column_idx[col] for col, _, _ in cat_embed.fused_embed_input]
+            ),
+        )
+        self.register_buffer("offsets", torch.tensor(offsets))
+        self.register_buffer("bias", bias)
+
+        # columns that are not folded: these are embedded (or normalised) as
+        # in the original model and projected via the corresponding columns
+        # of the first dense layer
+        self.unfused_cols: List[Tuple[str, int]] = []
+        self.unfused_embed = nn.ModuleDict()
+        rest_positions: List[int] = []
+        for col, _, _ in cat_embed.unfused_embed_input:
+            name = cat_embed.embed_layers_names[col]
+            self.unfused_cols.append((name, model.column_idx[col]))
+            self.unfused_embed[name] = cat_embed._unfused_embed_layer(col)
+            if cat_embed.use_bias:
+                self.register_buffer(
+                    "unfused_bias_" + name,
+                    cat_embed.unfused_biases["bias_" + name].detach(),
+                )
+            rest_positions += positions[col]
+        self.multi_hot_embed: Optional[nn.Module] = None
+        if embeddings.multi_hot_embed_input is not None:
+            self.multi_hot_embed = embeddings.multi_hot_embed
+            rest_positions += list(
+                range(pos, pos + embeddings.multi_hot_embed.emb_out_dim)
+            )
+            pos += embeddings.multi_hot_embed.emb_out_dim
+        self.cont_idx: Optional[List[int]] = None
+        if embeddings.continuous_cols is not None:
+            self.cont_idx = embeddings.cont_idx
+            self.cont_norm = embeddings.cont_norm
+            self.cont_embed = (
+                embeddings.cont_embed if embeddings.embed_continuous else None
+            )
+            self.cont_embed_act_fn = model.cont_embed_act_fn
+            rest_positions += list(range(pos, pos + embeddings.cont_out_dim))
+        self.register_buffer(
+            "rest_weight", weight[:, rest_positions] if rest_positions else None
+        )
+
+        self.encoder, self.mlp = self._strip_first_linear(model)
+
+        self.eval()
+
+    def forward(self, X: Tensor) -> Tensor:
+        idx = X[:, self.cat_idx].long() + self.offsets
+        x = F.embedding_bag(idx, self.folded_embed, mode="sum") + self.bias
+        if self.rest_weight is not None:
+            x = x + F.linear(self._rest_features(X), self.rest_weight)
+        x = self.encoder(x)
+        if self.mlp is not None:
+            x = self.mlp(x)
+        return x
+
+    def _rest_features(self, X: Tensor) -> Tensor:
+        rest = []
+        for name, idx in self.unfused_cols:
+            x = self.unfused_embed[name](X[:, idx].long())
+            if hasattr(self, "unfused_bias_" + name):
+                x = x + getattr(self, "unfused_bias_" + name)
+            rest.append(x)
+        if self.multi_hot_embed is not None:
+            rest.append(self.multi_hot_embed(X))
+        if self.cont_idx is not None:
+            x_cont = self.cont_norm(X[:, self.cont_idx].float())
+            if self.cont_embed is not None:
+                x_cont = einops.rearrange(self.cont_embed(x_cont), "b s d -> b (s d)")
+            if self.cont_embed_act_fn is not None:
+                x_cont = self.cont_embed_act_fn(x_cont)
+            rest.append(x_cont)
+        return torch.cat(rest, 1) if len(rest) > 1 else rest[0]
+
+    @staticmethod
+    def _check_model(
+        model: Union[TabMlp, TabResnet]
+    ) -> Tuple[nn.Linear, Optional[nn.BatchNorm1d]]:
+        if not isinstance(model, (TabMlp, TabResnet)):
+            raise ValueError(
+                "Only 'TabMlp' and 'TabResnet' models can be folded. Got "
+                f"{type(model).__name__} instead"
+            )
+        if (
+            model.cat_embed_input is None
+            or not model.cat_and_cont_embed.cat_embed.fused_embed_input
+        ):
+            # compositional and memory-mapped embeddings are not folded
+            raise ValueError("The model has no categorical embeddings to fold")
+        if model.cat_embed_act_fn is not None:
+            raise ValueError(
+                "The categorical embeddings cannot be folded if "
+                "'cat_embed_activation' is not None"
+            )
+        if isinstance(model, TabMlp):
+            first_layer = model.encoder.mlp.dense_layer_0
+            lin_pos = [isinstance(m, nn.Linear) for m in first_layer].index(True)
+            batchnorm = [
+                m for m in first_layer[:lin_pos] if isinstance(m, nn.BatchNorm1d)
+            ]
+            return first_layer[lin_pos], batchnorm[0] if batchnorm else None
+        if not hasattr(model.encoder.dense_resnet, "lin_inp"):
+            raise ValueError(
+                "A 'TabResnet' model can only be folded if its input dim is not "
+                "equal to the first element of 'blocks_dims', i.e. if the "
+                "embeddings are passed through a dense layer before the first "
+                "residual block"
+            )
+        return model.encoder.dense_resnet.lin_inp, None
+
+    @staticmethod
+    def _fold_batchnorm(
+        linear: nn.Linear, batchnorm: Optional[nn.BatchNorm1d]
+    ) -> Tuple[Tensor, Tensor]:
+        weight = linear.weight.detach()
+        bias = (
+            linear.bias.detach()
+            if linear.bias is not None
+            else torch.zeros(weight.size(0), device=weight.device)
+        )
+        if batchnorm is not None:
+            # BN(x) = x * scale + shift, so W @ BN(x) + b = (W * scale) @ x +
+            # (W @ shift + b)
+            scale, shift = batchnorm_scale_shift(batchnorm)
+            bias = bias + weight @ shift
+            weight = weight * scale
+        return weight, bias
+
+    @staticmethod
+    def _strip_first_linear(
+        model: Union[TabMlp, TabResnet]
+    ) -> Tuple[nn.Module, Optional[nn.Module]]:
+        encoder = deepcopy(model.encoder)
+        if isinstance(model, TabMlp):
+            first_layer = encoder.mlp.dense_layer_0
+            lin_pos = [isinstance(m, nn.Linear) for m in first_layer].index(True)
+            # the batchnorm/dropout before the linear layer, and the linear
+            # layer itself, are folded
+            for i in range(lin_pos + 1):
+                first_layer[i] = nn.Identity()
+            return encoder, None
+        encoder.dense_resnet.lin_inp = nn.Identity()
+        return encoder, model.mlp
+
+
+def fold_embeddings(model: nn.Module, inplace: bool = False) -> nn.Module:
+    r"""Replaces the `TabMlp` and `TabResnet` models within a trained model
+    (for example, the `deeptabular` component of a `WideDeep` model) by
+    their folded versions. See `FoldedTabModel`.
+
+    Models that cannot be folded (e.g. a `TabResnet` with no dense layer
+    before the first residual block) are left untouched.
+
+    Parameters
+    ----------
+    model: nn.Module
+        trained model
+    inplace: bool, default = False
+        whether the models are replaced in the model passed. If `False` a
+        folded copy of the model is returned
+
+    Returns
+    -------
+    nn.Module
+        the model with folded embeddings
+    """
+    if not inplace:
+        model = deepcopy(model)
+    if isinstance(model, (TabMlp, TabResnet)):
+        return _folded_or_original(model)
+    _fold_module(model)
+    return model
+
+
+def _fold_module(module: nn.Module):
+    for name, child in module.named_children():
+        if isinstance(child, (TabMlp, TabResnet)):
+            setattr(module, name, _folded_or_original(child))
+        else:
+            _fold_module(child)
+
+
+def _folded_or_original(model: Union[TabMlp, TabResnet]) -> nn.Module:
+    try:
+        return FoldedTabModel(model.eval())
+    except ValueError:
+        return model
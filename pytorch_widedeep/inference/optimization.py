@@ -0,0 +1,351 @@
+"""
+Inference-only optimisation of trained models.
+
+In eval mode a batch normalisation layer is just a per-channel affine
+transform, `BN(x) = x * scale + shift`, with `scale` and `shift` computed
+from the running statistics. When it sits right after (or, for the
+`BatchNorm1d`, right before) a linear or convolutional layer, it can be
+folded into the weights and bias of that layer, removing one kernel launch
+and one pass over the activations per batch normalisation layer. Dropout
+layers are also no-ops in eval mode, and the convolutions of the image
+models run faster with channels last inputs on CPU.
+"""
+
+from copy import deepcopy
+from collections import defaultdict
+
+import torch
+import torchvision
+from torch import nn
+
+from pytorch_widedeep.wdtypes import Dict, List, Tuple, Union, Tensor, Optional
+from pytorch_widedeep.models.image.vision import Vision
+from pytorch_widedeep.models.tabular.mlp.tab_mlp import TabMlp
+from pytorch_widedeep.models.tabular.resnet._layers import BasicBlock
+from pytorch_widedeep.models.tabular.tabnet._layers import (
+    GBN,
+    GLU_Layer,
+    AttentiveTransformer,
+)
+from pytorch_widedeep.models.tabular.embeddings_layers import (
+    ContEmbeddings,
+    FullEmbeddingDropout,
+)
+from pytorch_widedeep.models.tabular.resnet.tab_resnet import TabResnet
+
+DROPOUT_LAYERS = (
+    nn.Dropout,
+    nn.Dropout1d,
+    nn.Dropout2d,
+    nn.Dropout3d,
+    nn.AlphaDropout,
+    FullEmbeddingDropout,
+)
+
+# (layer, batchnorm) attribute pairs of the modules whose forward pass applies
+# the batchnorm directly to the output of the layer
+LAYER_BN_PAIRS: Dict[type, List[Tuple[str, str]]] = {
+    BasicBlock: [("lin1", "bn1"), ("lin2", "bn2")],
+    GLU_Layer: [("fc", "bn")],
+    AttentiveTransformer: [("fc", "bn")],
+    torchvision.models.resnet.BasicBlock: [("conv1", "bn1"), ("conv2", "bn2")],
+    torchvision.models.resnet.Bottleneck: [
+        ("conv1", "bn1"),
+        ("conv2", "bn2"),
+        ("conv3", "bn3"),
+    ],
+}
+
+_BatchNorm = Union[nn.BatchNorm1d, nn.BatchNorm2d]
+_Layer = Union[nn.Linear, nn.Conv2d]
+
+
+def optimize_for_inference(
+    model: nn.Module,
+    inplace: bool = False,
+    fold_batchnorm: bool = True,
+    remove_dropout: bool = True,
+    channels_last: bool = True,
+) -> nn.Module:
+    r"""Optimises a trained model (typically a `WideDeep` model) for
+    inference.
+
+    The model is set to eval mode and:
+
+    - the batch normalisation layers that are applied right after a linear
+    or convolutional layer (e.g. in the `TabResnet` blocks, the TabNet
+    `GLU_Layer`s and `AttentiveTransformer`s, the `Vision` basic CNN and the
+    ResNet backbones) or right before a linear layer (e.g. in the `MLP`s
+    with `batchnorm = True` and `linear_first = False`) are folded into that
+    layer. The same applies to the batch normalisation of the continuous
+    columns (`cont_norm_layer = "batchnorm"`) if these are embedded or, for
+    the `TabMlp` and `TabResnet`, passed directly to a linear layer.
+    - the dropout layers are replaced by `nn.Identity`
+    - the `Vision` components (and their inputs) are converted to the
+    channels last memory format
+
+    Batch normalisation layers with no adjacent linear layer, such as the
+    initial batch normalisation of TabNet or the last one of an `MLP` with
+    `linear_first = True`, are left as they are.
+
+    :information_source: **NOTE**: the resulting model can only be used for
+    inference: training it further (or even just setting it to train mode)
+    will not behave as the original model.
+
+    Parameters
+    ----------
+    model: nn.Module
+        trained model
+    inplace: bool, default = False
+        whether the model passed is modified. If `False` an optimised copy
+        of the model is returned
+    fold_batchnorm: bool, default = True
+        whether the batch normalisation layers are folded into the adjacent
+        linear or convolutional layers
+    remove_dropout: bool, default = True
+        whether the dropout layers are replaced by `nn.Identity`
+    channels_last: bool, default = True
+        whether the `Vision` components are converted to the channels last
+        memory format
+
+    Returns
+    -------
+    nn.Module
+        the optimised model, in eval mode
+
+    Examples
+    --------
+    >>> import torch
+    >>> from pytorch_widedeep.models import TabMlp, WideDeep
+    >>> from pytorch_widedeep.inference import optimize_for_inference
+    >>> X_tab = torch.cat((torch.empty(5, 4).random_(4), torch.rand(5, 1)), axis=1)
+    >>> colnames = ["a", "b", "c", "d", "e"]
+    >>> cat_embed_input = [(u, i, j) for u, i, j in zip(colnames[:4], [4] * 4, [8] * 4)]
+    >>> column_idx = {k: v for v, k in enumerate(colnames)}
+    >>> tab_mlp = TabMlp(mlp_hidden_dims=[8, 4], mlp_batchnorm=True, column_idx=column_idx,
+    ... cat_embed_input=cat_embed_input, continuous_cols=["e"])
+    >>> model = WideDeep(deeptabular=tab_mlp).eval()
+    >>> opt_model = optimize_for_inference(model)
+    >>> torch.allclose(opt_model({"deeptabular": X_tab}), model({"deeptabular": X_tab}), atol=1e-6)
+    True
+    """
+    if not inplace:
+        model = deepcopy(model)
+    model.eval()
+
+    if remove_dropout:
+        _remove_dropout(model)
+
+    if fold_batchnorm:
+        with torch.no_grad():
+            _fold_registered_pairs(model)
+            _fold_sequentials(model)
+            _fold_cont_norm(model)
+
+    if channels_last:
+        for module in model.modules():
+            if isinstance(module, Vision) and not getattr(
+                module, "channels_last", False
+            ):
+                module.to(memory_format=torch.channels_last)
+                module.register_forward_pre_hook(_to_channels_last)
+                module.channels_last = True
+
+    return model
+
+
+def batchnorm_scale_shift(batchnorm: _BatchNorm) -> Tuple[Tensor, Tensor]:
+    r"""Returns the `scale` and `shift` such that, in eval mode,
+    `batchnorm(x) = x * scale + shift` (per channel)"""
+    scale = torch.rsqrt(batchnorm.running_var + batchnorm.eps)
+    if batchnorm.affine:
+        scale = scale * batchnorm.weight.detach()
+    shift = -batchnorm.running_mean * scale
+    if batchnorm.affine:
+        shift = shift + batchnorm.bias.detach()
+    return scale, shift
+
+
+def _to_channels_last(module: nn.Module, inputs: Tuple[Tensor, ...]):
+    # forward pre-hook of the 'Vision' components. Defined at module level so
+    # that the optimised models can be pickled
+    return tuple(
+        x.contiguous(memory_format=torch.channels_last)
+        if isinstance(x, Tensor) and x.dim() == 4
+        else x
+        for x in inputs
+    )
+
+
+def _remove_dropout(module: nn.Module):
+    for name, child in module.named_children():
+        if isinstance(child, DROPOUT_LAYERS):
+            setattr(module, name, nn.Identity())
+        else:
+            _remove_dropout(child)
+
+
+def _is_foldable(batchnorm: nn.Module) -> bool:
+    # without running statistics the batchnorm uses the batch statistics
+    # also in eval mode
+    return (
+        isinstance(batchnorm, (nn.BatchNorm1d, nn.BatchNorm2d))
+        and batchnorm.running_mean is not None
+    )
+
+
+def _fold_into_output(layer: _Layer, batchnorm: _BatchNorm):
+    # BN(W @ x + b) = (W * scale) @ x + (b * scale + shift)
+    scale, shift = batchnorm_scale_shift(batchnorm)
+    shape = (-1,) + (1,) * (layer.weight.dim() - 1)
+    bias = layer.bias if layer.bias is not None else torch.zeros_like(scale)
+    layer.weight.mul_(scale.view(shape))
+    layer.bias = nn.Parameter(
+        bias * scale + shift, requires_grad=layer.weight.requires_grad
+    )
+
+
+def _fold_into_input(
+    batchnorm: nn.BatchNorm1d, linear: nn.Linear, cols: Optional[slice] = None
+):
+    # W @ BN(x) + b = (W * scale) @ x + (W @ shift + b), where only the input
+    # columns 'cols' of the linear layer are normalised
+    cols = cols if cols is not None else slice(None)
+    scale, shift = batchnorm_scale_shift(batchnorm)
+    bias = (
+        linear.bias
+        if linear.bias is not None
+        else torch.zeros(linear.out_features, device=scale.device)
+    )
+    linear.bias = nn.Parameter(
+        bias + linear.weight[:, cols] @ shift,
+        requires_grad=linear.weight.requires_grad,
+    )
+    linear.weight[:, cols] *= scale
+
+
+def _fold_cont_norm(model: nn.Module):
+    for module in model.modules():
+        embeddings = getattr(module, "cat_and_cont_embed", None)
+        if embeddings is None or not _is_foldable(
+            getattr(embeddings, "cont_norm", None)
+        ):
+            continue
+        if embeddings.embed_continuous:
+            _fold_into_cont_embed(embeddings.cont_norm, embeddings.cont_embed)
+        else:
+            first_linear = _first_linear(module)
+            if first_linear is None:
+                continue
+            n_cont = embeddings.cont_out_dim
+            _fold_into_input(
+                embeddings.cont_norm,
+                first_linear,
+                slice(first_linear.in_features - n_cont, None),
+            )
+        embeddings.cont_norm = nn.Identity()
+
+
+def _fold_into_cont_embed(batchnorm: nn.BatchNorm1d, cont_embed: ContEmbeddings):
+    # w * (x * scale + shift) + b = (w * scale) * x + (w * shift + b)
+    scale, shift = batchnorm_scale_shift(batchnorm)
+    bias = (
+        cont_embed.bias
+        if cont_embed.bias is not None
+        else torch.zeros_like(cont_embed.weight)
+    )
+    cont_embed.bias = nn.Parameter(
+        bias + cont_embed.weight * shift.unsqueeze(1),
+        requires_grad=cont_embed.weight.requires_grad,
+    )
+    cont_embed.weight.mul_(scale.unsqueeze(1))
+    cont_embed.use_bias = True
+
+
+def _first_linear(model: nn.Module) -> Optional[nn.Linear]:
+    # the linear layer that receives the (non-embedded) continuous columns as
+    # the last columns of its input, if any
+    if isinstance(model, TabMlp):
+        first_layer = [
+            m
+            for m in model.encoder.mlp.dense_layer_0
+            if not isinstance(m, (nn.Identity,) + DROPOUT_LAYERS)
+        ]
+        return first_layer[0] if isinstance(first_layer[0], nn.Linear) else None
+    if isinstance(model, TabResnet):
+        return getattr(model.encoder.dense_resnet, "lin_inp", None)
+    return None
+
+
+def _fold_registered_pairs(model: nn.Module):
+    n_parents = _count_parents(model)
+    for module in list(model.modules()):
+        for layer_name, bn_name in LAYER_BN_PAIRS.get(type(module), []):
+            layer = getattr(module, layer_name, None)
+            batchnorm = getattr(module, bn_name, None)
+            if isinstance(batchnorm, GBN):
+                # in eval mode a ghost batchnorm is a regular batchnorm
+                batchnorm = batchnorm.bn
+            if layer is None or not _is_foldable(batchnorm):
+                continue
+            if n_parents[id(layer)] > 1:
+                # layers shared by several modules (e.g. the shared layers of
+                # the TabNet feature transformers), each with its own
+                # batchnorm, are unshared before folding
+                layer = deepcopy(layer)
+                setattr(module, layer_name, layer)
+            _fold_into_output(layer, batchnorm)
+            setattr(module, bn_name, nn.Identity())
+
+
+def _count_parents(model: nn.Module) -> Dict[int, int]:
+    n_parents: Dict[int, int] = defaultdict(int)
+    for module in model.modules():
+        for child in module.children():
+            n_parents[id(child)] += 1
+    return n_parents
+
+
+def _fold_sequentials(model: nn.Module):
+    # the (potentially nested) sequential containers are flattened so that,
+    # for example, the batchnorm at the end of one dense layer of an MLP is
+    # folded into the linear layer at the beginning of the next one
+    for module in list(model.modules()):
+        if not isinstance(module, nn.Sequential):
+            continue
+        leaves = [
+            leaf
+            for leaf in _flatten(module)
+            if not isinstance(leaf[2], (nn.Identity,) + DROPOUT_LAYERS)
+        ]
+        for i, (parent, name, batchnorm) in enumerate(leaves):
+            if not _is_foldable(batchnorm):
+                continue
+            prev_layer = leaves[i - 1][2] if i > 0 else None
+            next_layer = leaves[i + 1][2] if i < len(leaves) - 1 else None
+            if (
+                isinstance(batchnorm, nn.BatchNorm1d)
+                and isinstance(prev_layer, nn.Linear)
+                or isinstance(batchnorm, nn.BatchNorm2d)
+                and isinstance(prev_layer, nn.Conv2d)
+            ):
+                _fold_into_output(prev_layer, batchnorm)
+            elif (
+                isinstance(batchnorm, nn.BatchNorm1d)
+                and isinstance(next_layer, nn.Linear)
+                and next_layer.in_features == batchnorm.num_features
+            ):
+                _fold_into_input(batchnorm, next_layer)
+            else:
+                continue
+            setattr(parent, name, nn.Identity())
+
+
+def _flatten(sequential: nn.Sequential) -> List[Tuple[nn.Module, str, nn.Module]]:
+    leaves: List[Tuple[nn.Module, str, nn.Module]] = []
+    for name, child in sequential.named_children():
+        if isinstance(child, nn.Sequential):
+            leaves += _flatten(child)
+        else:
+            leaves.append((sequential, name, child))
+    return leaves
@@ -0,0 +1,266 @@
+"""
+Post-training, row-wise quantization of the embedding tables of a model,
+meant to reduce the memory footprint of the models at serving time.
+"""
+
+from copy import deepcopy
+
+import numpy as np
+import torch
+from torch import nn
+from torch.utils.data import DataLoader
+
+from pytorch_widedeep.wdtypes import (
+    Dict,
+    Tuple,
+    Tensor,
+    Literal,
+    Callable,
+    Optional,
+)
+from pytorch_widedeep.training._wd_dataset import WideDeepDataset
+from pytorch_widedeep.models.tabular.embeddings_layers import (
+    MMapEmbedding,
+    ShardedEmbedding,
+    QuantizedEmbedding,
+    DiffSizeCatEmbeddings,
+)
+
+# with smaller embedding dims the per-row scale and offset of the int8
+# quantization take more memory than what the int8 rows save
+MIN_INT8_EMBED_DIM = 8
+
+
+def quantize_embeddings(
+    model: nn.Module,
+    dtype: Literal["int8", "float16"] = "int8",
+    inplace: bool = False,
+) -> nn.Module:
+    r"""Replaces the embedding tables of a trained model (e.g. those of the
+    `Wide` component, `nn.Embedding` and `nn.EmbeddingBag` layers, and the
+    fused tables of the `DiffSizeCatEmbeddings`) by row-wise quantized
+    tables (see
+    `pytorch_widedeep.models.tabular.embeddings_layers.QuantizedEmbedding`),
+    where only the looked up rows are dequantized.
+
+    The quantized model is meant to be used for inference only and its state
+    dict is not compatible with that of the original model. Memory-mapped
+    embeddings and `nn.EmbeddingBag` layers with `mode='max'` are not
+    quantized.
+
+    :information_source: **NOTE**: tables with an embedding dim smaller than
+    8 (e.g. the linear layer of the `Wide` component) are stored in
+    _'float16'_ even if `dtype = 'int8'`, since the per-row scale and
+    offset would take more memory than what the int8 rows save.
+
+    Parameters
+    ----------
+    model: nn.Module
+        trained model, e.g. a `WideDeep` model or any of its components
+    dtype: str, default = 'int8'
+        One of _'int8'_ or _'float16'_
+    inplace: bool, default = False
+        Boolean indicating if the model is modified in place. If `False` a
+        quantized copy of the model is returned
+
+    Returns
+    -------
+    nn.Module
+        the model with quantized embedding tables
+
+    Examples
+    --------
+    >>> import torch
+    >>> from pytorch_widedeep.models import TabMlp
+    >>> from pytorch_widedeep.inference import quantize_embeddings
+    >>> X_tab = torch.cat((torch.empty(5, 2).random_(1, 10), torch.rand(5, 1)), axis=1)
+    >>> colnames = ["a", "b", "c"]
+    >>> cat_embed_input = [(u, i, 16) for u, i in zip(colnames[:2], [10] * 2)]
+    >>> column_idx = {k: v for v, k in enumerate(colnames)}
+    >>> model = TabMlp(column_idx=column_idx, cat_embed_input=cat_embed_input, continuous_cols=["c"])
+    >>> quantized_model = quantize_embeddings(model.eval())
+    >>> out = quantized_model(X_tab)
+    """
+    if dtype not in ["int8", "float16"]:
+        raise ValueError(
+            f"'dtype' must be one of 'int8' or 'float16'. Got {dtype} instead"
+        )
+    if not inplace:
+        model = deepcopy(model)
+    # embedding layers can be shared by several modules (e.g. the columns
+    # that share a vocabulary), and so are their quantized versions
+    _quantize_module(model, dtype, {})
+    return model
+
+
+def quantization_drift_report(
+    model: nn.Module,
+    quantized_model: nn.Module,
+    X_wide: Optional[np.ndarray] = None,
+    X_tab: Optional[np.ndarray] = None,
+    X_text: Optional[np.ndarray] = None,
+    X_img: Optional[np.ndarray] = None,
+    target: Optional[np.ndarray] = None,
+    metric: Optional[Callable[[np.ndarray, np.ndarray], float]] = None,
+    batch_size: int = 1024,
+) -> Dict[str, float]:
+    r"""Compares the outputs of a `WideDeep` model and its quantized version
+    (see `quantize_embeddings`) on a (validation) dataset
+
+    Parameters
+    ----------
+    model: nn.Module
+        original `WideDeep` model
+    quantized_model: nn.Module
+        quantized `WideDeep` model
+    X_wide: np.ndarray, Optional. default=None
+        Input for the `wide` model component.
+        See `pytorch_widedeep.preprocessing.WidePreprocessor`
+    X_tab: np.ndarray, Optional. default=None
+        Input for the `deeptabular` model component.
+        See `pytorch_widedeep.preprocessing.TabPreprocessor`
+    X_text: np.ndarray, Optional. default=None
+        Input for the `deeptext` model component.
+        See `pytorch_widedeep.preprocessing.TextPreprocessor`
+    X_img: np.ndarray, Optional. default=None
+        Input for the `deepimage` model component.
+        See `pytorch_widedeep.preprocessing.ImagePreprocessor`
+    target: np.ndarray, Optional. default=None
+        target values. Only used if `metric` is not `None`
+    metric: Callable, Optional. default=None
+        function with signature `metric(target, outputs)` (e.g.
+        `sklearn.metrics.roc_auc_score`) that will be computed on the raw
+        outputs (i.e. the logits in the case of classification problems) of
+        both models
+    batch_size: int, default = 1024
+        batch size
+
+    Returns
+    -------
+    Dict
+        Dictionary with the maximum and mean absolute differences between
+        the outputs of both models, the memory (in bytes) of the embedding
+        tables of both models and their ratio and, if `metric` is not
+        `None`, the metric for both models and their difference
+    """
+    test_set = WideDeepDataset(X_wide, X_tab, X_text, X_img, is_training=False)
+    loader = DataLoader(test_set, batch_size=batch_size, shuffle=False)
+
+    outs = _predict(model, loader)
+    quantized_outs = _predict(quantized_model, loader)
+    abs_diff = np.abs(outs - quantized_outs)
+
+    embed_bytes = embedding_tables_bytes(model)
+    quantized_embed_bytes = embedding_tables_bytes(quantized_model)
+    report = {
+        "max_abs_diff": float(abs_diff.max()),
+        "mean_abs_diff": float(abs_diff.mean()),
+        "embedding_bytes": float(embed_bytes),
+        "quantized_embedding_bytes": float(quantized_embed_bytes),
+        "compression": embed_bytes / max(quantized_embed_bytes, 1),
+    }
+    if metric is not None:
+        if target is None:
+            raise ValueError("'target' is required to compute the 'metric'")
+        out = outs.squeeze(1) if outs.shape[1] == 1 else outs
+        quantized_out = (
+            quantized_outs.squeeze(1)
+            if quantized_outs.shape[1] == 1
+            else quantized_outs
+        )
+        report["metric"] = float(metric(target, out))
+        report["quantized_metric"] = float(metric(target, quantized_out))
+        report["metric_diff"] = report["quantized_metric"] - report["metric"]
+    return report
+
+
+def embedding_tables_bytes(model: nn.Module) -> int:
+    r"""Returns the memory (in bytes) taken by the embedding tables of a
+    model, quantized or not"""
+    n_bytes = 0
+    seen = set()
+    for m in model.modules():
+        if isinstance(m, MMapEmbedding):
+            tensors = [m.cache.weight]
+        elif isinstance(m, ShardedEmbedding):
+            # the shard of this process
+            tensors = [m.weight]
+        elif isinstance(m, QuantizedEmbedding):
+            tensors = list(m.buffers())
+        elif isinstance(m, (nn.Embedding, nn.EmbeddingBag)):
+            tensors = [m.weight]
+        elif isinstance(m, DiffSizeCatEmbeddings) and isinstance(
+            m.fused_embed, nn.ParameterDict
+        ):
+            tensors = list(m.fused_embed.values())
+        else:
+            continue
+        for t in tensors:
+            if id(t) not in seen:
+                seen.add(id(t))
+                n_bytes += t.numel() * t.element_size()
+    return n_bytes
+
+
+def _quantize_module(
+    module: nn.Module,
+    dtype: str,
+    quantized: Dict[int, Tuple[nn.Module, QuantizedEmbedding]],
+):
+    # 'quantized' keeps a reference to the original modules so that their
+    # ids are not reused while the model is being traversed
+    if isinstance(module, DiffSizeCatEmbeddings) and isinstance(
+        module.fused_embed, nn.ParameterDict
+    ):
+        module.fused_embed = nn.ModuleDict(
+            {
+                name: _quantized_embedding(weight, dtype)
+                for name, weight in module.fused_embed.items()
+            }
+        )
+    for name, child in module.named_children():
+        if isinstance(child, MMapEmbedding):
+            continue
+        if id(child) not in quantized:
+            if isinstance(child, nn.Embedding):
+                quantized[id(child)] = (
+                    child,
+                    _quantized_embedding(child.weight, dtype, child.padding_idx),
+                )
+            elif isinstance(child, nn.EmbeddingBag) and child.mode != "max":
+                quantized[id(child)] = (
+                    child,
+                    _quantized_embedding(
+                        child.weight, dtype, child.padding_idx, child.mode
+                    ),
+                )
+            else:
+                _quantize_module(child, dtype, quantized)
+                continue
+        setattr(module, name, quantized[id(child)][1])
+
+
+def _quantized_embedding(
+    weight: Tensor,
+    dtype: str,
+    padding_idx: Optional[int] = None,
+    mode: Optional[str] = None,
+) -> QuantizedEmbedding:
+    if weight.size(1) < MIN_INT8_EMBED_DIM:
+        dtype = "float16"
+    return QuantizedEmbedding(weight, dtype, padding_idx, mode)  # type: ignore[arg-type]
+
+
+def _predict(model: nn.Module, loader: DataLoader) -> np.ndarray:
+    device = next(model.parameters()).device
+    model.eval()
+    outs = []
+    with torch.no_grad():
+        for X in loader:
+            X = {k: v.to(device) for k, v in X.items()}
+            out = model(X)
+            if isinstance(out, tuple):
+                # TabNet also returns the sparsity regularization term
+                out = out[0]
+            outs.append(out.float().cpu().numpy())
+    return np.vstack(outs)
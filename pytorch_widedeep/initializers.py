@@ -1,8 +1,12 @@
 import re
 import warnings
-from typing import Dict, Union
+from typing import Dict, Tuple, Union, Iterator
 
-from torch import nn
+from torch import Tensor, nn
+
+from pytorch_widedeep.models.tabular.embeddings_layers import (
+    DiffSizeCatEmbeddings,
+)
 
 warnings.filterwarnings("default")
 
@@ -45,7 +49,7 @@ class Normal(Initializer):
         super(Normal, self).__init__()
 
     def __call__(self, submodel: nn.Module):
-        for n, p in submodel.named_parameters():
+        for n, p in _named_parameters(submodel):
             if re.search(self.pattern, n):
                 if self.bias and ("bias" in n):
                     nn.init.normal_(p, mean=self.mean, std=self.std)
@@ -64,7 +68,7 @@ class Uniform(Initializer):
         super(Uniform, self).__init__()
 
     def __call__(self, submodel: nn.Module):
-        for n, p in submodel.named_parameters():
+        for n, p in _named_parameters(submodel):
             if re.search(self.pattern, n):
                 if self.bias and ("bias" in n):
                     nn.init.uniform_(p, a=self.a, b=self.b)
@@ -82,7 +86,7 @@ class ConstantInitializer(Initializer):
         super(ConstantInitializer, self).__init__()
 
     def __call__(self, submodel: nn.Module):
-        for n, p in submodel.named_parameters():
+        for n, p in _named_parameters(submodel):
             if re.search(self.pattern, n):
                 if self.bias and ("bias" in n):
                     nn.init.constant_(p, val=self.value)
@@ -99,7 +103,7 @@ class XavierUniform(Initializer):
         super(XavierUniform, self).__init__()
 
     def __call__(self, submodel: nn.Module):
-        for n, p in submodel.named_parameters():
+        for n, p in _named_parameters(submodel):
             if re.search(self.pattern, n):
                 if "bias" in n:
                     nn.init.constant_(p, val=0)
@@ -117,7 +121,7 @@ class XavierNormal(Initializer):
         super(XavierNormal, self).__init__()
 
     def __call__(self, submodel: nn.Module):
-        for n, p in submodel.named_parameters():
+        for n, p in _named_parameters(submodel):
             if re.search(self.pattern, n):
                 if "bias" in n:
                     nn.init.constant_(p, val=0)
@@ -137,7 +141,7 @@ class KaimingUniform(Initializer):
         super(KaimingUniform, self).__init__()
 
     def __call__(self, submodel: nn.Module):
-        for n, p in submodel.named_parameters():
+        for n, p in _named_parameters(submodel):
             if re.search(self.pattern, n):
                 if "bias" in n:
                     nn.init.constant_(p, val=0)
@@ -159,7 +163,7 @@ class KaimingNormal(Initializer):
         super(KaimingNormal, self).__init__()
 
     def __call__(self, submodel: nn.Module):
-        for n, p in submodel.named_parameters():
+        for n, p in _named_parameters(submodel):
             if re.search(self.pattern, n):
                 if "bias" in n:
                     nn.init.constant_(p, val=0)
@@ -179,7 +183,7 @@ class Orthogonal(Initializer):
         super(Orthogonal, self).__init__()
 
     def __call__(self, submodel: nn.Module):
-        for n, p in submodel.named_parameters():
+        for n, p in _named_parameters(submodel):
             if re.search(self.pattern, n):
                 if "bias" in n:
                     nn.init.constant_(p, val=0)
@@ -188,3 +192,37 @@ class Orthogonal(Initializer):
                         nn.init.orthogonal_(p, gain=self.gain)
                     except Exception:
                         pass
+
+
+def _named_parameters(submodel: nn.Module) -> Iterator[Tuple[str, Tensor]]:
+    # the fused embedding tables of 'DiffSizeCatEmbeddings' are replaced by
+    # their per-column views (with the names used in the state dict, e.g.
+    # 'embed_layers.emb_layer_<col>.weight') so that the patterns and the
+    # initialisations apply column by column, as when each column had its
+    # own 'nn.Embedding' layer
+    fused = {}
+    for name, module in submodel.named_modules():
+        if isinstance(module, DiffSizeCatEmbeddings) and isinstance(
+            module.fused_embed, nn.ParameterDict
+        ):
+            fused[name] = module
+    fused_params = {
+        id(p)
+        for module in fused.values()
+        for p in list(module.fused_embed.values())
+        + (list(module.fused_biases.values()) if module.use_bias else [])
+    }
+    for n, p in submodel.named_parameters():
+        if id(p) not in fused_params:
+            yield n, p
+    for name, module in fused.items():
+        prefix = name + "." if name else ""
+        for col, _, dim in module.table_embed_input:
+            yield prefix + "embed_layers.emb_layer_" + module.embed_layers_names[
+                col
+            ] + ".weight", module._col_weight(col, dim, keep_vars=True)
+        if module.use_bias:
+            for col, _, dim in module.fused_embed_input:
+                yield prefix + "biases.bias_" + col, module._col_bias(
+                    col, dim, keep_vars=True
+                )
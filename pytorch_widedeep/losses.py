@@ -1,3 +1,5 @@
+import functools
+
 import torch
 import torch.nn as nn
 import torch.nn.functional as F
@@ -14,6 +16,23 @@ from pytorch_widedeep.wdtypes import (
 use_cuda = torch.cuda.is_available()
 
 
+def fp32_forward(forward):
+    r"""Decorator for the `forward` method of the losses that are numerically
+    sensitive. When training in mixed precision (see the `precision`
+    parameter of the trainers), the loss is computed in fp32, with autocast
+    disabled, regardless of the precision of the predictions"""
+
+    def _to_fp32(t: Tensor) -> Tensor:
+        return t.float() if t.is_floating_point() and t.element_size() < 4 else t
+
+    @functools.wraps(forward)
+    def wrapper(self, input: Tensor, target: Tensor, *args, **kwargs) -> Tensor:
+        with torch.autocast(device_type=input.device.type, enabled=False):
+            return forward(self, _to_fp32(input), _to_fp32(target), *args, **kwargs)
+
+    return wrapper
+
+
 class MSELoss(nn.Module):
     r"""Mean square error loss with the option of using Label Smooth
     Distribution (LDS)
@@ -386,6 +405,7 @@ class TweedieLoss(nn.Module):
     def __init__(self):
         super().__init__()
 
+    @fp32_forward
     def forward(
         self,
         input: Tensor,
@@ -444,6 +464,7 @@ class ZILNLoss(nn.Module):
     def __init__(self):
         super().__init__()
 
+    @fp32_forward
     def forward(self, input: Tensor, target: Tensor) -> Tensor:
         r"""
         Parameters
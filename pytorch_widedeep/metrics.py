@@ -3,9 +3,14 @@ import torch
 from torchmetrics import Metric as TorchMetric
 
 from pytorch_widedeep.wdtypes import Dict, List, Union, Tensor
+from pytorch_widedeep.distributed import all_reduce, is_distributed
 
 
 class Metric(object):
+    # names of the attributes that hold the state of the metric. In
+    # distributed training these are summed across processes
+    _state_names: List[str] = []
+
     def __init__(self):
         self._name = ""
 
@@ -15,6 +20,32 @@ class Metric(object):
     def __call__(self, y_pred: Tensor, y_true: Tensor):
         raise NotImplementedError("Custom Metrics must implement this function")
 
+    def update(self, y_pred: Tensor, y_true: Tensor):
+        r"""Updates the state of the metric with a new batch. Custom metrics
+        can implement `update` and `compute` to accumulate their state
+        without materialising the metric for every batch. By default the
+        metric is computed (via `__call__`) on every update"""
+        self._value = self(y_pred, y_true)
+
+    def compute(self) -> np.ndarray:
+        r"""Returns the value of the metric for all the batches seen since
+        the last reset"""
+        return self._value
+
+    def sync(self):
+        r"""In distributed training, sums the state of the metric (i.e. the
+        attributes in `_state_names`) across all processes, so that
+        `compute` returns the metric over the batches seen by all of them.
+        The value of the metrics that do not declare their state is averaged
+        across processes"""
+        if not is_distributed():
+            return
+        if self._state_names:
+            for name in self._state_names:
+                setattr(self, name, all_reduce(getattr(self, name)))
+        elif hasattr(self, "_value"):
+            self._value = all_reduce(self._value, op="mean").cpu().numpy()
+
 
 class MultipleMetrics(object):
     def __init__(self, metrics: List[Union[Metric, object]], prefix: str = ""):
@@ -31,18 +62,36 @@ class MultipleMetrics(object):
         for metric in self._metrics:
             metric.reset()
 
-    def __call__(self, y_pred: Tensor, y_true: Tensor) -> Dict:
-        logs = {}
+    def update(self, y_pred: Tensor, y_true: Tensor):
         for metric in self._metrics:
             if isinstance(metric, Metric):
-                logs[self.prefix + metric._name] = metric(y_pred, y_true)
+                metric.update(y_pred, y_true)
             elif isinstance(metric, TorchMetric):
                 metric.update(y_pred, y_true.int())  # type: ignore[attr-defined]
+
+    def sync(self):
+        r"""Syncs the state of the metrics across processes in distributed
+        training. Note that the `torchmetrics` metrics are synced by
+        `torchmetrics` itself when computed"""
+        for metric in self._metrics:
+            if isinstance(metric, Metric):
+                metric.sync()
+
+    def compute(self) -> Dict:
+        logs = {}
+        for metric in self._metrics:
+            if isinstance(metric, Metric):
+                logs[self.prefix + metric._name] = metric.compute()
+            elif isinstance(metric, TorchMetric):
                 logs[self.prefix + type(metric).__name__] = (
                     metric.compute().detach().cpu().numpy()
                 )
         return logs
 
+    def __call__(self, y_pred: Tensor, y_true: Tensor) -> Dict:
+        self.update(y_pred, y_true)
+        return self.compute()
+
 
 class Accuracy(Metric):
     r"""Class to calculate the accuracy for both binary and categorical problems
@@ -72,6 +121,8 @@ class Accuracy(Metric):
     array(0.66666667)
     """
 
+    _state_names = ["correct_count", "total_count"]
+
     def __init__(self, top_k: int = 1):
         super(Accuracy, self).__init__()
 
@@ -88,6 +139,10 @@ class Accuracy(Metric):
         self.total_count = 0
 
     def __call__(self, y_pred: Tensor, y_true: Tensor) -> np.ndarray:
+        self.update(y_pred, y_true)
+        return self.compute()
+
+    def update(self, y_pred: Tensor, y_true: Tensor):
         num_classes = y_pred.size(1)
 
         if num_classes == 1:
@@ -97,8 +152,11 @@ class Accuracy(Metric):
             y_pred = y_pred.topk(self.top_k, 1)[1]
             y_true = y_true.view(-1, 1).expand_as(y_pred)
 
-        self.correct_count += y_pred.eq(y_true).sum().item()  # type: ignore[assignment]
+        # the count is kept on the device of the predictions
+        self.correct_count += y_pred.eq(y_true).sum()  # type: ignore[assignment]
         self.total_count += len(y_pred)
+
+    def compute(self) -> np.ndarray:
         accuracy = float(self.correct_count) / float(self.total_count)
         return np.array(accuracy)
 
@@ -131,6 +189,8 @@ class Precision(Metric):
     array(0.33333334)
     """
 
+    _state_names = ["true_positives", "all_positives"]
+
     def __init__(self, average: bool = True):
         super(Precision, self).__init__()
 
@@ -148,19 +208,24 @@ class Precision(Metric):
         self.all_positives = 0
 
     def __call__(self, y_pred: Tensor, y_true: Tensor) -> np.ndarray:
+        self.update(y_pred, y_true)
+        return self.compute()
+
+    def update(self, y_pred: Tensor, y_true: Tensor):
         num_class = y_pred.size(1)
 
         if num_class == 1:
             y_pred = y_pred.round()
             y_true = y_true
         elif num_class > 1:
-            y_true = torch.eye(num_class)[y_true.squeeze().cpu().long()]
-            y_pred = y_pred.topk(1, 1)[1].view(-1)
-            y_pred = torch.eye(num_class)[y_pred.cpu().long()]
+            eye = torch.eye(num_class, device=y_pred.device)
+            y_true = eye[y_true.squeeze().long()]
+            y_pred = eye[y_pred.topk(1, 1)[1].view(-1)]
 
         self.true_positives += (y_true * y_pred).sum(dim=0)  # type:ignore
         self.all_positives += y_pred.sum(dim=0)  # type:ignore
 
+    def compute(self) -> np.ndarray:
         precision = self.true_positives / (self.all_positives + self.eps)
 
         if self.average:
@@ -197,6 +262,8 @@ class Recall(Metric):
     array(0.33333334)
     """
 
+    _state_names = ["true_positives", "actual_positives"]
+
     def __init__(self, average: bool = True):
         super(Recall, self).__init__()
 
@@ -214,19 +281,24 @@ class Recall(Metric):
         self.actual_positives = 0
 
     def __call__(self, y_pred: Tensor, y_true: Tensor) -> np.ndarray:
+        self.update(y_pred, y_true)
+        return self.compute()
+
+    def update(self, y_pred: Tensor, y_true: Tensor):
         num_class = y_pred.size(1)
 
         if num_class == 1:
             y_pred = y_pred.round()
             y_true = y_true
         elif num_class > 1:
-            y_true = torch.eye(num_class)[y_true.squeeze().cpu().long()]
-            y_pred = y_pred.topk(1, 1)[1].view(-1)
-            y_pred = torch.eye(num_class)[y_pred.cpu().long()]
+            eye = torch.eye(num_class, device=y_pred.device)
+            y_true = eye[y_true.squeeze().long()]
+            y_pred = eye[y_pred.topk(1, 1)[1].view(-1)]
 
         self.true_positives += (y_true * y_pred).sum(dim=0)  # type: ignore
         self.actual_positives += y_true.sum(dim=0)  # type: ignore
 
+    def compute(self) -> np.ndarray:
         recall = self.true_positives / (self.actual_positives + self.eps)
 
         if self.average:
@@ -286,9 +358,21 @@ class FBetaScore(Metric):
         self.precision.reset()
         self.recall.reset()
 
+    def sync(self):
+        self.precision.sync()
+        self.recall.sync()
+
     def __call__(self, y_pred: Tensor, y_true: Tensor) -> np.ndarray:
-        prec = self.precision(y_pred, y_true)
-        rec = self.recall(y_pred, y_true)
+        self.update(y_pred, y_true)
+        return self.compute()
+
+    def update(self, y_pred: Tensor, y_true: Tensor):
+        self.precision.update(y_pred, y_true)
+        self.recall.update(y_pred, y_true)
+
+    def compute(self) -> np.ndarray:
+        prec = self.precision.compute()
+        rec = self.recall.compute()
         beta2 = self.beta**2
 
         fbeta = ((1 + beta2) * prec * rec) / (beta2 * prec + rec + self.eps)
@@ -340,9 +424,18 @@ class F1Score(Metric):
         """
         self.f1.reset()
 
+    def sync(self):
+        self.f1.sync()
+
     def __call__(self, y_pred: Tensor, y_true: Tensor) -> np.ndarray:
         return self.f1(y_pred, y_true)
 
+    def update(self, y_pred: Tensor, y_true: Tensor):
+        self.f1.update(y_pred, y_true)
+
+    def compute(self) -> np.ndarray:
+        return self.f1.compute()
+
 
 class R2Score(Metric):
     r"""
@@ -369,6 +462,8 @@ class R2Score(Metric):
     array(0.94860814)
     """
 
+    _state_names = ["numerator", "denominator", "num_examples", "y_true_sum"]
+
     def __init__(self):
         self.numerator = 0
         self.denominator = 0
@@ -387,10 +482,19 @@ class R2Score(Metric):
         self.y_true_sum = 0
 
     def __call__(self, y_pred: Tensor, y_true: Tensor) -> np.ndarray:
-        self.numerator += ((y_pred - y_true) ** 2).sum().item()
+        self.update(y_pred, y_true)
+        return self.compute()
+
+    def update(self, y_pred: Tensor, y_true: Tensor):
+        # the sums are kept on the device of the predictions, in double
+        # precision
+        y_pred, y_true = torch.as_tensor(y_pred), torch.as_tensor(y_true)
+        self.numerator += ((y_pred - y_true) ** 2).sum().double()
 
         self.num_examples += y_true.shape[0]
-        self.y_true_sum += y_true.sum().item()
-        y_true_avg = self.y_true_sum / self.num_examples
-        self.denominator += ((y_true - y_true_avg) ** 2).sum().item()
-        return np.array((1 - (self.numerator / self.denominator)))
+        self.y_true_sum += y_true.sum().double()
+        y_true_avg = (self.y_true_sum / self.num_examples).to(y_true.dtype)
+        self.denominator += ((y_true - y_true_avg) ** 2).sum().double()
+
+    def compute(self) -> np.ndarray:
+        return np.array(float(1 - (self.numerator / self.denominator)))
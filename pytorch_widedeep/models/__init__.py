@@ -21,4 +21,9 @@ from pytorch_widedeep.models.tabular import (
     TabResnetDecoder,
     ContextAttentionMLP,
 )
+from pytorch_widedeep.models.lazy_init import (
+    init_empty_model,
+    materialize_model,
+)
 from pytorch_widedeep.models.wide_deep import WideDeep
+from pytorch_widedeep.models.attention_capture import capture_attention
@@ -0,0 +1,71 @@
+"""
+Opt-in capture of the attention weights of the transformer-based models.
+
+Materialising the attention weights of every layer in every forward pass
+keeps an extra $(N, H, F, F)$ tensor per layer alive and prevents the use
+of the fused `scaled_dot_product_attention` kernels. Therefore, the
+attention layers of the transformer-based models only compute and keep
+their attention weights when the forward pass runs within
+`capture_attention`.
+
+The flag is held in a context variable, so capturing in one thread does not
+change the behaviour of forward passes running in other threads.
+"""
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from pytorch_widedeep.wdtypes import Iterator
+
+_capture_attention: ContextVar[bool] = ContextVar("capture_attention", default=False)
+
+
+@contextmanager
+def capture_attention(enabled: bool = True) -> Iterator[None]:
+    r"""Context manager under which the attention layers of the
+    transformer-based models (`TabTransformer`, `SAINT`, `FTTransformer`,
+    `TabPerceiver` and `TabFastFormer`) keep their attention weights, so
+    they can be accessed through the models' `attention_weights` property
+    after the forward pass.
+
+    Outside this context manager the attention is computed with
+    `torch.nn.functional.scaled_dot_product_attention` and the attention
+    weights are not materialised.
+
+    :information_source: **NOTE**: the attention weights are still stored
+    as attributes of the attention layers. Therefore, forward passes
+    capturing the attention weights of the same model should not run
+    concurrently in different threads.
+
+    Parameters
+    ----------
+    enabled: bool, default = True
+        Boolean indicating if the attention weights will be captured. This
+        is useful to switch off the capture within an outer
+        `capture_attention` context
+
+    Examples
+    --------
+    >>> import torch
+    >>> from pytorch_widedeep.models import FTTransformer, capture_attention
+    >>> X_tab = torch.cat((torch.empty(5, 4).random_(4), torch.rand(5, 1)), axis=1)
+    >>> colnames = ["a", "b", "c", "d", "e"]
+    >>> cat_embed_input = [(u, i) for u, i in zip(colnames[:4], [4] * 4)]
+    >>> column_idx = {k: v for v, k in enumerate(colnames)}
+    >>> model = FTTransformer(
+    ...     column_idx=column_idx, cat_embed_input=cat_embed_input, continuous_cols=["e"]
+    ... ).eval()
+    >>> with capture_attention():
+    ...     out = model(X_tab)
+    >>> attention_weights = model.attention_weights
+    """
+    token = _capture_attention.set(enabled)
+    try:
+        yield
+    finally:
+        _capture_attention.reset(token)
+
+
+def is_capturing_attention() -> bool:
+    r"""Returns `True` if the forward passes run within `capture_attention`"""
+    return _capture_attention.get()
@@ -0,0 +1,221 @@
+"""
+Lazy construction of (potentially very large) models.
+
+By default, every parameter of a model is allocated and randomly initialised
+in the constructors of its components, just to be overwritten afterwards
+when the weights of a trained model are loaded. With large embedding
+tables this doubles both the time to build the model and the peak memory.
+Here the parameters are instead created on the 'meta' device (i.e. with no
+data) and materialised only once, either directly from the state dict or,
+if not present there, initialised as they would have been by the
+constructors.
+"""
+
+import inspect
+from typing import Set
+from contextlib import contextmanager
+
+import torch
+from torch import nn
+
+from pytorch_widedeep.wdtypes import (
+    Dict,
+    Tuple,
+    Union,
+    Tensor,
+    Iterator,
+    Optional,
+)
+
+# 'load_state_dict(..., assign=True)' is only available from torch 2.1
+_CAN_ASSIGN = "assign" in inspect.signature(nn.Module.load_state_dict).parameters
+
+
+@contextmanager
+def init_empty_model() -> Iterator[None]:
+    r"""Context manager under which the models are built with all their
+    parameters on the 'meta' device, i.e. with no memory allocated and no
+    initialisation. The buffers (e.g. the batch norm statistics or the
+    indices used by the embedding layers) are built as usual.
+
+    A model built this way cannot be used until it is materialised with
+    `materialize_model`.
+
+    :information_source: **NOTE**: values set by the constructors that are
+    not random initialisations, such as pretrained word vectors passed to
+    the text models or the pretrained weights of the `Vision` model, are
+    not kept unless they are part of the state dict loaded when
+    materialising the model.
+
+    Examples
+    --------
+    >>> import torch
+    >>> from pytorch_widedeep.models import TabMlp, WideDeep
+    >>> from pytorch_widedeep.models import init_empty_model, materialize_model
+    >>> colnames = ["a", "b", "c", "d", "e"]
+    >>> cat_embed_input = [(u, i, j) for u, i, j in zip(colnames[:4], [4] * 4, [8] * 4)]
+    >>> column_idx = {k: v for v, k in enumerate(colnames)}
+    >>> with init_empty_model():
+    ...     model = WideDeep(
+    ...         deeptabular=TabMlp(
+    ...             mlp_hidden_dims=[8, 4],
+    ...             column_idx=column_idx,
+    ...             cat_embed_input=cat_embed_input,
+    ...             continuous_cols=["e"],
+    ...         )
+    ...     )
+    >>> model = materialize_model(model)
+    """
+    register_parameter = nn.Module.register_parameter
+
+    def register_empty_parameter(
+        module: nn.Module, name: str, param: Optional[nn.Parameter]
+    ):
+        register_parameter(module, name, param)
+        if param is not None and not param.is_meta:
+            module._parameters[name] = type(param)(
+                param.to("meta"), requires_grad=param.requires_grad
+            )
+
+    nn.Module.register_parameter = register_empty_parameter  # type: ignore[assignment]
+    try:
+        yield
+    finally:
+        nn.Module.register_parameter = register_parameter  # type: ignore[assignment]
+
+
+def materialize_model(
+    model: nn.Module,
+    state_dict: Optional[Dict[str, Tensor]] = None,
+    device: Union[str, torch.device] = "cpu",
+    strict: bool = True,
+) -> nn.Module:
+    r"""Materialises a model built under `init_empty_model`, allocating
+    each parameter exactly once.
+
+    The tensors in the state dict become the parameters of the model (no
+    copies are made if they are already on `device`). Therefore, loading
+    the state dict with `torch.load(..., mmap=True)` results in parameters
+    that are backed by the file on disk until they are modified. The
+    parameters that are not in the state dict are initialised with the
+    `reset_parameters` method of the modules that hold them, as they would
+    have been by their constructors.
+
+    :information_source: **NOTE**: with torch < 2.1 (where
+    `load_state_dict` does not support `assign=True`) the parameters are
+    allocated first and the state dict is then copied into them.
+
+    Parameters
+    ----------
+    model: nn.Module
+        model built under `init_empty_model`
+    state_dict: Dict, Optional, default = None
+        state dict to be loaded into the model. If `None` all parameters are
+        initialised
+    device: str or torch.device, default = "cpu"
+        device where the parameters and buffers will be placed
+    strict: bool, default = True
+        whether the keys in the state dict must match those of the model.
+        See `nn.Module.load_state_dict`
+
+    Returns
+    -------
+    nn.Module
+        the (same) model, materialised
+    """
+    if state_dict is not None:
+        state_dict = {k: v.to(device) for k, v in state_dict.items()}
+        if _CAN_ASSIGN:
+            model.load_state_dict(state_dict, strict=strict, assign=True)
+
+    # parameters can be shared by several modules, so they are materialised
+    # only once
+    materialized: Dict[int, Tuple[nn.Parameter, nn.Parameter]] = {}
+    for module in model.modules():
+        for name, param in list(module._parameters.items()):
+            if param is None or not param.is_meta:
+                continue
+            if id(param) not in materialized:
+                materialized[id(param)] = (
+                    param,
+                    nn.Parameter(
+                        torch.empty_like(param, device=device),
+                        requires_grad=param.requires_grad,
+                    ),
+                )
+            setattr(module, name, materialized[id(param)][1])
+    to_reset = {id(p) for _, p in materialized.values()}
+
+    if state_dict is not None and not _CAN_ASSIGN:
+        # the state dict is copied into the (just allocated) parameters and
+        # only those that are not in it are initialised
+        missing_keys = set(
+            model.load_state_dict(state_dict, strict=strict).missing_keys
+        )
+        to_reset = {
+            id(p)
+            for n, p in model.named_parameters(remove_duplicate=False)
+            if n in missing_keys
+        }
+
+    _reset_parameters(model, to_reset)
+
+    return model.to(device)
+
+
+def has_meta_parameters(model: nn.Module) -> bool:
+    r"""Returns `True` if any of the parameters of the model has not been
+    materialised"""
+    return any(p.is_meta for p in model.parameters())
+
+
+def _reset_parameters(model: nn.Module, materialized_ids: Set[int]):
+    # The modules are visited children first, so that the initialisation of
+    # a module that (re)initialises the parameters of its children (e.g.
+    # 'Wide' or the TabNet layers) prevails, as in the constructors. Only the
+    # materialised parameters are affected: everything else in the module
+    # is temporarily replaced by meta tensors, on which the initialisation
+    # is a no-op
+    if not materialized_ids:
+        return
+    for module in _children_first(model, set()):
+        reset = getattr(module, "reset_parameters", None)
+        if reset is None or not any(
+            id(p) in materialized_ids for p in module.parameters()
+        ):
+            continue
+        with _only_materialized(module, materialized_ids):
+            reset()
+
+
+def _children_first(module: nn.Module, seen: Set[int]) -> Iterator[nn.Module]:
+    seen.add(id(module))
+    for child in module.children():
+        if id(child) not in seen:
+            yield from _children_first(child, seen)
+    yield module
+
+
+@contextmanager
+def _only_materialized(module: nn.Module, materialized_ids: Set[int]):
+    swapped = []
+    for m in module.modules():
+        for name, param in m._parameters.items():
+            if param is not None and id(param) not in materialized_ids:
+                swapped.append((m, name, param))
+        for name, buffer in m._buffers.items():
+            if buffer is not None and name not in m._non_persistent_buffers_set:
+                swapped.append((m, name, buffer))
+    try:
+        for m, name, t in swapped:
+            setattr(
+                m,
+                name,
+                nn.Parameter(t.to("meta"), requires_grad=t.requires_grad)
+                if isinstance(t, nn.Parameter)
+                else t.to("meta"),
+            )
+        yield
+    finally:
+        for m, name, t in swapped:
+            setattr(m, name, t)
@@ -1,6 +1,21 @@
+from contextlib import nullcontext
+
 import torch
+from torch.utils.checkpoint import checkpoint
 
-from pytorch_widedeep.wdtypes import Dict, List, Tuple, Tensor, Optional
+from pytorch_widedeep.wdtypes import (
+    Any,
+    Dict,
+    List,
+    Tuple,
+    Tensor,
+    Callable,
+    Optional,
+)
+from pytorch_widedeep.models.attention_capture import (
+    capture_attention,
+    is_capturing_attention,
+)
 from pytorch_widedeep.models._get_activation_fn import get_activation_fn
 from pytorch_widedeep.models._base_wd_model_component import (
     BaseWDModelComponent,
@@ -26,6 +41,11 @@ class BaseTabularModelWithoutAttention(BaseWDModelComponent):
         cont_embed_dropout: float,
         use_cont_bias: bool,
         cont_embed_activation: Optional[str],
+        multi_hot_embed_input: Optional[List[Tuple[str, int, int, int]]] = None,
+        compositional_embed_input: Optional[Dict[str, Any]] = None,
+        shared_vocab_cols: Optional[List[List[str]]] = None,
+        mmap_embed_input: Optional[Dict[str, Dict[str, Any]]] = None,
+        sharded_embed_input: Optional[Dict[str, Dict[str, Any]]] = None,
     ):
         super().__init__()
 
@@ -34,6 +54,11 @@ class BaseTabularModelWithoutAttention(BaseWDModelComponent):
         self.cat_embed_dropout = cat_embed_dropout
         self.use_cat_bias = use_cat_bias
         self.cat_embed_activation = cat_embed_activation
+        self.multi_hot_embed_input = multi_hot_embed_input
+        self.compositional_embed_input = compositional_embed_input
+        self.shared_vocab_cols = shared_vocab_cols
+        self.mmap_embed_input = mmap_embed_input
+        self.sharded_embed_input = sharded_embed_input
 
         self.continuous_cols = continuous_cols
         self.cont_norm_layer = cont_norm_layer
@@ -54,6 +79,11 @@ class BaseTabularModelWithoutAttention(BaseWDModelComponent):
             cont_embed_dim,
             cont_embed_dropout,
             use_cont_bias,
+            multi_hot_embed_input,
+            compositional_embed_input,
+            shared_vocab_cols,
+            mmap_embed_input,
+            sharded_embed_input,
         )
         self.cat_embed_act_fn = (
             get_activation_fn(cat_embed_activation)
@@ -100,9 +130,21 @@ class BaseTabularModelWithAttention(BaseWDModelComponent):
         use_cont_bias: bool,
         cont_embed_activation: Optional[str],
         input_dim: int,
+        compositional_embed_input: Optional[Dict[str, Any]] = None,
+        shared_vocab_cols: Optional[List[List[str]]] = None,
+        checkpoint_every_n_blocks: Optional[int] = None,
     ):
         super().__init__()
 
+        if checkpoint_every_n_blocks is not None and (
+            not isinstance(checkpoint_every_n_blocks, int)
+            or checkpoint_every_n_blocks < 1
+        ):
+            raise ValueError(
+                "'checkpoint_every_n_blocks' must be a positive integer or None. "
+                f"Got {checkpoint_every_n_blocks} instead"
+            )
+
         self.column_idx = column_idx
         self.cat_embed_input = cat_embed_input
         self.cat_embed_dropout = cat_embed_dropout
@@ -112,6 +154,8 @@ class BaseTabularModelWithAttention(BaseWDModelComponent):
         self.shared_embed = shared_embed
         self.add_shared_embed = add_shared_embed
         self.frac_shared_embed = frac_shared_embed
+        self.compositional_embed_input = compositional_embed_input
+        self.shared_vocab_cols = shared_vocab_cols
 
         self.continuous_cols = continuous_cols
         self.cont_norm_layer = cont_norm_layer
@@ -121,6 +165,7 @@ class BaseTabularModelWithAttention(BaseWDModelComponent):
         self.cont_embed_activation = cont_embed_activation
 
         self.input_dim = input_dim
+        self.checkpoint_every_n_blocks = checkpoint_every_n_blocks
 
         self.cat_and_cont_embed = SameSizeCatAndContEmbeddings(
             input_dim,
@@ -137,6 +182,8 @@ class BaseTabularModelWithAttention(BaseWDModelComponent):
             embed_continuous,
             cont_embed_dropout,
             use_cont_bias,
+            compositional_embed_input,
+            shared_vocab_cols,
         )
         self.cat_embed_act_fn = (
             get_activation_fn(cat_embed_activation)
@@ -163,6 +210,38 @@ class BaseTabularModelWithAttention(BaseWDModelComponent):
             x = torch.cat([x, x_cont], 1) if x_cat is not None else x_cont
         return x
 
+    def _forward_blocks(
+        self, blocks: List[Callable[[Tensor], Tensor]], x: Tensor
+    ) -> Tensor:
+        # With activation checkpointing the blocks are run in groups of
+        # 'checkpoint_every_n_blocks' and only the input of each group is
+        # kept for the backward pass, where the activations within the group
+        # are recomputed. The RNG state is restored before the recomputation
+        # so that the dropout masks (and the attention weights kept by the
+        # attention layers) are the same as in the forward pass. The
+        # recomputation also needs to capture (or not) the attention weights
+        # as the forward pass did, since the attention layers follow a
+        # different path when capturing
+        n = self.checkpoint_every_n_blocks
+        if n is None or not (self.training and torch.is_grad_enabled()):
+            return _run_blocks(blocks, x)
+        capturing = is_capturing_attention()
+        for i in range(0, len(blocks), n):
+            x = checkpoint(
+                _run_blocks,
+                blocks[i : i + n],
+                x,
+                use_reentrant=False,
+                context_fn=lambda: (nullcontext(), capture_attention(capturing)),
+            )
+        return x
+
     @property
     def attention_weights(self):
         raise NotImplementedError
+
+
+def _run_blocks(blocks: List[Callable[[Tensor], Tensor]], x: Tensor) -> Tensor:
+    for block in blocks:
+        x = block(x)
+    return x
@@ -3,12 +3,15 @@ SharedEmbeddings is inspired by the TabTransformer available in AutoGluon:
 https://github.com/awslabs/autogluon/tree/master/tabular/src/autogluon/tabular/models/tab_transformer
 """
 
+import os
 import math
 import warnings
+from collections import OrderedDict
 
 import numpy as np
 import torch
 import einops
+import torch.distributed as dist
 import torch.nn.functional as F
 from torch import nn
 
@@ -19,8 +22,11 @@ from pytorch_widedeep.wdtypes import (
     Tuple,
     Union,
     Tensor,
+    Literal,
+    Callable,
     Optional,
 )
+from pytorch_widedeep.distributed import get_rank, get_world_size
 
 
 class FullEmbeddingDropout(nn.Module):
@@ -63,17 +69,16 @@ class ContEmbeddings(nn.Module):
         self.embed_dropout = embed_dropout
         self.use_bias = use_bias
 
-        self.weight = nn.init.kaiming_uniform_(
-            nn.Parameter(torch.Tensor(n_cont_cols, embed_dim)), a=math.sqrt(5)
-        )
-
+        self.weight = nn.Parameter(torch.empty(n_cont_cols, embed_dim))
         self.bias = (
-            nn.init.kaiming_uniform_(
-                nn.Parameter(torch.Tensor(n_cont_cols, embed_dim)), a=math.sqrt(5)
-            )
-            if use_bias
-            else None
+            nn.Parameter(torch.empty(n_cont_cols, embed_dim)) if use_bias else None
         )
+        self.reset_parameters()
+
+    def reset_parameters(self) -> None:
+        nn.init.kaiming_uniform_(self.weight, a=math.sqrt(5))
+        if self.bias is not None:
+            nn.init.kaiming_uniform_(self.bias, a=math.sqrt(5))
 
     def forward(self, X: Tensor) -> Tensor:
         x = self.weight.unsqueeze(0) * X.unsqueeze(2)
@@ -86,6 +91,601 @@ class ContEmbeddings(nn.Module):
         return s.format(**self.__dict__)
 
 
+class CompositionalEmbedding(nn.Module):
+    r"""Compositional embeddings for high-cardinality categorical columns.
+
+    Instead of a full `n_embed x embed_dim` table, each category is
+    represented by a combination of rows from (much) smaller tables:
+
+    - _'qr_mult'_ and _'qr_sum'_: quotient-remainder embeddings
+      ([Shi et al., 2020](https://arxiv.org/abs/1909.02107)). Category `i` is
+      represented by the element-wise product (or the sum) of the rows `i %
+      n_buckets` and `i // n_buckets` of two tables. Every category gets a
+      unique representation.
+
+    - _'hash'_: multi-hash embeddings. Category `i` is represented by the sum
+      of `n_hashes` rows of a single table of `n_buckets` rows, selected via
+      independent hash functions.
+
+    As with the rest of the embedding layers, 0 is reserved for
+    padding/unseen categories, which are embedded as zeros.
+
+    Parameters
+    ----------
+    n_embed: int
+        number of categories, including the padding/unseen category
+    embed_dim: int
+        embedding dimension
+    method: str, default = 'qr_mult'
+        One of _'qr_mult'_, _'qr_sum'_ or _'hash'_
+    n_buckets: int, Optional, default = None
+        number of rows of the remainder table (for the quotient-remainder
+        methods) or of the hashed table. If `None`, `ceil(sqrt(n_embed))`
+    n_hashes: int, default = 2
+        number of hash functions. Only used if `method = 'hash'`
+    """
+
+    # Mersenne prime for the universal hash functions (a * x + b) % P
+    P = 2**31 - 1
+
+    def __init__(
+        self,
+        n_embed: int,
+        embed_dim: int,
+        method: Literal["qr_mult", "qr_sum", "hash"] = "qr_mult",
+        n_buckets: Optional[int] = None,
+        n_hashes: int = 2,
+    ):
+        super(CompositionalEmbedding, self).__init__()
+
+        if method not in ["qr_mult", "qr_sum", "hash"]:
+            raise ValueError(
+                "'method' must be one of 'qr_mult', 'qr_sum' or 'hash'. "
+                f"Got {method} instead"
+            )
+
+        self.n_embed = n_embed
+        self.embed_dim = embed_dim
+        self.method = method
+        self.n_buckets = (
+            n_buckets if n_buckets is not None else math.ceil(math.sqrt(n_embed))
+        )
+        self.n_hashes = n_hashes
+
+        if self.method == "hash":
+            self.embed = nn.Embedding(self.n_buckets, embed_dim)
+            # the hash functions are part of the state dict, so that a saved
+            # model can be reloaded
+            self.register_buffer(
+                "hash_a", torch.randint(1, self.P, (n_hashes,), dtype=torch.long)
+            )
+            self.register_buffer(
+                "hash_b", torch.randint(0, self.P, (n_hashes,), dtype=torch.long)
+            )
+        else:
+            self.remainder_embed = nn.Embedding(self.n_buckets, embed_dim)
+            self.quotient_embed = nn.Embedding(
+                math.ceil(n_embed / self.n_buckets), embed_dim
+            )
+
+    def forward(self, X: Tensor) -> Tensor:
+        if self.method == "hash":
+            idx = (
+                (self.hash_a * X.unsqueeze(-1) + self.hash_b) % self.P
+            ) % self.n_buckets
+            x = self.embed(idx).sum(-2)
+        else:
+            x_rem = self.remainder_embed(X % self.n_buckets)
+            x_quot = self.quotient_embed(
+                torch.div(X, self.n_buckets, rounding_mode="floor")
+            )
+            x = x_rem * x_quot if self.method == "qr_mult" else x_rem + x_quot
+        return x * (X != 0).unsqueeze(-1)
+
+    def extra_repr(self) -> str:
+        s = "{n_embed}, {embed_dim}, method='{method}', n_buckets={n_buckets}"
+        if self.method == "hash":
+            s += ", n_hashes={n_hashes}"
+        return s.format(**self.__dict__)
+
+
+class MMapEmbedding(nn.Module):
+    r"""Embedding table stored in a memory-mapped file, of which only the
+    recently used ("hot") rows are kept in memory.
+
+    This is meant for very large vocabularies (e.g. tens of millions of
+    IDs), where holding the whole table in memory, in every training or
+    serving process, is not possible or too expensive. The rows looked up in
+    each forward pass are loaded into a fixed size cache (an `nn.Embedding`
+    of `cache_size` rows) and, when the cache is full, the least recently
+    used rows are evicted and, if they were updated, written back to the
+    file. Serving processes that open the same file (with `read_only=True`)
+    share its pages via the OS page cache.
+
+    As with the rest of the embedding layers, 0 is reserved for
+    padding/unseen categories, which are embedded as zeros.
+
+    :information_source: **NOTE**: the rows are trained via the cache, so
+    `cache_size` must be larger than the number of unique categories per
+    forward pass (and, ideally, per optimizer step). For the same reason,
+    gradient accumulation is not supported. With `sparse=True` only
+    the cached rows in the batch get gradients, and optimizers with state
+    (e.g. `SparseAdam`) keep the state per cache slot, not per category. A
+    trained table is saved in its file (see `flush`), while the state dict
+    of this module only contains the cache. Therefore, the state dicts
+    saved during training (e.g. by the `ModelCheckpoint` callback) do not
+    capture the table at that point, and the weights of the best epoch
+    cannot be restored at the end of training.
+
+    Parameters
+    ----------
+    n_embed: int
+        number of categories, including the padding/unseen category
+    embed_dim: int
+        embedding dimension
+    path: str
+        path to the file with the table, a raw `float32` array of shape
+        `(n_embed, embed_dim)`. If it does not exist it is created and
+        initialised with `initializer`
+    cache_size: int, default = 100000
+        number of rows kept in memory
+    sparse: bool, default = False
+        Boolean indicating if the gradients of the cache will be sparse. See
+        the `sparse` parameter of `nn.Embedding`
+    read_only: bool, default = False
+        Boolean indicating if the file is opened in read-only mode, for
+        example when serving a trained model. The rows are never written
+        back to the file
+    initializer: Callable, Optional, default = None
+        in-place initializer (e.g. `nn.init.normal_`, the default) applied,
+        in chunks of rows, to the table when the file is created
+
+    Attributes
+    ----------
+    cache: nn.Embedding
+        the in-memory rows of the table
+    slot_ids: Tensor
+        the category stored in each row (slot) of the cache, -1 if empty
+    """
+
+    def __init__(
+        self,
+        n_embed: int,
+        embed_dim: int,
+        path: str,
+        cache_size: int = 100000,
+        sparse: bool = False,
+        read_only: bool = False,
+        initializer: Optional[Callable[[Tensor], Tensor]] = None,
+    ):
+        super(MMapEmbedding, self).__init__()
+
+        self.n_embed = n_embed
+        self.embed_dim = embed_dim
+        self.path = path
+        self.cache_size = min(cache_size, n_embed)
+        self.sparse = sparse
+        self.read_only = read_only
+
+        if not os.path.isfile(path):
+            if read_only:
+                raise ValueError(f"The table file {path} does not exist")
+            self._create_table(
+                initializer if initializer is not None else nn.init.normal_
+            )
+        elif os.path.getsize(path) != n_embed * embed_dim * 4:
+            raise ValueError(
+                f"The size of the table file {path} does not correspond to a "
+                f"float32 table of shape ({n_embed}, {embed_dim})"
+            )
+        self._table: Optional[np.memmap] = None
+
+        self.cache = nn.Embedding(self.cache_size, embed_dim, sparse=sparse)
+        nn.init.zeros_(self.cache.weight)
+        self.register_buffer(
+            "slot_ids", torch.full((self.cache_size,), -1, dtype=torch.long)
+        )
+        self._reset_cache_index()
+
+        # the public 'register_state_dict_post_hook' is only available
+        # from torch 2.5
+        self._register_state_dict_hook(_mmap_embed_state_dict_hook)
+        self.register_load_state_dict_post_hook(_mmap_embed_load_state_dict_hook)
+
+    @property
+    def table(self) -> np.memmap:
+        # opened lazily, so that the module can be pickled (e.g. to be sent
+        # to other processes) without the memory map
+        if self._table is None:
+            self._table = np.memmap(
+                self.path,
+                dtype="float32",
+                mode="r" if self.read_only else "r+",
+                shape=(self.n_embed, self.embed_dim),
+            )
+        return self._table
+
+    def forward(self, X: Tensor) -> Tensor:
+        ids, inverse = torch.unique(X, return_inverse=True)
+        slots = self._get_slots(ids)
+        if self.training and torch.is_grad_enabled():
+            self._dirty[slots.cpu()] = True
+        x = self.cache(slots[inverse])
+        return x * (X != 0).unsqueeze(-1)
+
+    def flush(self):
+        r"""Writes the updated rows in the cache back to the file"""
+        resident = torch.nonzero(self.slot_ids >= 0).squeeze(1).cpu()
+        self._write_back(self.slot_ids.cpu()[resident], resident)
+        if not self.read_only:
+            self.table.flush()
+
+    def _get_slots(self, ids: Tensor) -> Tensor:
+        ids_list = ids.tolist()
+        if len(ids_list) > self.cache_size:
+            raise ValueError(
+                f"The number of unique categories in the input ({len(ids_list)}) "
+                f"is larger than the 'cache_size' ({self.cache_size})"
+            )
+        slots: List[int] = []
+        misses: List[int] = []
+        for i, id_ in enumerate(ids_list):
+            slot = self._lru.get(id_)
+            if slot is None:
+                misses.append(i)
+                slots.append(-1)
+            else:
+                self._lru.move_to_end(id_)
+                slots.append(slot)
+
+        if misses:
+            miss_ids = [ids_list[i] for i in misses]
+            miss_slots = self._allocate(len(misses))
+            for i, id_, slot in zip(misses, miss_ids, miss_slots):
+                slots[i] = slot
+                self._lru[id_] = slot
+            miss_slots_t = torch.tensor(miss_slots, device=self.slot_ids.device)
+            self.slot_ids[miss_slots_t] = torch.tensor(
+                miss_ids, device=self.slot_ids.device
+            )
+            # ids are sorted (see 'torch.unique'), which helps the reads
+            with torch.no_grad():
+                self.cache.weight[miss_slots_t] = torch.from_numpy(
+                    np.asarray(self.table[miss_ids])
+                ).to(self.cache.weight.device)
+
+        return torch.tensor(slots, device=ids.device)
+
+    def _allocate(self, n_slots: int) -> List[int]:
+        slots = [self._free.pop() for _ in range(min(n_slots, len(self._free)))]
+        if len(slots) < n_slots:
+            # the least recently used rows are evicted
+            evicted = [
+                self._lru.popitem(last=False) for _ in range(n_slots - len(slots))
+            ]
+            evicted_ids = torch.tensor([id_ for id_, _ in evicted])
+            evicted_slots = torch.tensor([slot for _, slot in evicted])
+            self._write_back(evicted_ids, evicted_slots)
+            slots += evicted_slots.tolist()
+        return slots
+
+    def _write_back(self, ids: Tensor, slots: Tensor):
+        dirty = self._dirty[slots]
+        if not self.read_only and dirty.any():
+            self.table[ids[dirty].numpy()] = (
+                self.cache.weight.detach()[slots[dirty].to(self.cache.weight.device)]
+                .cpu()
+                .numpy()
+            )
+        self._dirty[slots] = False
+
+    def _reset_cache_index(self):
+        # the (python side) LRU index of the cache: category -> slot, from
+        # the least to the most recently used
+        slot_ids = self.slot_ids.tolist()
+        self._lru: OrderedDict = OrderedDict(
+            (id_, slot) for slot, id_ in enumerate(slot_ids) if id_ >= 0
+        )
+        self._free = [slot for slot, id_ in enumerate(slot_ids) if id_ < 0][::-1]
+        self._dirty = torch.zeros(self.cache_size, dtype=torch.bool)
+
+    def _create_table(self, initializer: Callable[[Tensor], Tensor]):
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        table = np.memmap(
+            self.path, dtype="float32", mode="w+", shape=(self.n_embed, self.embed_dim)
+        )
+        chunk_size = 2**16
+        for start in range(0, self.n_embed, chunk_size):
+            end = min(start + chunk_size, self.n_embed)
+            table[start:end] = initializer(
+                torch.empty(end - start, self.embed_dim)
+            ).numpy()
+        table[0] = 0.0
+        table.flush()
+        del table
+
+    def __getstate__(self) -> Dict[str, Any]:
+        state = self.__dict__.copy()
+        state["_table"] = None
+        return state
+
+    def extra_repr(self) -> str:
+        s = "{n_embed}, {embed_dim}, path='{path}', cache_size={cache_size}"
+        if self.sparse:
+            s += ", sparse=True"
+        if self.read_only:
+            s += ", read_only=True"
+        return s.format(**self.__dict__)
+
+
+def _mmap_embed_state_dict_hook(
+    module: MMapEmbedding,
+    state_dict: Dict[str, Tensor],
+    prefix: str,
+    local_metadata: Dict[str, Any],
+):
+    # the table is saved in its file, so that the saved state dict (i.e.
+    # the cache) and the file are consistent
+    module.flush()
+
+
+def _mmap_embed_load_state_dict_hook(module: MMapEmbedding, incompatible_keys: Any):
+    # the loaded cache rows take precedence over those in the file
+    module._reset_cache_index()
+    module._dirty[module.slot_ids.cpu() >= 0] = True
+
+
+class ShardedEmbedding(nn.Module):
+    r"""Embedding table split row-wise across the processes of a
+    `torch.distributed` process group (e.g. a _'gloo'_ one, see
+    `pytorch_widedeep.distributed`), so that each process only holds
+    (roughly) `1 / world_size` of the rows.
+
+    Row `i` of the table is stored in the process with rank `i %
+    world_size`. Each process embeds its own batch: the (unique) categories
+    in the batch are sent to the processes that own their rows, which send
+    the rows back, via an all-to-all exchange. In the backward pass the
+    gradients of the rows are sent back to their owners via another
+    all-to-all exchange, and are averaged over the processes, as
+    `DistributedDataParallel` does with the rest of the parameters.
+    Therefore, as in data-parallel training, all processes must run the
+    same number of forward and backward passes. If not within a process
+    group, this is a regular embedding table.
+
+    As with the rest of the embedding layers, 0 is reserved for
+    padding/unseen categories, which are embedded as zeros.
+
+    :information_source: **NOTE**: the parameters of this module (i.e. the
+    shard) are different in each process. The `Trainer` excludes them from
+    the `DistributedDataParallel` synchronisation and the state dict of the
+    module contains the shard of the process, so each process must save
+    (and load) its own state dict. The `ModelCheckpoint` callback and
+    `Trainer.save` do so, adding a `_rank{rank}` suffix to the file names
+    (see `pytorch_widedeep.distributed.rank_path` and
+    `pytorch_widedeep.distributed.load_checkpoint`)
+
+    Parameters
+    ----------
+    n_embed: int
+        number of categories, including the padding/unseen category
+    embed_dim: int
+        embedding dimension
+    sparse: bool, default = False
+        Boolean indicating if the gradients of the shard will be sparse. See
+        the `sparse` parameter of `nn.Embedding`
+    initializer: Callable, Optional, default = None
+        in-place initializer applied to the shard (`nn.init.normal_` by
+        default)
+
+    Attributes
+    ----------
+    weight: nn.Parameter
+        the rows of the table owned by this process
+    """
+
+    def __init__(
+        self,
+        n_embed: int,
+        embed_dim: int,
+        sparse: bool = False,
+        initializer: Optional[Callable[[Tensor], Tensor]] = None,
+    ):
+        super(ShardedEmbedding, self).__init__()
+
+        self.n_embed = n_embed
+        self.embed_dim = embed_dim
+        self.sparse = sparse
+        # the sharding is fixed at instantiation
+        self.rank = get_rank()
+        self.world_size = get_world_size()
+
+        n_rows = len(range(self.rank, n_embed, self.world_size))
+        self.weight = nn.Parameter(torch.empty(n_rows, embed_dim))
+        (initializer if initializer is not None else nn.init.normal_)(self.weight)
+
+    def forward(self, X: Tensor) -> Tensor:
+        ids, inverse = torch.unique(X, return_inverse=True)
+        if self.world_size == 1:
+            x = F.embedding(ids, self.weight, sparse=self.sparse)
+        else:
+            x = self._exchange_rows(ids)
+        return x[inverse] * (X != 0).unsqueeze(-1)
+
+    def _exchange_rows(self, ids: Tensor) -> Tensor:
+        # the ids are grouped by the process that owns their rows
+        owner = ids % self.world_size
+        order = torch.argsort(owner, stable=True)
+        send_counts = torch.bincount(owner, minlength=self.world_size)
+        recv_counts = torch.empty_like(send_counts)
+        dist.all_to_all_single(recv_counts, send_counts)
+        send_sizes, recv_sizes = send_counts.tolist(), recv_counts.tolist()
+
+        # ids requested to this process by each of the processes
+        requested = ids.new_empty(sum(recv_sizes))
+        dist.all_to_all_single(requested, ids[order], recv_sizes, send_sizes)
+        rows = F.embedding(
+            requested // self.world_size, self.weight, sparse=self.sparse
+        )
+        x = _AllToAllRows.apply(rows, recv_sizes, send_sizes)
+        return x[torch.argsort(order)]
+
+    def extra_repr(self) -> str:
+        s = "{n_embed}, {embed_dim}, rank={rank}, world_size={world_size}"
+        if self.sparse:
+            s += ", sparse=True"
+        return s.format(**self.__dict__)
+
+
+class _AllToAllRows(torch.autograd.Function):
+    # sends 'send_sizes[i]' rows to process i and receives 'recv_sizes[i]'
+    # rows from process i. The gradients travel in the opposite direction
+    # and are averaged over processes
+
+    @staticmethod
+    def forward(ctx, rows: Tensor, send_sizes: List[int], recv_sizes: List[int]):
+        ctx.send_sizes, ctx.recv_sizes = send_sizes, recv_sizes
+        return _all_to_all_rows(rows, send_sizes, recv_sizes)
+
+    @staticmethod
+    def backward(ctx, grad: Tensor):
+        grad = _all_to_all_rows(grad.contiguous(), ctx.recv_sizes, ctx.send_sizes)
+        return grad / dist.get_world_size(), None, None
+
+
+def _all_to_all_rows(rows: Tensor, send_sizes: List[int], recv_sizes: List[int]):
+    out = rows.new_empty(sum(recv_sizes), rows.size(1))
+    dist.all_to_all_single(out, rows, recv_sizes, send_sizes)
+    return out
+
+
+class QuantizedEmbedding(nn.Module):
+    r"""Row-wise quantized version of an embedding table, meant to be used
+    at inference time. Only the looked up rows are dequantized.
+
+    With `dtype = 'int8'` each row is stored as 8-bit integers with its own
+    scale and offset (i.e. `row ~ q * scale + offset`, where `q` takes
+    values between 0 and 255), which takes roughly a quarter of the memory
+    of the `float32` table for reasonably large embedding dims. With `dtype
+    = 'float16'` the table is simply stored in half precision.
+
+    This class is not meant to be instantiated directly, but via
+    `pytorch_widedeep.inference.quantize_embeddings`.
+
+    Parameters
+    ----------
+    weight: Tensor
+        the (float) embedding table
+    dtype: str, default = 'int8'
+        One of _'int8'_ or _'float16'_
+    padding_idx: int, Optional, default = None
+        padding index of the original layer. Only used when `mode` is not
+        `None`, since the padding rows of regular embeddings are zeros, which
+        are quantized exactly
+    mode: str, Optional, default = None
+        If not `None`, the layer behaves as an `nn.EmbeddingBag` with 2D
+        inputs and `mode` _'sum'_ or _'mean'_, where the rows with index
+        `padding_idx` do not contribute to the output
+    """
+
+    def __init__(
+        self,
+        weight: Tensor,
+        dtype: Literal["int8", "float16"] = "int8",
+        padding_idx: Optional[int] = None,
+        mode: Optional[Literal["sum", "mean"]] = None,
+    ):
+        super(QuantizedEmbedding, self).__init__()
+
+        if dtype not in ["int8", "float16"]:
+            raise ValueError(
+                f"'dtype' must be one of 'int8' or 'float16'. Got {dtype} instead"
+            )
+        if mode not in [None, "sum", "mean"]:
+            raise ValueError(
+                f"'mode' must be one of None, 'sum' or 'mean'. Got {mode} instead"
+            )
+
+        self.n_embed, self.embed_dim = weight.shape
+        self.dtype = dtype
+        self.padding_idx = padding_idx
+        self.mode = mode
+
+        weight = weight.detach().float()
+        if dtype == "int8":
+            w_min = weight.min(1).values
+            scale = (weight.max(1).values - w_min) / 255
+            # constant rows (e.g. the padding row) are stored as 0s
+            scale = torch.where(scale > 0, scale, torch.ones_like(scale))
+            self.register_buffer(
+                "weight",
+                torch.round((weight - w_min.unsqueeze(1)) / scale.unsqueeze(1)).to(
+                    torch.uint8
+                ),
+            )
+            self.register_buffer("scale", scale)
+            self.register_buffer("offset", w_min)
+        else:
+            self.register_buffer("weight", weight.half())
+
+    def forward(self, X: Tensor) -> Tensor:
+        X = X.long()
+        x = self._lookup(X)
+        if self.mode is None:
+            return x
+        if self.padding_idx is not None:
+            mask = (X != self.padding_idx).unsqueeze(-1)
+            x = x * mask
+        out = x.sum(-2)
+        if self.mode == "mean":
+            n = mask.sum(-2) if self.padding_idx is not None else X.size(-1)
+            out = out / torch.clamp(n, min=1)
+        return out
+
+    def dequantize(self) -> Tensor:
+        r"""Returns the (float) dequantized table"""
+        return self._lookup(torch.arange(self.n_embed, device=self.weight.device))
+
+    def _lookup(self, X: Tensor) -> Tensor:
+        if self.dtype == "int8":
+            return self.weight[X].float() * self.scale[X].unsqueeze(-1) + self.offset[
+                X
+            ].unsqueeze(-1)
+        return self.weight[X].float()
+
+    def extra_repr(self) -> str:
+        s = "{n_embed}, {embed_dim}, dtype='{dtype}'"
+        if self.mode is not None:
+            s += ", mode='{mode}', padding_idx={padding_idx}"
+        return s.format(**self.__dict__)
+
+
+def _compositional_params(spec: Union[str, Dict[str, Any]]) -> Dict[str, Any]:
+    # compositional embeddings are specified per column either with the name
+    # of the method (e.g. 'qr_mult') or with a dictionary with the params of
+    # 'CompositionalEmbedding' (e.g. {'method': 'hash', 'n_buckets': 1000})
+    return {"method": spec} if isinstance(spec, str) else dict(spec)
+
+
+def _vocab_owners(
+    cols: List[str], shared_vocab_cols: Optional[List[List[str]]]
+) -> Dict[str, str]:
+    # maps each column to the first column (in the order of 'cols') of the
+    # group of columns it shares a vocabulary, and therefore an embedding
+    # table, with. Columns that do not share a vocabulary map to themselves
+    owners = {col: col for col in cols}
+    for group in shared_vocab_cols if shared_vocab_cols is not None else []:
+        missing = [col for col in group if col not in owners]
+        if missing:
+            raise ValueError(
+                "The following columns in 'shared_vocab_cols' are not categorical "
+                f"columns with embeddings: {missing}"
+            )
+        members = [col for col in cols if col in group]
+        for col in members:
+            owners[col] = members[0]
+    return owners
+
+
 class SharedEmbeddings(nn.Module):
     def __init__(
         self,
@@ -95,24 +695,37 @@ class SharedEmbeddings(nn.Module):
         full_embed_dropout: bool = False,
         add_shared_embed: bool = False,
         frac_shared_embed=0.25,
+        compositional_embed: Optional[Union[str, Dict[str, Any]]] = None,
     ):
         super(SharedEmbeddings, self).__init__()
 
         assert frac_shared_embed < 1, "'frac_shared_embed' must be less than 1"
         self.add_shared_embed = add_shared_embed
-        self.embed = nn.Embedding(n_embed, embed_dim, padding_idx=0)
-        self.embed.weight.data.clamp_(-2, 2)
+        self.embed: Union[nn.Embedding, CompositionalEmbedding]
+        if compositional_embed is not None:
+            self.embed = CompositionalEmbedding(
+                n_embed, embed_dim, **_compositional_params(compositional_embed)
+            )
+        else:
+            self.embed = nn.Embedding(n_embed, embed_dim, padding_idx=0)
         if add_shared_embed:
             col_embed_dim = embed_dim
         else:
             col_embed_dim = int(embed_dim * frac_shared_embed)
-        self.shared_embed = nn.Parameter(torch.empty(1, col_embed_dim).uniform_(-1, 1))
+        self.shared_embed = nn.Parameter(torch.empty(1, col_embed_dim))
+        self.reset_parameters()
 
         if full_embed_dropout:
             self.dropout: DropoutLayers = FullEmbeddingDropout(embed_dropout)
         else:
             self.dropout = nn.Dropout(embed_dropout)
 
+    def reset_parameters(self) -> None:
+        if isinstance(self.embed, nn.Embedding):
+            with torch.no_grad():
+                self.embed.weight.clamp_(-2, 2)
+        nn.init.uniform_(self.shared_embed, -1, 1)
+
     def forward(self, X: Tensor) -> Tensor:
         out = self.dropout(self.embed(X))
         shared_embed = self.shared_embed.expand(out.shape[0], -1)
@@ -130,12 +743,20 @@ class DiffSizeCatEmbeddings(nn.Module):
         embed_input: List[Tuple[str, int, int]],
         embed_dropout: float,
         use_bias: bool,
+        compositional_embed_input: Optional[Dict[str, Any]] = None,
+        shared_vocab_cols: Optional[List[List[str]]] = None,
+        mmap_embed_input: Optional[Dict[str, Dict[str, Any]]] = None,
+        sharded_embed_input: Optional[Dict[str, Dict[str, Any]]] = None,
     ):
         super(DiffSizeCatEmbeddings, self).__init__()
 
         self.column_idx = column_idx
         self.embed_input = embed_input
         self.use_bias = use_bias
+        self.compositional_embed_input = compositional_embed_input
+        self.shared_vocab_cols = shared_vocab_cols
+        self.mmap_embed_input = mmap_embed_input
+        self.sharded_embed_input = sharded_embed_input
 
         self.embed_layers_names = None
         if self.embed_input is not None:
@@ -143,44 +764,395 @@ class DiffSizeCatEmbeddings(nn.Module):
                 e[0]: e[0].replace(".", "_") for e in self.embed_input
             }
 
-        # Categorical: val + 1 because 0 is reserved for padding/unseen cateogories.
+        # The columns are grouped by embedding dim and the embedding tables of
+        # the columns in a group are stored in a single, fused, table, so
+        # that each group is embedded with a single lookup. A fused table is
+        # made of the val + 1 rows of each column (val + 1 because 0 is
+        # reserved for padding/unseen cateogories), i.e. the rows of the
+        # per-column 'nn.Embedding' layers that are exposed via
+        # 'embed_layers' and used in the state dict. Each column keeps its
+        # own padding row, the first of its rows, which, as with
+        # 'padding_idx', receives no gradients. The columns with
+        # compositional, memory-mapped or sharded embeddings are not fused. Columns
+        # that share a vocabulary (see 'shared_vocab_cols') use the rows (or
+        # the embedding layer) of the first column of their group, the
+        # "owner" of the rows
+        comp_cols = (
+            compositional_embed_input if compositional_embed_input is not None else {}
+        )
+        mmap_cols = mmap_embed_input if mmap_embed_input is not None else {}
+        sharded_cols = sharded_embed_input if sharded_embed_input is not None else {}
+        self.vocab_owner = _vocab_owners([e[0] for e in embed_input], shared_vocab_cols)
+        self._check_unfused_cols(
+            {
+                "compositional": comp_cols,
+                "memory-mapped": mmap_cols,
+                "sharded": sharded_cols,
+            }
+        )
+        unfused_cols = {**comp_cols, **mmap_cols, **sharded_cols}
+        self.fused_embed_input = [
+            e for e in self.embed_input if e[0] not in unfused_cols
+        ]
+        self.unfused_embed_input = [e for e in self.embed_input if e[0] in unfused_cols]
+        self.embed_dims: List[int] = list(
+            dict.fromkeys([dim for _, _, dim in self.fused_embed_input])
+        )
+        self.col_rows: Dict[str, Tuple[int, int]] = {}
+        self.fused_embed = nn.ParameterDict()
+        if use_bias:
+            self.fused_biases = nn.ParameterDict()
+        out_cols: List[str] = []
+        for dim in self.embed_dims:
+            group = [(col, val) for col, val, d in self.fused_embed_input if d == dim]
+            starts, n_rows = [], 0
+            for col, val in group:
+                if self.vocab_owner[col] == col:
+                    self.col_rows[col] = (n_rows, n_rows + val + 1)
+                    n_rows += val + 1
+                else:
+                    self.col_rows[col] = self.col_rows[self.vocab_owner[col]]
+                starts.append(self.col_rows[col][0])
+            self.fused_embed["emb_layer_dim_" + str(dim)] = nn.Parameter(
+                torch.empty(n_rows, dim)
+            )
+            if use_bias:
+                self.fused_biases["bias_dim_" + str(dim)] = nn.Parameter(
+                    torch.empty(len(group), dim)
+                )
+            self.register_buffer(
+                "cat_idx_dim_" + str(dim),
+                torch.tensor([self.column_idx[col] for col, _ in group]),
+                persistent=False,
+            )
+            self.register_buffer(
+                "offsets_dim_" + str(dim), torch.tensor(starts), persistent=False
+            )
+            out_cols += [col for col, _ in group]
+
+        if comp_cols:
+            self.comp_embed = nn.ModuleDict(
+                {
+                    "emb_layer_"
+                    + self.embed_layers_names[col]: CompositionalEmbedding(
+                        val + 1, dim, **_compositional_params(comp_cols[col])
+                    )
+                    for col, val, dim in self.unfused_embed_input
+                    if col in comp_cols and self.vocab_owner[col] == col
+                }
+            )
+        if mmap_cols:
+            self.mmap_embed = nn.ModuleDict(
+                {
+                    "emb_layer_"
+                    + self.embed_layers_names[col]: MMapEmbedding(
+                        val + 1, dim, **mmap_cols[col]
+                    )
+                    for col, val, dim in self.unfused_embed_input
+                    if col in mmap_cols and self.vocab_owner[col] == col
+                }
+            )
+        if sharded_cols:
+            self.sharded_embed = nn.ModuleDict(
+                {
+                    "emb_layer_"
+                    + self.embed_layers_names[col]: ShardedEmbedding(
+                        val + 1, dim, **sharded_cols[col]
+                    )
+                    for col, val, dim in self.unfused_embed_input
+                    if col in sharded_cols and self.vocab_owner[col] == col
+                }
+            )
+        if self.unfused_embed_input:
+            if use_bias:
+                self.unfused_biases = nn.ParameterDict(
+                    {
+                        "bias_"
+                        + self.embed_layers_names[col]: nn.Parameter(torch.empty(dim))
+                        for col, _, dim in self.unfused_embed_input
+                    }
+                )
+            out_cols += [col for col, _, _ in self.unfused_embed_input]
+        self.reset_parameters()
+
+        # the fused lookups return the columns sorted by group, so the output
+        # is permuted back to the order in 'embed_input' (if needed)
+        col_dims = {col: dim for col, _, dim in self.embed_input}
+        out_slices: Dict[str, List[int]] = {}
+        pos = 0
+        for col in out_cols:
+            out_slices[col] = list(range(pos, pos + col_dims[col]))
+            pos += col_dims[col]
+        out_perm = [i for col, _, _ in self.embed_input for i in out_slices[col]]
+        self.out_perm: Optional[Tensor]
+        if out_perm != sorted(out_perm):
+            self.register_buffer("out_perm", torch.tensor(out_perm), persistent=False)
+        else:
+            self.out_perm = None
+
+        self.embedding_dropout = nn.Dropout(embed_dropout)
+
+        self.emb_out_dim: int = int(np.sum([embed[2] for embed in self.embed_input]))
+
+        self._embed_layers_cache: Optional[Tuple[Tuple, nn.ModuleDict]] = None
+        # the public 'register_state_dict_post_hook' and
+        # 'register_load_state_dict_pre_hook' are only available from torch 2.5
+        self._register_state_dict_hook(_diff_size_cat_embed_state_dict_hook)
+        self._register_load_state_dict_pre_hook(
+            _diff_size_cat_embed_load_state_dict_hook, with_module=True
+        )
+
+    def reset_parameters(self) -> None:
+        if not isinstance(self.fused_embed, nn.ParameterDict):
+            # quantized tables
+            return
+        with torch.no_grad():
+            for dim in self.embed_dims:
+                weight = self.fused_embed["emb_layer_dim_" + str(dim)]
+                nn.init.normal_(weight)
+                weight[getattr(self, "offsets_dim_" + str(dim))] = 0.0
+                if self.use_bias:
+                    # no major reason for this bound, I just want them to be
+                    # small, and related to the number of embeddings for
+                    # that particular feature
+                    bound = 1 / math.sqrt(dim)
+                    nn.init.uniform_(
+                        self.fused_biases["bias_dim_" + str(dim)], -bound, bound
+                    )
+            if self.use_bias:
+                for col, _, dim in self.unfused_embed_input:
+                    bound = 1 / math.sqrt(dim)
+                    nn.init.uniform_(
+                        self.unfused_biases["bias_" + self.embed_layers_names[col]],
+                        -bound,
+                        bound,
+                    )
+
+    def forward(self, X: Tensor) -> Tensor:
+        embed = []
+        for dim in self.embed_dims:
+            idx = X[:, getattr(self, "cat_idx_dim_" + str(dim))].long()
+            table = self.fused_embed["emb_layer_dim_" + str(dim)]
+            if isinstance(table, QuantizedEmbedding):
+                x = table(idx + getattr(self, "offsets_dim_" + str(dim)))
+            else:
+                x = F.embedding(idx + getattr(self, "offsets_dim_" + str(dim)), table)
+                # no gradients flow to the padding rows
+                x = torch.where((idx == 0).unsqueeze(-1), x.detach(), x)
+            if self.use_bias:
+                x = x + self.fused_biases["bias_dim_" + str(dim)].unsqueeze(0)
+            embed.append(x.flatten(1))
+        for col, _, _ in self.unfused_embed_input:
+            x = self._unfused_embed_layer(col)(X[:, self.column_idx[col]].long())
+            if self.use_bias:
+                x = x + self.unfused_biases["bias_" + self.embed_layers_names[col]]
+            embed.append(x)
+        x = torch.cat(embed, 1) if len(embed) > 1 else embed[0]
+        if self.out_perm is not None:
+            x = x[:, self.out_perm]
+        x = self.embedding_dropout(x)
+        return x
+
+    @property
+    def embed_layers(self) -> nn.ModuleDict:
+        # per-column 'nn.Embedding' layers whose weights are views of (i.e.
+        # share memory with) the fused tables. Columns with compositional
+        # embeddings are not included and columns that share a vocabulary
+        # are included via the owner of their rows. The layers are cached
+        # until the fused tables are replaced (e.g. when the model is moved
+        # to another device or loaded with 'assign=True')
+        key = tuple(
+            (id(t), (t.weight if isinstance(t, QuantizedEmbedding) else t).data_ptr())
+            for t in self.fused_embed.values()
+        )
+        if self._embed_layers_cache is None or self._embed_layers_cache[0] != key:
+            embed_layers = nn.ModuleDict(
+                {
+                    "emb_layer_"
+                    + self.embed_layers_names[col]: nn.Embedding(
+                        val + 1, dim, padding_idx=0, _weight=self._col_weight(col, dim)
+                    )
+                    for col, val, dim in self.table_embed_input
+                }
+            )
+            # stored in a tuple so that it is not registered as a submodule
+            self._embed_layers_cache = (key, embed_layers)
+        return self._embed_layers_cache[1]
+
+    @property
+    def table_embed_input(self) -> List[Tuple[str, int, int]]:
+        # the fused columns that own their rows
+        return [e for e in self.fused_embed_input if self.vocab_owner[e[0]] == e[0]]
+
+    def _col_weight(self, col: str, dim: int, keep_vars: bool = False) -> Tensor:
+        start, end = self.col_rows[col]
+        table = self.fused_embed["emb_layer_dim_" + str(dim)]
+        if isinstance(table, QuantizedEmbedding):
+            return table.dequantize()[start:end]
+        return (table if keep_vars else table.detach())[start:end]
+
+    def _col_bias(self, col: str, dim: int, keep_vars: bool = False) -> Tensor:
+        group = [c for c, _, d in self.fused_embed_input if d == dim]
+        bias = self.fused_biases["bias_dim_" + str(dim)]
+        return (bias if keep_vars else bias.detach())[group.index(col)]
+
+    def __getstate__(self) -> Dict[str, Any]:
+        state = self.__dict__.copy()
+        state["_embed_layers_cache"] = None
+        return state
+
+    def _unfused_embed_layer(self, col: str) -> nn.Module:
+        name = "emb_layer_" + self.embed_layers_names[self.vocab_owner[col]]
+        if self.compositional_embed_input and col in self.compositional_embed_input:
+            return self.comp_embed[name]
+        if self.sharded_embed_input and col in self.sharded_embed_input:
+            return self.sharded_embed[name]
+        return self.mmap_embed[name]
+
+    def _check_unfused_cols(self, unfused_cols: Dict[str, Dict[str, Any]]):
+        # 'unfused_cols' are the columns with each kind of unfused embeddings
+        kinds = list(unfused_cols)
+        for i, kind in enumerate(kinds):
+            for other in kinds[i + 1 :]:
+                both = [col for col in unfused_cols[kind] if col in unfused_cols[other]]
+                if both:
+                    raise ValueError(
+                        f"A column cannot have both {kind} and {other} "
+                        f"embeddings. Got {both}"
+                    )
+        embed_input = {col: (val, dim) for col, val, dim in self.embed_input}
+        for col, owner in self.vocab_owner.items():
+            if embed_input[col] != embed_input[owner]:
+                raise ValueError(
+                    "Columns that share a vocabulary must have the same number of "
+                    f"categories and embedding dim. Got {embed_input[owner]} for "
+                    f"'{owner}' and {embed_input[col]} for '{col}'"
+                )
+            if any((col in cols) != (owner in cols) for cols in unfused_cols.values()):
+                raise ValueError(
+                    "Either all or none of the columns that share a vocabulary "
+                    "must have compositional (or memory-mapped, or sharded) "
+                    f"embeddings. Got '{owner}' and '{col}'"
+                )
+
+
+def _diff_size_cat_embed_state_dict_hook(
+    module: DiffSizeCatEmbeddings,
+    state_dict: Dict[str, Tensor],
+    prefix: str,
+    local_metadata: Dict[str, Any],
+):
+    # the state dict is saved with one entry per column, as if the embeddings
+    # were not fused. Quantized tables (see
+    # 'pytorch_widedeep.inference.quantize_embeddings') are saved as they are
+    if not isinstance(module.fused_embed, nn.ParameterDict):
+        return
+    # with 'keep_vars = True' the state dict holds the parameters themselves
+    # (rather than detached tensors), and so the per-column entries are
+    # views of them that keep track of the gradients
+    keep_vars = False
+    for dim in module.embed_dims:
+        keep_vars = isinstance(
+            state_dict.pop(prefix + "fused_embed.emb_layer_dim_" + str(dim)),
+            nn.Parameter,
+        )
+        if module.use_bias:
+            del state_dict[prefix + "fused_biases.bias_dim_" + str(dim)]
+    for col, _, dim in module.table_embed_input:
+        state_dict[
+            prefix
+            + "embed_layers.emb_layer_"
+            + module.embed_layers_names[col]
+            + ".weight"
+        ] = module._col_weight(col, dim, keep_vars)
+    if module.use_bias:
+        for col, _, dim in module.fused_embed_input:
+            state_dict[prefix + "biases.bias_" + col] = module._col_bias(
+                col, dim, keep_vars
+            )
+
+
+def _diff_size_cat_embed_load_state_dict_hook(
+    module: DiffSizeCatEmbeddings,
+    state_dict: Dict[str, Tensor],
+    prefix: str,
+    local_metadata: Dict[str, Any],
+    strict: bool,
+    missing_keys: List[str],
+    unexpected_keys: List[str],
+    error_msgs: List[str],
+):
+    # fuses the per-column entries of the state dict. If any of them is
+    # missing, the fused entry is left missing too and 'load_state_dict'
+    # reports it as usual
+    if not isinstance(module.fused_embed, nn.ParameterDict):
+        return
+    for dim in module.embed_dims:
+        group = [col for col, _, d in module.fused_embed_input if d == dim]
+        weight_keys = [
+            prefix
+            + "embed_layers.emb_layer_"
+            + module.embed_layers_names[col]
+            + ".weight"
+            for col, _, d in module.table_embed_input
+            if d == dim
+        ]
+        if all([k in state_dict for k in weight_keys]):
+            weights = [state_dict.pop(k) for k in weight_keys]
+            state_dict[prefix + "fused_embed.emb_layer_dim_" + str(dim)] = torch.cat(
+                weights
+            )
+        if module.use_bias:
+            bias_keys = [prefix + "biases.bias_" + col for col in group]
+            if all([k in state_dict for k in bias_keys]):
+                state_dict[prefix + "fused_biases.bias_dim_" + str(dim)] = torch.stack(
+                    [state_dict.pop(k) for k in bias_keys]
+                )
+
+
+class MultiHotEmbeddings(nn.Module):
+    def __init__(
+        self,
+        column_idx: Dict[str, int],
+        embed_input: List[Tuple[str, int, int, int]],
+        embed_dropout: float,
+    ):
+        super(MultiHotEmbeddings, self).__init__()
+
+        self.column_idx = column_idx
+        self.embed_input = embed_input
+
+        # Each multi-hot column occupies 'max_len' consecutive columns,
+        # padded with 0s, starting at its 'column_idx'. The values of each
+        # row are embedded and averaged (ignoring the padding) via an
+        # 'nn.EmbeddingBag'. val + 1 because 0 is reserved for padding/unseen
+        # cateogories.
         self.embed_layers = nn.ModuleDict(
             {
                 "emb_layer_"
-                + self.embed_layers_names[col]: nn.Embedding(
-                    val + 1, dim, padding_idx=0
+                + col.replace(".", "_"): nn.EmbeddingBag(
+                    val + 1, dim, mode="mean", padding_idx=0
                 )
-                for col, val, dim in self.embed_input
+                for col, val, dim, _ in self.embed_input
             }
         )
-        self.embedding_dropout = nn.Dropout(embed_dropout)
+        self.col_slices = {
+            col: (self.column_idx[col], self.column_idx[col] + max_len)
+            for col, _, _, max_len in self.embed_input
+        }
 
-        if use_bias:
-            self.biases = nn.ParameterDict()
-            for col, _, dim in self.embed_input:
-                # no major reason for this bound, I just want them to be
-                # small, and related to the number of embeddings for that
-                # particular feature
-                bound = 1 / math.sqrt(dim)
-                self.biases["bias_" + col] = nn.Parameter(
-                    nn.init.uniform_(torch.Tensor(dim), -bound, bound)
-                )
+        self.embedding_dropout = nn.Dropout(embed_dropout)
 
         self.emb_out_dim: int = int(np.sum([embed[2] for embed in self.embed_input]))
 
     def forward(self, X: Tensor) -> Tensor:
         embed = [
-            self.embed_layers["emb_layer_" + self.embed_layers_names[col]](
-                X[:, self.column_idx[col]].long()
+            self.embed_layers["emb_layer_" + col.replace(".", "_")](
+                X[:, start:end].long()
             )
-            + (
-                self.biases["bias_" + col].unsqueeze(0)
-                if self.use_bias
-                else torch.zeros(1, dim, device=X.device)
-            )
-            for col, _, dim in self.embed_input
+            for col, (start, end) in self.col_slices.items()
         ]
-        x = torch.cat(embed, 1)
+        x = torch.cat(embed, 1) if len(embed) > 1 else embed[0]
         x = self.embedding_dropout(x)
         return x
 
@@ -197,14 +1169,29 @@ class SameSizeCatEmbeddings(nn.Module):
         shared_embed: bool,
         add_shared_embed: bool,
         frac_shared_embed: float,
+        compositional_embed_input: Optional[Dict[str, Any]] = None,
+        shared_vocab_cols: Optional[List[List[str]]] = None,
     ):
         super(SameSizeCatEmbeddings, self).__init__()
 
-        self.n_tokens = sum([ei[1] for ei in embed_input])
         self.column_idx = column_idx
         self.embed_input = embed_input
         self.shared_embed = shared_embed
         self.with_cls_token = "cls_token" in column_idx
+        self.compositional_embed_input = compositional_embed_input
+        self.shared_vocab_cols = shared_vocab_cols
+        comp_cols = (
+            compositional_embed_input if compositional_embed_input is not None else {}
+        )
+        # columns that share a vocabulary are encoded with the codes of the
+        # first column of their group (the "owner"), so they do not add
+        # tokens to the embedding table(s)
+        self.vocab_owner = _vocab_owners(
+            [ei[0] for ei in embed_input], shared_vocab_cols
+        )
+        self.n_tokens = sum(
+            [ei[1] for ei in embed_input if self.vocab_owner[ei[0]] == ei[0]]
+        )
 
         self.embed_layers_names = None
         if self.embed_input is not None:
@@ -226,11 +1213,10 @@ class SameSizeCatEmbeddings(nn.Module):
                 if self.with_cls_token
                 else len(categorical_cols)
             )
-            self.bias = nn.init.kaiming_uniform_(
-                nn.Parameter(torch.Tensor(n_cat, embed_dim)), a=math.sqrt(5)
-            )
+            self.bias = nn.Parameter(torch.empty(n_cat, embed_dim))
         else:
             self.bias = None
+        self.reset_parameters()
 
         # Categorical: val + 1 because 0 is reserved for padding/unseen cateogories.
         if self.shared_embed:
@@ -244,18 +1230,35 @@ class SameSizeCatEmbeddings(nn.Module):
                         full_embed_dropout,
                         add_shared_embed,
                         frac_shared_embed,
+                        comp_cols.get(col),
                     )
                     for col, val in self.embed_input
                 }
             )
+            # the column embeddings are not shared, but the embedding tables
+            # of the columns that share a vocabulary are
+            for col, owner in self.vocab_owner.items():
+                if col != owner:
+                    self.embed[
+                        "emb_layer_" + self.embed_layers_names[col]
+                    ].embed = self.embed[
+                        "emb_layer_" + self.embed_layers_names[owner]
+                    ].embed
+        elif comp_cols:
+            self._set_non_shared_compositional_embed(embed_dim, comp_cols)
         else:
-            n_tokens = sum([ei[1] for ei in embed_input])
-            self.embed = nn.Embedding(n_tokens + 1, embed_dim, padding_idx=0)
+            self.embed = nn.Embedding(self.n_tokens + 1, embed_dim, padding_idx=0)
+        if not self.shared_embed:
             if full_embed_dropout:
                 self.dropout: DropoutLayers = FullEmbeddingDropout(embed_dropout)
             else:
                 self.dropout = nn.Dropout(embed_dropout)
 
+    def reset_parameters(self) -> None:
+        # the embedding tables are initialised by their own modules
+        if self.bias is not None:
+            nn.init.kaiming_uniform_(self.bias, a=math.sqrt(5))
+
     def forward(self, X: Tensor) -> Tensor:
         if self.shared_embed:
             cat_embed = [
@@ -268,7 +1271,10 @@ class SameSizeCatEmbeddings(nn.Module):
             ]
             x = torch.cat(cat_embed, 1)
         else:
-            x = self.embed(X[:, self.cat_idx].long())
+            if self.compositional_embed_input:
+                x = self._compositional_embed(X)
+            else:
+                x = self.embed(X[:, self.cat_idx].long())
             if self.bias is not None:
                 if self.with_cls_token:
                     # no bias to be learned for the [CLS] token
@@ -282,6 +1288,91 @@ class SameSizeCatEmbeddings(nn.Module):
             x = self.dropout(x)
         return x
 
+    def _set_non_shared_compositional_embed(
+        self, embed_dim: int, comp_cols: Dict[str, Any]
+    ):
+        # Without shared embeddings the categories of all columns are
+        # encoded with a single, global, index (i.e. the codes of a column
+        # start where those of the previous column end) and embedded via a
+        # single table. Here the columns with compositional embeddings are
+        # removed from that table, so the codes of the rest of the columns
+        # are shifted accordingly, and the codes of the compositional
+        # columns are turned back into per-column codes
+        # columns that share a vocabulary share the codes, shifts and
+        # compositional embeddings of the owner of the vocabulary
+        reg_cols, col_shift, comp_start = [], {}, {}
+        start, shift = 1, 0
+        for col, val in self.embed_input:
+            if self.vocab_owner[col] != col:
+                owner = self.vocab_owner[col]
+                if owner in comp_start:
+                    comp_start[col] = comp_start[owner]
+                else:
+                    reg_cols.append(col)
+                    col_shift[col] = col_shift[owner]
+                continue
+            if col in comp_cols:
+                comp_start[col] = start
+                shift += val
+            else:
+                reg_cols.append(col)
+                col_shift[col] = shift
+            start += val
+        self.comp_cols = [col for col, _ in self.embed_input if col in comp_start]
+        reg_shift = [col_shift[col] for col in reg_cols]
+
+        n_tokens = sum(
+            [
+                val
+                for col, val in self.embed_input
+                if col not in comp_start and self.vocab_owner[col] == col
+            ]
+        )
+        self.embed = nn.Embedding(n_tokens + 1, embed_dim, padding_idx=0)
+        self.comp_embed = nn.ModuleDict(
+            {
+                "emb_layer_"
+                + self.embed_layers_names[col]: CompositionalEmbedding(
+                    val + 1, embed_dim, **_compositional_params(comp_cols[col])
+                )
+                for col, val in self.embed_input
+                if col in comp_cols and self.vocab_owner[col] == col
+            }
+        )
+        self.register_buffer(
+            "reg_idx",
+            torch.tensor([self.column_idx[col] for col in reg_cols]),
+            persistent=False,
+        )
+        self.register_buffer("reg_shift", torch.tensor(reg_shift), persistent=False)
+        self.register_buffer(
+            "comp_shift",
+            torch.tensor([comp_start[col] - 1 for col in self.comp_cols]),
+            persistent=False,
+        )
+        # the regular columns are embedded first, so the output is permuted
+        # back to the order in 'embed_input'
+        out_cols = reg_cols + self.comp_cols
+        self.register_buffer(
+            "out_perm",
+            torch.tensor([out_cols.index(col) for col, _ in self.embed_input]),
+            persistent=False,
+        )
+
+    def _compositional_embed(self, X: Tensor) -> Tensor:
+        idx = X[:, self.reg_idx].long()
+        x_reg = self.embed(torch.where(idx > 0, idx - self.reg_shift, 0))
+        x_comp = []
+        for i, col in enumerate(self.comp_cols):
+            idx = X[:, self.column_idx[col]].long()
+            x_comp.append(
+                self.comp_embed[
+                    "emb_layer_" + self.embed_layers_names[self.vocab_owner[col]]
+                ](torch.where(idx > 0, idx - self.comp_shift[i], 0))
+            )
+        x = torch.cat([x_reg, torch.stack(x_comp, 1)], 1)
+        return x[:, self.out_perm]
+
 
 class DiffSizeCatAndContEmbeddings(nn.Module):
     def __init__(
@@ -296,6 +1387,11 @@ class DiffSizeCatAndContEmbeddings(nn.Module):
         cont_embed_dim: int,
         cont_embed_dropout: float,
         use_cont_bias: bool,
+        multi_hot_embed_input: Optional[List[Tuple[str, int, int, int]]] = None,
+        compositional_embed_input: Optional[Dict[str, Any]] = None,
+        shared_vocab_cols: Optional[List[List[str]]] = None,
+        mmap_embed_input: Optional[Dict[str, Dict[str, Any]]] = None,
+        sharded_embed_input: Optional[Dict[str, Dict[str, Any]]] = None,
     ):
         super(DiffSizeCatAndContEmbeddings, self).__init__()
 
@@ -303,16 +1399,31 @@ class DiffSizeCatAndContEmbeddings(nn.Module):
         self.continuous_cols = continuous_cols
         self.embed_continuous = embed_continuous
         self.cont_embed_dim = cont_embed_dim
+        self.multi_hot_embed_input = multi_hot_embed_input
 
         # Categorical
         if self.cat_embed_input is not None:
             self.cat_embed = DiffSizeCatEmbeddings(
-                column_idx, cat_embed_input, cat_embed_dropout, use_cat_bias
+                column_idx,
+                cat_embed_input,
+                cat_embed_dropout,
+                use_cat_bias,
+                compositional_embed_input,
+                shared_vocab_cols,
+                mmap_embed_input,
+                sharded_embed_input,
             )
             self.cat_out_dim = int(np.sum([embed[2] for embed in self.cat_embed_input]))
         else:
             self.cat_out_dim = 0
 
+        # Multi-hot categorical, concatenated to the categorical embeddings
+        if self.multi_hot_embed_input is not None:
+            self.multi_hot_embed = MultiHotEmbeddings(
+                column_idx, multi_hot_embed_input, cat_embed_dropout
+            )
+            self.cat_out_dim += self.multi_hot_embed.emb_out_dim
+
         # Continuous
         if continuous_cols is not None:
             self.cont_idx = [column_idx[col] for col in continuous_cols]
@@ -343,6 +1454,12 @@ class DiffSizeCatAndContEmbeddings(nn.Module):
         else:
             x_cat = None
 
+        if self.multi_hot_embed_input is not None:
+            x_multi_hot = self.multi_hot_embed(X)
+            x_cat = (
+                torch.cat([x_cat, x_multi_hot], 1) if x_cat is not None else x_multi_hot
+            )
+
         if self.continuous_cols is not None:
             x_cont = self.cont_norm((X[:, self.cont_idx].float()))
             if self.embed_continuous:
@@ -371,6 +1488,8 @@ class SameSizeCatAndContEmbeddings(nn.Module):
         embed_continuous: bool,
         cont_embed_dropout: float,
         use_cont_bias: bool,
+        compositional_embed_input: Optional[Dict[str, Any]] = None,
+        shared_vocab_cols: Optional[List[List[str]]] = None,
     ):
         super(SameSizeCatAndContEmbeddings, self).__init__()
 
@@ -391,6 +1510,8 @@ class SameSizeCatAndContEmbeddings(nn.Module):
                 shared_embed,
                 add_shared_embed,
                 frac_shared_embed,
+                compositional_embed_input,
+                shared_vocab_cols,
             )
         # Continuous
         if continuous_cols is not None:
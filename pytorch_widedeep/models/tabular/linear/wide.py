@@ -3,8 +3,12 @@ import math
 import torch
 from torch import nn
 
-from pytorch_widedeep.wdtypes import Tensor
+from pytorch_widedeep.wdtypes import Any, Dict, Tensor, Optional
 from pytorch_widedeep.utils.general_utils import Alias
+from pytorch_widedeep.models.tabular.embeddings_layers import (
+    MMapEmbedding,
+    ShardedEmbedding,
+)
 
 
 class Wide(nn.Module):
@@ -24,6 +28,41 @@ class Wide(nn.Module):
         all the other models, the wide model is connected directly to the
         output neuron(s) when used to build a Wide and Deep model. Therefore,
         it requires the `pred_dim` parameter.
+    sparse: bool, default = False
+        Boolean indicating if the gradients of the linear layer will be
+        sparse. With large vocabularies, where each batch only touches a
+        handful of rows, this makes each optimizer step proportional to the
+        number of rows in the batch rather than to the size of the
+        vocabulary. The model itself (and its outputs) is the same as with
+        `sparse = False`. Note that sparse gradients are only supported by
+        some optimizers (e.g. `SGD` or `SparseAdam`). When used with the
+        `Trainer`, the parameters with sparse gradients are optimized with a
+        `SparseAdam` optimizer (or with the `sparse_optimizer` passed to the
+        `Trainer`) while the remaining parameters keep theirs
+    multi_hot: bool, default = False
+        Boolean indicating if the wide component receives multi-hot (i.e.
+        variable length) columns, padded with 0s (see the `multi_hot_cols`
+        parameter of the `WidePreprocessor`). If `True`, the linear layer is
+        an `nn.EmbeddingBag(mode="sum")` and padding/unseen values (i.e. 0)
+        do not contribute to the output, while, by default, the (fixed) row
+        of the padding/unseen values is added as any other row. Note that
+        padding/unseen values do not contribute to the output of
+        memory-mapped or sharded linear layers either (see `mmap_params` and
+        `sharded`)
+    mmap_params: Dict, Optional, default = None
+        If not `None`, the linear layer is stored in a memory-mapped file,
+        with only the recently used rows in memory, via an
+        `pytorch_widedeep.models.tabular.embeddings_layers.MMapEmbedding`,
+        and this is a dictionary with its params (at least the `path` to the
+        file), e.g. _{'path': 'tables/wide.bin', 'cache_size': 100000}_.
+        This is meant for very large `input_dim`s
+    sharded: bool, default = False
+        Boolean indicating if the linear layer is split row-wise across the
+        processes of a `torch.distributed` process group (e.g. one started
+        with `pytorch_widedeep.distributed.launch`) via a
+        `pytorch_widedeep.models.tabular.embeddings_layers.ShardedEmbedding`,
+        so that each process only holds `1 / world_size` of the rows. This
+        is meant for very large `input_dim`s in distributed training
 
     Attributes
     -----------
@@ -39,30 +78,74 @@ class Wide(nn.Module):
     >>> out = wide(X)
     """
 
+    # default for models pickled before the EmbeddingBag version existed
+    _pooled: bool = False
+
     @Alias("pred_dim", ["pred_size", "num_class"])
-    def __init__(self, input_dim: int, pred_dim: int = 1):
+    def __init__(
+        self,
+        input_dim: int,
+        pred_dim: int = 1,
+        sparse: bool = False,
+        multi_hot: bool = False,
+        mmap_params: Optional[Dict[str, Any]] = None,
+        sharded: bool = False,
+    ):
         super(Wide, self).__init__()
 
+        if mmap_params is not None and sharded:
+            raise ValueError(
+                "The linear layer cannot be both memory-mapped and sharded"
+            )
+
         self.input_dim = input_dim
         self.pred_dim = pred_dim
+        self.sparse = sparse
+        self.multi_hot = multi_hot
+        self.mmap_params = mmap_params
+        self.sharded = sharded
+        # the EmbeddingBag (or its quantized version) sums the rows itself
+        self._pooled = multi_hot and mmap_params is None and not sharded
 
         # Embeddings: val + 1 because 0 is reserved for padding/unseen cateogories.
-        self.wide_linear = nn.Embedding(input_dim + 1, pred_dim, padding_idx=0)
+        self.wide_linear: nn.Module
+        if mmap_params is not None:
+            # the table is initialised when the file is created
+            self.wide_linear = MMapEmbedding(
+                input_dim + 1,
+                pred_dim,
+                sparse=sparse,
+                initializer=lambda w: nn.init.kaiming_uniform_(w, a=math.sqrt(5)),
+                **mmap_params,
+            )
+        elif sharded:
+            self.wide_linear = ShardedEmbedding(input_dim + 1, pred_dim, sparse=sparse)
+        elif self._pooled:
+            self.wide_linear = nn.EmbeddingBag(
+                input_dim + 1, pred_dim, mode="sum", sparse=sparse, padding_idx=0
+            )
+        else:
+            self.wide_linear = nn.Embedding(
+                input_dim + 1, pred_dim, padding_idx=0, sparse=sparse
+            )
         # (Sum(Embedding) + bias) is equivalent to (OneHotVector + Linear)
         self.bias = nn.Parameter(torch.zeros(pred_dim))
-        self._reset_parameters()
+        self.reset_parameters()
 
-    def _reset_parameters(self) -> None:
+    def reset_parameters(self) -> None:
         r"""initialize Embedding and bias like nn.Linear. See [original
         implementation](https://pytorch.org/docs/stable/_modules/torch/nn/modules/linear.html#Linear).
         """
-        nn.init.kaiming_uniform_(self.wide_linear.weight, a=math.sqrt(5))
-        fan_in, _ = nn.init._calculate_fan_in_and_fan_out(self.wide_linear.weight)
-        bound = 1 / math.sqrt(fan_in)
+        if self.mmap_params is None:
+            nn.init.kaiming_uniform_(self.wide_linear.weight, a=math.sqrt(5))
+        # fan_in of the (input_dim + 1, pred_dim) weight
+        bound = 1 / math.sqrt(self.pred_dim)
         nn.init.uniform_(self.bias, -bound, bound)
 
     def forward(self, X: Tensor) -> Tensor:
         r"""Forward pass. Simply connecting the Embedding layer with the ouput
         neuron(s)"""
+        if self._pooled:
+            return self.wide_linear(X.long()) + self.bias
         out = self.wide_linear(X.long()).sum(dim=1) + self.bias
         return out
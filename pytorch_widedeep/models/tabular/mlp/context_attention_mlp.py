@@ -1,6 +1,6 @@
 from torch import nn
 
-from pytorch_widedeep.wdtypes import Dict, List, Tuple, Tensor, Optional
+from pytorch_widedeep.wdtypes import Any, Dict, List, Tuple, Tensor, Optional
 from pytorch_widedeep.models.tabular.mlp._encoders import (
     ContextAttentionEncoder,
 )
@@ -83,6 +83,22 @@ class ContextAttentionMLP(BaseTabularModelWithAttention):
         and _'gelu'_ are supported.
     n_blocks: int, default = 3
         Number of attention blocks
+    compositional_embed_input: Dict, Optional, default = None
+        Dictionary where the keys are the categorical columns that will be
+        represented by compositional embeddings (which use much smaller
+        tables than regular embeddings, see
+        `pytorch_widedeep.models.tabular.embeddings_layers.CompositionalEmbedding`)
+        and the values are either the method (_'qr_mult'_, _'qr_sum'_ or
+        _'hash'_) or a dictionary with the `CompositionalEmbedding` params,
+        e.g. _{'user_id': 'qr_mult', 'item_id': {'method': 'hash',
+        'n_buckets': 1000}}_. See the `compositional_embed_cols` parameter of
+        the `TabPreprocessor`
+    shared_vocab_cols: List, Optional, default = None
+        List of Lists with the names of the categorical columns that share a
+        vocabulary (e.g. _[['movie_id', 'prev_movie_1', 'prev_movie_2']]_)
+        and therefore share an embedding table. These columns must be encoded
+        with a common vocabulary, see the `shared_vocab_cols` parameter of
+        the `TabPreprocessor`
 
     Attributes
     ----------
@@ -124,6 +140,8 @@ class ContextAttentionMLP(BaseTabularModelWithAttention):
         with_addnorm: bool = False,
         attn_activation: str = "leaky_relu",
         n_blocks: int = 3,
+        compositional_embed_input: Optional[Dict[str, Any]] = None,
+        shared_vocab_cols: Optional[List[List[str]]] = None,
     ):
         super(ContextAttentionMLP, self).__init__(
             column_idx=column_idx,
@@ -142,6 +160,8 @@ class ContextAttentionMLP(BaseTabularModelWithAttention):
             use_cont_bias=use_cont_bias,
             cont_embed_activation=cont_embed_activation,
             input_dim=input_dim,
+            compositional_embed_input=compositional_embed_input,
+            shared_vocab_cols=shared_vocab_cols,
         )
 
         self.attn_dropout = attn_dropout
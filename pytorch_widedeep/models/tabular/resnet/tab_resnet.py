@@ -1,6 +1,6 @@
 from torch import nn
 
-from pytorch_widedeep.wdtypes import Dict, List, Tuple, Tensor, Optional
+from pytorch_widedeep.wdtypes import Any, Dict, List, Tuple, Tensor, Optional
 from pytorch_widedeep.models.tabular.mlp._layers import MLP
 from pytorch_widedeep.models.tabular.resnet._layers import DenseResnet
 from pytorch_widedeep.models.tabular._base_tabular_model import (
@@ -83,6 +83,45 @@ class TabResnet(BaseTabularModelWithoutAttention):
         Boolean indicating the order of the operations in the dense
         layer. If `True: [LIN -> ACT -> BN -> DP]`. If `False: [BN -> DP ->
         LIN -> ACT]`
+    multi_hot_embed_input: List, Optional, default = None
+        List of Tuples with the multi-hot column name, number of unique
+        values, embedding dimension and maximum number of values per row,
+        e.g. _[('genres', 18, 8, 6), ...]_. The values of each row are
+        embedded and averaged via an `nn.EmbeddingBag`, and the result is
+        concatenated to the categorical embeddings. See the
+        `multi_hot_cols` parameter of the `TabPreprocessor`
+    compositional_embed_input: Dict, Optional, default = None
+        Dictionary where the keys are the categorical columns that will be
+        represented by compositional embeddings (which use much smaller
+        tables than regular embeddings, see
+        `pytorch_widedeep.models.tabular.embeddings_layers.CompositionalEmbedding`)
+        and the values are either the method (_'qr_mult'_, _'qr_sum'_ or
+        _'hash'_) or a dictionary with the `CompositionalEmbedding` params,
+        e.g. _{'user_id': 'qr_mult', 'item_id': {'method': 'hash',
+        'n_buckets': 1000}}_. See the `compositional_embed_cols` parameter of
+        the `TabPreprocessor`
+    shared_vocab_cols: List, Optional, default = None
+        List of Lists with the names of the categorical columns that share a
+        vocabulary (e.g. _[['movie_id', 'prev_movie_1', 'prev_movie_2']]_)
+        and therefore share an embedding table. These columns must be encoded
+        with a common vocabulary, see the `shared_vocab_cols` parameter of
+        the `TabPreprocessor`
+    mmap_embed_input: Dict, Optional, default = None
+        Dictionary where the keys are the (very high-cardinality) categorical
+        columns whose embedding tables will be stored in memory-mapped files,
+        with only the recently used rows in memory, and the values are the
+        params of
+        `pytorch_widedeep.models.tabular.embeddings_layers.MMapEmbedding`
+        (at least the `path` to the file), e.g. _{'item_id': {'path':
+        'tables/item_id.bin', 'cache_size': 100000}}_
+    sharded_embed_input: Dict, Optional, default = None
+        Dictionary where the keys are the (very high-cardinality) categorical
+        columns whose embedding tables will be split row-wise across the
+        processes of a `torch.distributed` process group, and the values
+        are the params of
+        `pytorch_widedeep.models.tabular.embeddings_layers.ShardedEmbedding`
+        (if any), e.g. _{'item_id': {'sparse': True}}_. This is meant for
+        distributed training, see `pytorch_widedeep.distributed`
 
     Attributes
     ----------
@@ -132,6 +171,11 @@ class TabResnet(BaseTabularModelWithoutAttention):
         mlp_batchnorm: bool = False,
         mlp_batchnorm_last: bool = False,
         mlp_linear_first: bool = False,
+        multi_hot_embed_input: Optional[List[Tuple[str, int, int, int]]] = None,
+        compositional_embed_input: Optional[Dict[str, Any]] = None,
+        shared_vocab_cols: Optional[List[List[str]]] = None,
+        mmap_embed_input: Optional[Dict[str, Dict[str, Any]]] = None,
+        sharded_embed_input: Optional[Dict[str, Dict[str, Any]]] = None,
     ):
         super(TabResnet, self).__init__(
             column_idx=column_idx,
@@ -146,6 +190,11 @@ class TabResnet(BaseTabularModelWithoutAttention):
             cont_embed_dropout=cont_embed_dropout,
             use_cont_bias=use_cont_bias,
             cont_embed_activation=cont_embed_activation,
+            multi_hot_embed_input=multi_hot_embed_input,
+            compositional_embed_input=compositional_embed_input,
+            shared_vocab_cols=shared_vocab_cols,
+            mmap_embed_input=mmap_embed_input,
+            sharded_embed_input=sharded_embed_input,
         )
 
         if len(blocks_dims) < 2:
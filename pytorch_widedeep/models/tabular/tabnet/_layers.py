@@ -67,7 +67,7 @@ class GLU_Layer(nn.Module):
             self.fc = fc
         else:
             self.fc = nn.Linear(input_dim, 2 * output_dim, bias=False)
-        initialize_glu(self.fc, input_dim, 2 * output_dim)
+        self.reset_parameters()
 
         if ghost_bn:
             self.bn: Union[GBN, nn.BatchNorm1d] = GBN(
@@ -78,6 +78,9 @@ class GLU_Layer(nn.Module):
 
         self.dp = nn.Dropout(dropout)
 
+    def reset_parameters(self) -> None:
+        initialize_glu(self.fc, self.fc.in_features, self.fc.out_features)
+
     def forward(self, X: Tensor) -> Tensor:
         return self.dp(F.glu(self.bn(self.fc(X))))
 
@@ -197,7 +200,7 @@ class AttentiveTransformer(nn.Module):
     ):
         super(AttentiveTransformer, self).__init__()
         self.fc = nn.Linear(input_dim, output_dim, bias=False)
-        initialize_non_glu(self.fc, input_dim, output_dim)
+        self.reset_parameters()
         if ghost_bn:
             self.bn: Union[GBN, nn.BatchNorm1d] = GBN(
                 output_dim, virtual_batch_size=virtual_batch_size, momentum=momentum
@@ -216,6 +219,9 @@ class AttentiveTransformer(nn.Module):
                 "Please choose either 'sparsemax' or 'entmax' as masktype"
             )
 
+    def reset_parameters(self) -> None:
+        initialize_non_glu(self.fc, self.fc.in_features, self.fc.out_features)
+
     def forward(self, priors: Tensor, processed_feat: Tensor) -> Tensor:
         x = self.bn(self.fc(processed_feat))
         x = torch.mul(x, priors)
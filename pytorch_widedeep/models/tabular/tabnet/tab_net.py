@@ -218,7 +218,12 @@ class TabNetPredLayer(nn.Module):
         """
         super(TabNetPredLayer, self).__init__()
         self.pred_layer = nn.Linear(inp, out, bias=False)
-        initialize_non_glu(self.pred_layer, inp, out)
+        self.reset_parameters()
+
+    def reset_parameters(self) -> None:
+        initialize_non_glu(
+            self.pred_layer, self.pred_layer.in_features, self.pred_layer.out_features
+        )
 
     def forward(self, tabnet_tuple: Tuple[Tensor, Tensor]) -> Tuple[Tensor, Tensor]:
         res, M_loss = tabnet_tuple[0], tabnet_tuple[1]
@@ -325,7 +330,15 @@ class TabNetDecoder(nn.Module):
             self.decoder.append(transformer)
 
         self.reconstruction_layer = nn.Linear(step_dim, embed_dim, bias=False)
-        initialize_non_glu(self.reconstruction_layer, step_dim, embed_dim)
+        self.reset_parameters()
+
+    def reset_parameters(self) -> None:
+        # the decoder steps are initialised by their own modules
+        initialize_non_glu(
+            self.reconstruction_layer,
+            self.reconstruction_layer.in_features,
+            self.reconstruction_layer.out_features,
+        )
 
     def forward(self, X: List[Tensor]) -> Tensor:
         out = torch.tensor(0.0)
@@ -10,7 +10,8 @@ import einops
 import torch.nn.functional as F
 from torch import nn, einsum
 
-from pytorch_widedeep.wdtypes import Tuple, Tensor, Optional
+from pytorch_widedeep.wdtypes import Tuple, Tensor, Callable, Optional
+from pytorch_widedeep.models.attention_capture import is_capturing_attention
 from pytorch_widedeep.models._get_activation_fn import get_activation_fn
 
 
@@ -48,7 +49,7 @@ class NormAdd(nn.Module):
         self.dropout = nn.Dropout(dropout)
         self.ln = nn.LayerNorm(input_dim)
 
-    def forward(self, X: Tensor, sublayer: nn.Module) -> Tensor:
+    def forward(self, X: Tensor, sublayer: Callable[[Tensor], Tensor]) -> Tensor:
         return X + self.dropout(sublayer(self.ln(X)))
 
 
@@ -60,7 +61,7 @@ class AddNorm(nn.Module):
         self.dropout = nn.Dropout(dropout)
         self.ln = nn.LayerNorm(input_dim)
 
-    def forward(self, X: Tensor, sublayer: nn.Module) -> Tensor:
+    def forward(self, X: Tensor, sublayer: Callable[[Tensor], Tensor]) -> Tensor:
         return self.ln(X + self.dropout(sublayer(X)))
 
 
@@ -95,6 +96,9 @@ class MultiHeadedAttention(nn.Module):
             nn.Linear(input_dim, query_dim, bias=use_bias) if n_heads > 1 else None
         )
 
+        # only set when the forward pass runs within 'capture_attention'
+        self.attn_weights: Optional[Tensor] = None
+
     def forward(self, X_Q: Tensor, X_KV: Optional[Tensor] = None) -> Tensor:
         # b: batch size
         # s: seq length
@@ -111,20 +115,15 @@ class MultiHeadedAttention(nn.Module):
         )
 
         if self.use_flash_attention:
-            attn_output = F.scaled_dot_product_attention(
-                q,
-                k,
-                v,
-                attn_mask=None,
-                dropout_p=self.dropout_p if self.training else 0,
-                is_causal=False,
-            )
-            self.attn_weights: Optional[Tensor] = None
+            attn_output = self._sdpa_attention(q, k, v)
+            self.attn_weights = None
         elif self.use_linear_attention:
             attn_output = self._linear_attention(q, k, v)
             self.attn_weights = None
-        else:
+        elif is_capturing_attention():
             self.attn_weights, attn_output = self._standard_attention(q, k, v)
+        else:
+            attn_output = self._sdpa_attention(q, k, v)
 
         output = einops.rearrange(attn_output, "b h s d -> b s (h d)", h=self.n_heads)
 
@@ -133,6 +132,20 @@ class MultiHeadedAttention(nn.Module):
 
         return output
 
+    def _sdpa_attention(self, q: Tensor, k: Tensor, v: Tensor) -> Tensor:
+        """Same as the 'standard' attention but using the fused kernels in
+        `scaled_dot_product_attention`, without materialising the attention
+        weights
+        """
+        return F.scaled_dot_product_attention(
+            q,
+            k,
+            v,
+            attn_mask=None,
+            dropout_p=self.dropout_p if self.training else 0,
+            is_causal=False,
+        )
+
     def _standard_attention(
         self, q: Tensor, k: Tensor, v: Tensor
     ) -> Tuple[Tensor, Tensor]:
@@ -216,16 +229,25 @@ class LinearAttentionLinformer(nn.Module):
         self.dropout = nn.Dropout(dropout)
         self.qkv_proj = nn.Linear(input_dim, input_dim * 3, bias=use_bias)
 
-        self.E = nn.init.xavier_uniform_(nn.Parameter(torch.zeros(n_feats, dim_k)))
+        self.E = nn.Parameter(torch.zeros(n_feats, dim_k))
         if not kv_sharing:
-            self.F = nn.init.xavier_uniform_(nn.Parameter(torch.zeros(n_feats, dim_k)))
+            self.F = nn.Parameter(torch.zeros(n_feats, dim_k))
         else:
             self.F = self.E
+        self.reset_parameters()
 
         self.out_proj = (
             nn.Linear(input_dim, input_dim, bias=use_bias) if n_heads > 1 else None
         )
 
+        # only set when the forward pass runs within 'capture_attention'
+        self.attn_weights: Optional[Tensor] = None
+
+    def reset_parameters(self) -> None:
+        nn.init.xavier_uniform_(self.E)
+        if not self.share_kv:
+            nn.init.xavier_uniform_(self.F)
+
     def forward(self, X: Tensor) -> Tensor:
         # b: batch size
         # s: seq length
@@ -242,10 +264,24 @@ class LinearAttentionLinformer(nn.Module):
         k = einops.rearrange(k, "b k (h d) -> b h k d", d=self.head_dim)
         v = einops.rearrange(v, "b k (h d) -> b h k d", d=self.head_dim)
 
-        scores = einsum("b h s d, b h k d -> b h s k", q, k) / math.sqrt(self.head_dim)
-        attn_weights = scores.softmax(dim=-1)
-        self.attn_weights = attn_weights
-        output = einsum("b h s k, b h k d -> b h s d", self.dropout(attn_weights), v)
+        if is_capturing_attention():
+            scores = einsum("b h s d, b h k d -> b h s k", q, k) / math.sqrt(
+                self.head_dim
+            )
+            attn_weights = scores.softmax(dim=-1)
+            self.attn_weights = attn_weights
+            output = einsum(
+                "b h s k, b h k d -> b h s d", self.dropout(attn_weights), v
+            )
+        else:
+            output = F.scaled_dot_product_attention(
+                q,
+                k,
+                v,
+                attn_mask=None,
+                dropout_p=self.dropout.p if self.training else 0,
+                is_causal=False,
+            )
         output = einops.rearrange(output, "b h s d -> b s (h d)")
 
         if self.out_proj is not None:
@@ -291,6 +327,9 @@ class AdditiveAttention(nn.Module):
 
         self.r_out = nn.Linear(input_dim, input_dim)
 
+        # only set when the forward pass runs within 'capture_attention'
+        self.attn_weights: Optional[Tuple[Tensor, Tensor]] = None
+
     def forward(self, X: Tensor) -> Tensor:
         # b: batch size
         # s: seq length
@@ -316,10 +355,11 @@ class AdditiveAttention(nn.Module):
 
         # for consistency with all other transformer-based models, rearrange
         # the attn_weights
-        self.attn_weights = (
-            einops.rearrange(alphas, "b s h -> b h s"),
-            einops.rearrange(betas, "b s h -> b h s"),
-        )
+        if is_capturing_attention():
+            self.attn_weights = (
+                einops.rearrange(alphas, "b s h -> b h s"),
+                einops.rearrange(betas, "b s h -> b h s"),
+            )
 
         output = q + self.dropout(self.r_out(u))
 
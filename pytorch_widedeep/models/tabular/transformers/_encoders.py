@@ -1,7 +1,9 @@
+import torch
 import einops
 from torch import nn
 
-from pytorch_widedeep.wdtypes import Tensor, Optional
+from pytorch_widedeep.wdtypes import List, Tensor, Optional
+from pytorch_widedeep.models.attention_capture import is_capturing_attention
 from pytorch_widedeep.models.tabular.transformers._attention_layers import (
     AddNorm,
     NormAdd,
@@ -57,10 +59,14 @@ class SaintEncoder(nn.Module):
         ff_factor: int,
         activation: str,
         n_feat: int,
+        row_attn_chunk_size: Optional[int] = None,
+        row_attn_eval_chunk_size: Optional[int] = None,
     ):
         super(SaintEncoder, self).__init__()
 
         self.n_feat = n_feat
+        self.row_attn_chunk_size = row_attn_chunk_size
+        self.row_attn_eval_chunk_size = row_attn_eval_chunk_size
 
         self.col_attn = MultiHeadedAttention(
             input_dim,
@@ -90,12 +96,56 @@ class SaintEncoder(nn.Module):
     def forward(self, X: Tensor) -> Tensor:
         x = self.col_attn_addnorm(X, self.col_attn)
         x = self.col_attn_ff_addnorm(x, self.col_attn_ff)
-        x = einops.rearrange(x, "b n d -> 1 b (n d)")
-        x = self.row_attn_addnorm(x, self.row_attn)
-        x = self.row_attn_ff_addnorm(x, self.row_attn_ff)
-        x = einops.rearrange(x, "1 b (n d) -> b n d", n=self.n_feat)
+        chunk_size = (
+            self.row_attn_chunk_size if self.training else self.row_attn_eval_chunk_size
+        )
+        if chunk_size is None or chunk_size >= x.shape[0]:
+            x = einops.rearrange(x, "b n d -> 1 b (n d)")
+            x = self.row_attn_addnorm(x, self.row_attn)
+            x = self.row_attn_ff_addnorm(x, self.row_attn_ff)
+            x = einops.rearrange(x, "1 b (n d) -> b n d", n=self.n_feat)
+        else:
+            x = einops.rearrange(x, "b n d -> b (n d)")
+            x = self.row_attn_addnorm(
+                x, lambda t: self._chunked_row_attn(t, chunk_size)
+            )
+            x = self.row_attn_ff_addnorm(x, self.row_attn_ff)
+            x = einops.rearrange(x, "b (n d) -> b n d", n=self.n_feat)
         return x
 
+    def _chunked_row_attn(self, X: Tensor, chunk_size: int) -> Tensor:
+        # the batch is split into chunks of 'chunk_size' consecutive rows
+        # (the last one might be smaller) and each row only attends to the
+        # rows in its own chunk. The full chunks are processed together as a
+        # batch of sequences
+        n_full = (X.shape[0] // chunk_size) * chunk_size
+        chunks = [einops.rearrange(X[:n_full], "(g c) e -> g c e", c=chunk_size)]
+        if n_full < X.shape[0]:
+            chunks.append(X[n_full:].unsqueeze(0))
+
+        outputs, attn_weights = [], []
+        for chunk in chunks:
+            outputs.append(einops.rearrange(self.row_attn(chunk), "g c e -> (g c) e"))
+            attn_weights.append(self.row_attn.attn_weights)
+
+        if is_capturing_attention():
+            # for consistency with the non chunked row attention, the
+            # attention weights are kept as a (1, H, N, N) tensor, with zeros
+            # between rows in different chunks
+            self.row_attn.attn_weights = self._block_diagonal(attn_weights)
+
+        return torch.cat(outputs)
+
+    @staticmethod
+    def _block_diagonal(attn_weights: List[Tensor]) -> Tensor:
+        blocks = [blk for aw in attn_weights for blk in aw.unbind(0)]
+        return torch.stack(
+            [
+                torch.block_diag(*[blk[h] for blk in blocks])
+                for h in range(blocks[0].shape[0])
+            ]
+        ).unsqueeze(0)
+
 
 class FTTransformerEncoder(nn.Module):
     def __init__(
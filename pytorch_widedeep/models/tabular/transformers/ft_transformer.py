@@ -1,6 +1,6 @@
 from torch import nn
 
-from pytorch_widedeep.wdtypes import Dict, List, Tuple, Tensor, Optional
+from pytorch_widedeep.wdtypes import Any, Dict, List, Tuple, Tensor, Optional
 from pytorch_widedeep.models.tabular.mlp._layers import MLP
 from pytorch_widedeep.models.tabular._base_tabular_model import (
     BaseTabularModelWithAttention,
@@ -115,6 +115,30 @@ class FTTransformer(BaseTabularModelWithAttention):
         Boolean indicating whether the order of the operations in the dense
         layer. If `True: [LIN -> ACT -> BN -> DP]`. If `False: [BN -> DP ->
         LIN -> ACT]`
+    compositional_embed_input: Dict, Optional, default = None
+        Dictionary where the keys are the categorical columns that will be
+        represented by compositional embeddings (which use much smaller
+        tables than regular embeddings, see
+        `pytorch_widedeep.models.tabular.embeddings_layers.CompositionalEmbedding`)
+        and the values are either the method (_'qr_mult'_, _'qr_sum'_ or
+        _'hash'_) or a dictionary with the `CompositionalEmbedding` params,
+        e.g. _{'user_id': 'qr_mult', 'item_id': {'method': 'hash',
+        'n_buckets': 1000}}_. See the `compositional_embed_cols` parameter of
+        the `TabPreprocessor`
+    shared_vocab_cols: List, Optional, default = None
+        List of Lists with the names of the categorical columns that share a
+        vocabulary (e.g. _[['movie_id', 'prev_movie_1', 'prev_movie_2']]_)
+        and therefore share an embedding table. These columns must be encoded
+        with a common vocabulary, see the `shared_vocab_cols` parameter of
+        the `TabPreprocessor`
+    checkpoint_every_n_blocks: int, Optional, default = None
+        If not `None`, activation checkpointing is used during training: the
+        FTTransformer blocks are run in groups of `checkpoint_every_n_blocks` blocks
+        and only the input to each group is kept in memory. The activations
+        within the group are recomputed during the backward pass (see
+        `torch.utils.checkpoint`), trading compute for memory. The results
+        are the same as without checkpointing, including the dropout masks
+        and the attention weights
 
     Attributes
     ----------
@@ -170,6 +194,9 @@ class FTTransformer(BaseTabularModelWithAttention):
         mlp_batchnorm: bool = False,
         mlp_batchnorm_last: bool = False,
         mlp_linear_first: bool = True,
+        compositional_embed_input: Optional[Dict[str, Any]] = None,
+        shared_vocab_cols: Optional[List[List[str]]] = None,
+        checkpoint_every_n_blocks: Optional[int] = None,
     ):
         super(FTTransformer, self).__init__(
             column_idx=column_idx,
@@ -188,6 +215,9 @@ class FTTransformer(BaseTabularModelWithAttention):
             use_cont_bias=use_cont_bias,
             cont_embed_activation=cont_embed_activation,
             input_dim=input_dim,
+            compositional_embed_input=compositional_embed_input,
+            shared_vocab_cols=shared_vocab_cols,
+            checkpoint_every_n_blocks=checkpoint_every_n_blocks,
         )
 
         self.kv_compression_factor = kv_compression_factor
@@ -254,7 +284,7 @@ class FTTransformer(BaseTabularModelWithAttention):
 
     def forward(self, X: Tensor) -> Tensor:
         x = self._get_embeddings(X)
-        x = self.encoder(x)
+        x = self._forward_blocks(list(self.encoder), x)
         if self.with_cls_token:
             x = x[:, 0, :]
         else:
@@ -282,5 +312,9 @@ class FTTransformer(BaseTabularModelWithAttention):
         the batch size, $H$ is the number of attention heads, $F$ is the
         number of features/columns and $k$ is the reduced sequence length or
         dimension, i.e. $k = int(kv_{compression \space factor} \times s)$
+
+        :information_source: **NOTE**: the attention weights are only kept
+        for the forward passes run within
+        `pytorch_widedeep.models.capture_attention`
         """
         return [blk.attn.attn_weights for blk in self.encoder]
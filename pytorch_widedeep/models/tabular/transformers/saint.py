@@ -1,6 +1,6 @@
 from torch import nn
 
-from pytorch_widedeep.wdtypes import Dict, List, Tuple, Tensor, Optional
+from pytorch_widedeep.wdtypes import Any, Dict, List, Tuple, Tensor, Optional
 from pytorch_widedeep.models.tabular.mlp._layers import MLP
 from pytorch_widedeep.models.tabular._base_tabular_model import (
     BaseTabularModelWithAttention,
@@ -104,6 +104,45 @@ class SAINT(BaseTabularModelWithAttention):
         Boolean indicating whether the order of the operations in the dense
         layer. If `True: [LIN -> ACT -> BN -> DP]`. If `False: [BN -> DP ->
         LIN -> ACT]`
+    compositional_embed_input: Dict, Optional, default = None
+        Dictionary where the keys are the categorical columns that will be
+        represented by compositional embeddings (which use much smaller
+        tables than regular embeddings, see
+        `pytorch_widedeep.models.tabular.embeddings_layers.CompositionalEmbedding`)
+        and the values are either the method (_'qr_mult'_, _'qr_sum'_ or
+        _'hash'_) or a dictionary with the `CompositionalEmbedding` params,
+        e.g. _{'user_id': 'qr_mult', 'item_id': {'method': 'hash',
+        'n_buckets': 1000}}_. See the `compositional_embed_cols` parameter of
+        the `TabPreprocessor`
+    shared_vocab_cols: List, Optional, default = None
+        List of Lists with the names of the categorical columns that share a
+        vocabulary (e.g. _[['movie_id', 'prev_movie_1', 'prev_movie_2']]_)
+        and therefore share an embedding table. These columns must be encoded
+        with a common vocabulary, see the `shared_vocab_cols` parameter of
+        the `TabPreprocessor`
+    checkpoint_every_n_blocks: int, Optional, default = None
+        If not `None`, activation checkpointing is used during training: the
+        SAINT blocks are run in groups of `checkpoint_every_n_blocks` blocks
+        and only the input to each group is kept in memory. The activations
+        within the group are recomputed during the backward pass (see
+        `torch.utils.checkpoint`), trading compute for memory. The results
+        are the same as without checkpointing, including the dropout masks
+        and the attention weights
+    row_attn_chunk_size: int, Optional, default = None
+        If not `None`, the row (or inter-sample) attention is computed
+        blockwise during training: the batch is split into chunks of
+        `row_attn_chunk_size` consecutive rows and each row only attends to
+        the rows in its own chunk. This bounds the memory of the row
+        attention, which otherwise grows quadratically with the batch size.
+        If `None` each row attends to all the rows in the batch
+    row_attn_eval_chunk_size: int, Optional, default = None
+        Same as `row_attn_chunk_size` but used in evaluation mode, i.e. when
+        predicting. Since the chunks are formed with consecutive rows, the
+        prediction for a given row only depends on the rows in its chunk,
+        regardless of the batch size (as long as the batch size is a
+        multiple of `row_attn_eval_chunk_size`). Setting it to 1 makes each
+        prediction independent of the other rows. If `None` it defaults to
+        `row_attn_chunk_size`
 
     Attributes
     ----------
@@ -157,6 +196,11 @@ class SAINT(BaseTabularModelWithAttention):
         mlp_batchnorm: bool = False,
         mlp_batchnorm_last: bool = False,
         mlp_linear_first: bool = True,
+        compositional_embed_input: Optional[Dict[str, Any]] = None,
+        shared_vocab_cols: Optional[List[List[str]]] = None,
+        checkpoint_every_n_blocks: Optional[int] = None,
+        row_attn_chunk_size: Optional[int] = None,
+        row_attn_eval_chunk_size: Optional[int] = None,
     ):
         super(SAINT, self).__init__(
             column_idx=column_idx,
@@ -175,8 +219,23 @@ class SAINT(BaseTabularModelWithAttention):
             use_cont_bias=use_cont_bias,
             cont_embed_activation=cont_embed_activation,
             input_dim=input_dim,
+            compositional_embed_input=compositional_embed_input,
+            shared_vocab_cols=shared_vocab_cols,
+            checkpoint_every_n_blocks=checkpoint_every_n_blocks,
         )
 
+        for param_name, chunk_size in [
+            ("row_attn_chunk_size", row_attn_chunk_size),
+            ("row_attn_eval_chunk_size", row_attn_eval_chunk_size),
+        ]:
+            if chunk_size is not None and (
+                not isinstance(chunk_size, int) or chunk_size < 1
+            ):
+                raise ValueError(
+                    f"'{param_name}' must be a positive integer or None. "
+                    f"Got {chunk_size} instead"
+                )
+
         self.use_qkv_bias = use_qkv_bias
         self.n_heads = n_heads
         self.n_blocks = n_blocks
@@ -184,6 +243,12 @@ class SAINT(BaseTabularModelWithAttention):
         self.ff_dropout = ff_dropout
         self.ff_factor = ff_factor
         self.transformer_activation = transformer_activation
+        self.row_attn_chunk_size = row_attn_chunk_size
+        self.row_attn_eval_chunk_size = (
+            row_attn_eval_chunk_size
+            if row_attn_eval_chunk_size is not None
+            else row_attn_chunk_size
+        )
 
         self.mlp_hidden_dims = mlp_hidden_dims
         self.mlp_activation = mlp_activation
@@ -212,6 +277,8 @@ class SAINT(BaseTabularModelWithAttention):
                     ff_factor,
                     transformer_activation,
                     self.n_feats,
+                    self.row_attn_chunk_size,
+                    self.row_attn_eval_chunk_size,
                 ),
             )
 
@@ -233,7 +300,7 @@ class SAINT(BaseTabularModelWithAttention):
 
     def forward(self, X: Tensor) -> Tensor:
         x = self._get_embeddings(X)
-        x = self.encoder(x)
+        x = self._forward_blocks(list(self.encoder), x)
         if self.with_cls_token:
             x = x[:, 0, :]
         else:
@@ -266,7 +333,13 @@ class SAINT(BaseTabularModelWithAttention):
         - row attention: $(1, H, N, N)$
 
         where $N$ is the batch size, $H$ is the number of heads and $F$ is the
-        number of features/columns in the dataset
+        number of features/columns in the dataset. If the row attention is
+        computed in chunks, the row attention weights between rows in
+        different chunks are zero
+
+        :information_source: **NOTE**: the attention weights are only kept
+        for the forward passes run within
+        `pytorch_widedeep.models.capture_attention`
         """
         attention_weights = []
         for blk in self.encoder:
@@ -1,8 +1,10 @@
+from functools import partial
+
 import torch
 import einops
 from torch import nn
 
-from pytorch_widedeep.wdtypes import Dict, List, Tuple, Tensor, Optional
+from pytorch_widedeep.wdtypes import Any, Dict, List, Tuple, Tensor, Optional
 from pytorch_widedeep.models.tabular.mlp._layers import MLP
 from pytorch_widedeep.models.tabular._base_tabular_model import (
     BaseTabularModelWithAttention,
@@ -132,6 +134,30 @@ class TabPerceiver(BaseTabularModelWithAttention):
         Boolean indicating whether the order of the operations in the dense
         layer. If `True: [LIN -> ACT -> BN -> DP]`. If `False: [BN -> DP ->
         LIN -> ACT]`
+    compositional_embed_input: Dict, Optional, default = None
+        Dictionary where the keys are the categorical columns that will be
+        represented by compositional embeddings (which use much smaller
+        tables than regular embeddings, see
+        `pytorch_widedeep.models.tabular.embeddings_layers.CompositionalEmbedding`)
+        and the values are either the method (_'qr_mult'_, _'qr_sum'_ or
+        _'hash'_) or a dictionary with the `CompositionalEmbedding` params,
+        e.g. _{'user_id': 'qr_mult', 'item_id': {'method': 'hash',
+        'n_buckets': 1000}}_. See the `compositional_embed_cols` parameter of
+        the `TabPreprocessor`
+    shared_vocab_cols: List, Optional, default = None
+        List of Lists with the names of the categorical columns that share a
+        vocabulary (e.g. _[['movie_id', 'prev_movie_1', 'prev_movie_2']]_)
+        and therefore share an embedding table. These columns must be encoded
+        with a common vocabulary, see the `shared_vocab_cols` parameter of
+        the `TabPreprocessor`
+    checkpoint_every_n_blocks: int, Optional, default = None
+        If not `None`, activation checkpointing is used during training: the
+        Perceiver blocks are run in groups of `checkpoint_every_n_blocks` blocks
+        and only the input to each group is kept in memory. The activations
+        within the group are recomputed during the backward pass (see
+        `torch.utils.checkpoint`), trading compute for memory. The results
+        are the same as without checkpointing, including the dropout masks
+        and the attention weights
 
     Attributes
     ----------
@@ -194,6 +220,9 @@ class TabPerceiver(BaseTabularModelWithAttention):
         mlp_batchnorm: bool = False,
         mlp_batchnorm_last: bool = False,
         mlp_linear_first: bool = True,
+        compositional_embed_input: Optional[Dict[str, Any]] = None,
+        shared_vocab_cols: Optional[List[List[str]]] = None,
+        checkpoint_every_n_blocks: Optional[int] = None,
     ):
         super(TabPerceiver, self).__init__(
             column_idx=column_idx,
@@ -212,6 +241,9 @@ class TabPerceiver(BaseTabularModelWithAttention):
             use_cont_bias=use_cont_bias,
             cont_embed_activation=cont_embed_activation,
             input_dim=input_dim,
+            compositional_embed_input=compositional_embed_input,
+            shared_vocab_cols=shared_vocab_cols,
+            checkpoint_every_n_blocks=checkpoint_every_n_blocks,
         )
 
         self.n_cross_attns = n_cross_attns
@@ -236,9 +268,8 @@ class TabPerceiver(BaseTabularModelWithAttention):
 
         # Embeddings are instantiated at the base model
         # Transformer blocks
-        self.latents = nn.init.trunc_normal_(
-            nn.Parameter(torch.empty(n_latents, latent_dim))
-        )
+        self.latents = nn.Parameter(torch.empty(n_latents, latent_dim))
+        self.reset_parameters()
 
         self.encoder = nn.ModuleDict()
         first_perceiver_block = self._build_perceiver_block()
@@ -266,19 +297,27 @@ class TabPerceiver(BaseTabularModelWithAttention):
         else:
             self.mlp = None
 
+    def reset_parameters(self) -> None:
+        # the embeddings and the perceiver blocks are initialised by their
+        # own modules
+        nn.init.trunc_normal_(self.latents)
+
     def forward(self, X: Tensor) -> Tensor:
         x_emb = self._get_embeddings(X)
 
         x = einops.repeat(self.latents, "n d -> b n d", b=X.shape[0])
 
-        for n in range(self.n_perceiver_blocks):
-            cross_attns = self.encoder["perceiver_block" + str(n)]["cross_attns"]
-            latent_transformer = self.encoder["perceiver_block" + str(n)][
-                "latent_transformer"
-            ]
-            for cross_attn in cross_attns:
-                x = cross_attn(x, x_emb)
-            x = latent_transformer(x)
+        x = self._forward_blocks(
+            [
+                partial(
+                    self._run_perceiver_block,
+                    self.encoder["perceiver_block" + str(n)],
+                    x_emb,
+                )
+                for n in range(self.n_perceiver_blocks)
+            ],
+            x,
+        )
 
         # average along the latent index axis
         x = x.mean(dim=1)
@@ -316,6 +355,10 @@ class TabPerceiver(BaseTabularModelWithAttention):
         heads, $L$ is the number of Latents, $F$ is the number of
         features/columns in the dataset and $T$ is the number of Latent
         Attention heads
+
+        :information_source: **NOTE**: the attention weights are only kept
+        for the forward passes run within
+        `pytorch_widedeep.models.capture_attention`
         """
         if self.share_weights:
             cross_attns = self.encoder["perceiver_block0"]["cross_attns"]
@@ -335,6 +378,14 @@ class TabPerceiver(BaseTabularModelWithAttention):
                 )
         return attention_weights
 
+    @staticmethod
+    def _run_perceiver_block(
+        perceiver_block: nn.ModuleDict, x_emb: Tensor, x: Tensor
+    ) -> Tensor:
+        for cross_attn in perceiver_block["cross_attns"]:
+            x = cross_attn(x, x_emb)
+        return perceiver_block["latent_transformer"](x)
+
     def _build_perceiver_block(self) -> nn.ModuleDict:
         perceiver_block = nn.ModuleDict()
 
@@ -414,10 +414,10 @@ class WideDeep(nn.Module):
         with_fds,
     ):
         if wide is not None:
-            assert wide.wide_linear.weight.size(1) == pred_dim, (
+            assert wide.pred_dim == pred_dim, (
                 "the 'pred_dim' of the wide component ({}) must be equal to the 'pred_dim' "
                 "of the deep component and the overall model itself ({})".format(
-                    wide.wide_linear.weight.size(1), pred_dim
+                    wide.pred_dim, pred_dim
                 )
             )
         if deeptabular is not None and not hasattr(deeptabular, "output_dim"):
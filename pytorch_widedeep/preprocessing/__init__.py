@@ -1,3 +1,7 @@
+from pytorch_widedeep.preprocessing.serialization import (
+    load_preprocessor,
+    save_preprocessor,
+)
 from pytorch_widedeep.preprocessing.tab_preprocessor import (
     TabPreprocessor,
     ChunkTabPreprocessor,
@@ -11,3 +15,7 @@ from pytorch_widedeep.preprocessing.wide_preprocessor import (
     ChunkWidePreprocessor,
 )
 from pytorch_widedeep.preprocessing.image_preprocessor import ImagePreprocessor
+from pytorch_widedeep.preprocessing.compiled_preprocessors import (
+    CompiledTabPreprocessor,
+    CompiledWidePreprocessor,
+)
@@ -1,8 +1,15 @@
-from typing import Any, List, Union
+import os
+import copy
+import pickle
+import hashlib
+from typing import Any, Dict, List, Tuple, Union, Optional
 
+import numpy as np
 import pandas as pd
 from sklearn.exceptions import NotFittedError
 
+from pytorch_widedeep.version import __version__
+
 
 # This class does not represent any sctructural advantage, but I keep it to
 # keep things tidy, as guidance for contribution and because is useful for the
@@ -10,9 +17,20 @@ from sklearn.exceptions import NotFittedError
 class BasePreprocessor:
     """Base Class of All Preprocessors."""
 
+    # default values of the attributes added to the preprocessors over time,
+    # so that preprocessors pickled before they existed can still be used
+    _attr_defaults: Dict[str, Any] = {}
+    # attributes that affect neither the fitted preprocessor nor its output
+    # (e.g. the number of cpus used). These are not part of the key of the
+    # cache entries and are kept when the preprocessor is loaded from one
+    _runtime_attrs: List[str] = []
+
     def __init__(self, *args):
         pass
 
+    def __setstate__(self, state: Dict[str, Any]):
+        self.__dict__.update({**copy.deepcopy(self._attr_defaults), **state})
+
     def fit(self, df: pd.DataFrame):
         raise NotImplementedError("Preprocessor must implement this method")
 
@@ -22,6 +40,26 @@ class BasePreprocessor:
     def fit_transform(self, df: pd.DataFrame):
         raise NotImplementedError("Preprocessor must implement this method")
 
+    def _cached_fit_transform(
+        self, df: pd.DataFrame, cache_dir: str, columns: List[str]
+    ) -> np.ndarray:
+        # Runs 'fit' and 'transform' unless an entry for the same input
+        # columns and preprocessor configuration is found in 'cache_dir'. In
+        # that case the fitted preprocessor is restored in place and the
+        # transformed array is memory-mapped from disk
+        cache = PreprocessorCache(cache_dir)
+        key = cache.key(self, df, columns)
+        cached = cache.load(key)
+        if cached is not None:
+            fitted_preprocessor, X = cached
+            runtime_attrs = {a: getattr(self, a) for a in self._runtime_attrs}
+            self.__dict__.update(fitted_preprocessor.__dict__)
+            self.__dict__.update(runtime_attrs)
+            return X
+        X = self.fit(df).transform(df)
+        cache.save(key, self, X)
+        return X
+
 
 def check_is_fitted(
     estimator: Union[BasePreprocessor, Any],
@@ -57,3 +95,87 @@ def check_is_fitted(
             raise NotFittedError(error_msg)
     elif not condition:
         raise NotFittedError(error_msg)
+
+
+def hash_dataframe(df: pd.DataFrame, columns: List[str]) -> str:
+    r"""Fast content hash of the columns of a dataframe. The hash depends on
+    the column names, dtypes and values, but not on the index
+
+    Parameters
+    ----------
+    df: pd.DataFrame
+        Input pandas dataframe
+    columns: List
+        List with the names of the columns to hash
+
+    Returns
+    -------
+    str
+        hexadecimal digest
+    """
+    h = hashlib.blake2b(digest_size=16)
+    for col in columns:
+        h.update(f"{col}:{df[col].dtype}".encode())
+        h.update(pd.util.hash_pandas_object(df[col], index=False).values.tobytes())
+    return h.hexdigest()
+
+
+class PreprocessorCache:
+    r"""On-disk cache of fitted preprocessors and their transformed output.
+
+    Each entry is a directory named after a key computed from the content
+    of the input columns and the preprocessor's configuration. The entry
+    contains the pickled fitted preprocessor and the transformed array
+    saved as a `.npy` file, which is memory-mapped when loaded.
+
+    Parameters
+    ----------
+    cache_dir: str
+        Path to the directory where the cache entries will be stored
+    """
+
+    def __init__(self, cache_dir: str):
+        self.cache_dir = cache_dir
+
+    def key(
+        self, preprocessor: BasePreprocessor, df: pd.DataFrame, columns: List[str]
+    ) -> str:
+        config = copy.copy(preprocessor)
+        for attr in preprocessor._runtime_attrs:
+            setattr(config, attr, preprocessor._attr_defaults.get(attr))
+        h = hashlib.blake2b(digest_size=16)
+        h.update(__version__.encode())
+        h.update(repr(config).encode())
+        h.update(hash_dataframe(df, columns).encode())
+        h.update(str(len(df)).encode())
+        return h.hexdigest()
+
+    def load(self, key: str) -> Optional[Tuple[BasePreprocessor, np.ndarray]]:
+        entry_dir = os.path.join(self.cache_dir, key)
+        if not os.path.isfile(os.path.join(entry_dir, "X.npy")):
+            return None
+        with open(os.path.join(entry_dir, "preprocessor.p"), "rb") as f:
+            preprocessor = pickle.load(f)
+        # copy-on-write memmap: pages are shared between processes reading
+        # the same entry and the array is still writable
+        X = np.load(os.path.join(entry_dir, "X.npy"), mmap_mode="c")
+        return preprocessor, X
+
+    def save(self, key: str, preprocessor: BasePreprocessor, X: np.ndarray):
+        if not isinstance(X, np.ndarray) or X.dtype == object:
+            # object arrays cannot be memory-mapped and multi-hot arrays
+            # would be stored padded
+            return
+        entry_dir = os.path.join(self.cache_dir, key)
+        os.makedirs(entry_dir, exist_ok=True)
+        # the array is written last (and atomically) since its presence is
+        # what marks the entry as complete
+        tmp_preprocessor_path = os.path.join(
+            entry_dir, f"preprocessor.{os.getpid()}.tmp"
+        )
+        with open(tmp_preprocessor_path, "wb") as f:
+            pickle.dump(preprocessor, f)
+        os.replace(tmp_preprocessor_path, os.path.join(entry_dir, "preprocessor.p"))
+        tmp_X_path = os.path.join(entry_dir, f"X.{os.getpid()}.tmp.npy")
+        np.save(tmp_X_path, X)
+        os.replace(tmp_X_path, os.path.join(entry_dir, "X.npy"))
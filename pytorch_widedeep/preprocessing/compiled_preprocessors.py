@@ -0,0 +1,210 @@
+"""
+Lightweight, pandas-free versions of the fitted tabular and wide
+preprocessors, meant to be used at serving time, where the inputs are
+individual records (e.g. parsed JSON) rather than dataframes.
+"""
+
+from bisect import bisect_left, bisect_right
+from typing import Any, Dict, List, Tuple, Union, Optional
+
+import numpy as np
+
+Record = Dict[str, Any]
+Records = Union[Record, List[Record]]
+
+
+class CompiledTabPreprocessor:
+    r"""Flat, array/dict based version of a fitted `TabPreprocessor`.
+
+    It holds one lookup table per categorical column, the means and scales
+    of the `StandardScaler` and the bin edges of the `Quantizer`, and
+    transforms records (dictionaries) without building dataframes. The
+    output is identical to that of the `transform` method of the
+    `TabPreprocessor` it was compiled from.
+
+    This class is not meant to be instantiated directly, but via the
+    `compile` method of a fitted `TabPreprocessor`.
+
+    Parameters
+    ----------
+    columns: List
+        List of Tuples with the column name, the column type (one of
+        _'cls_token'_, _'categorical'_ or _'continuous'_) and the column's
+        transformation parameters, in the order of the output columns
+    quant_args: Dict
+        `pd.cut` related args used by the quantizer
+
+    Examples
+    --------
+    >>> import pandas as pd
+    >>> from pytorch_widedeep.preprocessing import TabPreprocessor
+    >>> df = pd.DataFrame({'color': ['r', 'b', 'g'], 'size': ['s', 'n', 'l'], 'age': [25, 40, 55]})
+    >>> tab_preprocessor = TabPreprocessor(cat_embed_cols=['color', 'size'], continuous_cols=['age'])
+    >>> X_tab = tab_preprocessor.fit_transform(df)
+    >>> compiled_preprocessor = tab_preprocessor.compile()
+    >>> compiled_preprocessor.transform({'color': 'b', 'size': 's', 'age': 30})
+    array([[ 2,  1, 30]])
+    """
+
+    def __init__(
+        self,
+        columns: List[Tuple[str, str, Dict[str, Any]]],
+        quant_args: Optional[Dict[str, Any]] = None,
+    ):
+        self.columns = columns
+        self.quant_args = quant_args if quant_args is not None else {}
+
+        self.right = self.quant_args.get("right", True)
+        self.include_lowest = self.quant_args.get("include_lowest", False)
+
+        self.column_idx = {col: i for i, (col, _, _) in enumerate(columns)}
+
+    def transform(self, records: Records) -> np.ndarray:
+        r"""Transforms one record or a list of records
+
+        Parameters
+        ----------
+        records: Dict or List
+            a record (i.e. a dictionary where the keys are the column names)
+            or a list of records
+
+        Returns
+        -------
+        np.ndarray
+            transformed records. Note that, as with the `TabPreprocessor`,
+            the output is always a 2 dimensional array
+        """
+        if isinstance(records, dict):
+            records = [records]
+        return np.array([self._transform_record(r) for r in records])
+
+    def transform_sample(self, record: Record) -> np.ndarray:
+        return self.transform(record).astype("float")[0]
+
+    def _transform_record(self, record: Record) -> List[Union[int, float]]:
+        row: List[Union[int, float]] = []
+        for col, col_type, params in self.columns:
+            if col_type == "cls_token":
+                row.append(params["code"])
+            elif col_type == "categorical":
+                row.append(params["encoding"].get(record[col], params["default"]))
+            else:
+                row.append(self._transform_continuous(record[col], params))
+        return row
+
+    def _transform_continuous(
+        self, value: Any, params: Dict[str, Any]
+    ) -> Union[int, float]:
+        if value is None:
+            value = np.nan
+        if "mean" in params:
+            value = float(value)
+            if params["mean"] is not None:
+                value -= params["mean"]
+            if params["scale"] is not None:
+                value /= params["scale"]
+        if "bins" in params:
+            value = self._quantize(value, params["bins"])
+        return value
+
+    def _quantize(self, value: float, bins: List[float]) -> Union[int, float]:
+        # replicates 'pd.cut(..., labels=False)' for a single value
+        if value != value:
+            return np.nan
+        if self.right:
+            idx = bisect_left(bins, value)
+        else:
+            idx = bisect_right(bins, value)
+        if self.include_lowest and value == bins[0]:
+            idx = 1
+        if idx == 0 or idx == len(bins):
+            return np.nan
+        return idx - 1
+
+    def __repr__(self) -> str:
+        return f"CompiledTabPreprocessor(columns={list(self.column_idx.keys())})"
+
+
+class CompiledWidePreprocessor:
+    r"""Flat, dict based version of a fitted `WidePreprocessor`.
+
+    It transforms records (dictionaries) without building dataframes. The
+    output is identical to that of the `transform` method of the
+    `WidePreprocessor` it was compiled from.
+
+    This class is not meant to be instantiated directly, but via the
+    `compile` method of a fitted `WidePreprocessor`.
+
+    Parameters
+    ----------
+    wide_cols: List
+        List of strings with the name of the wide columns
+    crossed_cols: List
+        List of Tuples with the name of the crossed columns
+    encoding_dict: Dict
+        the `encoding_dict` of the fitted `WidePreprocessor`
+
+    Examples
+    --------
+    >>> import pandas as pd
+    >>> from pytorch_widedeep.preprocessing import WidePreprocessor
+    >>> df = pd.DataFrame({'color': ['r', 'b', 'g'], 'size': ['s', 'n', 'l']})
+    >>> wide_preprocessor = WidePreprocessor(wide_cols=['color'], crossed_cols=[('color', 'size')])
+    >>> X_wide = wide_preprocessor.fit_transform(df)
+    >>> compiled_preprocessor = wide_preprocessor.compile()
+    >>> compiled_preprocessor.transform([{'color': 'b', 'size': 'n'}, {'color': 'b', 'size': 's'}])
+    array([[2, 5],
+           [2, 0]])
+    """
+
+    def __init__(
+        self,
+        wide_cols: List[str],
+        crossed_cols: Optional[List[Tuple[str, ...]]],
+        encoding_dict: Dict[str, int],
+    ):
+        self.wide_cols = wide_cols
+        self.crossed_cols = crossed_cols if crossed_cols is not None else []
+        self.encoding_dict = encoding_dict
+
+        self.crossed_colnames = ["_".join(cols) for cols in self.crossed_cols]
+
+    def transform(self, records: Records) -> np.ndarray:
+        r"""Transforms one record or a list of records
+
+        Parameters
+        ----------
+        records: Dict or List
+            a record (i.e. a dictionary where the keys are the column names)
+            or a list of records
+
+        Returns
+        -------
+        np.ndarray
+            transformed records. Note that, as with the `WidePreprocessor`,
+            the output is always a 2 dimensional array
+        """
+        if isinstance(records, dict):
+            records = [records]
+        return np.array(
+            [self._transform_record(r) for r in records], dtype="int64"
+        ).reshape(len(records), len(self.wide_cols) + len(self.crossed_cols))
+
+    def transform_sample(self, record: Record) -> np.ndarray:
+        return self.transform(record)[0]
+
+    def _transform_record(self, record: Record) -> List[int]:
+        row = [
+            self.encoding_dict.get(col + "_" + str(record[col]), 0)
+            for col in self.wide_cols
+        ]
+        for colname, cols in zip(self.crossed_colnames, self.crossed_cols):
+            crossed_value = "-".join([str(record[c]) for c in cols])
+            row.append(self.encoding_dict.get(colname + "_" + crossed_value, 0))
+        return row
+
+    def __repr__(self) -> str:
+        return (
+            f"CompiledWidePreprocessor(wide_cols={self.wide_cols}, "
+            f"crossed_cols={self.crossed_cols})"
+        )
@@ -0,0 +1,186 @@
+"""
+Compact, columnar, on-disk format for fitted preprocessors.
+
+Pickling a fitted preprocessor with large vocabularies is slow, both to
+write and (more importantly) to load, since every category is a separate
+Python object and every encoding dictionary has to be rebuilt. Here the
+encodings are instead stored as numpy arrays (categories, codes and the
+indices that sort the categories) that are memory-mapped when loaded, and
+only a small "skeleton" of the preprocessor (its configuration, the scaler
+and quantizer parameters, etc.) is pickled.
+
+A saved preprocessor is a directory with the following content:
+
+- `preprocessor.p`: the pickled skeleton and the list of stored encodings
+  (with the codes of the `None` and `NaN` categories, if any)
+- `encoding_<i>.categories.npy`, `encoding_<i>.codes.npy` and
+  `encoding_<i>.sorter.npy`: the arrays of each encoding
+"""
+
+import os
+import copy
+import pickle
+from typing import Any, Dict, List, Optional
+from collections.abc import Mapping
+
+import numpy as np
+
+from pytorch_widedeep.version import __version__
+from pytorch_widedeep.utils.deeptabular_utils import ArrayEncoding
+from pytorch_widedeep.preprocessing.base_preprocessor import (
+    BasePreprocessor,
+    check_is_fitted,
+)
+
+ARRAY_NAMES = ["categories", "codes", "sorter"]
+
+
+def save_preprocessor(preprocessor: BasePreprocessor, path: str):
+    r"""Saves a fitted preprocessor in a compact, columnar format that can be
+    loaded (and memory-mapped) with `load_preprocessor`.
+
+    The encodings of the categorical columns of a `TabPreprocessor` and the
+    `encoding_dict` of a `WidePreprocessor` are stored as arrays, as long as
+    their categories are all strings or all numbers (plus, potentially,
+    `None` and `NaN`). Any other encoding, and the rest of the attributes
+    of the preprocessor, are pickled as usual. Attributes that can be
+    recomputed, such as the inverse encoding dictionaries, are not saved.
+    The vocabulary of the columns that share one (see the
+    `shared_vocab_cols` parameter of the `TabPreprocessor`) is stored once.
+
+    :information_source: **NOTE**: the `category_counts` of a
+    `LabelEncoder` fitted with `min_freq` or `max_categories` are not saved,
+    so a loaded `ChunkTabPreprocessor` cannot be further fitted.
+
+    Parameters
+    ----------
+    preprocessor: BasePreprocessor
+        fitted preprocessor
+    path: str
+        path to the directory where the preprocessor will be saved
+    """
+    check_is_fitted(preprocessor, condition=getattr(preprocessor, "is_fitted", True))
+
+    os.makedirs(path, exist_ok=True)
+
+    skeleton = copy.copy(preprocessor)
+    encodings: List[Dict[str, Any]] = []
+
+    label_encoder = getattr(preprocessor, "label_encoder", None)
+    if label_encoder is not None and hasattr(label_encoder, "encoding_dict"):
+        skeleton.label_encoder = copy.copy(label_encoder)
+        skeleton.label_encoder.__dict__.pop("inverse_encoding_dict", None)
+        skeleton.label_encoder.__dict__.pop("category_counts", None)
+        skeleton.label_encoder.encoding_dict = {}
+        # columns that share a vocabulary share the mapping, which is saved
+        # only once
+        saved: Dict[int, Optional[Dict[str, Any]]] = {}
+        for col, mapping in label_encoder.encoding_dict.items():
+            if id(mapping) in saved:
+                encoding = copy.copy(saved[id(mapping)])
+            else:
+                encoding = _save_encoding(mapping, path, f"encoding_{len(saved)}")
+                saved[id(mapping)] = encoding
+            if encoding is not None:
+                encoding["column"] = col
+                encodings.append(encoding)
+                # placeholder, to preserve the order of the columns
+                mapping = None
+            skeleton.label_encoder.encoding_dict[col] = mapping
+
+    if isinstance(getattr(preprocessor, "encoding_dict", None), Mapping):
+        skeleton.__dict__.pop("inverse_encoding_dict", None)
+        skeleton.__dict__.pop("glob_feature_set", None)
+        encoding = _save_encoding(
+            preprocessor.encoding_dict, path, f"encoding_{len(encodings)}"
+        )
+        if encoding is not None:
+            encoding["column"] = None
+            encodings.append(encoding)
+            skeleton.encoding_dict = None
+
+    with open(os.path.join(path, "preprocessor.p"), "wb") as f:
+        pickle.dump(
+            {
+                "version": __version__,
+                "preprocessor": skeleton,
+                "encodings": encodings,
+            },
+            f,
+        )
+
+
+def load_preprocessor(path: str, mmap_mode: Optional[str] = "r") -> Any:
+    r"""Loads a preprocessor saved with `save_preprocessor`.
+
+    The encodings stored as arrays are loaded as `ArrayEncoding` objects,
+    which behave as the original (read-only) dictionaries. When memory-mapped,
+    loading is almost instantaneous regardless of the number of categories
+    and the pages of the arrays are shared between all the processes that
+    load the same preprocessor (e.g. the workers of a serving application).
+
+    Parameters
+    ----------
+    path: str
+        path to the directory where the preprocessor was saved
+    mmap_mode: str, Optional, default = "r"
+        `mmap_mode` passed to `np.load`. If `None` the arrays are read into
+        memory
+
+    Returns
+    -------
+    BasePreprocessor
+        the fitted preprocessor
+    """
+    with open(os.path.join(path, "preprocessor.p"), "rb") as f:
+        state = pickle.load(f)
+
+    preprocessor = state["preprocessor"]
+    array_encodings: Dict[str, ArrayEncoding] = {}
+    for encoding in state["encodings"]:
+        if encoding["name"] in array_encodings:
+            # a vocabulary shared by several columns
+            preprocessor.label_encoder.encoding_dict[
+                encoding["column"]
+            ] = array_encodings[encoding["name"]]
+            continue
+        arrays = {
+            array_name: np.load(
+                os.path.join(path, f"{encoding['name']}.{array_name}.npy"),
+                mmap_mode=mmap_mode,
+            )
+            for array_name in ARRAY_NAMES
+        }
+        array_encoding = ArrayEncoding(
+            **arrays, nan_code=encoding["nan_code"], none_code=encoding["none_code"]
+        )
+        array_encodings[encoding["name"]] = array_encoding
+        if encoding["column"] is None:
+            preprocessor.encoding_dict = array_encoding
+        else:
+            preprocessor.label_encoder.encoding_dict[
+                encoding["column"]
+            ] = array_encoding
+
+    return preprocessor
+
+
+def _save_encoding(mapping: Mapping, path: str, name: str) -> Optional[Dict[str, Any]]:
+    # returns None if the mapping cannot be stored as arrays
+    array_encoding = (
+        mapping
+        if isinstance(mapping, ArrayEncoding)
+        else ArrayEncoding.from_dict(mapping)
+    )
+    if array_encoding is None:
+        return None
+    for array_name in ARRAY_NAMES:
+        np.save(
+            os.path.join(path, f"{name}.{array_name}.npy"),
+            np.asarray(getattr(array_encoding, array_name)),
+        )
+    return {
+        "name": name,
+        "nan_code": array_encoding.nan_code,
+        "none_code": array_encoding.none_code,
+    }
@@ -1,10 +1,12 @@
 import warnings
+from concurrent.futures import ThreadPoolExecutor
 
 import numpy as np
 import pandas as pd
 from sklearn.preprocessing import StandardScaler
 
 from pytorch_widedeep.wdtypes import (
+    Any,
     Dict,
     List,
     Tuple,
@@ -13,11 +15,18 @@ from pytorch_widedeep.wdtypes import (
     Optional,
 )
 from pytorch_widedeep.utils.general_utils import Alias
-from pytorch_widedeep.utils.deeptabular_utils import LabelEncoder
+from pytorch_widedeep.utils.deeptabular_utils import (
+    LabelEncoder,
+    MultiHotArray,
+    flatten_multi_hot,
+)
 from pytorch_widedeep.preprocessing.base_preprocessor import (
     BasePreprocessor,
     check_is_fitted,
 )
+from pytorch_widedeep.preprocessing.compiled_preprocessors import (
+    CompiledTabPreprocessor,
+)
 
 
 def embed_sz_rule(
@@ -186,6 +195,71 @@ class TabPreprocessor(BasePreprocessor):
         columns'_. In other words, the idea is to let the model learn which
         column is embedded at the time. See: `pytorch_widedeep.models.transformers._layers.SharedEmbeddings`.
     verbose: int, default = 1
+    min_freq: int or Dict, Optional, default = None
+        Minimum frequency for a category to be represented by its own
+        embedding. Rare categories are mapped to a shared `'[OTHER]'`
+        category, reducing the size of the embedding tables. If an `int`, it
+        applies to all categorical columns. Alternatively, a dictionary where
+        the keys are column names and the values the minimum frequency for
+        that column. See `pytorch_widedeep.utils.deeptabular_utils.LabelEncoder`
+    max_categories: int or Dict, Optional, default = None
+        Maximum number of categories per column that will be represented by
+        their own embedding. Only the most frequent categories are kept and
+        the rest are mapped to the shared `'[OTHER]'` category. If an `int`,
+        it applies to all categorical columns. Alternatively, a dictionary
+        where the keys are column names and the values the maximum number of
+        categories for that column
+    n_cpus: int, default = 1
+        Number of threads used by the `transform` method. If greater than 1,
+        the categorical and continuous columns are split in groups that are
+        processed in parallel, and each column is written directly into a
+        preallocated output array, without intermediate DataFrame copies.
+        This is designed for very wide dataframes. Note that the continuous
+        columns must be numpy-backed, otherwise the sequential `transform`
+        will be used.
+    cache_dir: str, Optional, default = None
+        If not `None`, `fit_transform` will cache the fitted preprocessor and
+        the transformed array in this directory. The cache entries are keyed
+        by a hash of the content of the input columns and the preprocessor's
+        configuration, so that subsequent calls to `fit_transform` with the
+        same data and configuration will load the fitted preprocessor and
+        memory-map the transformed array instead of recomputing them.
+        Note that the multi-hot columns (see below) are not cached.
+    multi_hot_cols: List, Optional, default = None
+        List containing the name of the multi-hot (i.e. list-valued, variable
+        length) categorical columns, such as genres or tags, or a Tuple with
+        the name and the embedding dimension. Each row of these columns is a
+        list of categories that will be embedded and pooled (averaged) via
+        an `nn.EmbeddingBag`. If not `None`, the output of the `transform`
+        method is a `MultiHotArray`, where the multi-hot columns are stored as
+        encoded values and offsets (see
+        `pytorch_widedeep.utils.deeptabular_utils.MultiHotArray`). Multi-hot
+        columns are not supported with attention-based models.
+    multi_hot_max_len: int or Dict, Optional, default = None
+        Maximum number of values per row of the multi-hot columns. Rows with
+        more values are truncated when the rows of the `MultiHotArray` are
+        retrieved. If an `int`, it applies to all multi-hot columns.
+        Alternatively, a dictionary where the keys are column names and the
+        values the maximum number of values for that column. If `None` (or
+        for the columns not in the dictionary), the maximum number of values
+        per row observed during `fit` is used.
+    compositional_embed_cols: Dict, Optional, default = None
+        Dictionary where the keys are the (high-cardinality) categorical
+        columns that will be represented by compositional embeddings, which
+        combine rows of much smaller tables instead of using a full table
+        per column, and the values are either the method (_'qr_mult'_,
+        _'qr_sum'_ or _'hash'_) or a dictionary with the params of
+        `pytorch_widedeep.models.tabular.embeddings_layers.CompositionalEmbedding`,
+        e.g. _{'user_id': 'qr_mult', 'item_id': {'method': 'hash',
+        'n_buckets': 1000}}_. The encoding of these columns does not change.
+    shared_vocab_cols: List, Optional, default = None
+        List of Lists with the names of categorical columns drawn from the
+        same ID space, e.g. _[['movie_id', 'prev_movie_1', 'prev_movie_2']]_.
+        The columns in a group are encoded with a single vocabulary (see
+        `pytorch_widedeep.utils.deeptabular_utils.LabelEncoder`) and, when
+        passed to the tabular models via their `shared_vocab_cols`
+        parameter, share an embedding table. All the columns in a group
+        must have the same embedding dim.
 
     Other Parameters
     ----------------
@@ -214,6 +288,19 @@ class TabPreprocessor(BasePreprocessor):
         This is neccesary to slice tensors
     quantizer: Quantizer
         an instance of `Quantizer`
+    multi_hot_encoding_dict: Dict
+        Dictionary where the keys are the multi-hot columns and the values
+        the encoding of their categories. As with the `LabelEncoder`, 0 is
+        reserved for padding and unseen categories
+    multi_hot_embed_input: List
+        List of Tuples with the multi-hot column name, number of individual
+        values for that column, the corresponding embeddings dim and the
+        maximum number of values per row, e.g. _[('genres', 18, 8, 6), ...]_.
+        The multi-hot columns are placed after the rest of the columns and
+        their `column_idx` is the index where their (padded) values start
+    compositional_embed_input: Dict
+        Dictionary with the compositional embeddings setup, to be passed to
+        the tabular models (see `compositional_embed_cols`)
 
     Examples
     --------
@@ -239,6 +326,18 @@ class TabPreprocessor(BasePreprocessor):
     >>> ft_cont_df2 = tab_preprocessor2.fit_transform(cont_df)
     """
 
+    _attr_defaults: Dict[str, Any] = {
+        "n_cpus": 1,
+        "cache_dir": None,
+        "min_freq": None,
+        "max_categories": None,
+        "multi_hot_cols": None,
+        "multi_hot_max_len": None,
+        "compositional_embed_cols": None,
+        "shared_vocab_cols": None,
+    }
+    _runtime_attrs: List[str] = ["n_cpus", "cache_dir"]
+
     @Alias("with_attention", "for_transformer")
     @Alias("cat_embed_cols", "embed_cols")
     @Alias("scale", "scale_cont_cols")
@@ -261,6 +360,14 @@ class TabPreprocessor(BasePreprocessor):
         *,
         scale: bool = False,
         already_standard: List[str] = None,
+        min_freq: Optional[Union[int, Dict[str, int]]] = None,
+        max_categories: Optional[Union[int, Dict[str, int]]] = None,
+        n_cpus: int = 1,
+        cache_dir: Optional[str] = None,
+        multi_hot_cols: Optional[Union[List[str], List[Tuple[str, int]]]] = None,
+        multi_hot_max_len: Optional[Union[int, Dict[str, int]]] = None,
+        compositional_embed_cols: Optional[Dict[str, Union[str, Dict]]] = None,
+        shared_vocab_cols: Optional[List[List[str]]] = None,
         **kwargs,
     ):
         super(TabPreprocessor, self).__init__()
@@ -277,6 +384,14 @@ class TabPreprocessor(BasePreprocessor):
         self.with_cls_token = with_cls_token
         self.shared_embed = shared_embed
         self.verbose = verbose
+        self.min_freq = min_freq
+        self.max_categories = max_categories
+        self.n_cpus = n_cpus
+        self.cache_dir = cache_dir
+        self.multi_hot_cols = multi_hot_cols
+        self.multi_hot_max_len = multi_hot_max_len
+        self.compositional_embed_cols = compositional_embed_cols
+        self.shared_vocab_cols = shared_vocab_cols
 
         self.quant_args = {
             k: v for k, v in kwargs.items() if k in pd.cut.__code__.co_varnames
@@ -321,8 +436,33 @@ class TabPreprocessor(BasePreprocessor):
                 columns_to_encode=df_emb.columns.tolist(),
                 shared_embed=self.shared_embed,
                 with_attention=self.with_attention,
+                min_freq=self.min_freq,
+                max_categories=self.max_categories,
+                shared_vocab_cols=self.shared_vocab_cols,
             )
             self.label_encoder.fit(df_emb)
+            if (
+                not self.with_attention
+                and self.auto_embed_dim
+                and not isinstance(self.cat_embed_cols[0], tuple)
+            ):
+                # if rare categories are bucketed or columns share a
+                # vocabulary, the embedding dims are based on the number of
+                # categories of the resulting encoding
+                shared_vocab_cols = [
+                    c
+                    for cols in (
+                        self.shared_vocab_cols
+                        if self.shared_vocab_cols is not None
+                        else []
+                    )
+                    for c in cols
+                ]
+                for col in list(self.label_encoder.other_idx) + shared_vocab_cols:
+                    self.embed_dim[col] = embed_sz_rule(
+                        len(self.label_encoder.encoding_dict[col]),
+                        self.embedding_rule,
+                    )
             self.cat_embed_input: List = []
             for k, v in self.label_encoder.encoding_dict.items():
                 if self.with_attention:
@@ -332,6 +472,9 @@ class TabPreprocessor(BasePreprocessor):
 
             self.column_idx.update({k: v for v, k in enumerate(df_emb.columns)})
 
+            if self.compositional_embed_cols is not None:
+                self.compositional_embed_input = dict(self.compositional_embed_cols)
+
         if self.continuous_cols is not None:
             df_cont = self._prepare_continuous(df_adj)
 
@@ -352,11 +495,14 @@ class TabPreprocessor(BasePreprocessor):
                 # columns, the Quantizer will run on the scaled data
                 self.quantizer = Quantizer(self.cols_and_bins, **self.quant_args)
 
+        if self.multi_hot_cols is not None:
+            self._fit_multi_hot(df)
+
         self.is_fitted = True
 
         return self
 
-    def transform(self, df: pd.DataFrame) -> np.ndarray:  # noqa: C901
+    def transform(self, df: pd.DataFrame) -> np.ndarray:
         """Returns the processed `dataframe` as a np.ndarray
 
         Parameters
@@ -367,10 +513,22 @@ class TabPreprocessor(BasePreprocessor):
         Returns
         -------
         np.ndarray
-            transformed input dataframe
+            transformed input dataframe. If `multi_hot_cols` is not `None`,
+            a `MultiHotArray`
         """
         check_is_fitted(self, condition=self.is_fitted)
 
+        if self.n_cpus > 1 and self._is_numpy_backed(df):
+            X = self._transform_parallel(df)
+        else:
+            X = self._transform_sequential(df)
+
+        if self.multi_hot_cols is not None:
+            return self._transform_multi_hot(df, X)
+
+        return X
+
+    def _transform_sequential(self, df: pd.DataFrame) -> np.ndarray:  # noqa: C901
         df_adj = self._insert_cls_token(df) if self.with_cls_token else df.copy()
 
         if self.cat_embed_cols is not None:
@@ -395,17 +553,132 @@ class TabPreprocessor(BasePreprocessor):
             try:
                 df_deep = df_emb.copy()
             except NameError:
-                df_deep = df_cont.copy()
+                try:
+                    df_deep = df_cont.copy()
+                except NameError:
+                    # only multi-hot columns
+                    return np.empty((len(df), 0), dtype="int64")
 
         # TO DO: remove this assertion before merge
         _column_idx = {k: v for v, k in enumerate(df_deep.columns)}
-        assert _column_idx == self.column_idx
+        assert _column_idx == dict(list(self.column_idx.items())[: len(_column_idx)])
 
         return df_deep.values
 
+    def _fit_multi_hot(self, df: pd.DataFrame):
+        self.multi_hot_encoding_dict: Dict[str, Dict] = {}
+        self.multi_hot_embed_input: List[Tuple[str, int, int, int]] = []
+        start = len(self.column_idx)
+        for c in self.multi_hot_cols:
+            col, embed_dim = c if isinstance(c, tuple) else (c, None)
+            flat, offsets = flatten_multi_hot(df[col])
+            self.multi_hot_encoding_dict[col] = {
+                v: i + 1 for i, v in enumerate(pd.unique(pd.Series(flat, dtype=object)))
+            }
+            n_cat = len(self.multi_hot_encoding_dict[col])
+            if embed_dim is None:
+                embed_dim = (
+                    embed_sz_rule(n_cat, self.embedding_rule)
+                    if self.auto_embed_dim
+                    else self.default_embed_dim
+                )
+            if isinstance(self.multi_hot_max_len, int):
+                max_len = self.multi_hot_max_len
+            elif (
+                isinstance(self.multi_hot_max_len, dict)
+                and col in self.multi_hot_max_len
+            ):
+                max_len = self.multi_hot_max_len[col]
+            else:
+                max_len = max(int(np.diff(offsets).max(initial=0)), 1)
+            self.multi_hot_embed_input.append((col, n_cat, embed_dim, max_len))
+            # the (padded) values of the multi-hot columns are placed after
+            # the rest of the columns
+            self.column_idx[col] = start
+            start += max_len
+
+    def _transform_multi_hot(self, df: pd.DataFrame, X: np.ndarray) -> MultiHotArray:
+        values: List[np.ndarray] = []
+        offsets: List[np.ndarray] = []
+        for col, _, _, _ in self.multi_hot_embed_input:
+            flat, offs = flatten_multi_hot(df[col])
+            encoding = self.multi_hot_encoding_dict[col]
+            values.append(
+                np.fromiter((encoding.get(v, 0) for v in flat), "int64", len(flat))
+            )
+            offsets.append(offs)
+        return MultiHotArray(
+            X, values, offsets, [e[3] for e in self.multi_hot_embed_input]
+        )
+
     def transform_sample(self, df: pd.DataFrame) -> pd.DataFrame:
         return self.transform(df).astype("float")[0]
 
+    def compile(self) -> CompiledTabPreprocessor:
+        r"""Compiles the fitted preprocessor into a `CompiledTabPreprocessor`:
+        a flat, pandas-free transformer that holds the lookup tables of the
+        categorical columns, the scaler means and scales and the quantizer
+        bin edges. It is designed to transform individual records (i.e.
+        dictionaries) at serving time, with an output identical to that of
+        the `transform` method.
+
+        Returns
+        -------
+        CompiledTabPreprocessor
+            compiled version of this preprocessor
+        """
+        check_is_fitted(self, condition=self.is_fitted)
+
+        if self.multi_hot_cols is not None:
+            raise ValueError("Preprocessors with multi-hot columns cannot be compiled")
+
+        scaling_params: Dict[str, Dict[str, Optional[float]]] = {}
+        if self.continuous_cols is not None and self.standardize_cols:
+            for i, c in enumerate(self.standardize_cols):
+                scaling_params[c] = {
+                    "mean": float(self.scaler.mean_[i])
+                    if self.scaler.with_mean
+                    else None,
+                    "scale": float(self.scaler.scale_[i])
+                    if self.scaler.with_std
+                    else None,
+                }
+
+        quant_args: Dict = {}
+        bins: Dict[str, List[float]] = {}
+        if self.continuous_cols is not None and self.cols_and_bins is not None:
+            if not self.quantizer.is_fitted:
+                raise ValueError(
+                    "The quantizer is fitted the first time 'transform' runs. Please, "
+                    "run 'fit_transform' or 'transform' before compiling the preprocessor"
+                )
+            quant_args = self.quantizer.quant_args
+            bins = {c: [float(e) for e in b] for c, b in self.quantizer.bins.items()}
+
+        columns: List[Tuple[str, str, Dict]] = []
+        for col in self.column_idx:
+            if col == "cls_token":
+                code = self.label_encoder.encoding_dict[col]["[CLS]"]
+                columns.append((col, "cls_token", {"code": code}))
+            elif (
+                self.cat_embed_cols is not None
+                and col in self.label_encoder.encoding_dict
+            ):
+                encoding = dict(self.label_encoder.encoding_dict[col])
+                default = self.label_encoder.other_idx.get(col, 0)
+                columns.append(
+                    (col, "categorical", {"encoding": encoding, "default": default})
+                )
+            else:
+                params: Dict = {}
+                if col in scaling_params:
+                    params.update(scaling_params[col])
+                if col in bins:
+                    params["bins"] = bins[col]
+                columns.append((col, "continuous", params))
+
+        return CompiledTabPreprocessor(columns, quant_args)
+
     def inverse_transform(self, encoded: np.ndarray) -> pd.DataFrame:  # noqa: C901
         r"""Takes as input the output from the `transform` method and it will
         return the original values.
@@ -418,9 +691,21 @@ class TabPreprocessor(BasePreprocessor):
         Returns
         -------
         pd.DataFrame
-            Pandas dataframe with the original values
+            Pandas dataframe with the original values. The multi-hot
+            columns, if any, are decoded as lists (without the padding and
+            unseen values)
         """
-        decoded = pd.DataFrame(encoded, columns=self.column_idx.keys())
+        if self.multi_hot_cols is not None:
+            encoded = np.asarray(encoded)
+            multi_hot_cols = [e[0] for e in self.multi_hot_embed_input]
+            decoded_multi_hot = self._inverse_transform_multi_hot(encoded)
+            encoded = encoded[:, : self.column_idx[multi_hot_cols[0]]]
+        columns = [
+            c
+            for c in self.column_idx.keys()
+            if self.multi_hot_cols is None or c not in multi_hot_cols
+        ]
+        decoded = pd.DataFrame(encoded, columns=columns)
         # embeddings back to original category
         if self.cat_embed_cols is not None:
             decoded = self.label_encoder.inverse_transform(decoded)
@@ -445,6 +730,23 @@ class TabPreprocessor(BasePreprocessor):
         if "cls_token" in decoded.columns:
             decoded.drop("cls_token", axis=1, inplace=True)
 
+        if self.multi_hot_cols is not None:
+            for col in multi_hot_cols:
+                decoded[col] = decoded_multi_hot[col]
+
+        return decoded
+
+    def _inverse_transform_multi_hot(self, encoded: np.ndarray) -> Dict[str, List]:
+        decoded: Dict[str, List] = {}
+        for col, _, _, max_len in self.multi_hot_embed_input:
+            inverse_encoding = {
+                v: k for k, v in self.multi_hot_encoding_dict[col].items()
+            }
+            start = self.column_idx[col]
+            decoded[col] = [
+                [inverse_encoding[v] for v in row if v != 0]
+                for row in encoded[:, start : start + max_len].astype("int64").tolist()
+            ]
         return decoded
 
     def fit_transform(self, df: pd.DataFrame) -> np.ndarray:
@@ -460,8 +762,145 @@ class TabPreprocessor(BasePreprocessor):
         np.ndarray
             transformed input dataframe
         """
+        if self.cache_dir is not None:
+            return self._cached_fit_transform(df, self.cache_dir, self._input_cols())
         return self.fit(df).transform(df)
 
+    def _input_cols(self) -> List[str]:
+        input_cols: List[str] = []
+        if self.cat_embed_cols is not None:
+            input_cols += [
+                c[0] if isinstance(c, tuple) else c
+                for c in self.cat_embed_cols
+                if c != "cls_token"
+            ]
+        if self.continuous_cols is not None:
+            input_cols += self.continuous_cols
+        return input_cols
+
+    def _is_numpy_backed(self, df: pd.DataFrame) -> bool:
+        if self.continuous_cols is None:
+            return True
+        return all(isinstance(df[c].dtype, np.dtype) for c in self.continuous_cols)
+
+    def _transform_parallel(self, df: pd.DataFrame) -> np.ndarray:  # noqa: C901
+        # Column-parallel version of 'transform'. The categorical and
+        # continuous columns are split in blocks that are processed by a pool
+        # of threads. Each block reads the numpy arrays underlying the input
+        # columns and writes its output directly into a preallocated array,
+        # so no intermediate DataFrames are created. The results are
+        # identical to those of the sequential 'transform'
+        cat_cols = (
+            list(self.label_encoder.encoding_dict.keys())
+            if self.cat_embed_cols is not None
+            else []
+        )
+        cont_cols = self.continuous_cols if self.continuous_cols is not None else []
+
+        scaling_params: Dict[str, Tuple[Optional[float], Optional[float]]] = {}
+        if self.continuous_cols is not None and self.standardize_cols:
+            block_dtype = np.result_type(*[df[c].dtype for c in self.standardize_cols])
+            # same casting rules as those in sklearn's 'StandardScaler'
+            scale_dtype = (
+                block_dtype
+                if block_dtype in (np.float16, np.float32, np.float64)
+                else np.dtype("float64")
+            )
+            for i, c in enumerate(self.standardize_cols):
+                scaling_params[c] = (
+                    self.scaler.mean_[i] if self.scaler.with_mean else None,
+                    self.scaler.scale_[i] if self.scaler.with_std else None,
+                )
+
+        def _scale(col: str) -> np.ndarray:
+            values = df[col].to_numpy()
+            if col not in scaling_params:
+                return values
+            mean, scale = scaling_params[col]
+            scaled = values.astype(scale_dtype, copy=True)
+            if mean is not None:
+                scaled -= mean
+            if scale is not None:
+                scaled /= scale
+            return scaled
+
+        quant_cols: List[str] = []
+        if self.continuous_cols is not None and self.cols_and_bins is not None:
+            quant_cols = list(self.cols_and_bins.keys())
+            if not self.quantizer.is_fitted:
+                # the quantizer is fitted on the scaled data, as in 'transform'
+                self.quantizer.fit(pd.DataFrame({c: _scale(c) for c in quant_cols}))
+
+        def _quantize(cols: List[str]) -> List[np.ndarray]:
+            return [
+                pd.cut(
+                    _scale(c),
+                    self.quantizer.bins[c],
+                    labels=False,
+                    **self.quantizer.quant_args,
+                )
+                for c in cols
+            ]
+
+        n_threads = max(min(self.n_cpus, len(cat_cols) + len(cont_cols)), 1)
+        with ThreadPoolExecutor(max_workers=n_threads) as executor:
+            # the output dtype of the quantized columns depends on the data
+            # (i.e. NaNs for values outside the bins), so these are computed
+            # before the output array is allocated
+            quantized: Dict[str, np.ndarray] = {}
+            quant_blocks = self._split_in_blocks(quant_cols, n_threads)
+            for block, res in zip(quant_blocks, executor.map(_quantize, quant_blocks)):
+                quantized.update(dict(zip(block, res)))
+
+            col_dtypes = [np.dtype("int64")] * len(cat_cols)
+            for c in cont_cols:
+                if c in quantized:
+                    col_dtypes.append(quantized[c].dtype)
+                elif c in scaling_params:
+                    col_dtypes.append(scale_dtype)
+                else:
+                    col_dtypes.append(df[c].dtype)
+            out = np.empty(
+                (len(df), len(cat_cols) + len(cont_cols)),
+                dtype=np.result_type(*col_dtypes) if col_dtypes else "int64",
+            )
+
+            def _encode_block(cols: List[str]):
+                for c in cols:
+                    if c == "cls_token":
+                        out[:, self.column_idx[c]] = self.label_encoder.encoding_dict[
+                            c
+                        ]["[CLS]"]
+                    else:
+                        out[:, self.column_idx[c]] = self.label_encoder.encode_column(
+                            c, df[c].to_numpy()
+                        )
+
+            def _continuous_block(cols: List[str]):
+                for c in cols:
+                    out[:, self.column_idx[c]] = (
+                        quantized[c] if c in quantized else _scale(c)
+                    )
+
+            futures = [
+                executor.submit(_encode_block, block)
+                for block in self._split_in_blocks(cat_cols, n_threads)
+            ] + [
+                executor.submit(_continuous_block, block)
+                for block in self._split_in_blocks(cont_cols, n_threads)
+            ]
+            for future in futures:
+                future.result()
+
+        return out
+
+    @staticmethod
+    def _split_in_blocks(cols: List[str], n_blocks: int) -> List[List[str]]:
+        if len(cols) == 0:
+            return []
+        block_size = -(-len(cols) // n_blocks)
+        return [cols[i : i + block_size] for i in range(0, len(cols), block_size)]
+
     def _insert_cls_token(self, df: pd.DataFrame) -> pd.DataFrame:
         df_cls = df.copy()
         df_cls.insert(loc=0, column="cls_token", value="[CLS]")
@@ -568,11 +1007,37 @@ class TabPreprocessor(BasePreprocessor):
             )
             self.with_attention = True
 
-        if (cat_embed_cols is None) and (self.continuous_cols is None):
+        if (
+            (cat_embed_cols is None)
+            and (self.continuous_cols is None)
+            and (self.multi_hot_cols is None)
+        ):
             raise ValueError(
                 "'cat_embed_cols' and 'continuous_cols' are 'None'. Please, define at least one of the two."
             )
 
+        if self.multi_hot_cols is not None and self.with_attention:
+            raise ValueError(
+                "Multi-hot columns are not supported with attention-based models"
+            )
+
+        if self.compositional_embed_cols is not None:
+            cat_cols = [
+                c[0] if isinstance(c, tuple) else c
+                for c in (cat_embed_cols if cat_embed_cols is not None else [])
+            ]
+            not_cat_cols = [
+                c for c in self.compositional_embed_cols if c not in cat_cols
+            ]
+            if len(not_cat_cols) > 0:
+                raise ValueError(
+                    "The following columns in 'compositional_embed_cols' are not in "
+                    "'cat_embed_cols': {}".format(", ".join(not_cat_cols))
+                )
+
+        if self.shared_vocab_cols is not None:
+            self._check_shared_vocab_cols(cat_embed_cols)
+
         if (
             cat_embed_cols is not None
             and self.continuous_cols is not None
@@ -598,6 +1063,31 @@ class TabPreprocessor(BasePreprocessor):
         ):
             raise ValueError(transformer_error_message)
 
+    def _check_shared_vocab_cols(self, cat_embed_cols):
+        embed_dims = {
+            c[0] if isinstance(c, tuple) else c: c[1] if isinstance(c, tuple) else None
+            for c in (cat_embed_cols if cat_embed_cols is not None else [])
+        }
+        grouped_cols = [c for cols in self.shared_vocab_cols for c in cols]
+        not_cat_cols = [c for c in grouped_cols if c not in embed_dims]
+        if len(not_cat_cols) > 0:
+            raise ValueError(
+                "The following columns in 'shared_vocab_cols' are not in "
+                "'cat_embed_cols': {}".format(", ".join(not_cat_cols))
+            )
+        if len(set(grouped_cols)) != len(grouped_cols):
+            raise ValueError(
+                "A column can only be in one of the groups in 'shared_vocab_cols'"
+            )
+        for cols in self.shared_vocab_cols:
+            if len(set([embed_dims[c] for c in cols])) > 1:
+                raise ValueError(
+                    "The columns that share a vocabulary must have the same "
+                    "embedding dim. Got {}".format(
+                        ", ".join([f"{c}: {embed_dims[c]}" for c in cols])
+                    )
+                )
+
     def __repr__(self) -> str:  # noqa: C901
         list_of_params: List[str] = []
         if self.cat_embed_cols is not None:
@@ -626,6 +1116,22 @@ class TabPreprocessor(BasePreprocessor):
             list_of_params.append("scale={scale}")
         if self.already_standard is not None:
             list_of_params.append("already_standard={already_standard}")
+        if self.min_freq is not None:
+            list_of_params.append("min_freq={min_freq}")
+        if self.max_categories is not None:
+            list_of_params.append("max_categories={max_categories}")
+        if self.n_cpus != 1:
+            list_of_params.append("n_cpus={n_cpus}")
+        if self.cache_dir is not None:
+            list_of_params.append("cache_dir='{cache_dir}'")
+        if self.multi_hot_cols is not None:
+            list_of_params.append("multi_hot_cols={multi_hot_cols}")
+        if self.multi_hot_max_len is not None:
+            list_of_params.append("multi_hot_max_len={multi_hot_max_len}")
+        if self.compositional_embed_cols is not None:
+            list_of_params.append("compositional_embed_cols={compositional_embed_cols}")
+        if self.shared_vocab_cols is not None:
+            list_of_params.append("shared_vocab_cols={shared_vocab_cols}")
         if len(self.quant_args) > 0:
             list_of_params.append(
                 ", ".join([f"{k}" + "=" + f"{v}" for k, v in self.quant_args.items()])
@@ -690,6 +1196,18 @@ class ChunkTabPreprocessor(TabPreprocessor):
         columns'_. In other words, the idea is to let the model learn which
         column is embedded at the time. See: `pytorch_widedeep.models.transformers._layers.SharedEmbeddings`.
     verbose: int, default = 1
+    min_freq: int or Dict, Optional, default = None
+        Minimum frequency for a category to be represented by its own
+        embedding. See `TabPreprocessor`
+    max_categories: int or Dict, Optional, default = None
+        Maximum number of categories per column that will be represented by
+        their own embedding. See `TabPreprocessor`
+    n_cpus: int, default = 1
+        Number of threads used by the `transform` method. See
+        `TabPreprocessor`
+    shared_vocab_cols: List, Optional, default = None
+        List of Lists with the names of the categorical columns that share a
+        vocabulary. See `TabPreprocessor`
 
     Other Parameters
     ----------------
@@ -759,6 +1277,10 @@ class ChunkTabPreprocessor(TabPreprocessor):
         *,
         scale: bool = False,
         already_standard: List[str] = None,
+        min_freq: Optional[Union[int, Dict[str, int]]] = None,
+        max_categories: Optional[Union[int, Dict[str, int]]] = None,
+        n_cpus: int = 1,
+        shared_vocab_cols: Optional[List[List[str]]] = None,
         **kwargs,
     ):
         super(ChunkTabPreprocessor, self).__init__(
@@ -775,6 +1297,10 @@ class ChunkTabPreprocessor(TabPreprocessor):
             verbose=verbose,
             scale=scale,
             already_standard=already_standard,
+            min_freq=min_freq,
+            max_categories=max_categories,
+            n_cpus=n_cpus,
+            shared_vocab_cols=shared_vocab_cols,
             **kwargs,
         )
 
@@ -804,6 +1330,9 @@ class ChunkTabPreprocessor(TabPreprocessor):
                     columns_to_encode=chunk_emb.columns.tolist(),
                     shared_embed=self.shared_embed,
                     with_attention=self.with_attention,
+                    min_freq=self.min_freq,
+                    max_categories=self.max_categories,
+                    shared_vocab_cols=self.shared_vocab_cols,
                 )
                 self.label_encoder.partial_fit(chunk_emb)
             else:
@@ -920,6 +1449,14 @@ class ChunkTabPreprocessor(TabPreprocessor):
             list_of_params.append("scale={scale}")
         if self.already_standard is not None:
             list_of_params.append("already_standard={already_standard}")
+        if self.min_freq is not None:
+            list_of_params.append("min_freq={min_freq}")
+        if self.max_categories is not None:
+            list_of_params.append("max_categories={max_categories}")
+        if self.n_cpus != 1:
+            list_of_params.append("n_cpus={n_cpus}")
+        if self.shared_vocab_cols is not None:
+            list_of_params.append("shared_vocab_cols={shared_vocab_cols}")
         if len(self.quant_args) > 0:
             list_of_params.append(
                 ", ".join([f"{k}" + "=" + f"{v}" for k, v in self.quant_args.items()])
@@ -1,12 +1,20 @@
-from typing import List, Tuple
+from typing import Any, Dict, List, Tuple, Union, Optional
 
 import numpy as np
 import pandas as pd
 
+from pytorch_widedeep.utils.deeptabular_utils import (
+    ArrayEncoding,
+    MultiHotArray,
+    flatten_multi_hot,
+)
 from pytorch_widedeep.preprocessing.base_preprocessor import (
     BasePreprocessor,
     check_is_fitted,
 )
+from pytorch_widedeep.preprocessing.compiled_preprocessors import (
+    CompiledWidePreprocessor,
+)
 
 
 class WidePreprocessor(BasePreprocessor):
@@ -28,6 +36,23 @@ class WidePreprocessor(BasePreprocessor):
         and then label encoded. e.g. _[('education', 'occupation'), ...]_. For
         binary features, a cross-product transformation is 1 if and only if
         the constituent features are all 1, and 0 otherwise.
+    cache_dir: str, Optional, default = None
+        If not `None`, `fit_transform` will cache the fitted preprocessor and
+        the transformed array in this directory. See `TabPreprocessor`
+    multi_hot_cols: List, Optional, default = None
+        List with the name of the multi-hot (i.e. list-valued, variable
+        length) categorical columns, such as genres or tags. Each of the
+        values in these columns is encoded (as `colname + '_' + value`) as
+        any other value in `wide_cols`, but all the values in a row are
+        "activated" at once. If not `None`, the output of the `transform`
+        method is a `MultiHotArray`, where the multi-hot columns are stored as
+        encoded values and offsets (see
+        `pytorch_widedeep.utils.deeptabular_utils.MultiHotArray`). Note that
+        the `Wide` model must then be built with `multi_hot = True`, so that
+        the padding values do not contribute to its output
+    multi_hot_max_len: int or Dict, Optional, default = None
+        Maximum number of values per row of the multi-hot columns. See
+        `TabPreprocessor`
 
     Attributes
     ----------
@@ -40,6 +65,10 @@ class WidePreprocessor(BasePreprocessor):
         the inverse encoding dictionary
     wide_dim: int
         Dimension of the wide model (i.e. dim of the linear layer)
+    multi_hot_max_lens: Dict
+        Dictionary where the keys are the multi-hot columns and the values
+        the maximum number of values per row. The multi-hot columns are
+        placed after the `wide_crossed_cols`
 
     Examples
     --------
@@ -63,13 +92,28 @@ class WidePreprocessor(BasePreprocessor):
     2     g        g-l
     """
 
+    _attr_defaults: Dict[str, Any] = {
+        "cache_dir": None,
+        "multi_hot_cols": None,
+        "multi_hot_max_len": None,
+    }
+    _runtime_attrs: List[str] = ["cache_dir"]
+
     def __init__(
-        self, wide_cols: List[str], crossed_cols: List[Tuple[str, str]] = None
+        self,
+        wide_cols: List[str],
+        crossed_cols: List[Tuple[str, str]] = None,
+        cache_dir: Optional[str] = None,
+        multi_hot_cols: Optional[List[str]] = None,
+        multi_hot_max_len: Optional[Union[int, Dict[str, int]]] = None,
     ):
         super(WidePreprocessor, self).__init__()
 
         self.wide_cols = wide_cols
         self.crossed_cols = crossed_cols
+        self.cache_dir = cache_dir
+        self.multi_hot_cols = multi_hot_cols
+        self.multi_hot_max_len = multi_hot_max_len
 
         self.is_fitted = False
 
@@ -91,11 +135,12 @@ class WidePreprocessor(BasePreprocessor):
         glob_feature_list = self._make_global_feature_list(
             df_wide[self.wide_crossed_cols]
         )
+        if self.multi_hot_cols is not None:
+            glob_feature_list += self._fit_multi_hot(df)
         # leave 0 for padding/"unseen" categories
         self.encoding_dict = {v: i + 1 for i, v in enumerate(glob_feature_list)}
         self.wide_dim = len(self.encoding_dict)
-        self.inverse_encoding_dict = {k: v for v, k in self.encoding_dict.items()}
-        self.inverse_encoding_dict[0] = "unseen"
+        self.inverse_encoding_dict = self._create_inverse_encoding_dict()
 
         self.is_fitted = True
 
@@ -111,22 +156,49 @@ class WidePreprocessor(BasePreprocessor):
         Returns
         -------
         np.ndarray
-            transformed input dataframe
+            transformed input dataframe. If `multi_hot_cols` is not `None`,
+            a `MultiHotArray`
         """
         check_is_fitted(self, attributes=["encoding_dict"])
         df_wide = self._prepare_wide(df)
         encoded = np.zeros([len(df_wide), len(self.wide_crossed_cols)])
         for col_i, col in enumerate(self.wide_crossed_cols):
-            encoded[:, col_i] = df_wide[col].apply(
-                lambda x: self.encoding_dict[col + "_" + str(x)]
-                if col + "_" + str(x) in self.encoding_dict
-                else 0
-            )
+            if isinstance(self.encoding_dict, ArrayEncoding):
+                # one vectorised lookup per column, of its unique values
+                codes, uniques = pd.factorize(df_wide[col], use_na_sentinel=False)
+                keys = np.array([col + "_" + str(x) for x in uniques])
+                encoded[:, col_i] = self.encoding_dict.encode(keys, 0)[codes]
+            else:
+                encoded[:, col_i] = df_wide[col].apply(
+                    lambda x: self.encoding_dict.get(col + "_" + str(x), 0)
+                )
+        if self.multi_hot_cols is not None:
+            return self._transform_multi_hot(df, encoded.astype("int64"))
         return encoded.astype("int64")
 
     def transform_sample(self, df: pd.DataFrame) -> np.ndarray:
         return self.transform(df)[0]
 
+    def compile(self) -> CompiledWidePreprocessor:
+        r"""Compiles the fitted preprocessor into a `CompiledWidePreprocessor`:
+        a flat, pandas-free transformer designed to transform individual
+        records (i.e. dictionaries) at serving time, with an output identical
+        to that of the `transform` method.
+
+        Returns
+        -------
+        CompiledWidePreprocessor
+            compiled version of this preprocessor
+        """
+        check_is_fitted(self, attributes=["encoding_dict"])
+        if self.multi_hot_cols is not None:
+            raise ValueError("Preprocessors with multi-hot columns cannot be compiled")
+        return CompiledWidePreprocessor(
+            wide_cols=self.wide_cols,
+            crossed_cols=self.crossed_cols,
+            encoding_dict=dict(self.encoding_dict),
+        )
+
     def inverse_transform(self, encoded: np.ndarray) -> pd.DataFrame:
         r"""Takes as input the output from the `transform` method and it will
         return the original values.
@@ -140,13 +212,24 @@ class WidePreprocessor(BasePreprocessor):
         Returns
         -------
         pd.DataFrame
-            Pandas dataframe with the original values
+            Pandas dataframe with the original values. The multi-hot
+            columns, if any, are decoded as lists (without the padding and
+            unseen values)
         """
+        if not hasattr(self, "inverse_encoding_dict"):
+            self.inverse_encoding_dict = self._create_inverse_encoding_dict()
+        if self.multi_hot_cols is not None:
+            encoded = np.asarray(encoded)
+            decoded_multi_hot = self._inverse_transform_multi_hot(encoded)
+            encoded = encoded[:, : len(self.wide_crossed_cols)]
         decoded = pd.DataFrame(encoded, columns=self.wide_crossed_cols)
         decoded = decoded.applymap(lambda x: self.inverse_encoding_dict[x])
         for col in decoded.columns:
             rm_str = "".join([col, "_"])
             decoded[col] = decoded[col].apply(lambda x: x.replace(rm_str, ""))
+        if self.multi_hot_cols is not None:
+            for col in self.multi_hot_cols:
+                decoded[col] = decoded_multi_hot[col]
         return decoded
 
     def fit_transform(self, df: pd.DataFrame) -> np.ndarray:
@@ -162,8 +245,78 @@ class WidePreprocessor(BasePreprocessor):
         np.ndarray
             transformed input dataframe
         """
+        if self.cache_dir is not None:
+            return self._cached_fit_transform(df, self.cache_dir, self._input_cols())
         return self.fit(df).transform(df)
 
+    def _input_cols(self) -> List[str]:
+        input_cols = list(self.wide_cols)
+        if self.crossed_cols is not None:
+            for cols in self.crossed_cols:
+                input_cols += [c for c in cols if c not in input_cols]
+        return input_cols
+
+    def _fit_multi_hot(self, df: pd.DataFrame) -> List[str]:
+        feature_list: List[str] = []
+        self.multi_hot_max_lens: Dict[str, int] = {}
+        for col in self.multi_hot_cols:
+            flat, offsets = flatten_multi_hot(df[col])
+            feature_list += list(dict.fromkeys([col + "_" + str(x) for x in flat]))
+            if isinstance(self.multi_hot_max_len, int):
+                self.multi_hot_max_lens[col] = self.multi_hot_max_len
+            elif (
+                isinstance(self.multi_hot_max_len, dict)
+                and col in self.multi_hot_max_len
+            ):
+                self.multi_hot_max_lens[col] = self.multi_hot_max_len[col]
+            else:
+                self.multi_hot_max_lens[col] = max(
+                    int(np.diff(offsets).max(initial=0)), 1
+                )
+        return feature_list
+
+    def _transform_multi_hot(self, df: pd.DataFrame, X: np.ndarray) -> MultiHotArray:
+        values: List[np.ndarray] = []
+        offsets: List[np.ndarray] = []
+        for col in self.multi_hot_cols:
+            flat, offs = flatten_multi_hot(df[col])
+            values.append(
+                np.fromiter(
+                    (self.encoding_dict.get(col + "_" + str(x), 0) for x in flat),
+                    "int64",
+                    len(flat),
+                )
+            )
+            offsets.append(offs)
+        return MultiHotArray(
+            X,
+            values,
+            offsets,
+            [self.multi_hot_max_lens[c] for c in self.multi_hot_cols],
+        )
+
+    def _inverse_transform_multi_hot(self, encoded: np.ndarray) -> Dict[str, List]:
+        decoded: Dict[str, List] = {}
+        start = len(self.wide_crossed_cols)
+        for col in self.multi_hot_cols:
+            max_len = self.multi_hot_max_lens[col]
+            rm_str = "".join([col, "_"])
+            decoded[col] = [
+                [
+                    self.inverse_encoding_dict[v].replace(rm_str, "")
+                    for v in row
+                    if v != 0
+                ]
+                for row in encoded[:, start : start + max_len].astype("int64").tolist()
+            ]
+            start += max_len
+        return decoded
+
+    def _create_inverse_encoding_dict(self) -> Dict[int, str]:
+        inverse_encoding_dict = {k: v for v, k in self.encoding_dict.items()}
+        inverse_encoding_dict[0] = "unseen"
+        return inverse_encoding_dict
+
     def _make_global_feature_list(self, df: pd.DataFrame) -> List:
         glob_feature_list = []
         for column in df.columns:
@@ -195,6 +348,12 @@ class WidePreprocessor(BasePreprocessor):
         list_of_params: List[str] = ["wide_cols={wide_cols}"]
         if self.crossed_cols is not None:
             list_of_params.append("crossed_cols={crossed_cols}")
+        if self.cache_dir is not None:
+            list_of_params.append("cache_dir='{cache_dir}'")
+        if self.multi_hot_cols is not None:
+            list_of_params.append("multi_hot_cols={multi_hot_cols}")
+        if self.multi_hot_max_len is not None:
+            list_of_params.append("multi_hot_max_len={multi_hot_max_len}")
         all_params = ", ".join(list_of_params)
         return f"WidePreprocessor({all_params.format(**self.__dict__)})"
 
@@ -287,8 +446,7 @@ class ChunkWidePreprocessor(WidePreprocessor):
         if self.chunk_counter == self.n_chunks:
             self.encoding_dict = {v: i + 1 for i, v in enumerate(self.glob_feature_set)}
             self.wide_dim = len(self.encoding_dict)
-            self.inverse_encoding_dict = {k: v for v, k in self.encoding_dict.items()}
-            self.inverse_encoding_dict[0] = "unseen"
+            self.inverse_encoding_dict = self._create_inverse_encoding_dict()
 
             self.is_fitted = True
 
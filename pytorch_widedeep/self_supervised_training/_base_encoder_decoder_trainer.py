@@ -23,6 +23,10 @@ from pytorch_widedeep.callbacks import (
     CallbackContainer,
     LRShedulerCallback,
 )
+from pytorch_widedeep.training._trainer_utils import (
+    grad_scaler,
+    check_precision,
+)
 from pytorch_widedeep.models.tabular.self_supervised import EncoderDecoderModel
 
 
@@ -40,6 +44,8 @@ class BaseEncoderDecoderTrainer(ABC):
         **kwargs,
     ):
         self.device, self.num_workers = self._set_device_and_num_workers(**kwargs)
+        self.precision = check_precision(kwargs.get("precision", "fp32"))
+        self.scaler = grad_scaler(self.device, self.precision)
 
         self.early_stop = False
         self.verbose = verbose
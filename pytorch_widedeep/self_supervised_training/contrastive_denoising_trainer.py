@@ -21,6 +21,7 @@ from pytorch_widedeep.wdtypes import (
 from pytorch_widedeep.callbacks import Callback
 from pytorch_widedeep.preprocessing import TabPreprocessor
 from pytorch_widedeep.training._trainer_utils import (
+    autocast,
     save_epoch_logs,
     print_loss_and_metric,
 )
@@ -106,6 +107,10 @@ class ContrastiveDenoisingTrainer(BaseContrastiveDenoisingTrainer):
             take a step: One of _'loss'_ or _'metric'_. The ReduceLROnPlateau
             learning rate is a bit particular.
 
+        - **precision**: `str`<br/>
+            One of _'fp32'_ (default), _'bf16'_ or _'fp16'_. Mixed precision
+            training. See `pytorch_widedeep.training.Trainer`
+
     """
 
     def __init__(
@@ -303,10 +308,12 @@ class ContrastiveDenoisingTrainer(BaseContrastiveDenoisingTrainer):
         X = X_tab.to(self.device)
 
         self.optimizer.zero_grad()
-        g_projs, cat_x_and_x_, cont_x_and_x_ = self.cd_model(X)
-        loss = self._compute_loss(g_projs, cat_x_and_x_, cont_x_and_x_)
-        loss.backward()
-        self.optimizer.step()
+        with autocast(self.device, self.precision):
+            g_projs, cat_x_and_x_, cont_x_and_x_ = self.cd_model(X)
+            loss = self._compute_loss(g_projs, cat_x_and_x_, cont_x_and_x_)
+        self.scaler.scale(loss).backward()
+        self.scaler.step(self.optimizer)
+        self.scaler.update()
 
         self.train_running_loss += loss.item()
         avg_loss = self.train_running_loss / (batch_idx + 1)
@@ -319,8 +326,9 @@ class ContrastiveDenoisingTrainer(BaseContrastiveDenoisingTrainer):
         with torch.no_grad():
             X = X_tab.to(self.device)
 
-            g_projs, cat_x_and_x_, cont_x_and_x_ = self.cd_model(X)
-            loss = self._compute_loss(g_projs, cat_x_and_x_, cont_x_and_x_)
+            with autocast(self.device, self.precision):
+                g_projs, cat_x_and_x_, cont_x_and_x_ = self.cd_model(X)
+                loss = self._compute_loss(g_projs, cat_x_and_x_, cont_x_and_x_)
 
             self.valid_running_loss += loss.item()
             avg_loss = self.valid_running_loss / (batch_idx + 1)
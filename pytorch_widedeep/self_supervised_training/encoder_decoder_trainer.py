@@ -20,6 +20,7 @@ from pytorch_widedeep.wdtypes import (
 )
 from pytorch_widedeep.callbacks import Callback
 from pytorch_widedeep.training._trainer_utils import (
+    autocast,
     save_epoch_logs,
     print_loss_and_metric,
 )
@@ -78,6 +79,10 @@ class EncoderDecoderTrainer(BaseEncoderDecoderTrainer):
             take a step: One of _'loss'_ or _'metric'_. The ReduceLROnPlateau
             learning rate is a bit particular.
 
+        - **precision**: `str`<br/>
+            One of _'fp32'_ (default), _'bf16'_ or _'fp16'_. Mixed precision
+            training. See `pytorch_widedeep.training.Trainer`
+
     """
 
     def __init__(
@@ -260,10 +265,12 @@ class EncoderDecoderTrainer(BaseEncoderDecoderTrainer):
         X = X_tab.to(self.device)
 
         self.optimizer.zero_grad()
-        x_embed, x_embed_rec, mask = self.ed_model(X)
-        loss = self.loss_fn(x_embed, x_embed_rec, mask)
-        loss.backward()
-        self.optimizer.step()
+        with autocast(self.device, self.precision):
+            x_embed, x_embed_rec, mask = self.ed_model(X)
+            loss = self.loss_fn(x_embed, x_embed_rec, mask)
+        self.scaler.scale(loss).backward()
+        self.scaler.step(self.optimizer)
+        self.scaler.update()
 
         self.train_running_loss += loss.item()
         avg_loss = self.train_running_loss / (batch_idx + 1)
@@ -276,8 +283,9 @@ class EncoderDecoderTrainer(BaseEncoderDecoderTrainer):
         with torch.no_grad():
             X = X_tab.to(self.device)
 
-            x_embed, x_embed_rec, mask = self.ed_model(X)
-            loss = self.loss_fn(x_embed, x_embed_rec, mask)
+            with autocast(self.device, self.precision):
+                x_embed, x_embed_rec, mask = self.ed_model(X)
+                loss = self.loss_fn(x_embed, x_embed_rec, mask)
 
             self.valid_running_loss += loss.item()
             avg_loss = self.valid_running_loss / (batch_idx + 1)
@@ -2,10 +2,13 @@ import os
 import sys
 import warnings
 from abc import ABC, abstractmethod
+from typing import ContextManager
+from contextlib import nullcontext
 
 import numpy as np
 import torch
 from torchmetrics import Metric as TorchMetric
+from torch.nn.parallel import DistributedDataParallel
 from torch.optim.lr_scheduler import ReduceLROnPlateau
 
 from pytorch_widedeep.metrics import Metric, MultipleMetrics
@@ -13,8 +16,10 @@ from pytorch_widedeep.wdtypes import (
     Any,
     Dict,
     List,
+    Tuple,
     Union,
     Module,
+    Tensor,
     Optional,
     WideDeep,
     Optimizer,
@@ -29,13 +34,25 @@ from pytorch_widedeep.callbacks import (
     LRShedulerCallback,
 )
 from pytorch_widedeep.initializers import Initializer, MultipleInitializer
-from pytorch_widedeep.training._trainer_utils import alias_to_loss
-from pytorch_widedeep.training._multiple_optimizer import MultipleOptimizer
+from pytorch_widedeep.models.lazy_init import has_meta_parameters
+from pytorch_widedeep.training._trainer_utils import (
+    grad_scaler,
+    alias_to_loss,
+    compile_model,
+    check_precision,
+)
+from pytorch_widedeep.training._multiple_optimizer import (
+    MultipleOptimizer,
+    SparseMultipleOptimizer,
+    sparse_parameters,
+    sparse_param_groups,
+)
 from pytorch_widedeep.training._multiple_transforms import MultipleTransforms
 from pytorch_widedeep.training._loss_and_obj_aliases import _ObjectiveToMethod
 from pytorch_widedeep.training._multiple_lr_scheduler import (
     MultipleLRScheduler,
 )
+from pytorch_widedeep.models.tabular.embeddings_layers import MMapEmbedding
 
 # I would like to be more specific with the abstract methods in 'BaseTrainer'
 # so they are more informative. However I also want to use this class to be
@@ -63,9 +80,18 @@ class BaseTrainer(ABC):
             model, objective, optimizers, lr_schedulers, custom_loss_function
         )
         self.device, self.num_workers = self._set_device_and_num_workers(**kwargs)
+        self.precision = check_precision(kwargs.get("precision", "fp32"))
+        self.scaler = grad_scaler(self.device, self.precision)
 
         self.early_stop = False
         self.verbose = verbose
+        # 'optimizer_stepped' is used by the 'LRShedulerCallback' so that the
+        # schedulers only take a step when the optimizer does
+        self.accumulation_steps = 1
+        self.optimizer_stepped = True
+        # the model wrapped with 'DistributedDataParallel' for the training
+        # forward passes (only in distributed training, see 'Trainer')
+        self.ddp_model: Optional[DistributedDataParallel] = None
         self.seed = seed
 
         self.model = model
@@ -73,13 +99,18 @@ class BaseTrainer(ABC):
             self.lambda_sparse = kwargs.get("lambda_sparse", 1e-3)
         self.model.to(self.device)
         self.model.wd_device = self.device
+        compile_model(
+            self.model, kwargs.get("compile", False), kwargs.get("compile_kwargs")
+        )
 
         self.objective = objective
         self.method = _ObjectiveToMethod.get(objective)
 
         self._initialize(initializers)
         self.loss_fn = self._set_loss_fn(objective, custom_loss_function, **kwargs)
-        self.optimizer = self._set_optimizer(optimizers)
+        self.optimizer = self._set_optimizer(
+            optimizers, kwargs.get("sparse_optimizer", None)
+        )
         self.lr_scheduler = self._set_lr_scheduler(lr_schedulers, **kwargs)
         self.transforms = self._set_transforms(transforms)
         self._set_callbacks_and_metrics(callbacks, metrics)
@@ -105,6 +136,59 @@ class BaseTrainer(ABC):
     ):
         raise NotImplementedError("Trainer.save method not implemented")
 
+    def _set_accumulation_steps(self, accumulation_steps: int, train_steps: int):
+        if not isinstance(accumulation_steps, int) or accumulation_steps < 1:
+            raise ValueError(
+                "'gradient_accumulation_steps' must be a positive integer. "
+                f"Got {accumulation_steps} instead"
+            )
+        if accumulation_steps > 1 and self._has_mmap_embeddings():
+            # the cache slots of the memory-mapped tables can be evicted, and
+            # reused by other categories, between the batches whose
+            # gradients are accumulated
+            raise ValueError(
+                "'gradient_accumulation_steps' > 1 is not supported for models "
+                "with memory-mapped embedding tables"
+            )
+        self.accumulation_steps = accumulation_steps
+        self.train_steps = train_steps
+
+    def _accumulation_group(self, batch_idx: int) -> Tuple[int, int]:
+        # first batch and number of batches of the group of accumulated
+        # batches that 'batch_idx' belongs to. The last group of batches in
+        # an epoch might have fewer batches
+        group_start = batch_idx - batch_idx % self.accumulation_steps
+        return group_start, min(self.accumulation_steps, self.train_steps - group_start)
+
+    def _is_optimizer_step(self, batch_idx: int) -> bool:
+        group_start, n_accumulated = self._accumulation_group(batch_idx)
+        return batch_idx - group_start == n_accumulated - 1
+
+    def _grad_sync(self, batch_idx: int) -> ContextManager:
+        # in distributed training the gradients are only all-reduced across
+        # processes in the batches where the optimizer takes a step
+        if self.ddp_model is None or self._is_optimizer_step(batch_idx):
+            return nullcontext()
+        return self.ddp_model.no_sync()
+
+    def _backward_and_step(self, loss: Tensor, batch_idx: int):
+        # With gradient accumulation the gradients of 'accumulation_steps'
+        # consecutive batches are added up before the optimizer takes a
+        # step. The loss is divided by the number of batches accumulated so
+        # that the gradients are those of the mean loss over the batches,
+        # i.e. those of a batch 'accumulation_steps' times larger
+        group_start, n_accumulated = self._accumulation_group(batch_idx)
+
+        if batch_idx == group_start:
+            self.optimizer.zero_grad()
+
+        self.scaler.scale(loss / n_accumulated).backward()
+
+        self.optimizer_stepped = self._is_optimizer_step(batch_idx)
+        if self.optimizer_stepped:
+            self.scaler.step(self.optimizer)
+            self.scaler.update()
+
     def _restore_best_weights(self):  # noqa: C901
         early_stopping_min_delta = None
         model_checkpoint_min_delta = None
@@ -137,7 +221,18 @@ class BaseTrainer(ABC):
         else:
             for callback in self.callback_container.callbacks:
                 if callback.__class__.__name__ == "ModelCheckpoint":
-                    if callback.save_best_only:
+                    if callback.save_best_only and self._has_mmap_embeddings():
+                        # the state dict only contains the cache of the
+                        # tables, which would be restored on top of the
+                        # rows of the last epoch in the files
+                        warnings.warn(
+                            "The weights of the best epoch cannot be restored for "
+                            "models with memory-mapped embedding tables. The model "
+                            "weights after training correspond to those of the "
+                            "final epoch",
+                            UserWarning,
+                        )
+                    elif callback.save_best_only:
                         if self.verbose:
                             print(
                                 f"Model weights restored to best epoch: {callback.best_epoch + 1}"
@@ -151,6 +246,9 @@ class BaseTrainer(ABC):
                                 "the 'ModelCheckpoint' Callback to restore the best epoch weights."
                             )
 
+    def _has_mmap_embeddings(self) -> bool:
+        return any(isinstance(m, MMapEmbedding) for m in self.model.modules())
+
     def _initialize(self, initializers):
         if initializers is not None:
             if isinstance(initializers, Dict):
@@ -186,7 +284,11 @@ class BaseTrainer(ABC):
         else:
             return alias_to_loss(objective)
 
-    def _set_optimizer(self, optimizers: Union[Optimizer, Dict[str, Optimizer]]):
+    def _set_optimizer(
+        self,
+        optimizers: Union[Optimizer, Dict[str, Optimizer]],
+        sparse_optimizer: Optional[Optimizer] = None,
+    ):
         if optimizers is not None:
             if isinstance(optimizers, Optimizer):
                 optimizer: Union[Optimizer, MultipleOptimizer] = optimizers
@@ -208,8 +310,51 @@ class BaseTrainer(ABC):
                 optimizer = MultipleOptimizer(optimizers)
         else:
             optimizer = torch.optim.Adam(self.model.parameters())  # type: ignore
+
+        sparse_params = sparse_parameters(self.model)
+        if sparse_params:
+            optimizer = self._set_sparse_optimizer(
+                optimizer, sparse_params, sparse_optimizer
+            )
         return optimizer
 
+    @staticmethod
+    def _set_sparse_optimizer(
+        optimizer: Union[Optimizer, MultipleOptimizer],
+        sparse_params: List[torch.nn.Parameter],
+        sparse_optimizer: Optional[Optimizer],
+    ) -> Union[Optimizer, MultipleOptimizer]:
+        # parameters with sparse gradients (e.g. those of a 'Wide' model with
+        # sparse=True) in optimizers that do not support sparse gradients
+        # are optimized with 'sparse_optimizer' instead (or a 'SparseAdam'
+        # whose lr follows that of the param groups they are in). The
+        # optimizers passed to the Trainer are not modified (see
+        # 'SparseMultipleOptimizer')
+        if isinstance(optimizer, MultipleOptimizer):
+            optimizers = optimizer._optimizers
+        else:
+            optimizers = {"model": optimizer}
+
+        groups = [
+            g
+            for _, opt in optimizers.items()
+            for g in sparse_param_groups(opt, sparse_params)
+        ]
+
+        if not groups:
+            return optimizer
+
+        lr_sources = None
+        if sparse_optimizer is None:
+            sparse_optimizer = torch.optim.SparseAdam(
+                [{"params": params, "lr": group["lr"]} for params, group in groups]
+            )
+            lr_sources = [group for _, group in groups]
+
+        return SparseMultipleOptimizer(
+            {**optimizers, "sparse": sparse_optimizer}, lr_sources
+        )
+
     def _set_lr_scheduler(self, lr_schedulers, **kwargs):
         # ReduceLROnPlateau is special
         reducelronplateau_criterion = kwargs.get("reducelronplateau_criterion", None)
@@ -300,6 +445,13 @@ class BaseTrainer(ABC):
         lr_schedulers,
         custom_loss_function,
     ):
+        if has_meta_parameters(model):
+            raise ValueError(
+                "The model has parameters on the 'meta' device. Models built under "
+                "'init_empty_model' must be materialised with 'materialize_model' "
+                "before being trained"
+            )
+
         if model.with_fds and _ObjectiveToMethod.get(objective) != "regression":
             raise ValueError(
                 "Feature Distribution Smooting can be used only for regression"
@@ -26,6 +26,7 @@ from pytorch_widedeep.models.tabular import (
 )
 from pytorch_widedeep.utils.general_utils import Alias
 from pytorch_widedeep.training._wd_dataset import WideDeepDataset
+from pytorch_widedeep.models.attention_capture import capture_attention
 from pytorch_widedeep.models.tabular.tabnet._utils import create_explain_matrix
 
 TransformerBasedModels = (
@@ -184,7 +185,8 @@ class TransformerBasedFeatureImportance(BaseFeatureImportance):
         X = self._sample_data(loader)
 
         model.eval()
-        _ = model.deeptabular(X)
+        with capture_attention():
+            _ = model.deeptabular(X)
 
         feature_importance, column_idx = self._feature_importance(model)
 
@@ -364,7 +366,8 @@ class TransformerBasedExplainer(TransformerBasedFeatureImportance):
         batch_feat_imp: Any = []
         for _, data in enumerate(loader):
             X = data["deeptabular"].to(self.device)
-            _ = model.deeptabular(X)
+            with capture_attention():
+                _ = model.deeptabular(X)
 
             feat_imp, col_idx = self._feature_importance(model)
 
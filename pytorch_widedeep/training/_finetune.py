@@ -15,6 +15,8 @@ from pytorch_widedeep.wdtypes import (
     DataLoader,
     LRScheduler,
 )
+from pytorch_widedeep.training._trainer_utils import autocast, grad_scaler
+from pytorch_widedeep.training._multiple_optimizer import sparse_parameters
 from pytorch_widedeep.models._base_wd_model_component import (
     BaseWDModelComponent,
 )
@@ -54,6 +56,9 @@ class FineTune:
     method: str
        one of 'binary', 'regression' or 'multiclass'
     verbose: Boolean
+    precision: str, default = "fp32"
+       one of 'fp32', 'bf16' or 'fp16'. See the `precision` parameter of the
+       ``Trainer``
     """
 
     def __init__(
@@ -62,11 +67,13 @@ class FineTune:
         metric: Union[Metric, MultipleMetrics],
         method: Literal["binary", "regression", "multiclass"],
         verbose: int,
+        precision: str = "fp32",
     ):
         self.loss_fn = loss_fn
         self.metric = metric
         self.method = method
         self.verbose = verbose
+        self.precision = precision
 
     def finetune_all(
         self,
@@ -108,7 +115,10 @@ class FineTune:
             print("Training {} for {} epochs".format(model_name, n_epochs))
         model.train()
 
-        optimizer = torch.optim.AdamW(model.parameters(), lr=max_lr / 10.0)  # type: ignore
+        # AdamW does not support sparse gradients (e.g. those of a 'Wide' model
+        # with sparse=True)
+        opt_class = torch.optim.SGD if sparse_parameters(model) else torch.optim.AdamW
+        optimizer = opt_class(model.parameters(), lr=max_lr / 10.0)  # type: ignore
         step_size_up, step_size_down = self._steps_up_down(len(loader), n_epochs)
         scheduler = torch.optim.lr_scheduler.CyclicLR(
             optimizer,
@@ -261,6 +271,8 @@ class FineTune:
         Standard Pytorch training loop
         """
         steps = len(loader)
+        device = "cuda" if use_cuda else "cpu"
+        scaler = grad_scaler(device, self.precision)
         for epoch in range(n_epochs):
             running_loss = 0.0
             with trange(steps, disable=self.verbose != 1) as t:
@@ -279,11 +291,14 @@ class FineTune:
                     y = y.cuda() if use_cuda else y
 
                     optimizer.zero_grad()
-                    y_pred = model(X)
-                    loss = self.loss_fn(y_pred, y)
-                    loss.backward()
-                    optimizer.step()
+                    with autocast(device, self.precision):
+                        y_pred = model(X)
+                        loss = self.loss_fn(y_pred, y)
+                    scaler.scale(loss).backward()
+                    scaler.step(optimizer)
+                    scaler.update()
                     scheduler.step()
+                    y_pred = y_pred.float()
 
                     running_loss += loss.item()
                     avg_loss = running_loss / (batch_idx + 1)
@@ -0,0 +1,150 @@
+import copy
+import queue
+
+import torch.multiprocessing as mp
+from tqdm import trange
+from torch.utils.data import DataLoader, DistributedSampler
+
+from pytorch_widedeep.wdtypes import Any, Dict, List, Tuple, Callable, Optional
+from pytorch_widedeep.distributed import _spawn, get_rank
+from pytorch_widedeep.training._wd_dataset import WideDeepDataset
+from pytorch_widedeep.training._trainer_utils import print_loss_and_metric
+
+
+class HogwildWorkers:
+    r"""Processes that train, asynchronously and without locks (i.e.
+    _Hogwild!_ style), a model whose parameters live in shared memory.
+
+    Each process trains on its own shard of the training data with its own
+    copy of the optimizer, and applies its updates directly to the shared
+    parameters. The process that starts the workers (i.e. the one running
+    `Trainer.fit`) only dictates the epochs (and the learning rates) and
+    takes care of the progress bar, the validation and the callbacks.
+
+    This is meant for models where each step only touches a few rows of
+    large embedding tables (e.g. a `Wide` model with `sparse=True`), where
+    the updates of the different processes rarely collide and where
+    synchronous data parallelism would spend most of its time all-reducing
+    zeros.
+    """
+
+    def __init__(
+        self,
+        trainer: Any,
+        train_set: WideDeepDataset,
+        batch_size: int,
+        dataloader_class: Callable[..., DataLoader],
+        dataloader_args: Dict[str, Any],
+        n_workers: int,
+        log_freq: int,
+    ):
+        # no gradients must be shared, only the parameters (and buffers)
+        trainer.model.zero_grad(set_to_none=True)
+        trainer.model.share_memory()
+
+        # the workers only need what is used in a training step
+        worker_trainer = copy.copy(trainer)
+        worker_trainer.callbacks = []
+        worker_trainer.callback_container = None
+        worker_trainer.lr_scheduler = None
+
+        ctx = mp.get_context("spawn")
+        self.commands = [ctx.SimpleQueue() for _ in range(n_workers)]
+        self.messages = ctx.Queue()
+        self.context = _spawn(
+            _train_worker,
+            n_workers,
+            args=(
+                worker_trainer,
+                train_set,
+                batch_size,
+                dataloader_class,
+                dataloader_args,
+                log_freq,
+                self.commands,
+                self.messages,
+            ),
+            join=False,
+        )
+        # number of steps per epoch of each worker
+        self.train_steps: int = self._next_message()
+
+    def train_epoch(
+        self, epoch: int, lrs: List[float], disable_pbar: bool
+    ) -> Tuple[Optional[Dict], float]:
+        r"""Runs an epoch in all workers and returns the training metrics and
+        loss, averaged over the workers"""
+        for commands in self.commands:
+            commands.put((epoch, lrs))
+
+        with trange(self.train_steps, disable=disable_pbar) as t:
+            t.set_description("epoch %i" % (epoch + 1))
+            while True:
+                n_steps, train_score, train_loss = self._next_message()
+                t.update(n_steps - t.n)
+                print_loss_and_metric(t, train_loss, train_score)
+                if n_steps == self.train_steps:
+                    return train_score, train_loss
+
+    def close(self):
+        r"""Stops the workers"""
+        for commands in self.commands:
+            commands.put(None)
+        while not self.context.join():
+            pass
+
+    def _next_message(self) -> Any:
+        while True:
+            try:
+                return self.messages.get(timeout=1.0)
+            except queue.Empty:
+                # raises if any of the workers failed
+                if self.context.join(timeout=0.1):
+                    raise RuntimeError("The hogwild workers exited unexpectedly")
+
+
+def _train_worker(
+    trainer: Any,
+    train_set: WideDeepDataset,
+    batch_size: int,
+    dataloader_class: Callable[..., DataLoader],
+    dataloader_args: Dict[str, Any],
+    log_freq: int,
+    commands: List[Any],
+    messages: Any,
+):
+    rank = get_rank()
+
+    # within the process group formed by the workers, the default dataloader
+    # and 'DataLoaderImbalanced' load a different shard of the data in each
+    # process
+    train_loader = dataloader_class(
+        dataset=train_set, batch_size=batch_size, num_workers=0, **dataloader_args
+    )
+    train_steps = len(train_loader)
+    trainer._set_accumulation_steps(trainer.accumulation_steps, train_steps)
+    if rank == 0:
+        messages.put(train_steps)
+
+    for epoch, lrs in iter(commands[rank].get, None):
+        # the learning rate schedulers are stepped by the main process
+        for group, lr in zip(trainer.optimizer.param_groups, lrs):
+            group["lr"] = lr
+        if isinstance(train_loader.sampler, DistributedSampler):
+            train_loader.sampler.set_epoch(epoch)
+        if trainer.metric is not None:
+            trainer.metric.reset()
+
+        trainer.train_running_loss = 0.0
+        for batch_idx, (data, targett, lds_weightt) in enumerate(train_loader):
+            trainer._train_step(data, targett, batch_idx, epoch, lds_weightt)
+            if trainer._is_log_step(batch_idx, train_steps, log_freq):
+                # the loss and metrics are reduced across the workers at the
+                # end of the epoch
+                train_score, train_loss = trainer._running_score_and_loss(
+                    trainer.train_running_loss,
+                    batch_idx,
+                    sync=batch_idx == train_steps - 1,
+                )
+                if rank == 0:
+                    messages.put((batch_idx + 1, train_score, train_loss))
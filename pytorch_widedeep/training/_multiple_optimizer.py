@@ -1,4 +1,11 @@
-from pytorch_widedeep.wdtypes import Dict, Optimizer
+import torch
+from torch import nn
+
+from pytorch_widedeep.wdtypes import Dict, List, Tuple, Optional, Optimizer
+from pytorch_widedeep.models.tabular.embeddings_layers import ShardedEmbedding
+
+# optimizers that support sparse gradients
+SPARSE_OPTIMIZERS = (torch.optim.SGD, torch.optim.SparseAdam, torch.optim.Adagrad)
 
 
 class MultipleOptimizer(object):
@@ -12,3 +19,69 @@ class MultipleOptimizer(object):
     def step(self):
         for _, op in self._optimizers.items():
             op.step()
+
+    @property
+    def param_groups(self) -> List[Dict]:
+        return [g for _, op in self._optimizers.items() for g in op.param_groups]
+
+
+class SparseMultipleOptimizer(MultipleOptimizer):
+    r"""`MultipleOptimizer` where the parameters with sparse gradients are
+    only optimized by the optimizer under the key _'sparse'_. The rest of
+    the optimizers (which might not support sparse gradients) are not
+    modified: the sparse parameters are simply skipped, since their
+    gradients are set to `None` before these optimizers take a step.
+
+    If `lr_sources` is not `None`, the learning rate of each param group of
+    the _'sparse'_ optimizer follows that of the corresponding param group
+    (of the optimizer the sparse parameters belong to) in `lr_sources`, so
+    that the learning rate schedulers of the latter also apply to them
+    """
+
+    def __init__(
+        self, opts: Dict[str, Optimizer], lr_sources: Optional[List[Dict]] = None
+    ):
+        super(SparseMultipleOptimizer, self).__init__(opts)
+        self.lr_sources = lr_sources
+
+    def step(self):
+        sparse_optimizer = self._optimizers["sparse"]
+        if self.lr_sources is not None:
+            for group, source in zip(sparse_optimizer.param_groups, self.lr_sources):
+                group["lr"] = source["lr"]
+        sparse_optimizer.step()
+        for group in sparse_optimizer.param_groups:
+            for p in group["params"]:
+                p.grad = None
+        for name, op in self._optimizers.items():
+            if name != "sparse":
+                op.step()
+
+
+def sparse_parameters(model: nn.Module) -> List[nn.Parameter]:
+    r"""Returns the parameters of the model that receive sparse gradients,
+    i.e. the weights of the `nn.Embedding`, `nn.EmbeddingBag` and
+    `ShardedEmbedding` layers with `sparse=True`
+    """
+    return [
+        m.weight
+        for m in model.modules()
+        if isinstance(m, (nn.Embedding, nn.EmbeddingBag, ShardedEmbedding)) and m.sparse
+    ]
+
+
+def sparse_param_groups(
+    optimizer: Optimizer, sparse_params: List[nn.Parameter]
+) -> List[Tuple[List[nn.Parameter], Dict]]:
+    r"""Returns the sparse parameters in each param group of an optimizer
+    that does not support sparse gradients, together with the param group
+    """
+    if isinstance(optimizer, SPARSE_OPTIMIZERS):
+        return []
+    sparse_ids = [id(p) for p in sparse_params]
+    groups: List[Tuple[List[nn.Parameter], Dict]] = []
+    for group in optimizer.param_groups:
+        params = [p for p in group["params"] if id(p) in sparse_ids]
+        if params:
+            groups.append((params, group))
+    return groups
@@ -1,3 +1,5 @@
+import warnings
+
 import numpy as np
 import torch
 from tqdm import tqdm
@@ -21,13 +23,29 @@ from pytorch_widedeep.losses import (
     FocalR_MSELoss,
     FocalR_RMSELoss,
 )
-from pytorch_widedeep.wdtypes import Dict, List, Optional, Transforms
+from pytorch_widedeep.wdtypes import (
+    Any,
+    Dict,
+    List,
+    Union,
+    Optional,
+    WideDeep,
+    Transforms,
+)
 from pytorch_widedeep.training._wd_dataset import WideDeepDataset
 from pytorch_widedeep.training._loss_and_obj_aliases import (
     _LossAliases,
     _ObjectiveToMethod,
 )
 
+PRECISION_DTYPES = {
+    "fp32": torch.float32,
+    "bf16": torch.bfloat16,
+    "fp16": torch.float16,
+}
+
+WIDEDEEP_COMPONENTS = ["wide", "deeptabular", "deeptext", "deepimage", "deephead"]
+
 
 def tabular_train_val_split(
     seed: int,
@@ -215,6 +233,174 @@ def _build_train_dict(X_wide, X_tab, X_text, X_img, target):
     return X_train
 
 
+def check_precision(precision: str) -> str:
+    r"""
+    Function to check the 'precision' parameter of the trainers
+
+    Parameters
+    ----------
+    precision: str
+        one of _'fp32'_, _'bf16'_ or _'fp16'_
+    """
+    if precision not in PRECISION_DTYPES:
+        raise ValueError(
+            "'precision' must be one of {}. Got '{}' instead".format(
+                ", ".join(["'{}'".format(p) for p in PRECISION_DTYPES]), precision
+            )
+        )
+    return precision
+
+
+def autocast(device: str, precision: str) -> torch.autocast:
+    r"""
+    Returns the context manager under which the forward passes (and the
+    losses) are run. With _'bf16'_ or _'fp16'_ precision, the operations
+    that are safe in lower precision (e.g. matrix multiplications) run in
+    that precision while the parameters of the model (i.e. the 'master
+    weights') remain in fp32
+
+    Parameters
+    ----------
+    device: str
+        device where the model is
+    precision: str
+        one of _'fp32'_, _'bf16'_ or _'fp16'_
+    """
+    return torch.autocast(
+        device_type=torch.device(device).type,
+        dtype=PRECISION_DTYPES[precision] if precision != "fp32" else None,
+        enabled=precision != "fp32",
+    )
+
+
+def grad_scaler(device: str, precision: str) -> "torch.cuda.amp.GradScaler":
+    r"""
+    Returns the gradient scaler used to avoid the underflow of the gradients
+    when training with _'fp16'_ precision. With any other precision the
+    scaler is disabled (bf16 has the same range as fp32) and
+    `scaler.step(optimizer)` simply calls `optimizer.step()`
+
+    Parameters
+    ----------
+    device: str
+        device where the model is
+    precision: str
+        one of _'fp32'_, _'bf16'_ or _'fp16'_
+    """
+    device_type = torch.device(device).type
+    if hasattr(torch.amp, "GradScaler"):
+        return torch.amp.GradScaler(device_type, enabled=precision == "fp16")
+    # torch < 2.3 only has the CUDA scaler. On any other device fp16
+    # training runs with no scaling of the loss
+    return torch.cuda.amp.GradScaler(
+        enabled=precision == "fp16" and device_type == "cuda"
+    )
+
+
+def compile_model(
+    model: WideDeep,
+    compile: Union[bool, str],
+    compile_kwargs: Optional[Dict[str, Any]] = None,
+) -> WideDeep:
+    r"""
+    Function to compile (in place) the forward pass of a `WideDeep` model
+    with `torch.compile`. The model is not wrapped, so its attributes and
+    the keys of its state dict remain the same.
+
+    Compilation happens at the first forward pass. If it fails (e.g. due to
+    an unsupported operation or a missing compiler toolchain) a warning is
+    raised and the module falls back to eager mode. Any other error, or
+    errors in later forward passes, are raised as usual
+
+    Parameters
+    ----------
+    model: WideDeep
+        model to be compiled
+    compile: bool or str
+        one of `False`, `True`/_'model'_ or _'components'_. With
+        _'model'_ the whole `WideDeep` forward is compiled (and the python
+        control flow over the components is traced once). With
+        _'components'_ each of the components (i.e. `wide`,
+        `deeptabular`, `deeptext`, `deepimage` and `deephead`) is compiled
+        separately, which is more robust to graph breaks
+    compile_kwargs: Dict, Optional, default = None
+        keyword arguments passed to `torch.compile` (e.g. `mode` or
+        `dynamic`)
+    """
+    if compile is False:
+        return model
+    if compile is True:
+        compile = "model"
+    if compile not in ["model", "components"]:
+        raise ValueError(
+            "'compile' must be one of False, True, 'model' or 'components'. "
+            f"Got {compile} instead"
+        )
+    if not hasattr(nn.Module, "compile"):
+        warnings.warn(
+            "'nn.Module.compile' is not available in this version of torch "
+            f"({torch.__version__}). The model will run in eager mode",
+            UserWarning,
+        )
+        return model
+
+    compile_kwargs = compile_kwargs if compile_kwargs is not None else {}
+    if compile == "model":
+        _compile_with_fallback(model, compile_kwargs)
+    else:
+        for name in WIDEDEEP_COMPONENTS:
+            component = getattr(model, name, None)
+            if component is not None:
+                _compile_with_fallback(component, compile_kwargs)
+    return model
+
+
+class _CompiledCallWithFallback:
+    # compiled version of 'module.__call__' that, if the compilation fails
+    # at the first call, resets the module to eager mode and re-runs the
+    # call. Only compilation errors are caught and only at the first call:
+    # any other error would also happen in eager mode, and re-running a
+    # forward pass that has already run (part of) its side effects (e.g.
+    # batchnorm stats, memory-mapped caches or the collectives of sharded
+    # embeddings) is not safe
+    def __init__(self, module: nn.Module, compile_kwargs: Dict[str, Any]):
+        from torch._dynamo.exc import (
+            Unsupported,
+            BackendCompilerFailed,
+            InternalTorchDynamoError,
+        )
+
+        self.module = module
+        self.compiled_call = torch.compile(module._call_impl, **compile_kwargs)
+        self.compilation_errors = (
+            Unsupported,
+            BackendCompilerFailed,
+            InternalTorchDynamoError,
+        )
+        self.compiled = False
+
+    def __call__(self, *args, **kwargs):
+        if self.compiled:
+            return self.compiled_call(*args, **kwargs)
+        try:
+            out = self.compiled_call(*args, **kwargs)
+        except self.compilation_errors as e:
+            warnings.warn(
+                f"Compilation of '{type(self.module).__name__}' failed with "
+                f"'{type(e).__name__}: {e}'. Falling back to eager mode",
+                UserWarning,
+            )
+            self.module._compiled_call_impl = None
+            return self.module._call_impl(*args, **kwargs)
+        self.compiled = True
+        return out
+
+
+def _compile_with_fallback(module: nn.Module, compile_kwargs: Dict[str, Any]):
+    # same as 'module.compile(**compile_kwargs)', but with the fallback
+    module._compiled_call_impl = _CompiledCallWithFallback(module, compile_kwargs)
+
+
 def print_loss_and_metric(pb: tqdm, loss: float, score: Optional[Dict] = None):
     r"""
     Function to improve readability and avoid code repetition in the
@@ -18,9 +18,13 @@ class WideDeepDataset(Dataset):
     Parameters
     ----------
     X_wide: np.ndarray
-        wide input
+        wide input. It can also be a `MultiHotArray` (see below)
     X_tab: np.ndarray
-        deeptabular input
+        deeptabular input. It can also be a `MultiHotArray`, i.e. the output
+        of a `WidePreprocessor` or a `TabPreprocessor` with multi-hot
+        columns, where these columns are stored as values and offsets. The
+        rows are padded (to the fixed width expected by the models) only
+        when they are retrieved
     X_text: np.ndarray
         deeptext input
     X_img: np.ndarray
@@ -9,11 +9,13 @@ import torch.nn.functional as F
 from tqdm import trange
 from torch import nn
 from torchmetrics import Metric as TorchMetric
-from torch.utils.data import DataLoader
+from torch.utils.data import DataLoader, DistributedSampler
+from torch.nn.parallel import DistributedDataParallel
 
 from pytorch_widedeep.losses import ZILNLoss
 from pytorch_widedeep.metrics import Metric
 from pytorch_widedeep.wdtypes import (
+    Any,
     Dict,
     List,
     Tuple,
@@ -28,12 +30,23 @@ from pytorch_widedeep.wdtypes import (
 )
 from pytorch_widedeep.callbacks import Callback
 from pytorch_widedeep.dataloaders import DataLoaderDefault
+from pytorch_widedeep.distributed import (
+    rank_path,
+    all_reduce,
+    is_distributed,
+    broadcast_model,
+    is_main_process,
+    n_local_samples,
+    saves_per_process,
+)
 from pytorch_widedeep.initializers import Initializer
+from pytorch_widedeep.training._hogwild import HogwildWorkers
 from pytorch_widedeep.training._finetune import FineTune
 from pytorch_widedeep.utils.general_utils import Alias
 from pytorch_widedeep.training._wd_dataset import WideDeepDataset
 from pytorch_widedeep.training._base_trainer import BaseTrainer
 from pytorch_widedeep.training._trainer_utils import (
+    autocast,
     save_epoch_logs,
     wd_train_val_split,
     print_loss_and_metric,
@@ -42,6 +55,7 @@ from pytorch_widedeep.training._feature_importance import (
     Explainer,
     FeatureImportance,
 )
+from pytorch_widedeep.models.tabular.embeddings_layers import ShardedEmbedding
 
 
 class Trainer(BaseTrainer):
@@ -163,6 +177,60 @@ class Trainer(BaseTrainer):
             take a step: One of _'loss'_ or _'metric'_. The ReduceLROnPlateau
             learning rate is a bit particular.
 
+        - **sparse_optimizer**: `Optimizer`<br/>
+            optimizer for the parameters with sparse gradients (e.g. those of
+            a `Wide` model with `sparse=True`). These parameters are skipped
+            by the optimizers that do not support sparse gradients, which are
+            otherwise left as they are passed. If not passed, it defaults to
+            `SparseAdam` with the learning rate of the optimizer the
+            parameters are in, which follows that of this optimizer during
+            training (i.e. its learning rate scheduler also applies to the
+            sparse parameters). The learning rate scheduler of a
+            `sparse_optimizer` passed here can be passed within a
+            dictionary of `lr_schedulers`, under the key _'sparse'_
+
+        - **precision**: `str`<br/>
+            One of _'fp32'_ (default), _'bf16'_ or _'fp16'_. With _'bf16'_
+            or _'fp16'_ the forward passes (training, evaluation, prediction
+            and fine-tuning) run under `torch.autocast` with that dtype,
+            while the parameters of the model are kept in fp32. With
+            _'fp16'_ a gradient scaler is used to avoid the underflow of the
+            gradients. Note that bf16 requires hardware support to be faster
+            (e.g. AVX512-BF16/AMX CPUs or Ampere and newer GPUs)
+
+        - **compile**: `Union[bool, str]`<br/>
+            One of `False` (default), `True`/_'model'_ or _'components'_.
+            If not `False` the forward pass is compiled with
+            `torch.compile`, either that of the whole model (_'model'_) or
+            that of each of its components (_'components'_). The model is
+            compiled in place, so its attributes and state dict do not
+            change. If compilation fails at the first forward pass, the
+            model falls back to eager mode with a warning. Note that the first forward passes (and those
+            with a new batch size) are slower, since that is when the
+            compilation happens
+
+        - **compile_kwargs**: `Dict`<br/>
+            keyword arguments passed to `torch.compile` (e.g.
+            `{"mode": "max-autotune"}` or `{"dynamic": False}`)
+
+        - **ddp_kwargs**: `Dict`<br/>
+            keyword arguments passed to `DistributedDataParallel` in
+            distributed training (e.g. `{"find_unused_parameters": True}`).
+            The `Trainer` trains in distributed mode if it is instantiated
+            within a process group of more than one process (see
+            `pytorch_widedeep.distributed.launch`). In that case each
+            process trains on a different shard of the training (and
+            validation) data, the gradients are all-reduced across processes
+            and so are the losses and metrics at the end of each epoch. All
+            processes therefore have the same `History` and take the same
+            decisions (early stopping, best weights, etc). Only the process
+            with rank 0 prints and writes to disk. The parameters of the
+            sharded embeddings (see `ShardedEmbedding`) are not synchronised
+            by `DistributedDataParallel`. Note that `batch_size` is
+            the batch size per process and that, if fine-tuning is used, the
+            fine-tuned weights of the process with rank 0 are broadcast to
+            all processes
+
     Attributes
     ----------
     cyclic_lr: bool
@@ -253,6 +321,21 @@ class Trainer(BaseTrainer):
             **kwargs,
         )
 
+        if is_distributed():
+            # the sharded embeddings hold different rows in each process and
+            # exchange their gradients themselves
+            DistributedDataParallel._set_params_and_buffers_to_ignore_for_model(
+                self.model,
+                [
+                    name + ".weight"
+                    for name, m in self.model.named_modules()
+                    if isinstance(m, ShardedEmbedding)
+                ],
+            )
+            self.ddp_model = DistributedDataParallel(
+                self.model, **kwargs.get("ddp_kwargs", {})
+            )
+
     @Alias("finetune", "warmup")
     def fit(  # noqa: C901
         self,
@@ -271,6 +354,9 @@ class Trainer(BaseTrainer):
         feature_importance_sample_size: Optional[int] = None,
         finetune: bool = False,
         with_lds: bool = False,
+        log_freq: int = 1,
+        gradient_accumulation_steps: int = 1,
+        hogwild_workers: int = 0,
         **kwargs,
     ):
         r"""Fit methodx_valx_val.
@@ -351,6 +437,48 @@ class Trainer(BaseTrainer):
             experimental and we recommend the user to not use it unless the
             corresponding [publication](https://arxiv.org/abs/2102.09554) is
             well understood
+        log_freq: int, default=1
+            number of steps between updates of the running loss and metrics
+            shown in the progress bar. The loss and the metrics are
+            accumulated on the device where the model is, and are only
+            materialised (which requires a host-device synchronisation) every
+            `log_freq` steps and at the end of each epoch. Therefore, larger
+            values result in faster training loops, especially on GPU. Note
+            that the values at the end of each epoch (and hence those in the
+            `History` callback) do not depend on `log_freq`. If `verbose` is
+            not 1 the values are only materialised at the end of each epoch
+        gradient_accumulation_steps: int, default=1
+            number of batches whose gradients are accumulated before the
+            optimizer takes a step. The effective batch size is therefore
+            `batch_size * gradient_accumulation_steps`, while the memory used
+            is that of `batch_size`. The loss of each batch is scaled so
+            that the gradients are those of the mean loss over the
+            accumulated batches. The learning rate schedulers that step per
+            batch (i.e. the cyclic ones) step per optimizer step, so their
+            number of steps per epoch (e.g. `steps_per_epoch` in
+            `OneCycleLR`) must be `ceil(n_batches /
+            gradient_accumulation_steps)`. The loss and metrics (and
+            therefore the `History` callback) are still computed per batch.
+            Note that, for models with batch normalisation, the statistics
+            are computed over each batch (not over the effective batch).
+            Gradient accumulation is not supported for models with
+            memory-mapped embedding tables
+        hogwild_workers: int, default=0
+            if greater than 0, the model is placed in shared memory and
+            trained asynchronously and without locks (i.e. _Hogwild!_ style)
+            by `hogwild_workers` processes, each with its own shard of the
+            training data and its own copy of the optimizer. This process
+            coordinates the epochs and takes care of the progress bar, the
+            validation, the callbacks (e.g. checkpointing or early stopping)
+            and of the learning rate schedulers (the cyclic ones are not
+            supported). The training loss and metrics are averaged over the
+            processes. This is meant for CPU training of models where each
+            step only updates a few rows of large embeddings, such as a
+            `Wide` model with `sparse=True`, where the updates of different
+            processes rarely collide and synchronous data parallelism would
+            mostly all-reduce zeros. Custom dataloaders (e.g.
+            `DataLoaderImbalanced`) must shard the data when used within a
+            process group (see `pytorch_widedeep.distributed`)
 
         Other Parameters
         ----------------
@@ -420,6 +548,11 @@ class Trainer(BaseTrainer):
         folder in the repo
         """
 
+        if not isinstance(log_freq, int) or log_freq < 1:
+            raise ValueError(
+                f"'log_freq' must be a positive integer. Got {log_freq} instead"
+            )
+
         lds_args, dataloader_args, finetune_args = self._extract_kwargs(kwargs)
         lds_args["with_lds"] = with_lds
         self.with_lds = with_lds
@@ -461,74 +594,143 @@ class Trainer(BaseTrainer):
                 **dataloader_args,
             )
         train_steps = len(train_loader)
+        self._set_accumulation_steps(gradient_accumulation_steps, train_steps)
         if eval_set is not None:
             eval_loader = DataLoader(
                 dataset=eval_set,
                 batch_size=batch_size,
                 num_workers=self.num_workers,
+                sampler=(
+                    DistributedSampler(eval_set, shuffle=False)
+                    if is_distributed()
+                    else None
+                ),
                 shuffle=False,
             )
             eval_steps = len(eval_loader)
+            # the samples repeated by the DistributedSampler are excluded
+            # from the validation loss and metrics
+            n_eval_samples = (
+                n_local_samples(len(eval_set)) if is_distributed() else None
+            )
 
         if finetune:
             self._finetune(train_loader, **finetune_args)
-            if self.verbose:
+            # each process has fine-tuned on its own shard of the data
+            broadcast_model(self.model)
+            if self.verbose and is_main_process():
                 print(
                     "Fine-tuning (or warmup) of individual components completed. "
                     "Training the whole model for {} epochs".format(n_epochs)
                 )
 
+        hogwild = (
+            self._start_hogwild(
+                hogwild_workers,
+                train_set,
+                batch_size,
+                custom_dataloader,
+                dataloader_args,
+                log_freq,
+            )
+            if hogwild_workers > 0
+            else None
+        )
         self.callback_container.on_train_begin(
             {"batch_size": batch_size, "train_steps": train_steps, "n_epochs": n_epochs}
         )
-        for epoch in range(n_epochs):
-            epoch_logs: Dict[str, float] = {}
-            self.callback_container.on_epoch_begin(epoch, logs=epoch_logs)
-
-            self.train_running_loss = 0.0
-            with trange(train_steps, disable=self.verbose != 1) as t:
-                for batch_idx, (data, targett, lds_weightt) in zip(t, train_loader):
-                    t.set_description("epoch %i" % (epoch + 1))
-                    train_score, train_loss = self._train_step(
-                        data, targett, batch_idx, epoch, lds_weightt
+        try:
+            for epoch in range(n_epochs):
+                epoch_logs: Dict[str, float] = {}
+                self.callback_container.on_epoch_begin(epoch, logs=epoch_logs)
+
+                if isinstance(train_loader.sampler, DistributedSampler):
+                    train_loader.sampler.set_epoch(epoch)
+                self.train_running_loss = 0.0
+                if hogwild is not None:
+                    train_score, train_loss = hogwild.train_epoch(
+                        epoch,
+                        [g["lr"] for g in self.optimizer.param_groups],
+                        self._disable_pbar(),
                     )
-                    print_loss_and_metric(t, train_loss, train_score)
-                    self.callback_container.on_batch_end(batch=batch_idx)
-            epoch_logs = save_epoch_logs(epoch_logs, train_loss, train_score, "train")
-
-            on_epoch_end_metric = None
-            if eval_set is not None and epoch % validation_freq == (
-                validation_freq - 1
-            ):
-                self.callback_container.on_eval_begin()
-                self.valid_running_loss = 0.0
-                with trange(eval_steps, disable=self.verbose != 1) as v:
-                    for i, (data, targett) in zip(v, eval_loader):
+                else:
+                    with trange(train_steps, disable=self._disable_pbar()) as t:
+                        t.set_description("epoch %i" % (epoch + 1))
+                        for batch_idx, (data, targett, lds_weightt) in zip(
+                            t, train_loader
+                        ):
+                            self._train_step(
+                                data, targett, batch_idx, epoch, lds_weightt
+                            )
+                            if self._is_log_step(batch_idx, train_steps, log_freq):
+                                train_score, train_loss = self._running_score_and_loss(
+                                    self.train_running_loss,
+                                    batch_idx,
+                                    sync=batch_idx == train_steps - 1,
+                                )
+                                print_loss_and_metric(t, train_loss, train_score)
+                            self.callback_container.on_batch_end(batch=batch_idx)
+                epoch_logs = save_epoch_logs(
+                    epoch_logs, train_loss, train_score, "train"
+                )
+
+                on_epoch_end_metric = None
+                if eval_set is not None and epoch % validation_freq == (
+                    validation_freq - 1
+                ):
+                    self.callback_container.on_eval_begin()
+                    self.valid_running_loss = 0.0
+                    self.valid_steps = 0
+                    with trange(eval_steps, disable=self._disable_pbar()) as v:
                         v.set_description("valid")
-                        val_score, val_loss = self._eval_step(data, targett, i)
-                        print_loss_and_metric(v, val_loss, val_score)
-                epoch_logs = save_epoch_logs(epoch_logs, val_loss, val_score, "val")
-
-                if self.reducelronplateau:
-                    if self.reducelronplateau_criterion == "loss":
-                        on_epoch_end_metric = val_loss
-                    else:
-                        on_epoch_end_metric = val_score[
-                            self.reducelronplateau_criterion
-                        ]
-            else:
-                if self.reducelronplateau:
-                    raise NotImplementedError(
-                        "ReduceLROnPlateau scheduler can be used only with validation data."
-                    )
-            self.callback_container.on_epoch_end(epoch, epoch_logs, on_epoch_end_metric)
+                        for i, (data, targett) in zip(v, eval_loader):
+                            self._eval_step(
+                                data,
+                                targett,
+                                i,
+                                (
+                                    n_eval_samples - i * batch_size
+                                    if n_eval_samples is not None
+                                    else None
+                                ),
+                            )
+                            if self._is_log_step(i, eval_steps, log_freq):
+                                val_score, val_loss = self._running_score_and_loss(
+                                    self.valid_running_loss,
+                                    max(self.valid_steps, 1) - 1,
+                                    sync=i == eval_steps - 1,
+                                )
+                                print_loss_and_metric(v, val_loss, val_score)
+                    epoch_logs = save_epoch_logs(epoch_logs, val_loss, val_score, "val")
+
+                    if self.reducelronplateau:
+                        if self.reducelronplateau_criterion == "loss":
+                            on_epoch_end_metric = val_loss
+                        else:
+                            on_epoch_end_metric = val_score[
+                                self.reducelronplateau_criterion
+                            ]
+                else:
+                    if self.reducelronplateau:
+                        raise NotImplementedError(
+                            "ReduceLROnPlateau scheduler can be used only with validation data."
+                        )
+                self.callback_container.on_epoch_end(
+                    epoch, epoch_logs, on_epoch_end_metric
+                )
+
+                # all processes must stop at the same epoch
+                self.early_stop = bool(all_reduce(self.early_stop, op="max"))
+                if self.early_stop:
+                    # self.callback_container.on_train_end(epoch_logs)
+                    break
 
-            if self.early_stop:
-                # self.callback_container.on_train_end(epoch_logs)
-                break
+                if self.model.with_fds:
+                    self._update_fds_stats(train_loader, epoch)
 
-            if self.model.with_fds:
-                self._update_fds_stats(train_loader, epoch)
+        finally:
+            if hogwild is not None:
+                hogwild.close()
 
         self.callback_container.on_train_end(epoch_logs)
 
@@ -794,9 +996,31 @@ class Trainer(BaseTrainer):
             model's state dictionary
         model_filename: str, Optional, default = "wd_model.pt"
             filename where the model weights will be store
+
+        In distributed training, only the process with rank 0 saves, unless
+        the model has sharded embeddings. In that case each process saves its
+        own model (or state dict), with its shards of the tables, in
+        `model_filename` with a `_rank{rank}` suffix (see
+        `pytorch_widedeep.distributed.load_checkpoint`)
         """
+        per_process = saves_per_process(self.model)
+        if not (per_process or is_main_process()):
+            return
 
         save_dir = Path(path)
+        save_dir.mkdir(exist_ok=True, parents=True)
+
+        model_path = save_dir / model_filename
+        if per_process:
+            model_path = Path(rank_path(str(model_path)))
+        if save_state_dict:
+            torch.save(self.model.state_dict(), model_path)
+        else:
+            torch.save(self.model, model_path)
+
+        if not is_main_process():
+            return
+
         history_dir = save_dir / "history"
         history_dir.mkdir(exist_ok=True, parents=True)
 
@@ -811,12 +1035,6 @@ class Trainer(BaseTrainer):
             with open(history_dir / "lr_history.json", "w") as lrh:
                 json.dump(self.lr_history, lrh)  # type: ignore[attr-defined]
 
-        model_path = save_dir / model_filename
-        if save_state_dict:
-            torch.save(self.model.state_dict(), model_path)
-        else:
-            torch.save(self.model, model_path)
-
         if self.model.is_tabnet:
             with open(save_dir / "feature_importance.json", "w") as fi:
                 json.dump(self.feature_importance, fi)
@@ -847,7 +1065,9 @@ class Trainer(BaseTrainer):
                 "Currently warming up is only supported without a fully connected 'DeepHead'"
             )
 
-        finetuner = FineTune(self.loss_fn, self.metric, self.method, self.verbose)
+        finetuner = FineTune(
+            self.loss_fn, self.metric, self.method, self.verbose, self.precision
+        )
         if self.model.wide:
             finetuner.finetune_all(self.model.wide, "wide", loader, n_epochs, max_lr)
 
@@ -905,9 +1125,9 @@ class Trainer(BaseTrainer):
         lds_weightt: Tensor,
     ):
         lds_weight = (
-            None
-            if torch.all(lds_weightt == 0)
-            else lds_weightt.view(-1, 1).to(self.device)
+            lds_weightt.view(-1, 1).to(self.device)
+            if self.with_lds and not torch.all(lds_weightt == 0)
+            else None
         )
         if (
             self.with_lds
@@ -930,70 +1150,148 @@ class Trainer(BaseTrainer):
         )
         y = y.to(self.device)
 
-        self.optimizer.zero_grad()
-
-        if self.model.with_fds:
-            _, y_pred = self.model(X, y, epoch)
-        else:
-            y_pred = self.model(X)
-            y_pred = y_pred.to(self.device)
-
-        if self.model.is_tabnet:
-            loss = self.loss_fn(y_pred[0], y) - self.lambda_sparse * y_pred[1]
-            score = self._get_score(y_pred[0], y)
-        else:
-            loss = (
-                self.loss_fn(y_pred, y)
-                if not self.with_lds
-                else self.loss_fn(y_pred, y, lds_weight=lds_weight)
-            )
-            score = self._get_score(y_pred, y)
-
-        loss.backward()
-        self.optimizer.step()
+        # in distributed training the forward pass goes through the
+        # 'DistributedDataParallel' wrapper, that all-reduces the gradients
+        model = self.ddp_model if self.ddp_model is not None else self.model
+        with self._grad_sync(batch_idx):
+            with autocast(self.device, self.precision):
+                if self.model.with_fds:
+                    _, y_pred = model(X, y, epoch)
+                else:
+                    y_pred = model(X)
+
+                if self.model.is_tabnet:
+                    loss = self.loss_fn(y_pred[0], y) - self.lambda_sparse * y_pred[1]
+                    self._update_metric(y_pred[0], y)
+                else:
+                    loss = (
+                        self.loss_fn(y_pred, y)
+                        if not self.with_lds
+                        else self.loss_fn(y_pred, y, lds_weight=lds_weight)
+                    )
+                    self._update_metric(y_pred, y)
 
-        self.train_running_loss += loss.item()
-        avg_loss = self.train_running_loss / (batch_idx + 1)
+            self._backward_and_step(loss, batch_idx)
 
-        return score, avg_loss
+        # accumulated on device (in double precision, as the python float it
+        # used to be) to avoid a synchronisation per step
+        self.train_running_loss += loss.detach().double()
 
-    def _eval_step(self, data: Dict[str, Tensor], target: Tensor, batch_idx: int):
+    def _eval_step(
+        self,
+        data: Dict[str, Tensor],
+        target: Tensor,
+        batch_idx: int,
+        n_samples: Optional[int] = None,
+    ):
+        # 'n_samples' is the number of samples (from the start of the batch)
+        # that are not repeated ones (see 'n_local_samples')
         self.model.eval()
         with torch.no_grad():
             X = {k: v.to(self.device) for k, v in data.items()}
             y = (
                 target.view(-1, 1).float()
-                if self.method not in ["multiclass", "qregression", 'regression']
+                if self.method not in ["multiclass", "qregression", "regression"]
                 else target.float()
             )
             y = y.to(self.device)
 
-            y_pred = self.model(X)
-            if self.model.is_tabnet:
-                loss = self.loss_fn(y_pred[0], y) - self.lambda_sparse * y_pred[1]
-                score = self._get_score(y_pred[0], y)
-            else:
-                score = self._get_score(y_pred, y)
-                loss = self.loss_fn(y_pred, y)
-
-            self.valid_running_loss += loss.item()
-            avg_loss = self.valid_running_loss / (batch_idx + 1)
+            with autocast(self.device, self.precision):
+                y_pred = self.model(X)
+                if n_samples is not None and n_samples < y.size(0):
+                    if n_samples <= 0:
+                        return
+                    y = y[:n_samples]
+                    y_pred = (
+                        (y_pred[0][:n_samples], y_pred[1])
+                        if self.model.is_tabnet
+                        else y_pred[:n_samples]
+                    )
+                if self.model.is_tabnet:
+                    loss = self.loss_fn(y_pred[0], y) - self.lambda_sparse * y_pred[1]
+                    self._update_metric(y_pred[0], y)
+                else:
+                    self._update_metric(y_pred, y)
+                    loss = self.loss_fn(y_pred, y)
 
-        return score, avg_loss
+            self.valid_running_loss += loss.detach().double()
+            self.valid_steps += 1
 
-    def _get_score(self, y_pred, y):
+    def _update_metric(self, y_pred: Tensor, y: Tensor):
         if self.metric is not None:
-            if self.method == "regression":
-                score = self.metric(y_pred, y)
+            y_pred = y_pred.float()
+            if self.method in ["regression", "qregression"]:
+                self.metric.update(y_pred, y)
             if self.method == "binary":
-                score = self.metric(torch.sigmoid(y_pred), y)
-            if self.method == "qregression":
-                score = self.metric(y_pred, y)
+                self.metric.update(torch.sigmoid(y_pred), y)
             if self.method == "multiclass":
-                score = self.metric(F.softmax(y_pred, dim=1), y)
-            return score
-        else:
-            return None
+                self.metric.update(F.softmax(y_pred, dim=1), y)
+
+    def _running_score_and_loss(
+        self, running_loss: Tensor, batch_idx: int, sync: bool = False
+    ) -> Tuple[Optional[Dict], float]:
+        # materialises the metrics and the average loss since the beginning
+        # of the epoch (or the evaluation). With 'sync' (i.e. at the end of
+        # the epoch) these are reduced across processes in distributed
+        # training, so that all processes have the same History
+        n_steps = batch_idx + 1
+        if sync:
+            if self.metric is not None:
+                self.metric.sync()
+            # processes might have run a different number of steps (see
+            # 'n_local_samples')
+            running_loss = all_reduce(running_loss)
+            n_steps = int(all_reduce(n_steps).item())
+        score = self.metric.compute() if self.metric is not None else None
+        return score, running_loss.item() / n_steps
+
+    def _start_hogwild(
+        self,
+        n_workers: int,
+        train_set: WideDeepDataset,
+        batch_size: int,
+        custom_dataloader: Optional[DataLoader],
+        dataloader_args: Dict[str, Any],
+        log_freq: int,
+    ) -> HogwildWorkers:
+        if is_distributed():
+            raise ValueError(
+                "Hogwild training cannot be used within a distributed process group"
+            )
+        if self.device != "cpu":
+            raise ValueError("Hogwild training is only supported on CPU")
+        if self.cyclic_lr:
+            raise ValueError(
+                "Hogwild training does not support learning rate schedulers "
+                "that step per batch (i.e. cyclic ones)"
+            )
+        if self._has_mmap_embeddings():
+            # the cache index of the memory-mapped embeddings is local to
+            # each process
+            raise ValueError(
+                "Hogwild training does not support memory-mapped embeddings"
+            )
+        return HogwildWorkers(
+            self,
+            train_set,
+            batch_size,
+            (
+                custom_dataloader
+                if isinstance(custom_dataloader, type)
+                else DataLoaderDefault
+            ),
+            dataloader_args,
+            n_workers,
+            log_freq,
+        )
+
+    def _disable_pbar(self) -> bool:
+        return self.verbose != 1 or not is_main_process()
+
+    def _is_log_step(self, batch_idx: int, n_steps: int, log_freq: int) -> bool:
+        return batch_idx == n_steps - 1 or (
+            self.verbose == 1 and (batch_idx + 1) % log_freq == 0
+        )
 
     def _fds_step(
         self,
@@ -1093,11 +1391,14 @@ class Trainer(BaseTrainer):
                         for j, data in zip(tt, test_loader):
                             tt.set_description("predict")
                             X = {k: v.to(self.device) for k, v in data.items()}
-                            preds = (
-                                self.model(X)
-                                if not self.model.is_tabnet
-                                else self.model(X)[0]
-                            )
+                            with autocast(self.device, self.precision):
+                                preds = (
+                                    self.model(X)
+                                    if not self.model.is_tabnet
+                                    else self.model(X)[0]
+                                )
+                            # the post-processing (and numpy) in fp32
+                            preds = preds.float()
                             if self.method == "binary":
                                 preds = torch.sigmoid(preds)
                             if self.method == "multiclass":
@@ -30,6 +30,7 @@ from pytorch_widedeep.utils.general_utils import Alias
 from pytorch_widedeep.training._wd_dataset import WideDeepDataset
 from pytorch_widedeep.training._base_trainer import BaseTrainer
 from pytorch_widedeep.training._trainer_utils import (
+    autocast,
     save_epoch_logs,
     print_loss_and_metric,
 )
@@ -169,6 +170,22 @@ class TrainerFromFolder(BaseTrainer):
             take a step: One of _'loss'_ or _'metric'_. The ReduceLROnPlateau
             learning rate is a bit particular.
 
+        - **sparse_optimizer**: `Optimizer`<br/>
+            optimizer for the parameters with sparse gradients (e.g. those of
+            a `Wide` model with `sparse=True`). See `Trainer`
+
+        - **precision**: `str`<br/>
+            One of _'fp32'_ (default), _'bf16'_ or _'fp16'_. Mixed precision
+            training, evaluation and prediction. See `Trainer`
+
+        - **compile**: `Union[bool, str]`<br/>
+            One of `False` (default), `True`/_'model'_ or _'components'_.
+            Compilation of the forward pass with `torch.compile`. See
+            `Trainer`
+
+        - **compile_kwargs**: `Dict`<br/>
+            keyword arguments passed to `torch.compile`. See `Trainer`
+
     Attributes
     ----------
     cyclic_lr: bool
@@ -220,11 +237,13 @@ class TrainerFromFolder(BaseTrainer):
         n_epochs: int = 1,
         validation_freq: int = 1,
         finetune: bool = False,
+        gradient_accumulation_steps: int = 1,
         **kwargs,
     ):
         finetune_args = self._extract_kwargs(kwargs)
 
         train_steps = len(train_loader)
+        self._set_accumulation_steps(gradient_accumulation_steps, train_steps)
 
         if finetune:
             self._finetune(train_loader, **finetune_args)
@@ -444,7 +463,9 @@ class TrainerFromFolder(BaseTrainer):
                 "Currently warming up is only supported without a fully connected 'DeepHead'"
             )
 
-        finetuner = FineTune(self.loss_fn, self.metric, self.method, self.verbose)
+        finetuner = FineTune(
+            self.loss_fn, self.metric, self.method, self.verbose, self.precision
+        )
         if self.model.wide:
             finetuner.finetune_all(self.model.wide, "wide", loader, n_epochs, max_lr)
 
@@ -509,19 +530,17 @@ class TrainerFromFolder(BaseTrainer):
         )
         y = y.to(self.device)
 
-        self.optimizer.zero_grad()
-
-        y_pred = self.model(X)
+        with autocast(self.device, self.precision):
+            y_pred = self.model(X)
 
-        if self.model.is_tabnet:  # pragma: no cover
-            loss = self.loss_fn(y_pred[0], y) - self.lambda_sparse * y_pred[1]
-            score = self._get_score(y_pred[0], y)
-        else:
-            loss = self.loss_fn(y_pred, y)
-            score = self._get_score(y_pred, y)
+            if self.model.is_tabnet:  # pragma: no cover
+                loss = self.loss_fn(y_pred[0], y) - self.lambda_sparse * y_pred[1]
+                score = self._get_score(y_pred[0], y)
+            else:
+                loss = self.loss_fn(y_pred, y)
+                score = self._get_score(y_pred, y)
 
-        loss.backward()
-        self.optimizer.step()
+        self._backward_and_step(loss, batch_idx)
 
         self.train_running_loss += loss.item()
         avg_loss = self.train_running_loss / (batch_idx + 1)
@@ -539,13 +558,14 @@ class TrainerFromFolder(BaseTrainer):
             )
             y = y.to(self.device)
 
-            y_pred = self.model(X)
-            if self.model.is_tabnet:  # pragma: no cover
-                loss = self.loss_fn(y_pred[0], y) - self.lambda_sparse * y_pred[1]
-                score = self._get_score(y_pred[0], y)
-            else:
-                score = self._get_score(y_pred, y)
-                loss = self.loss_fn(y_pred, y)
+            with autocast(self.device, self.precision):
+                y_pred = self.model(X)
+                if self.model.is_tabnet:  # pragma: no cover
+                    loss = self.loss_fn(y_pred[0], y) - self.lambda_sparse * y_pred[1]
+                    score = self._get_score(y_pred[0], y)
+                else:
+                    score = self._get_score(y_pred, y)
+                    loss = self.loss_fn(y_pred, y)
 
             self.valid_running_loss += loss.item()
             avg_loss = self.valid_running_loss / (batch_idx + 1)
@@ -554,6 +574,7 @@ class TrainerFromFolder(BaseTrainer):
 
     def _get_score(self, y_pred, y):  # pragma: no cover
         if self.metric is not None:
+            y_pred = y_pred.float()
             if self.method == "regression":
                 score = self.metric(y_pred, y)
             if self.method == "binary":
@@ -638,11 +659,13 @@ class TrainerFromFolder(BaseTrainer):
                         for j, data in zip(tt, test_loader):
                             tt.set_description("predict")
                             X = {k: v.to(self.device) for k, v in data.items()}
-                            preds = (
-                                self.model(X)
-                                if not self.model.is_tabnet
-                                else self.model(X)[0]
-                            )
+                            with autocast(self.device, self.precision):
+                                preds = (
+                                    self.model(X)
+                                    if not self.model.is_tabnet
+                                    else self.model(X)[0]
+                                )
+                            preds = preds.float()
                             if self.method == "binary":
                                 preds = torch.sigmoid(preds)
                             if self.method == "multiclass":
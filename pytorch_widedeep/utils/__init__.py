@@ -8,5 +8,9 @@ from pytorch_widedeep.utils.image_utils import (
     SimplePreprocessor,
     AspectAwarePreprocessor,
 )
-from pytorch_widedeep.utils.deeptabular_utils import LabelEncoder
+from pytorch_widedeep.utils.deeptabular_utils import (
+    LabelEncoder,
+    ArrayEncoding,
+    MultiHotArray,
+)
 from pytorch_widedeep.utils.fastai_transforms import Vocab, Tokenizer
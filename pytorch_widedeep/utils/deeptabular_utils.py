@@ -1,4 +1,6 @@
+import copy
 import warnings
+from collections.abc import Mapping
 
 import numpy as np
 import torch
@@ -8,11 +10,14 @@ from sklearn.exceptions import NotFittedError
 from scipy.signal.windows import triang
 
 from pytorch_widedeep.wdtypes import (
+    Any,
     Dict,
     List,
+    Tuple,
     Union,
     Tensor,
     Literal,
+    Iterator,
     Optional,
 )
 from pytorch_widedeep.utils.general_utils import Alias
@@ -20,7 +25,14 @@ from pytorch_widedeep.utils.general_utils import Alias
 warnings.filterwarnings("ignore")
 pd.options.mode.chained_assignment = None
 
-__all__ = ["LabelEncoder", "find_bin", "get_kernel_window"]
+__all__ = [
+    "LabelEncoder",
+    "ArrayEncoding",
+    "MultiHotArray",
+    "flatten_multi_hot",
+    "find_bin",
+    "get_kernel_window",
+]
 
 
 class LabelEncoder:
@@ -47,32 +59,84 @@ class LabelEncoder:
         distinguish the classes in one column from those in the
         other columns_'. In other words, the idea is to let the model learn
         which column is embedded at the time. See: `pytorch_widedeep.models.transformers._layers.SharedEmbeddings`.
+    min_freq: int or Dict, Optional, default = None
+        Minimum frequency for a category to be encoded on its own. Categories
+        with a lower frequency are mapped to a shared `'[OTHER]'`
+        category. If an `int`, it applies to all columns. Alternatively, a
+        dictionary where the keys are column names and the values the
+        minimum frequency for that column.
+    max_categories: int or Dict, Optional, default = None
+        Maximum number of categories (excluding `'[OTHER]'`) encoded on their
+        own per column. Only the most frequent categories are kept and the
+        rest are mapped to the shared `'[OTHER]'` category. If an `int`, it
+        applies to all columns. Alternatively, a dictionary where the keys
+        are column names and the values the maximum number of categories for
+        that column.
+    shared_vocab_cols: List, Optional, default = None
+        List of Lists with the names of the columns that share a vocabulary,
+        e.g. _[['movie_id', 'prev_movie_1', 'prev_movie_2']]_. The
+        categories of all the columns in a group are encoded with a single
+        mapping (i.e. the same category has the same code in all of them).
+        When `min_freq` or `max_categories` apply, the frequencies are
+        computed over all the columns in the group and the params of the
+        first column of the group are used.
+
+    :information_source: **NOTE**: for the columns where `min_freq` or
+    `max_categories` apply, categories not seen during `fit` are also
+    mapped to `'[OTHER]'`. These columns cannot contain a category that is
+    literally named `'[OTHER]'`.
 
     Attributes
     ----------
     encoding_dict : Dict
         Dictionary containing the encoding mappings in the format, e.g. : <br/>
-        `{'colname1': {'cat1': 1, 'cat2': 2, ...}, 'colname2': {'cat1': 1, 'cat2': 2, ...}, ...}`
+        `{'colname1': {'cat1': 1, 'cat2': 2, ...}, 'colname2': {'cat1': 1, 'cat2': 2, ...}, ...}`.
+        The columns that share a vocabulary share the same mapping object
     inverse_encoding_dict : Dict
         Dictionary containing the inverse encoding mappings in the format, e.g. : <br/>
         `{'colname1': {1: 'cat1', 2: 'cat2', ...}, 'colname2': {1: 'cat1', 2: 'cat2', ...}, ...}`
+    other_idx : Dict
+        Dictionary where the keys are the columns where `min_freq` or
+        `max_categories` apply and the values are the index of the
+        `'[OTHER]'` category for that column
+    category_counts : Dict
+        Dictionary with the frequency of each category per column. Only
+        generated if `min_freq` or `max_categories` are not `None`
 
     """
 
+    # default values of the attributes added over time, so that encoders
+    # pickled before they existed can still be used
+    _attr_defaults: Dict[str, Any] = {
+        "min_freq": None,
+        "max_categories": None,
+        "other_idx": {},
+        "shared_vocab_cols": None,
+    }
+
     @Alias("with_attention", "for_transformer")
     def __init__(
         self,
         columns_to_encode: Optional[List[str]] = None,
         with_attention: bool = False,
         shared_embed: bool = False,
+        min_freq: Optional[Union[int, Dict[str, int]]] = None,
+        max_categories: Optional[Union[int, Dict[str, int]]] = None,
+        shared_vocab_cols: Optional[List[List[str]]] = None,
     ):
         self.columns_to_encode = columns_to_encode
 
         self.shared_embed = shared_embed
         self.with_attention = with_attention
+        self.min_freq = min_freq
+        self.max_categories = max_categories
+        self.shared_vocab_cols = shared_vocab_cols
 
         self.reset_embed_idx = not self.with_attention or self.shared_embed
 
+    def __setstate__(self, state: Dict[str, Any]):
+        self.__dict__.update({**copy.deepcopy(self._attr_defaults), **state})
+
     def partial_fit(self, chunk: pd.DataFrame) -> "LabelEncoder":  # noqa: C901
         """Main method. Creates encoding attributes.
 
@@ -94,13 +158,26 @@ class LabelEncoder:
             for col in self.columns_to_encode:
                 chunk[col] = chunk[col].astype("O")
 
+        vocab_groups = self._vocab_groups()
+
+        if self.min_freq is not None or self.max_categories is not None:
+            return self._partial_fit_with_frequencies(chunk, vocab_groups)
+
+        # the columns that share a vocabulary are encoded once, under the
+        # name of the first column of the group
         unique_column_vals: Dict[str, List[str]] = {}
-        for c in self.columns_to_encode:
-            unique_column_vals[c] = chunk[c].unique().tolist()
+        for c, cols in vocab_groups.items():
+            if len(cols) > 1:
+                unique_column_vals[c] = (
+                    pd.concat([chunk[col] for col in cols]).unique().tolist()
+                )
+            else:
+                unique_column_vals[c] = chunk[c].unique().tolist()
 
         if not hasattr(self, "encoding_dict"):
             # we run the method 'partial_fit' for the 1st time
             self.encoding_dict: Dict[str, Dict[str, int]] = {}
+            self.other_idx: Dict[str, int] = {}
             if "cls_token" in unique_column_vals and self.shared_embed:
                 self.encoding_dict["cls_token"] = {"[CLS]": 0}
                 del unique_column_vals["cls_token"]
@@ -127,7 +204,7 @@ class LabelEncoder:
             # Classes in the new chunk of the dataset that have not been seen
             # before
             unseen_classes: Dict[str, List[str]] = {}
-            for c in self.columns_to_encode:
+            for c in vocab_groups:
                 unseen_classes[c] = list(
                     np.setdiff1d(
                         unique_column_vals[c], list(self.encoding_dict[c].keys())
@@ -155,8 +232,134 @@ class LabelEncoder:
                         else self.cum_idx + len(unseen_classes[k])
                     )
 
+        self._share_vocabs(vocab_groups)
+
+        return self
+
+    def _vocab_groups(self) -> Dict[str, List[str]]:
+        # maps the first column (in the order of 'columns_to_encode') of each
+        # group of columns that share a vocabulary to the columns in the
+        # group. Columns that do not share a vocabulary are groups of one
+        shared_vocab_cols = (
+            self.shared_vocab_cols if self.shared_vocab_cols is not None else []
+        )
+        missing = [
+            c
+            for cols in shared_vocab_cols
+            for c in cols
+            if c not in self.columns_to_encode  # type: ignore[operator]
+        ]
+        if missing:
+            raise ValueError(
+                "The following columns in 'shared_vocab_cols' are not in "
+                f"'columns_to_encode': {missing}"
+            )
+        col_group = {c: i for i, cols in enumerate(shared_vocab_cols) for c in cols}
+        vocab_groups: Dict[str, List[str]] = {}
+        first_cols: Dict[int, str] = {}
+        for c in self.columns_to_encode:  # type: ignore[union-attr]
+            if c in col_group:
+                first_col = first_cols.setdefault(col_group[c], c)
+                vocab_groups.setdefault(first_col, []).append(c)
+            else:
+                vocab_groups[c] = [c]
+        return vocab_groups
+
+    def _share_vocabs(self, vocab_groups: Dict[str, List[str]]):
+        # the columns that share a vocabulary point to the mapping of the
+        # first column of their group. The encoding dict is rebuilt to
+        # preserve the order of the columns
+        if all([len(cols) == 1 for cols in vocab_groups.values()]):
+            return
+        first_col = {c: k for k, cols in vocab_groups.items() for c in cols}
+        self.encoding_dict = {
+            c: self.encoding_dict[first_col[c]]
+            for c in self.columns_to_encode  # type: ignore[union-attr]
+        }
+        for c, k in first_col.items():
+            if k in self.other_idx:
+                self.other_idx[c] = self.other_idx[k]
+
+    def _partial_fit_with_frequencies(
+        self, chunk: pd.DataFrame, vocab_groups: Dict[str, List[str]]
+    ) -> "LabelEncoder":
+        # The frequency of each category is accumulated across chunks and the
+        # encoding is rebuilt from these frequencies every time this method
+        # runs, since a category that is rare in one chunk might not be rare
+        # in the overall dataset. Categories are encoded in order of
+        # appearance. The frequencies of the columns that share a vocabulary
+        # are accumulated under the name of the first column of their group
+        if not hasattr(self, "category_counts"):
+            self.category_counts: Dict[str, Dict[Any, int]] = {
+                c: {} for c in vocab_groups
+            }
+        for c, cols in vocab_groups.items():
+            counts = self.category_counts[c]
+            values = (
+                pd.concat([chunk[col] for col in cols]) if len(cols) > 1 else chunk[c]
+            )
+            for cat, count in values.value_counts(dropna=False, sort=False).items():
+                counts[cat] = counts.get(cat, 0) + count
+
+        self.encoding_dict = {}
+        self.other_idx = {}
+        if "cls_token" in self.category_counts and self.shared_embed:
+            self.encoding_dict["cls_token"] = {"[CLS]": 0}
+
+        # leave 0 for padding/"unseen" categories
+        cum_idx = 1
+        for c, counts in self.category_counts.items():
+            if c == "cls_token" and self.shared_embed:
+                continue
+            min_freq = self._param_for_col(self.min_freq, c)
+            max_categories = self._param_for_col(self.max_categories, c)
+            if min_freq is None and max_categories is None:
+                self.encoding_dict[c] = {o: i + cum_idx for i, o in enumerate(counts)}
+            else:
+                if "[OTHER]" in counts:
+                    raise ValueError(
+                        f"Column '{c}' contains a category named '[OTHER]', which "
+                        "is reserved for the rare categories when 'min_freq' or "
+                        "'max_categories' are used"
+                    )
+                categories = self._frequent_categories(counts, min_freq, max_categories)
+                self.encoding_dict[c] = {
+                    o: i + cum_idx for i, o in enumerate(categories)
+                }
+                self.other_idx[c] = len(categories) + cum_idx
+                self.encoding_dict[c]["[OTHER]"] = self.other_idx[c]
+            cum_idx = (
+                1 if self.reset_embed_idx else cum_idx + len(self.encoding_dict[c])
+            )
+        self.cum_idx = cum_idx
+
+        self._share_vocabs(vocab_groups)
+
         return self
 
+    @staticmethod
+    def _param_for_col(
+        param: Optional[Union[int, Dict[str, int]]], col: str
+    ) -> Optional[int]:
+        if isinstance(param, dict):
+            return param.get(col)
+        return param
+
+    @staticmethod
+    def _frequent_categories(
+        counts: Dict[Any, int], min_freq: Optional[int], max_categories: Optional[int]
+    ) -> List[Any]:
+        categories = [o for o, n in counts.items() if min_freq is None or n >= min_freq]
+        if max_categories is not None and len(categories) > max_categories:
+            # 'sorted' is stable, so ties are resolved by order of appearance
+            most_frequent = set(
+                sorted(categories, key=lambda o: counts[o], reverse=True)[
+                    :max_categories
+                ]
+            )
+            categories = [o for o in categories if o in most_frequent]
+        return categories
+
     def fit(self, df: pd.DataFrame) -> "LabelEncoder":
         """Runs update under the hood
 
@@ -196,10 +399,62 @@ class LabelEncoder:
             df_inp[col] = df_inp[col].astype("O")
 
         for k, v in self.encoding_dict.items():
-            df_inp[k] = df_inp[k].apply(lambda x: v[x] if x in v.keys() else 0)
+            default = self.other_idx.get(k, 0)
+            if isinstance(v, ArrayEncoding):
+                df_inp[k] = v.encode(df_inp[k].to_numpy(), default)
+                continue
+            df_inp[k] = df_inp[k].apply(lambda x: v[x] if x in v.keys() else default)
 
         return df_inp
 
+    def encode_column(self, col: str, values: np.ndarray) -> np.ndarray:
+        """Label encodes the values of a single column without building a
+        `DataFrame`. Unseen categories are encoded as 0 or, if the column
+        has an _'[OTHER]'_ category (i.e. with `min_freq` or
+        `max_categories`), as `other_idx[col]`
+
+        Parameters
+        ----------
+        col: str
+            name of the column to encode
+        values: np.ndarray
+            array with the column values
+
+        Returns
+        -------
+        np.ndarray
+            label-encoded values
+        """
+        try:
+            mapping = self.encoding_dict[col]
+        except AttributeError:
+            raise NotFittedError(
+                "This LabelEncoder instance is not fitted yet. "
+                "Call 'fit' with appropriate arguments before using this LabelEncoder."
+            )
+        default = self.other_idx.get(col, 0)
+
+        if isinstance(mapping, ArrayEncoding):
+            return mapping.encode(values, default)
+
+        categories = pd.Index(list(mapping.keys()))
+        if not categories.is_unique:
+            return np.fromiter(
+                (mapping.get(v, default) for v in values),
+                dtype="int64",
+                count=len(values),
+            )
+
+        codes = np.fromiter(mapping.values(), dtype="int64", count=len(mapping))
+        positions = categories.get_indexer(values)
+        encoded = np.where(positions == -1, default, codes[positions])
+        # values that the index cannot match (e.g. None) are looked up
+        # directly in the mapping, as in 'transform'
+        not_found = np.flatnonzero(positions == -1)
+        if len(not_found) > 0:
+            encoded[not_found] = [mapping.get(values[i], default) for i in not_found]
+        return encoded
+
     def fit_transform(self, df: pd.DataFrame) -> pd.DataFrame:
         """Combines `fit` and `transform`
 
@@ -273,10 +528,378 @@ class LabelEncoder:
             list_of_params.append("with_attention={with_attention}")
         if self.shared_embed:
             list_of_params.append("shared_embed={shared_embed}")
+        if self.min_freq is not None:
+            list_of_params.append("min_freq={min_freq}")
+        if self.max_categories is not None:
+            list_of_params.append("max_categories={max_categories}")
         all_params = ", ".join(list_of_params)
         return f"LabelEncoder({all_params.format(**self.__dict__)})"
 
 
+class ArrayEncoding(Mapping):
+    r"""Read-only, array backed, category to code mapping.
+
+    It behaves like the dictionaries in the `encoding_dict` attributes of
+    the `LabelEncoder` and the `WidePreprocessor`, but the categories and
+    their codes are stored in two (potentially memory-mapped) numpy arrays
+    and looked up via binary search. This is what the fitted preprocessors
+    loaded with `load_preprocessor` use, so that loading them does not
+    require rebuilding large dictionaries.
+
+    Null categories (`None` and `NaN`) cannot be stored in a typed array
+    and are kept separately.
+
+    Parameters
+    ----------
+    categories: np.ndarray
+        array with the categories. Its dtype must be unicode, integer or
+        float
+    codes: np.ndarray
+        array with the codes of the categories, in the same order
+    sorter: np.ndarray, Optional, default = None
+        indices that sort `categories`. If `None` they are computed
+    nan_code: int, Optional, default = None
+        code for `NaN`, if `NaN` is one of the categories
+    none_code: int, Optional, default = None
+        code for `None`, if `None` is one of the categories
+
+    Examples
+    --------
+    >>> from pytorch_widedeep.utils import ArrayEncoding
+    >>> encoding = ArrayEncoding.from_dict({'me': 1, 'you': 2, 'him': 3})
+    >>> encoding['you']
+    2
+    >>> encoding.encode(np.array(['him', 'her', 'me']))
+    array([3, 0, 1])
+    """
+
+    def __init__(
+        self,
+        categories: np.ndarray,
+        codes: np.ndarray,
+        sorter: Optional[np.ndarray] = None,
+        nan_code: Optional[int] = None,
+        none_code: Optional[int] = None,
+    ):
+        self.categories = categories
+        self.codes = codes
+        self.sorter = (
+            sorter if sorter is not None else np.argsort(categories, kind="stable")
+        )
+        self.nan_code = nan_code
+        self.none_code = none_code
+
+    @classmethod
+    def from_dict(cls, mapping: Dict[Any, int]) -> Optional["ArrayEncoding"]:
+        r"""Builds an `ArrayEncoding` from a dictionary. Returns `None` if
+        the non-null categories are not all strings, or all numbers.
+        """
+        nan_code, none_code = None, None
+        keys, codes = [], []
+        for k, v in mapping.items():
+            if k is None:
+                none_code = int(v)
+            elif _is_nan(k):
+                # NaN keys are matched by identity in a dict. Here any NaN
+                # maps to the same code, the one of np.nan if present
+                if nan_code is None or k is np.nan:
+                    nan_code = int(v)
+            else:
+                keys.append(k)
+                codes.append(v)
+
+        if all(isinstance(k, str) for k in keys):
+            dtype: Any = str
+        elif all(_is_int(k) for k in keys):
+            dtype = "int64"
+        elif all(_is_int(k) or isinstance(k, (float, np.floating)) for k in keys):
+            dtype = "float64"
+        else:
+            return None
+
+        return cls(
+            categories=np.array(keys, dtype=dtype),
+            codes=np.array(codes, dtype="int64"),
+            nan_code=nan_code,
+            none_code=none_code,
+        )
+
+    def encode(self, values: np.ndarray, default: int = 0) -> np.ndarray:
+        r"""Vectorised lookup of an array of values
+
+        Parameters
+        ----------
+        values: np.ndarray
+            array with the values to encode
+        default: int, default = 0
+            code for the values that are not in the mapping
+
+        Returns
+        -------
+        np.ndarray
+            encoded values
+        """
+        values = np.asarray(values)
+        encoded = np.full(len(values), default, dtype="int64")
+
+        is_null = pd.isna(values)
+        for i in np.flatnonzero(is_null):
+            encoded[i] = self.get(values[i], default)
+
+        not_null = ~is_null
+        candidates = values[not_null]
+        if len(candidates) == 0 or len(self.categories) == 0:
+            return encoded
+
+        candidates = self._as_categories_dtype(candidates)
+        if candidates is None:
+            encoded[not_null] = [self.get(v, default) for v in values[not_null]]
+            return encoded
+
+        positions = np.searchsorted(self.categories, candidates, sorter=self.sorter)
+        idx = self.sorter[np.minimum(positions, len(self.categories) - 1)]
+        found = self.categories[idx] == candidates
+        encoded[not_null] = np.where(found, self.codes[idx], default)
+        return encoded
+
+    def _as_categories_dtype(self, values: np.ndarray) -> Optional[np.ndarray]:
+        # returns None if the values cannot be compared with the categories
+        # without changing the lookup semantics (e.g. 1 and '1')
+        kind = self.categories.dtype.kind
+        inferred = (
+            pd.api.types.infer_dtype(values, skipna=False)
+            if values.dtype == object
+            else None
+        )
+        if kind == "U" and (values.dtype.kind == "U" or inferred == "string"):
+            return values.astype(str)
+        if kind in "iu" and (values.dtype.kind in "iu" or inferred == "integer"):
+            return values.astype("int64")
+        if kind == "f" and (
+            values.dtype.kind in "fiu"
+            or inferred in ["floating", "integer", "mixed-integer-float"]
+        ):
+            return values.astype("float64")
+        return None
+
+    def _lookup(self, key: Any) -> Optional[int]:
+        if key is None:
+            return self.none_code
+        if _is_nan(key):
+            return self.nan_code
+        if len(self.categories) == 0:
+            return None
+        try:
+            position = np.searchsorted(self.categories, key, sorter=self.sorter)
+        except (TypeError, ValueError):
+            return None
+        if position == len(self.categories):
+            return None
+        idx = self.sorter[position]
+        if self.categories[idx] != key:
+            return None
+        return int(self.codes[idx])
+
+    def __getitem__(self, key: Any) -> int:
+        code = self._lookup(key)
+        if code is None:
+            raise KeyError(key)
+        return code
+
+    def __contains__(self, key: Any) -> bool:
+        return self._lookup(key) is not None
+
+    def get(self, key: Any, default: Any = None) -> Any:
+        code = self._lookup(key)
+        return default if code is None else code
+
+    def items(self) -> List:  # type: ignore[override]
+        items = list(zip(self.categories.tolist(), self.codes.tolist()))
+        if self.nan_code is not None:
+            items.append((np.nan, self.nan_code))
+        if self.none_code is not None:
+            items.append((None, self.none_code))
+        return items
+
+    def values(self) -> List:  # type: ignore[override]
+        return [v for _, v in self.items()]
+
+    def __iter__(self) -> Iterator:
+        for k, _ in self.items():
+            yield k
+
+    def __len__(self) -> int:
+        return (
+            len(self.categories)
+            + (self.nan_code is not None)
+            + (self.none_code is not None)
+        )
+
+    def __repr__(self) -> str:
+        return f"ArrayEncoding(n_categories={len(self)})"
+
+
+def _is_nan(x: Any) -> bool:
+    return isinstance(x, (float, np.floating)) and x != x
+
+
+def _is_int(x: Any) -> bool:
+    return isinstance(x, (int, np.integer)) and not isinstance(x, (bool, np.bool_))
+
+
+class MultiHotArray:
+    r"""Array-like container for datasets with multi-hot (i.e. list-valued,
+    variable length) categorical columns.
+
+    The "regular" (dense) columns are stored as a 2-dimensional array while
+    each multi-hot column is stored as the concatenation of the encoded
+    values of all rows (`values`) and the offsets where the values of each
+    row start (`offsets`, of length `n_rows + 1`, i.e. the values of the row
+    `i` are `values[offsets[i]:offsets[i + 1]]`). This is what the
+    `TabPreprocessor` and the `WidePreprocessor` return when `multi_hot_cols`
+    is not `None`.
+
+    Indexing a `MultiHotArray` with an integer returns the corresponding row
+    as a 1-dimensional array where each multi-hot column is padded with 0s
+    (or truncated) to its `max_len`, i.e. as in the dense representation
+    obtained via `np.asarray`. The padded rows are only materialised when
+    a row is accessed, so a `MultiHotArray` can be passed to the `Trainer`
+    (and the `WideDeepDataset`) as any other array. Indexing it with an
+    array of indexes or a slice returns a new `MultiHotArray`.
+
+    Parameters
+    ----------
+    dense: np.ndarray
+        2-dimensional array with the dense columns
+    values: List
+        List with the arrays of encoded values of each multi-hot column
+    offsets: List
+        List with the arrays of offsets of each multi-hot column
+    max_lens: List
+        List with the maximum number of values per row of each multi-hot
+        column
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> from pytorch_widedeep.utils.deeptabular_utils import MultiHotArray
+    >>> X = MultiHotArray(np.array([[1], [2]]), [np.array([3, 4, 5])], [np.array([0, 2, 3])], [3])
+    >>> X[0]
+    array([1, 3, 4, 0])
+    >>> np.asarray(X[[1]])
+    array([[2, 5, 0, 0]])
+    """
+
+    def __init__(
+        self,
+        dense: np.ndarray,
+        values: List[np.ndarray],
+        offsets: List[np.ndarray],
+        max_lens: List[int],
+    ):
+        self.dense = dense
+        self.values = values
+        self.offsets = offsets
+        self.max_lens = max_lens
+
+        self.dtype = np.result_type(dense.dtype, np.int64)
+
+    @property
+    def shape(self) -> Tuple[int, int]:
+        return (len(self.dense), self.dense.shape[1] + sum(self.max_lens))
+
+    @property
+    def ndim(self) -> int:
+        return 2
+
+    def __len__(self) -> int:
+        return len(self.dense)
+
+    def __getitem__(self, idx: Any) -> Union[np.ndarray, "MultiHotArray"]:
+        if isinstance(idx, (int, np.integer)):
+            return self._get_row(range(len(self))[idx])
+        if isinstance(idx, tuple):
+            return self.to_dense()[idx]
+        rows = np.arange(len(self))[idx]
+        values, offsets = [], []
+        for vals, offs in zip(self.values, self.offsets):
+            starts, lengths = offs[rows], offs[rows + 1] - offs[rows]
+            new_offs = np.concatenate([[0], np.cumsum(lengths)]).astype("int64")
+            # position of each of the selected values in the original array
+            pos = np.repeat(starts - new_offs[:-1], lengths) + np.arange(new_offs[-1])
+            values.append(vals[pos])
+            offsets.append(new_offs)
+        return MultiHotArray(self.dense[rows], values, offsets, self.max_lens)
+
+    def _get_row(self, i: int) -> np.ndarray:
+        n_dense = self.dense.shape[1]
+        row = np.zeros(self.shape[1], dtype=self.dtype)
+        row[:n_dense] = self.dense[i]
+        start = n_dense
+        for vals, offs, max_len in zip(self.values, self.offsets, self.max_lens):
+            row_vals = vals[offs[i] : offs[i + 1]][:max_len]
+            row[start : start + len(row_vals)] = row_vals
+            start += max_len
+        return row
+
+    def to_dense(self) -> np.ndarray:
+        r"""Returns the dense representation of the array, where each
+        multi-hot column is padded with 0s (or truncated) to its `max_len`
+        """
+        n_rows, n_dense = len(self), self.dense.shape[1]
+        out = np.zeros(self.shape, dtype=self.dtype)
+        out[:, :n_dense] = self.dense
+        start = n_dense
+        for vals, offs, max_len in zip(self.values, self.offsets, self.max_lens):
+            lengths = np.diff(offs)
+            rows = np.repeat(np.arange(n_rows), lengths)
+            pos = np.arange(offs[-1] - offs[0]) - np.repeat(
+                offs[:-1] - offs[0], lengths
+            )
+            keep = pos < max_len
+            out[rows[keep], start + pos[keep]] = vals[offs[0] : offs[-1]][keep]
+            start += max_len
+        return out
+
+    def __array__(self, dtype: Any = None, copy: Any = None) -> np.ndarray:
+        out = self.to_dense()
+        return out if dtype is None else out.astype(dtype)
+
+    def __repr__(self) -> str:
+        return f"MultiHotArray(shape={self.shape}, n_multi_hot_cols={len(self.values)})"
+
+
+def flatten_multi_hot(s: pd.Series) -> Tuple[List[Any], np.ndarray]:
+    r"""Flattens a multi-hot (i.e. list-valued) column
+
+    Each element of the column can be a list (or any other list-like
+    object such as a tuple or an array) or a scalar, which is treated as a
+    list of one element. `None` and `NaN` are treated as empty lists.
+
+    Parameters
+    ----------
+    s: pd.Series
+        multi-hot column
+
+    Returns
+    -------
+    Tuple
+        List with the concatenation of the values of all rows and the
+        offsets where the values of each row start (with length `len(s) + 1`)
+    """
+    flat: List[Any] = []
+    lengths = np.zeros(len(s), dtype="int64")
+    for i, x in enumerate(s.tolist()):
+        if x is None or _is_nan(x):
+            continue
+        if isinstance(x, str) or not pd.api.types.is_list_like(x):
+            x = [x]
+        flat.extend(x)
+        lengths[i] = len(x)
+    offsets = np.concatenate([[0], np.cumsum(lengths)]).astype("int64")
+    return flat, offsets
+
+
 def find_bin(
     bin_edges: Union[np.ndarray, Tensor],
     values: Union[np.ndarray, Tensor],
@@ -0,0 +1,171 @@
+import os
+import shutil
+
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.exceptions import NotFittedError
+
+from pytorch_widedeep.utils import ArrayEncoding
+from pytorch_widedeep.preprocessing import (
+    TabPreprocessor,
+    WidePreprocessor,
+    load_preprocessor,
+    save_preprocessor,
+)
+
+save_dir = "tests/test_data_utils/saved_preprocessor"
+
+df = pd.DataFrame(
+    {
+        "col1": ["a", "b", None, "c", "a", "b"],
+        "col2": [1, 2, 3, 4, 5, 1],
+        "col3": ["x", 1, "y", 2, "x", "y"],
+        "col4": np.random.rand(6),
+        "col5": np.random.rand(6),
+    }
+)
+df_new = pd.DataFrame(
+    {
+        "col1": ["a", "z", None, "c", "aa", "b"],
+        "col2": [1, 2, 7, 4, 5, 1],
+        "col3": ["x", 3, "y", 2, "1", "y"],
+        "col4": np.random.rand(6),
+        "col5": np.random.rand(6),
+    }
+)
+
+
+@pytest.mark.parametrize(
+    "mapping, values",
+    [
+        ({"a": 1, "bb": 2, "c": 3}, np.array(["bb", "b", "ccc", "a"])),
+        (
+            {"a": 1, None: 2, np.nan: 3},
+            np.array(["a", None, np.nan, "d"], dtype=object),
+        ),
+        ({3: 1, 1: 2, 2: 3}, np.array([1, 2, 3, 4])),
+        ({3: 1, 1: 2, 2: 3}, np.array(["1", 1.0, 2, "x"], dtype=object)),
+        ({0.5: 1, 1.5: 2}, np.array([1.5, np.nan, 0.25])),
+    ],
+)
+def test_array_encoding(mapping, values):
+    encoding = ArrayEncoding.from_dict(mapping)
+    expected = np.array([mapping.get(v, 0) for v in values])
+    assert np.array_equal(encoding.encode(values), expected)
+    assert len(encoding) == len(mapping)
+    assert all(encoding[k] == v for k, v in mapping.items() if k == k)
+
+
+def test_array_encoding_mixed_types():
+    assert ArrayEncoding.from_dict({"a": 1, 2: 2}) is None
+
+
+@pytest.mark.parametrize("mmap_mode", ["r", None])
+def test_save_load_tab_preprocessor(mmap_mode):
+    tab_preprocessor = TabPreprocessor(
+        cat_embed_cols=["col1", "col2", "col3"],
+        continuous_cols=["col4", "col5"],
+        quantization_setup={"col5": 3},
+        cols_to_scale=["col4"],
+    )
+    X = tab_preprocessor.fit_transform(df)
+
+    save_preprocessor(tab_preprocessor, save_dir)
+    loaded_preprocessor = load_preprocessor(save_dir, mmap_mode=mmap_mode)
+
+    encoding_dict = loaded_preprocessor.label_encoder.encoding_dict
+    assert isinstance(encoding_dict["col1"], ArrayEncoding)
+    assert isinstance(encoding_dict["col2"], ArrayEncoding)
+    # mixed types cannot be stored as arrays
+    assert isinstance(encoding_dict["col3"], dict)
+    assert list(encoding_dict.keys()) == ["col1", "col2", "col3"]
+
+    np.testing.assert_array_equal(loaded_preprocessor.transform(df), X)
+    np.testing.assert_array_equal(
+        loaded_preprocessor.transform(df_new), tab_preprocessor.transform(df_new)
+    )
+    assert loaded_preprocessor.inverse_transform(X).equals(
+        tab_preprocessor.inverse_transform(X)
+    )
+
+    shutil.rmtree(save_dir)
+
+
+def test_save_load_tab_preprocessor_rare_categories():
+    tab_preprocessor = TabPreprocessor(
+        cat_embed_cols=["col1", "col2"], continuous_cols=["col4"], min_freq=2
+    )
+    tab_preprocessor.fit(df)
+
+    save_preprocessor(tab_preprocessor, save_dir)
+    loaded_preprocessor = load_preprocessor(save_dir)
+
+    assert np.array_equal(
+        loaded_preprocessor.transform(df_new), tab_preprocessor.transform(df_new)
+    )
+
+    shutil.rmtree(save_dir)
+
+
+def test_save_load_tab_preprocessor_shared_vocab():
+    tab_preprocessor = TabPreprocessor(
+        cat_embed_cols=["col1", "col2", "col3"],
+        shared_vocab_cols=[["col1", "col3"]],
+    )
+    X = tab_preprocessor.fit_transform(df.fillna("d"))
+
+    save_preprocessor(tab_preprocessor, save_dir)
+    loaded_preprocessor = load_preprocessor(save_dir)
+
+    # mixed types, the shared vocabulary is pickled
+    encoding_dict = loaded_preprocessor.label_encoder.encoding_dict
+    assert encoding_dict["col1"] is encoding_dict["col3"]
+    np.testing.assert_array_equal(loaded_preprocessor.transform(df.fillna("d")), X)
+
+    shutil.rmtree(save_dir)
+
+    tab_preprocessor = TabPreprocessor(
+        cat_embed_cols=["col1", "col2", "col3"],
+        shared_vocab_cols=[["col1", "col3"]],
+    )
+    X = tab_preprocessor.fit_transform(df.astype({"col3": str}))
+
+    save_preprocessor(tab_preprocessor, save_dir)
+    loaded_preprocessor = load_preprocessor(save_dir)
+
+    encoding_dict = loaded_preprocessor.label_encoder.encoding_dict
+    assert isinstance(encoding_dict["col1"], ArrayEncoding)
+    assert encoding_dict["col1"] is encoding_dict["col3"]
+    assert not os.path.isfile(os.path.join(save_dir, "encoding_2.codes.npy"))
+    np.testing.assert_array_equal(
+        loaded_preprocessor.transform(df.astype({"col3": str})), X
+    )
+
+    shutil.rmtree(save_dir)
+
+
+def test_save_load_wide_preprocessor():
+    wide_preprocessor = WidePreprocessor(
+        wide_cols=["col1", "col2"], crossed_cols=[("col1", "col2")]
+    )
+    X = wide_preprocessor.fit_transform(df.fillna("d"))
+
+    save_preprocessor(wide_preprocessor, save_dir)
+    loaded_preprocessor = load_preprocessor(save_dir)
+
+    assert isinstance(loaded_preprocessor.encoding_dict, ArrayEncoding)
+    assert not os.path.isfile(os.path.join(save_dir, "encoding_1.codes.npy"))
+    assert np.array_equal(loaded_preprocessor.transform(df.fillna("d")), X)
+    assert np.array_equal(
+        loaded_preprocessor.transform(df_new.fillna("d")),
+        wide_preprocessor.transform(df_new.fillna("d")),
+    )
+    assert loaded_preprocessor.wide_dim == wide_preprocessor.wide_dim
+
+    shutil.rmtree(save_dir)
+
+
+def test_save_not_fitted_preprocessor():
+    with pytest.raises(NotFittedError):
+        save_preprocessor(WidePreprocessor(wide_cols=["col1"]), save_dir)
@@ -1,3 +1,7 @@
+import copy
+import pickle
+import shutil
+
 import numpy as np
 import torch
 import pandas as pd
@@ -7,6 +11,7 @@ from sklearn.exceptions import NotFittedError
 from pytorch_widedeep.preprocessing import TabPreprocessor
 from pytorch_widedeep.utils.deeptabular_utils import (
     LabelEncoder,
+    MultiHotArray,
     find_bin,
     get_kernel_window,
 )
@@ -384,3 +389,532 @@ def test_quantization(quantization_setup, expected_bins_col1, expected_bins_col2
         if expected_bins_col2
         else 20
     )
+
+
+###############################################################################
+# Test the column-parallel transform
+###############################################################################
+
+
+df_for_parallel = pd.DataFrame(
+    {
+        "col1": np.random.choice(["a", "b", "c", None], 50),
+        "col2": np.random.choice([1, 2, 3, 4], 50),
+        "col3": np.random.rand(50),
+        "col4": np.random.randint(100, size=50),
+    }
+)
+
+
+@pytest.mark.parametrize(
+    "embed_cols, continuous_cols, cols_to_scale, quantization_setup, with_cls_token",
+    [
+        (["col1", "col2"], None, None, None, False),
+        (None, ["col3", "col4"], ["col3"], None, False),
+        (["col1", "col2"], ["col3", "col4"], "all", None, False),
+        (["col1", "col2"], ["col3", "col4"], ["col3"], {"col4": 3}, False),
+        (["col1", "col2"], ["col3", "col4"], "all", None, True),
+    ],
+)
+def test_parallel_transform(
+    embed_cols, continuous_cols, cols_to_scale, quantization_setup, with_cls_token
+):
+    tab_preprocessor = TabPreprocessor(
+        cat_embed_cols=embed_cols,
+        continuous_cols=continuous_cols,
+        cols_to_scale=cols_to_scale,
+        quantization_setup=quantization_setup,
+        with_attention=with_cls_token,
+        with_cls_token=with_cls_token,
+        verbose=False,
+    )
+    X_seq = tab_preprocessor.fit_transform(df_for_parallel)
+
+    df_test = df_for_parallel.sample(10).copy()
+    df_test.iloc[0, 1] = 10  # unseen category
+    X_test_seq = tab_preprocessor.transform(df_test)
+
+    tab_preprocessor.n_cpus = 2
+    X_par = tab_preprocessor.transform(df_for_parallel)
+    X_test_par = tab_preprocessor.transform(df_test)
+
+    assert X_par.dtype == X_seq.dtype and X_test_par.dtype == X_test_seq.dtype
+    assert np.array_equal(X_par, X_seq, equal_nan=True)
+    assert np.array_equal(X_test_par, X_test_seq, equal_nan=True)
+
+
+def _pickled_before(obj, attrs):
+    # round trip through pickle of 'obj' as if it had been pickled before
+    # the attributes in 'attrs' were added. Nested attributes are given as
+    # 'attr.nested_attr'
+    old = copy.deepcopy(obj)
+    for attr in attrs:
+        *path, name = attr.split(".")
+        target = old
+        for p in path:
+            target = getattr(target, p)
+        del target.__dict__[name]
+    return pickle.loads(pickle.dumps(old))
+
+
+df_for_pickle = pd.DataFrame(
+    {
+        "col1": np.random.choice(["a", "b", "c"], 50),
+        "col2": np.random.choice([1, 2, 3, 4], 50),
+        "col3": np.random.rand(50),
+    }
+)
+
+
+def test_unpickle_without_n_cpus():
+    tab_preprocessor = TabPreprocessor(
+        cat_embed_cols=["col1", "col2"], continuous_cols=["col3"], verbose=False
+    )
+    X = tab_preprocessor.fit_transform(df_for_pickle)
+
+    old_tab_preprocessor = _pickled_before(tab_preprocessor, ["n_cpus"])
+
+    assert old_tab_preprocessor.n_cpus == 1
+    assert np.array_equal(old_tab_preprocessor.transform(df_for_pickle), X)
+
+
+def test_unpickle_without_cache_dir():
+    tab_preprocessor = TabPreprocessor(
+        cat_embed_cols=["col1", "col2"], continuous_cols=["col3"], verbose=False
+    )
+    tab_preprocessor.fit(df_for_pickle)
+
+    old_tab_preprocessor = _pickled_before(tab_preprocessor, ["cache_dir"])
+
+    assert old_tab_preprocessor.cache_dir is None
+    assert repr(old_tab_preprocessor) == repr(tab_preprocessor)
+    assert np.array_equal(
+        old_tab_preprocessor.fit_transform(df_for_pickle),
+        tab_preprocessor.transform(df_for_pickle),
+    )
+
+
+###############################################################################
+# Test the fit_transform cache
+###############################################################################
+
+
+def test_fit_transform_cache():
+    cache_dir = "tests/test_data_utils/tab_preprocessor_cache"
+
+    tab_preprocessor = TabPreprocessor(
+        cat_embed_cols=["col1", "col2"],
+        continuous_cols=["col3", "col4"],
+        cols_to_scale="all",
+        cache_dir=cache_dir,
+        verbose=False,
+    )
+    X = tab_preprocessor.fit_transform(df)
+
+    def _fail(df):
+        raise AssertionError("'fit' should not run when there is a cache hit")
+
+    new_tab_preprocessor = TabPreprocessor(
+        cat_embed_cols=["col1", "col2"],
+        continuous_cols=["col3", "col4"],
+        cols_to_scale="all",
+        cache_dir=cache_dir,
+        verbose=False,
+    )
+    new_tab_preprocessor.fit = _fail
+    X_cached = new_tab_preprocessor.fit_transform(df)
+
+    # the number of cpus (or the way the cache dir is written) do not affect
+    # the fitted preprocessor, and are kept when it is loaded from the cache
+    n_cpus_tab_preprocessor = TabPreprocessor(
+        cat_embed_cols=["col1", "col2"],
+        continuous_cols=["col3", "col4"],
+        cols_to_scale="all",
+        n_cpus=2,
+        cache_dir=cache_dir + "/",
+        verbose=False,
+    )
+    n_cpus_tab_preprocessor.fit = _fail
+    X_n_cpus = n_cpus_tab_preprocessor.fit_transform(df)
+    assert n_cpus_tab_preprocessor.n_cpus == 2
+    assert n_cpus_tab_preprocessor.cache_dir == cache_dir + "/"
+
+    # a different configuration or input must not hit the cache
+    other_tab_preprocessor = TabPreprocessor(
+        cat_embed_cols=["col1", "col2"],
+        continuous_cols=["col3", "col4"],
+        cache_dir=cache_dir,
+        verbose=False,
+    )
+    X_other = other_tab_preprocessor.fit_transform(df)
+    X_other_input = tab_preprocessor.fit_transform(df.iloc[:-1])
+
+    shutil.rmtree(cache_dir)
+
+    assert isinstance(X_cached, np.memmap)
+    assert np.array_equal(X, X_cached)
+    assert np.array_equal(X, X_n_cpus)
+    assert new_tab_preprocessor.column_idx == tab_preprocessor.column_idx
+    assert np.array_equal(new_tab_preprocessor.transform(df), X)
+    assert not np.array_equal(X_other, X)
+    assert X_other_input.shape[0] == X.shape[0] - 1
+
+
+###############################################################################
+# Test the compiled preprocessor
+###############################################################################
+
+
+@pytest.mark.parametrize(
+    "embed_cols, continuous_cols, cols_to_scale, quantization_setup, with_cls_token",
+    [
+        (["col1", "col2"], None, None, None, False),
+        (None, ["col3", "col4"], None, None, False),
+        (["col1", "col2"], ["col3", "col4"], "all", None, False),
+        (["col1", "col2"], ["col3", "col4"], ["col3"], {"col4": 3}, False),
+        (["col1", "col2"], ["col3", "col4"], None, {"col3": [0.2, 0.5, 0.8]}, False),
+        (["col1", "col2"], ["col3", "col4"], "all", None, True),
+    ],
+)
+def test_compiled_preprocessor(
+    embed_cols, continuous_cols, cols_to_scale, quantization_setup, with_cls_token
+):
+    tab_preprocessor = TabPreprocessor(
+        cat_embed_cols=embed_cols,
+        continuous_cols=continuous_cols,
+        cols_to_scale=cols_to_scale,
+        quantization_setup=quantization_setup,
+        with_attention=with_cls_token,
+        with_cls_token=with_cls_token,
+        verbose=False,
+    )
+    X = tab_preprocessor.fit_transform(df_for_parallel)
+    compiled_preprocessor = tab_preprocessor.compile()
+
+    df_test = df_for_parallel.sample(10).copy()
+    df_test.iloc[0, 1] = 10  # unseen category
+    X_test = tab_preprocessor.transform(df_test)
+
+    X_compiled = compiled_preprocessor.transform(df_for_parallel.to_dict("records"))
+    X_test_compiled = compiled_preprocessor.transform(df_test.to_dict("records"))
+    sample = compiled_preprocessor.transform_sample(df_test.to_dict("records")[0])
+
+    assert X_compiled.dtype == X.dtype
+    assert np.array_equal(X_compiled, X, equal_nan=True)
+    assert np.array_equal(X_test_compiled, X_test, equal_nan=True)
+    assert np.array_equal(
+        sample, tab_preprocessor.transform_sample(df_test.iloc[:1]), equal_nan=True
+    )
+
+
+###############################################################################
+# Test rare categories bucketing
+###############################################################################
+
+
+df_rare = pd.DataFrame(
+    {
+        "col1": ["a"] * 5 + ["b"] * 4 + ["c"] * 2 + ["d"],
+        "col2": ["x"] * 6 + ["y"] * 3 + ["z"] * 3,
+        "col3": np.random.rand(12),
+    }
+)
+
+
+@pytest.mark.parametrize(
+    "min_freq, max_categories, expected_col1, expected_col2",
+    [
+        (3, None, ["a", "b"], ["x", "y", "z"]),
+        (None, 2, ["a", "b"], ["x", "y"]),
+        ({"col1": 2}, None, ["a", "b", "c"], None),
+        (None, {"col2": 1}, None, ["x"]),
+        (2, 1, ["a"], ["x"]),
+    ],
+)
+def test_label_encoder_rare_categories(
+    min_freq, max_categories, expected_col1, expected_col2
+):
+    encoder = LabelEncoder(
+        ["col1", "col2"], min_freq=min_freq, max_categories=max_categories
+    )
+    df_enc = encoder.fit_transform(df_rare)
+
+    for col, expected in zip(["col1", "col2"], [expected_col1, expected_col2]):
+        encoding = encoder.encoding_dict[col]
+        if expected is None:
+            assert col not in encoder.other_idx
+            assert list(encoding.keys()) == df_rare[col].unique().tolist()
+        else:
+            other_idx = encoder.other_idx[col]
+            assert list(encoding.keys()) == expected + ["[OTHER]"]
+            assert encoding["[OTHER]"] == other_idx == len(expected) + 1
+            is_rare = ~df_rare[col].isin(expected)
+            assert (df_enc.loc[is_rare, col] == other_idx).all()
+            assert (df_enc.loc[~is_rare, col] != other_idx).all()
+
+
+def test_label_encoder_rare_categories_partial_fit():
+    # 'c' is rare in each chunk but not in the whole dataset
+    chunk1 = pd.DataFrame({"col1": ["a", "a", "b", "c"]})
+    chunk2 = pd.DataFrame({"col1": ["a", "c", "d", "d"]})
+    encoder = LabelEncoder(["col1"], min_freq=2)
+    encoder.partial_fit(chunk1)
+    encoder.partial_fit(chunk2)
+    assert encoder.encoding_dict["col1"] == {"a": 1, "c": 2, "d": 3, "[OTHER]": 4}
+    assert encoder.transform(pd.DataFrame({"col1": ["b", "e"]}))["col1"].tolist() == [
+        4,
+        4,
+    ]
+
+
+def test_tab_preprocessor_rare_categories():
+    tab_preprocessor = TabPreprocessor(
+        cat_embed_cols=["col1", "col2"],
+        continuous_cols=["col3"],
+        min_freq={"col1": 3},
+        max_categories={"col2": 1},
+        verbose=False,
+    )
+    X_tab = tab_preprocessor.fit_transform(df_rare)
+    cat_embed_input = {c: n for c, n, _ in tab_preprocessor.cat_embed_input}
+    assert cat_embed_input == {"col1": 3, "col2": 2}
+    assert tab_preprocessor.embed_dim["col1"] == embed_sz_rule(3)
+
+    df_test = pd.DataFrame({"col1": ["a", "d", "e"], "col2": ["x", "z", "y"]})
+    df_test["col3"] = 0.5
+    X_test = tab_preprocessor.transform(df_test)
+    assert X_test[:, :2].tolist() == [[1, 1], [3, 2], [3, 2]]
+
+    tab_preprocessor.n_cpus = 2
+    assert np.array_equal(tab_preprocessor.transform(df_rare), X_tab)
+    compiled_preprocessor = tab_preprocessor.compile()
+    assert np.array_equal(
+        compiled_preprocessor.transform(df_test.to_dict("records")), X_test
+    )
+
+
+def test_label_encoder_other_category_name():
+    df = pd.DataFrame({"col1": ["a", "a", "[OTHER]"]})
+    with pytest.raises(ValueError):
+        LabelEncoder(["col1"], min_freq=2).fit(df)
+
+
+def test_unpickle_without_rare_categories():
+    tab_preprocessor = TabPreprocessor(
+        cat_embed_cols=["col1", "col2"], continuous_cols=["col3"], verbose=False
+    )
+    X = tab_preprocessor.fit_transform(df_for_pickle)
+
+    old_tab_preprocessor = _pickled_before(
+        tab_preprocessor,
+        [
+            "min_freq",
+            "max_categories",
+            "label_encoder.min_freq",
+            "label_encoder.max_categories",
+            "label_encoder.other_idx",
+        ],
+    )
+
+    assert old_tab_preprocessor.label_encoder.other_idx == {}
+    assert np.array_equal(old_tab_preprocessor.transform(df_for_pickle), X)
+    old_tab_preprocessor.n_cpus = 2
+    assert np.array_equal(old_tab_preprocessor.transform(df_for_pickle), X)
+    compiled_preprocessor = old_tab_preprocessor.compile()
+    assert np.array_equal(
+        compiled_preprocessor.transform(df_for_pickle.to_dict("records")), X
+    )
+
+
+###############################################################################
+# Test multi-hot columns
+###############################################################################
+
+df_multi_hot = pd.DataFrame(
+    {
+        "col1": ["a", "b", "a", "c"],
+        "col2": [0.1, 0.2, 0.3, 0.4],
+        "col3": [["x", "y"], ["y"], [], None],
+        "col4": [[1, 2, 3], [3], [4, 5], [1]],
+    }
+)
+
+
+@pytest.mark.parametrize("n_cpus", [1, 2])
+def test_tab_preprocessor_multi_hot(n_cpus):
+    tab_preprocessor = TabPreprocessor(
+        cat_embed_cols=["col1"],
+        continuous_cols=["col2"],
+        multi_hot_cols=["col3", ("col4", 4)],
+        multi_hot_max_len={"col4": 2},
+        n_cpus=n_cpus,
+        verbose=False,
+    )
+    X_tab = tab_preprocessor.fit_transform(df_multi_hot)
+
+    assert isinstance(X_tab, MultiHotArray)
+    assert X_tab.shape == (4, 6)
+    assert tab_preprocessor.column_idx == {"col1": 0, "col2": 1, "col3": 2, "col4": 4}
+    assert tab_preprocessor.multi_hot_embed_input == [
+        ("col3", 2, embed_sz_rule(2), 2),
+        ("col4", 5, 4, 2),
+    ]
+    # values beyond 'max_len' are truncated, rows with fewer values padded
+    assert np.asarray(X_tab)[:, 2:].tolist() == [
+        [1, 2, 1, 2],
+        [2, 0, 3, 0],
+        [0, 0, 4, 5],
+        [0, 0, 1, 0],
+    ]
+    assert np.array_equal(X_tab[1], np.asarray(X_tab)[1])
+    assert np.array_equal(np.asarray(X_tab[[3, 0]]), np.asarray(X_tab)[[3, 0]])
+
+    df_inv = tab_preprocessor.inverse_transform(X_tab)
+    assert df_inv.col3.tolist() == [["x", "y"], ["y"], [], []]
+    assert df_inv.col4.tolist() == [[1, 2], [3], [4, 5], [1]]
+
+    df_test = df_multi_hot.copy()
+    df_test["col3"] = [["z", "x"], "y", None, []]
+    assert np.asarray(tab_preprocessor.transform(df_test))[:, 2:4].tolist() == [
+        [0, 1],
+        [2, 0],
+        [0, 0],
+        [0, 0],
+    ]
+
+
+def test_tab_preprocessor_multi_hot_with_attention():
+    with pytest.raises(ValueError):
+        TabPreprocessor(
+            cat_embed_cols=["col1"], multi_hot_cols=["col3"], with_attention=True
+        )
+
+
+def test_unpickle_without_multi_hot_cols():
+    tab_preprocessor = TabPreprocessor(
+        cat_embed_cols=["col1", "col2"], continuous_cols=["col3"], verbose=False
+    )
+    X = tab_preprocessor.fit_transform(df_for_pickle)
+
+    old_tab_preprocessor = _pickled_before(
+        tab_preprocessor, ["multi_hot_cols", "multi_hot_max_len"]
+    )
+
+    assert old_tab_preprocessor.multi_hot_cols is None
+    assert np.array_equal(old_tab_preprocessor.transform(df_for_pickle), X)
+    assert old_tab_preprocessor.inverse_transform(X).col1.tolist() == (
+        df_for_pickle.col1.tolist()
+    )
+
+
+###############################################################################
+# Test compositional embeddings
+###############################################################################
+
+
+def test_tab_preprocessor_compositional_embed_cols():
+    tab_preprocessor = TabPreprocessor(
+        cat_embed_cols=["col1", "col2"],
+        continuous_cols=["col3"],
+        compositional_embed_cols={"col1": "qr_mult"},
+    )
+    tab_preprocessor.fit(df)
+    assert tab_preprocessor.compositional_embed_input == {"col1": "qr_mult"}
+
+    with pytest.raises(ValueError):
+        TabPreprocessor(
+            cat_embed_cols=["col1"],
+            continuous_cols=["col3"],
+            compositional_embed_cols={"col2": "hash"},
+        )
+
+
+def test_unpickle_without_compositional_embed_cols():
+    tab_preprocessor = TabPreprocessor(
+        cat_embed_cols=["col1", "col2"], continuous_cols=["col3"], verbose=False
+    )
+    X = tab_preprocessor.fit_transform(df_for_pickle)
+
+    old_tab_preprocessor = _pickled_before(
+        tab_preprocessor, ["compositional_embed_cols"]
+    )
+
+    assert "compositional_embed_cols" not in repr(old_tab_preprocessor)
+    assert np.array_equal(old_tab_preprocessor.fit_transform(df_for_pickle), X)
+
+
+###############################################################################
+# Test shared vocabularies
+###############################################################################
+
+df_shared_vocab = pd.DataFrame(
+    {
+        "item": ["a", "b", "c", "a", "d"],
+        "col1": ["x", "y", "x", "y", "x"],
+        "prev_item": ["e", "a", "b", "a", None],
+    }
+)
+
+
+@pytest.mark.parametrize("with_attention", [True, False])
+@pytest.mark.parametrize("min_freq", [None, 2])
+def test_tab_preprocessor_shared_vocab(with_attention, min_freq):
+    tab_preprocessor = TabPreprocessor(
+        cat_embed_cols=["item", "col1", "prev_item"],
+        with_attention=with_attention,
+        min_freq=min_freq,
+        shared_vocab_cols=[["prev_item", "item"]],
+    )
+    X_tab = tab_preprocessor.fit_transform(df_shared_vocab)
+    encoding_dict = tab_preprocessor.label_encoder.encoding_dict
+
+    assert list(encoding_dict.keys()) == ["item", "col1", "prev_item"]
+    assert encoding_dict["item"] is encoding_dict["prev_item"]
+    # the same category has the same code in both columns
+    assert X_tab[0, 0] == X_tab[1, 2] == X_tab[3, 2]
+    assert X_tab[1, 0] == X_tab[2, 2]
+    if min_freq is None:
+        assert len(encoding_dict["item"]) == 6
+        assert min(encoding_dict["col1"].values()) == (1 if not with_attention else 7)
+    else:
+        # 'a' (4 times) and 'b' (2 times) across both columns
+        assert set(encoding_dict["item"].keys()) == {"a", "b", "[OTHER]"}
+    if not with_attention:
+        assert (
+            tab_preprocessor.embed_dim["item"]
+            == tab_preprocessor.embed_dim["prev_item"]
+        )
+    assert tab_preprocessor.inverse_transform(X_tab)["prev_item"].tolist()[:4] == (
+        ["e", "a", "b", "a"] if min_freq is None else ["[OTHER]", "a", "b", "a"]
+    )
+
+
+@pytest.mark.parametrize(
+    "cat_embed_cols, shared_vocab_cols",
+    [
+        (["item", "col1"], [["item", "prev_item"]]),
+        ([("item", 4), ("prev_item", 8)], [["item", "prev_item"]]),
+        (["item", "col1", "prev_item"], [["item", "prev_item"], ["item", "col1"]]),
+    ],
+)
+def test_tab_preprocessor_shared_vocab_raise_error(cat_embed_cols, shared_vocab_cols):
+    with pytest.raises(ValueError):
+        TabPreprocessor(
+            cat_embed_cols=cat_embed_cols, shared_vocab_cols=shared_vocab_cols
+        )
+
+
+def test_unpickle_without_shared_vocab_cols():
+    tab_preprocessor = TabPreprocessor(
+        cat_embed_cols=["col1", "col2"], continuous_cols=["col3"], verbose=False
+    )
+    X = tab_preprocessor.fit_transform(df_for_pickle)
+
+    old_tab_preprocessor = _pickled_before(
+        tab_preprocessor, ["shared_vocab_cols", "label_encoder.shared_vocab_cols"]
+    )
+
+    assert old_tab_preprocessor.label_encoder.shared_vocab_cols is None
+    assert np.array_equal(old_tab_preprocessor.transform(df_for_pickle), X)
+    old_tab_preprocessor.label_encoder.partial_fit(df_for_pickle)
+    assert np.array_equal(old_tab_preprocessor.fit_transform(df_for_pickle), X)
@@ -1,9 +1,15 @@
+import os
+import copy
+import pickle
+import shutil
+
 import numpy as np
 import pandas as pd
 import pytest
 from sklearn.exceptions import NotFittedError
 
 from pytorch_widedeep.preprocessing import WidePreprocessor
+from pytorch_widedeep.utils.deeptabular_utils import MultiHotArray
 
 
 def create_test_dataset(input_type, with_crossed=True):
@@ -95,3 +101,108 @@ def test_notfittederror():
     processor = WidePreprocessor(wide_cols, cross_cols)
     with pytest.raises(NotFittedError):
         processor.transform(df_letters)
+
+
+###############################################################################
+# Test the fit_transform cache
+###############################################################################
+
+
+def test_fit_transform_cache():
+    cache_dir = "tests/test_data_utils/wide_preprocessor_cache"
+
+    processor = WidePreprocessor(wide_cols, cross_cols, cache_dir=cache_dir)
+    X_wide = processor.fit_transform(df_letters)
+
+    new_processor = WidePreprocessor(wide_cols, cross_cols, cache_dir=cache_dir)
+    X_wide_cached = new_processor.fit_transform(df_letters)
+    n_entries = len(os.listdir(cache_dir))
+
+    shutil.rmtree(cache_dir)
+
+    assert n_entries == 1
+    assert np.array_equal(X_wide, X_wide_cached)
+    assert new_processor.encoding_dict == processor.encoding_dict
+
+
+###############################################################################
+# Test unpickling preprocessors pickled before some attributes were added
+###############################################################################
+
+
+def _pickled_before(obj, attrs):
+    # round trip through pickle of 'obj' as if it had been pickled before
+    # the attributes in 'attrs' were added
+    old = copy.deepcopy(obj)
+    for attr in attrs:
+        del old.__dict__[attr]
+    return pickle.loads(pickle.dumps(old))
+
+
+def test_unpickle_without_cache_dir():
+    processor = WidePreprocessor(wide_cols, cross_cols)
+    X_wide = processor.fit_transform(df_letters)
+
+    old_processor = _pickled_before(processor, ["cache_dir"])
+
+    assert old_processor.cache_dir is None
+    assert np.array_equal(old_processor.fit_transform(df_letters), X_wide)
+
+
+def test_unpickle_without_multi_hot_cols():
+    processor = WidePreprocessor(wide_cols, cross_cols)
+    X_wide = processor.fit_transform(df_letters)
+
+    old_processor = _pickled_before(processor, ["multi_hot_cols", "multi_hot_max_len"])
+
+    assert old_processor.multi_hot_cols is None
+    assert np.array_equal(old_processor.transform(df_letters), X_wide)
+    assert np.array_equal(
+        old_processor.compile().transform(df_letters.to_dict("records")), X_wide
+    )
+
+
+###############################################################################
+# Test the compiled preprocessor
+###############################################################################
+
+
+@pytest.mark.parametrize("crossed_cols", [None, cross_cols])
+def test_compiled_preprocessor(crossed_cols):
+    processor = WidePreprocessor(wide_cols, crossed_cols)
+    X_wide = processor.fit_transform(df_numbers)
+    compiled_processor = processor.compile()
+
+    df_test = df_numbers.copy()
+    df_test.iloc[0, 0] = 10  # unseen value
+
+    X_wide_compiled = compiled_processor.transform(df_numbers.to_dict("records"))
+    X_wide_test_compiled = compiled_processor.transform(df_test.to_dict("records"))
+
+    assert np.array_equal(X_wide_compiled, X_wide)
+    assert np.array_equal(X_wide_test_compiled, processor.transform(df_test))
+    assert np.array_equal(
+        compiled_processor.transform_sample(df_test.to_dict("records")[0]),
+        processor.transform_sample(df_test),
+    )
+
+
+###############################################################################
+# Test multi-hot columns
+###############################################################################
+
+
+def test_multi_hot_cols():
+    df = pd.DataFrame(
+        {"col1": ["a", "b", "a"], "col2": [["x", "y"], ["y", "z", "x"], None]}
+    )
+    processor = WidePreprocessor(["col1"], multi_hot_cols=["col2"])
+    X_wide = processor.fit_transform(df)
+
+    assert isinstance(X_wide, MultiHotArray)
+    assert processor.wide_dim == 5
+    assert processor.multi_hot_max_lens == {"col2": 3}
+    assert np.asarray(X_wide).tolist() == [[1, 3, 4, 0], [2, 4, 5, 3], [1, 0, 0, 0]]
+    assert processor._inverse_transform_multi_hot(np.asarray(X_wide)) == {
+        "col2": [["x", "y"], ["y", "z", "x"], []]
+    }
@@ -0,0 +1,173 @@
+import os
+import string
+
+import numpy as np
+import torch
+import pytest
+from torchmetrics.classification import BinaryAUROC
+
+from pytorch_widedeep.models import Wide, TabMlp, WideDeep
+from pytorch_widedeep.metrics import F1Score, Accuracy
+from pytorch_widedeep.training import Trainer
+from pytorch_widedeep.callbacks import EarlyStopping, ModelCheckpoint
+from pytorch_widedeep.dataloaders import DataLoaderImbalanced
+from pytorch_widedeep.distributed import (
+    launch,
+    get_rank,
+    all_reduce,
+    get_world_size,
+    is_distributed,
+)
+from pytorch_widedeep.training._wd_dataset import WideDeepDataset
+
+# Wide array
+X_wide = np.random.choice(50, (64, 10))
+
+# Deep Array
+colnames = list(string.ascii_lowercase)[:10]
+embed_cols = [np.random.choice(np.arange(5), 64) for _ in range(5)]
+embed_input = [(u, i, j) for u, i, j in zip(colnames[:5], [5] * 5, [8] * 5)]
+cont_cols = [np.random.rand(64) for _ in range(5)]
+column_idx = {k: v for v, k in enumerate(colnames)}
+X_tab = np.vstack(embed_cols + cont_cols).transpose()
+
+target = np.random.choice(2, 64)
+
+
+def _build_model():
+    torch.manual_seed(0)
+    wide = Wide(np.unique(X_wide).shape[0], 1)
+    # no dropout or batchnorm so that the results do not depend on how the
+    # data is split into batches
+    deeptabular = TabMlp(
+        column_idx=column_idx,
+        cat_embed_input=embed_input,
+        continuous_cols=colnames[-5:],
+        cont_norm_layer=None,
+        mlp_hidden_dims=[16, 8],
+        cat_embed_dropout=0.0,
+        cont_embed_dropout=0.0,
+        mlp_dropout=0.0,
+    )
+    return WideDeep(wide=wide, deeptabular=deeptabular, pred_dim=1)
+
+
+def _fit(data, batch_size, n_epochs, callbacks=None, lr=0.1):
+    X_wide, X_tab, target = data
+    model = _build_model()
+    trainer = Trainer(
+        model,
+        objective="binary",
+        optimizers=torch.optim.SGD(model.parameters(), lr=lr),
+        metrics=[Accuracy, F1Score, BinaryAUROC()],
+        callbacks=[EarlyStopping(patience=1)] + (callbacks or []),
+        verbose=0,
+    )
+    trainer.fit(
+        X_wide=X_wide,
+        X_tab=X_tab,
+        target=target,
+        n_epochs=n_epochs,
+        batch_size=batch_size,
+        val_split=0.25,
+    )
+    return trainer.history, model.state_dict()
+
+
+def _distributed_fit(data, batch_size, n_epochs, checkpoint_path):
+    # the data is passed to the processes, since they are spawned and
+    # would re-generate it otherwise
+    callbacks = [ModelCheckpoint(filepath=checkpoint_path, save_best_only=False)]
+    history, state_dict = _fit(data, batch_size, n_epochs, callbacks)
+    return get_rank(), get_world_size(), history, state_dict
+
+
+def _distributed_eval_history(data):
+    # with lr = 0 the model does not change during training
+    history, _ = _fit(data, batch_size=4, n_epochs=1, lr=0.0)
+    return history
+
+
+def _imbalanced_loader_n_samples(X_wide, target):
+    dataset = WideDeepDataset(X_wide=X_wide, target=target)
+    loader = DataLoaderImbalanced(dataset, batch_size=4, num_workers=0)
+    return len(loader.sampler), all_reduce(torch.tensor([get_rank()])).item()
+
+
+###############################################################################
+# Test that distributed training over 2 processes is equivalent to training
+# in a single process with a batch twice as large
+###############################################################################
+def test_distributed_fit(tmp_path):
+    data = (X_wide, X_tab, target)
+    history, state_dict = _fit(data, batch_size=16, n_epochs=3)
+
+    checkpoint_path = os.path.join(tmp_path, "checkpoints", "wd_model")
+    results = launch(
+        _distributed_fit,
+        n_workers=2,
+        args=(data, 8, 3, checkpoint_path),
+        n_threads=1,
+    )
+
+    assert [r[:2] for r in results] == [(0, 2), (1, 2)]
+    for _, _, dist_history, dist_state_dict in results:
+        # the losses and metrics are all-reduced, so the history is the same
+        # in both processes, and equal to the single process one
+        assert dist_history.keys() == history.keys()
+        for k, v in history.items():
+            assert np.allclose(dist_history[k], v, atol=1e-5)
+        for k, v in state_dict.items():
+            assert torch.allclose(dist_state_dict[k], v, atol=1e-5)
+
+    # the early stopping decision is shared, and the checkpoints are written
+    # once, by the process with rank 0
+    n_epochs = len(history["train_loss"])
+    assert sorted(os.listdir(os.path.dirname(checkpoint_path))) == [
+        f"wd_model_{epoch}.p" for epoch in range(1, n_epochs + 1)
+    ]
+
+
+def test_distributed_eval_not_divisible():
+    # 15 validation samples: the DistributedSampler repeats one sample so
+    # that both processes get 8, which must not count in the metrics
+    data = (X_wide[:60], X_tab[:60], target[:60])
+    history, _ = _fit(data, batch_size=4, n_epochs=1, lr=0.0)
+
+    results = launch(_distributed_eval_history, n_workers=2, args=(data,), n_threads=1)
+
+    for dist_history in results:
+        assert np.allclose(dist_history["val_acc"], history["val_acc"])
+        assert np.allclose(dist_history["val_f1"], history["val_f1"])
+        assert dist_history["val_loss"] == results[0]["val_loss"]
+
+
+def test_distributed_imbalanced_loader():
+    n_samples, rank_sum = launch(
+        _imbalanced_loader_n_samples,
+        n_workers=2,
+        args=(X_wide, target),
+        n_threads=1,
+    )[0]
+
+    minor_class_count = np.unique(target, return_counts=True)[1].min()
+    assert n_samples == int(np.ceil(minor_class_count * 2 / 2))
+    assert rank_sum == 1
+
+
+###############################################################################
+# Test the helpers outside of a process group
+###############################################################################
+def test_not_distributed():
+    assert not is_distributed()
+    assert get_rank() == 0
+    assert get_world_size() == 1
+    assert all_reduce(3.0, op="mean").item() == 3.0
+
+    acc = Accuracy()
+    acc.update(torch.tensor([[0.3], [0.7]]), torch.tensor([[0.0], [0.0]]))
+    acc.sync()
+    assert acc.compute() == 0.5
+
+    with pytest.raises(ValueError):
+        all_reduce(3.0, op="min")
@@ -0,0 +1,102 @@
+import os
+
+import numpy as np
+import torch
+import pytest
+
+from pytorch_widedeep.models import Wide, TabMlp, WideDeep
+from pytorch_widedeep.metrics import Accuracy
+from pytorch_widedeep.training import Trainer
+from pytorch_widedeep.callbacks import (
+    LRHistory,
+    EarlyStopping,
+    ModelCheckpoint,
+)
+
+n_rows = 512
+X_wide = np.random.randint(1, 200, (n_rows, 6))
+X_tab = np.random.rand(n_rows, 4)
+column_idx = {k: v for v, k in enumerate(["a", "b", "c", "d"])}
+# a target that can be learned by the wide component
+target = (np.random.randn(200)[X_wide - 1].sum(1) > 0).astype(int)
+
+
+def _model(**wide_params):
+    wide = Wide(input_dim=199, pred_dim=1, sparse=True, **wide_params)
+    deeptabular = TabMlp(
+        column_idx=column_idx, continuous_cols=["a", "b", "c", "d"], mlp_hidden_dims=[8]
+    )
+    return WideDeep(wide=wide, deeptabular=deeptabular)
+
+
+###############################################################################
+# Test that the workers train the shared model, while this process takes care
+# of the validation, callbacks and lr schedulers
+###############################################################################
+def test_hogwild_fit(tmp_path):
+    model = _model()
+    wide_weight = model.wide.wide_linear.weight.detach().clone()
+    # SGD supports sparse gradients
+    optimizer = torch.optim.SGD(model.parameters(), lr=0.1)
+    trainer = Trainer(
+        model,
+        objective="binary",
+        optimizers=optimizer,
+        lr_schedulers=torch.optim.lr_scheduler.StepLR(
+            optimizer, step_size=1, gamma=0.5
+        ),
+        metrics=[Accuracy],
+        callbacks=[
+            LRHistory(n_epochs=3),
+            EarlyStopping(patience=3),
+            ModelCheckpoint(filepath=os.path.join(tmp_path, "wd_model")),
+        ],
+        verbose=0,
+    )
+    trainer.fit(
+        X_wide=X_wide,
+        X_tab=X_tab,
+        target=target,
+        n_epochs=3,
+        batch_size=32,
+        val_split=0.25,
+        hogwild_workers=2,
+    )
+
+    assert not torch.equal(model.wide.wide_linear.weight, wide_weight)
+    assert len(trainer.history["train_loss"]) == 3
+    assert len(trainer.history["val_acc"]) == 3
+    assert trainer.history["train_loss"][-1] < trainer.history["train_loss"][0]
+    # the lr schedulers step in this process, and the learning rates are sent
+    # to the workers
+    assert trainer.lr_history["lr_0"] == [0.1, 0.05, 0.025]
+    assert sorted(os.listdir(tmp_path)) == [
+        "wd_model_1.p",
+        "wd_model_2.p",
+        "wd_model_3.p",
+    ]
+
+    # the model can be used (or trained further) in this process
+    preds = trainer.predict(X_wide=X_wide, X_tab=X_tab, batch_size=128)
+    assert preds.shape == (n_rows,)
+
+
+@pytest.mark.parametrize("setup", ["cyclic_lr", "mmap"])
+def test_hogwild_not_supported(setup, tmp_path):
+    if setup == "mmap":
+        model = _model(mmap_params={"path": os.path.join(tmp_path, "wide.bin")})
+        trainer = Trainer(model, objective="binary", verbose=0)
+    else:
+        model = _model()
+        optimizer = torch.optim.SGD(model.parameters(), lr=0.1)
+        trainer = Trainer(
+            model,
+            objective="binary",
+            optimizers=optimizer,
+            lr_schedulers=torch.optim.lr_scheduler.CyclicLR(
+                optimizer, base_lr=0.01, max_lr=0.1
+            ),
+            verbose=0,
+        )
+    with pytest.raises(ValueError):
+        trainer.fit(X_wide=X_wide, X_tab=X_tab, target=target, hogwild_workers=2)
@@ -0,0 +1,228 @@
+import os
+import string
+
+import numpy as np
+import torch
+import pytest
+
+from pytorch_widedeep.models import Wide, TabMlp, WideDeep
+from pytorch_widedeep.training import Trainer
+from pytorch_widedeep.callbacks import ModelCheckpoint
+from pytorch_widedeep.distributed import (
+    launch,
+    get_rank,
+    rank_path,
+    get_world_size,
+    load_checkpoint,
+)
+from pytorch_widedeep.models.tabular.embeddings_layers import (
+    ShardedEmbedding,
+    DiffSizeCatEmbeddings,
+)
+
+# Wide array
+# no padding/unseen values (i.e. 0), which do not contribute to the output of
+# the sharded Wide, but do to that of the non sharded one
+X_wide = np.random.choice(np.arange(1, 50), (64, 10))
+
+# Deep Array
+colnames = list(string.ascii_lowercase)[:6]
+embed_cols = [np.random.choice(np.arange(20), 64) for _ in range(3)]
+embed_input = [(u, i, j) for u, i, j in zip(colnames[:3], [20] * 3, [8] * 3)]
+cont_cols = [np.random.rand(64) for _ in range(3)]
+column_idx = {k: v for v, k in enumerate(colnames)}
+X_tab = np.vstack(embed_cols + cont_cols).transpose()
+
+target = np.random.choice(2, 64)
+
+
+def _build_model(sharded: bool):
+    # no dropout or batchnorm so that the results do not depend on how the
+    # data is split into batches
+    wide = Wide(49, 1, sparse=True, sharded=sharded)
+    deeptabular = TabMlp(
+        column_idx=column_idx,
+        cat_embed_input=embed_input,
+        continuous_cols=colnames[-3:],
+        cont_norm_layer=None,
+        mlp_hidden_dims=[16, 8],
+        cat_embed_dropout=0.0,
+        cont_embed_dropout=0.0,
+        mlp_dropout=0.0,
+        sharded_embed_input={"a": {"sparse": True}} if sharded else None,
+    )
+    return WideDeep(wide=wide, deeptabular=deeptabular, pred_dim=1)
+
+
+def _fit(model, data, batch_size):
+    X_wide, X_tab, target = data
+    trainer = Trainer(
+        model,
+        objective="binary",
+        optimizers=torch.optim.SGD(model.parameters(), lr=0.1),
+        verbose=0,
+    )
+    trainer.fit(
+        X_wide=X_wide,
+        X_tab=X_tab,
+        target=target,
+        n_epochs=2,
+        batch_size=batch_size,
+        val_split=0.25,
+    )
+    return trainer.history
+
+
+def _shard_key(key):
+    # key of the (full) table in the state dict of the non sharded model
+    return key.replace("sharded_embed", "embed_layers")
+
+
+def _sharded_fit(data, state_dict, batch_size):
+    # the sharded model starts from the same weights as the non sharded one
+    rank, world_size = get_rank(), get_world_size()
+    model = _build_model(sharded=True)
+    model.load_state_dict(
+        {
+            k: (
+                state_dict[_shard_key(k)][rank::world_size]
+                if k.endswith("wide_linear.weight") or "sharded_embed" in k
+                else state_dict[k]
+            )
+            for k in model.state_dict()
+        }
+    )
+    history = _fit(model, data, batch_size)
+    return rank, world_size, history, model.state_dict()
+
+
+###############################################################################
+# Test that training with the tables sharded over 2 processes is equivalent to
+# training with the full tables in a single process with a batch twice as
+# large
+###############################################################################
+def test_sharded_embeddings_fit():
+    data = (X_wide, X_tab, target)
+    torch.manual_seed(0)
+    model = _build_model(sharded=False)
+    init_state_dict = {k: v.clone() for k, v in model.state_dict().items()}
+    history = _fit(model, data, batch_size=16)
+    state_dict = model.state_dict()
+
+    results = launch(
+        _sharded_fit, n_workers=2, args=(data, init_state_dict, 8), n_threads=1
+    )
+
+    shard_keys = []
+    for rank, world_size, sharded_history, sharded_state_dict in results:
+        for k, v in history.items():
+            assert np.allclose(sharded_history[k], v, atol=1e-5)
+        for k, v in sharded_state_dict.items():
+            if k.endswith("wide_linear.weight") or "sharded_embed" in k:
+                shard_keys.append(k)
+                v_full = state_dict[_shard_key(k)][rank::world_size]
+                assert v.shape == v_full.shape
+                assert torch.allclose(v, v_full, atol=1e-5)
+            else:
+                assert torch.allclose(v, state_dict[k], atol=1e-5)
+    # the wide and the 'a' tables, in each process
+    assert len(shard_keys) == 4
+
+
+###############################################################################
+# Test that each process saves (and loads) its own shards of the tables
+###############################################################################
+def _sharded_save_and_load(data, path):
+    X_wide, X_tab, target = data
+    model = _build_model(sharded=True)
+    trainer = Trainer(
+        model,
+        objective="binary",
+        callbacks=[ModelCheckpoint(filepath=os.path.join(path, "weights_out"))],
+        verbose=0,
+    )
+    trainer.fit(X_wide=X_wide, X_tab=X_tab, target=target, batch_size=8, val_split=0.25)
+    trainer.save(path, save_state_dict=True)
+
+    new_model = _build_model(sharded=True)
+    new_model.load_state_dict(load_checkpoint(os.path.join(path, "wd_model.pt")))
+    checkpoint = load_checkpoint(os.path.join(path, "weights_out_1.p"))
+    state_dict = model.state_dict()
+    loaded = all(
+        torch.equal(v, new_model.state_dict()[k]) and torch.equal(v, checkpoint[k])
+        for k, v in state_dict.items()
+    )
+    return get_rank(), loaded, state_dict
+
+
+def test_sharded_embeddings_save_and_load(tmp_path):
+    data = (X_wide, X_tab, target)
+    results = launch(
+        _sharded_save_and_load, n_workers=2, args=(data, str(tmp_path)), n_threads=1
+    )
+
+    for rank, loaded, state_dict in results:
+        assert loaded
+        for fname in ["wd_model.pt", "weights_out_1.p"]:
+            saved = torch.load(rank_path(str(tmp_path / fname), rank))
+            assert saved.keys() == state_dict.keys()
+            assert all(torch.equal(saved[k], v) for k, v in state_dict.items())
+    assert not (tmp_path / "wd_model.pt").exists()
+    # the shards of the processes are different
+    wide_key = "wide.wide_linear.weight"
+    assert not torch.equal(results[0][2][wide_key], results[1][2][wide_key])
+
+
+def test_load_checkpoint_not_distributed(tmp_path):
+    path = str(tmp_path / "wd_model.pt")
+    assert rank_path(path) == str(tmp_path / "wd_model_rank0.pt")
+
+    model = _build_model(sharded=True)
+    torch.save(model.state_dict(), path)
+    assert load_checkpoint(path).keys() == model.state_dict().keys()
+
+
+###############################################################################
+# Test the layers outside of a process group
+###############################################################################
+def test_sharded_embedding_not_distributed():
+    embed = ShardedEmbedding(10, 4)
+    assert embed.weight.shape == (10, 4)
+
+    X = torch.tensor([[0, 1, 3], [3, 9, 1]])
+    out = embed(X)
+    assert torch.equal(out[0, 0], torch.zeros(4))
+    assert torch.allclose(out[1, 1], embed.weight[9])
+
+    out.sum().backward()
+    # 3 appears twice in the batch
+    assert torch.allclose(embed.weight.grad[3], torch.full((4,), 2.0))
+    assert torch.equal(embed.weight.grad[0], torch.zeros(4))
+
+
+def test_sharded_wide_and_tab_mlp():
+    wide = Wide(49, 1, sharded=True)
+    out = wide(torch.from_numpy(X_wide))
+    assert out.shape == (64, 1)
+
+    cat_embed = DiffSizeCatEmbeddings(
+        column_idx, embed_input, 0.0, False, sharded_embed_input={"a": {}}
+    )
+    assert isinstance(cat_embed._unfused_embed_layer("a"), ShardedEmbedding)
+    assert cat_embed(torch.from_numpy(X_tab)).shape == (64, 24)
+
+
+@pytest.mark.parametrize("setup", ["wide", "tab"])
+def test_sharded_and_mmap(setup, tmp_path):
+    with pytest.raises(ValueError):
+        if setup == "wide":
+            Wide(49, 1, mmap_params={"path": str(tmp_path / "w.bin")}, sharded=True)
+        else:
+            DiffSizeCatEmbeddings(
+                column_idx,
+                embed_input,
+                0.0,
+                False,
+                mmap_embed_input={"a": {"path": str(tmp_path / "a.bin")}},
+                sharded_embed_input={"a": {}},
+            )
@@ -126,7 +126,7 @@ finetuner = FineTune(loss_fn, MultipleMetrics([Accuracy()]), "binary", False)
 # so here we go...
 last_linear = list(tab_mlp.children())[1]
 inverted_mlp_layers = list(
-    list(list(tab_mlp.named_modules())[12][1].children())[0].children()
+    list(dict(tab_mlp.named_modules())["0.encoder"].children())[0].children()
 )[::-1]
 tab_layers = [last_linear] + inverted_mlp_layers
 text_layers = [c for c in list(deeptext.children())[1:]][::-1]
@@ -0,0 +1,127 @@
+import torch
+import pytest
+
+from pytorch_widedeep.models import (
+    Wide,
+    TabMlp,
+    WideDeep,
+    TabResnet,
+    FTTransformer,
+)
+from pytorch_widedeep.inference import FoldedTabModel, fold_embeddings
+
+colnames = list("abcdef")
+column_idx = {k: v for v, k in enumerate(colnames)}
+cat_embed_input = [("a", 10, 4), ("b", 20, 8), ("c", 10, 4), ("d", 50, 16)]
+continuous_cols = ["e", "f"]
+
+X_tab = torch.cat(
+    [
+        torch.randint(0, 11, (32, 1)),
+        torch.randint(0, 21, (32, 1)),
+        torch.randint(0, 11, (32, 1)),
+        torch.randint(0, 51, (32, 1)),
+        torch.rand(32, 2),
+    ],
+    1,
+)
+
+
+def _trained(model):
+    # non trivial batchnorm statistics
+    model.train()
+    for _ in range(3):
+        model(X_tab)
+    return model.eval()
+
+
+###############################################################################
+# Test that the folded models return the same outputs as the original ones
+###############################################################################
+@pytest.mark.parametrize(
+    "params",
+    [
+        {},
+        {"use_cat_bias": True, "embed_continuous": True},
+        {"mlp_batchnorm": True, "mlp_linear_first": False},
+        {"shared_vocab_cols": [["a", "c"]]},
+        {"compositional_embed_input": {"d": {"method": "hash", "n_buckets": 8}}},
+        {"cont_norm_layer": None, "continuous_cols": None},
+    ],
+)
+def test_folded_tab_mlp(params):
+    params = {
+        "column_idx": column_idx,
+        "cat_embed_input": cat_embed_input,
+        "continuous_cols": continuous_cols,
+        "cont_norm_layer": "batchnorm",
+        "mlp_hidden_dims": [16, 8],
+        **params,
+    }
+    model = _trained(TabMlp(**params))
+    folded_model = FoldedTabModel(model)
+
+    assert folded_model.output_dim == model.output_dim
+    assert torch.allclose(folded_model(X_tab), model(X_tab), atol=1e-5)
+
+
+@pytest.mark.parametrize("mlp_hidden_dims", [None, [8]])
+def test_folded_tab_resnet(mlp_hidden_dims):
+    model = _trained(
+        TabResnet(
+            column_idx=column_idx,
+            cat_embed_input=cat_embed_input,
+            continuous_cols=continuous_cols,
+            blocks_dims=[16, 16],
+            mlp_hidden_dims=mlp_hidden_dims,
+        )
+    )
+    folded_model = FoldedTabModel(model)
+
+    assert torch.allclose(folded_model(X_tab), model(X_tab), atol=1e-5)
+
+
+def test_fold_embeddings_wide_deep():
+    model = WideDeep(
+        wide=Wide(10, 1),
+        deeptabular=TabMlp(
+            column_idx=column_idx,
+            cat_embed_input=cat_embed_input,
+            continuous_cols=continuous_cols,
+        ),
+    ).eval()
+    X = {"wide": torch.randint(0, 10, (32, 2)), "deeptabular": X_tab}
+
+    folded_model = fold_embeddings(model)
+
+    assert isinstance(folded_model.deeptabular[0], FoldedTabModel)
+    # the original model is untouched
+    assert isinstance(model.deeptabular[0], TabMlp)
+    assert torch.allclose(folded_model(X), model(X), atol=1e-5)
+
+
+###############################################################################
+# Test the models that cannot be folded
+###############################################################################
+def test_folding_errors():
+    tab_resnet = TabResnet(
+        column_idx=column_idx,
+        cat_embed_input=cat_embed_input,
+        continuous_cols=continuous_cols,
+        blocks_dims=[34, 16],
+    )
+    tab_mlp = TabMlp(
+        column_idx=column_idx,
+        cat_embed_input=cat_embed_input,
+        cat_embed_activation="relu",
+    )
+    ft_transformer = FTTransformer(
+        column_idx=column_idx,
+        cat_embed_input=[(c, v) for c, v, _ in cat_embed_input],
+    )
+    for model in [tab_resnet, tab_mlp, ft_transformer]:
+        with pytest.raises(ValueError):
+            FoldedTabModel(model)
+
+    # models that cannot be folded are left untouched
+    assert fold_embeddings(tab_resnet, inplace=True) is tab_resnet
@@ -0,0 +1,217 @@
+import pickle
+
+import torch
+import pytest
+from torch import nn
+
+from pytorch_widedeep.models import (
+    SAINT,
+    Wide,
+    TabMlp,
+    TabNet,
+    Vision,
+    WideDeep,
+    TabResnet,
+)
+from pytorch_widedeep.inference import optimize_for_inference
+
+colnames = list("abcdef")
+column_idx = {k: v for v, k in enumerate(colnames)}
+cat_embed_input = [("a", 10, 4), ("b", 20, 8), ("c", 10, 4), ("d", 50, 16)]
+continuous_cols = ["e", "f"]
+
+X_tab = torch.cat(
+    [
+        torch.randint(0, 11, (32, 1)),
+        torch.randint(0, 21, (32, 1)),
+        torch.randint(0, 11, (32, 1)),
+        torch.randint(0, 51, (32, 1)),
+        torch.rand(32, 2),
+    ],
+    1,
+)
+X_wide = torch.randint(0, 10, (32, 4))
+X_img = torch.rand(32, 3, 32, 32)
+
+
+def _trained(model, X):
+    # non trivial batchnorm statistics
+    model.train()
+    with torch.no_grad():
+        for _ in range(3):
+            model(X)
+    return model.eval()
+
+
+def _n_batchnorms(model):
+    return len(
+        [m for m in model.modules() if isinstance(m, (nn.BatchNorm1d, nn.BatchNorm2d))]
+    )
+
+
+def _n_dropouts(model):
+    return len([m for m in model.modules() if isinstance(m, nn.Dropout)])
+
+
+###############################################################################
+# Test that the optimised models return the same outputs as the original ones
+###############################################################################
+@pytest.mark.parametrize(
+    "params",
+    [
+        {"mlp_batchnorm": True, "mlp_linear_first": False},
+        {"mlp_batchnorm": True, "mlp_batchnorm_last": True, "mlp_linear_first": True},
+        {"mlp_batchnorm": True, "embed_continuous": True},
+        {"mlp_batchnorm": True, "embed_continuous": True, "use_cont_bias": False},
+    ],
+)
+def test_optimized_tab_mlp(params):
+    tab_mlp = TabMlp(
+        column_idx=column_idx,
+        cat_embed_input=cat_embed_input,
+        continuous_cols=continuous_cols,
+        cont_norm_layer="batchnorm",
+        mlp_hidden_dims=[16, 8],
+        mlp_dropout=0.2,
+        **params,
+    )
+    model = WideDeep(wide=Wide(input_dim=10, pred_dim=1), deeptabular=tab_mlp)
+    X = {"wide": X_wide, "deeptabular": X_tab}
+    model = _trained(model, X)
+    opt_model = optimize_for_inference(model)
+
+    # with linear_first = True the batchnorm of the last layer has no linear
+    # layer to be folded into
+    assert _n_batchnorms(opt_model) == int(params.get("mlp_linear_first", False))
+    assert _n_dropouts(opt_model) == 0
+    assert torch.allclose(opt_model(X), model(X), atol=1e-5)
+
+
+@pytest.mark.parametrize("blocks_dims", [[16, 16, 8], [34, 16]])
+def test_optimized_tab_resnet(blocks_dims):
+    # with blocks_dims[0] == 34 there is no dense layer before the first block
+    tab_resnet = TabResnet(
+        column_idx=column_idx,
+        cat_embed_input=cat_embed_input,
+        continuous_cols=continuous_cols,
+        cont_norm_layer="batchnorm",
+        blocks_dims=blocks_dims,
+        blocks_dropout=0.2,
+        mlp_hidden_dims=[8],
+        mlp_batchnorm=True,
+    )
+    model = _trained(WideDeep(deeptabular=tab_resnet), {"deeptabular": X_tab})
+    opt_model = optimize_for_inference(model)
+
+    # the continuous columns batchnorm cannot be folded if there is no dense
+    # layer before the first block
+    assert _n_batchnorms(opt_model) == int(blocks_dims[0] == 34)
+    assert torch.allclose(
+        opt_model({"deeptabular": X_tab}), model({"deeptabular": X_tab}), atol=1e-5
+    )
+
+
+@pytest.mark.parametrize("ghost_bn", [True, False])
+def test_optimized_tabnet(ghost_bn):
+    tabnet = TabNet(
+        column_idx=column_idx,
+        cat_embed_input=cat_embed_input,
+        continuous_cols=continuous_cols,
+        ghost_bn=ghost_bn,
+        virtual_batch_size=8,
+    )
+    model = _trained(WideDeep(deeptabular=tabnet), {"deeptabular": X_tab})
+    opt_model = optimize_for_inference(model)
+
+    # only the initial batchnorm remains
+    assert _n_batchnorms(opt_model) == 1
+    # the shared layers are unshared before folding, the original model is
+    # untouched
+    assert _n_batchnorms(model) > 1
+    assert torch.allclose(
+        opt_model({"deeptabular": X_tab})[0],
+        model({"deeptabular": X_tab})[0],
+        atol=1e-4,
+    )
+
+
+@pytest.mark.parametrize(
+    "pretrained_model_setup", [None, {"resnet18": None}, {"resnet50": None}]
+)
+def test_optimized_vision(pretrained_model_setup):
+    vision = Vision(
+        pretrained_model_setup=pretrained_model_setup,
+        channel_sizes=[16, 32],
+        kernel_sizes=3,
+        strides=1,
+        head_hidden_dims=[16],
+        head_batchnorm=True,
+    )
+    model = _trained(WideDeep(deepimage=vision), {"deepimage": X_img})
+    opt_model = optimize_for_inference(model)
+
+    assert _n_batchnorms(opt_model) == 0
+    conv = [m for m in opt_model.modules() if isinstance(m, nn.Conv2d)][0]
+    assert conv.weight.is_contiguous(memory_format=torch.channels_last)
+    assert torch.allclose(
+        opt_model({"deepimage": X_img}), model({"deepimage": X_img}), atol=1e-4
+    )
+
+
+###############################################################################
+# Test the options and some edge cases
+###############################################################################
+def test_optimize_inplace_and_options():
+    tab_mlp = TabMlp(
+        column_idx=column_idx,
+        cat_embed_input=cat_embed_input,
+        continuous_cols=continuous_cols,
+        mlp_hidden_dims=[16, 8],
+        mlp_batchnorm=True,
+        mlp_dropout=0.2,
+    )
+    model = _trained(WideDeep(deeptabular=tab_mlp), {"deeptabular": X_tab})
+    out = model({"deeptabular": X_tab})
+
+    opt_model = optimize_for_inference(model, fold_batchnorm=False)
+    assert _n_batchnorms(opt_model) == _n_batchnorms(model)
+    assert _n_dropouts(opt_model) == 0
+
+    opt_model = optimize_for_inference(model, remove_dropout=False)
+    assert _n_batchnorms(opt_model) == 0
+    assert _n_dropouts(opt_model) == _n_dropouts(model)
+
+    opt_model = optimize_for_inference(model, inplace=True)
+    assert opt_model is model
+    assert _n_batchnorms(model) == 0
+    assert torch.allclose(model({"deeptabular": X_tab}), out, atol=1e-5)
+
+
+def test_optimize_attention_model():
+    # no batchnorm to fold in the attention based models, but the continuous
+    # columns batchnorm is folded into the continuous embeddings
+    saint = SAINT(
+        column_idx=column_idx,
+        cat_embed_input=[(c, n) for c, n, _ in cat_embed_input],
+        continuous_cols=continuous_cols,
+        cont_norm_layer="batchnorm",
+        input_dim=8,
+        n_blocks=1,
+    )
+    model = _trained(WideDeep(deeptabular=saint), {"deeptabular": X_tab})
+    opt_model = optimize_for_inference(model)
+
+    assert _n_batchnorms(opt_model) == 0
+    assert torch.allclose(
+        opt_model({"deeptabular": X_tab}), model({"deeptabular": X_tab}), atol=1e-5
+    )
+
+
+def test_optimized_model_pickle():
+    vision = Vision(channel_sizes=[16, 32], kernel_sizes=3, strides=1)
+    model = _trained(WideDeep(deepimage=vision), {"deepimage": X_img})
+    opt_model = pickle.loads(pickle.dumps(optimize_for_inference(model)))
+
+    assert torch.allclose(
+        opt_model({"deepimage": X_img}), model({"deepimage": X_img}), atol=1e-4
+    )
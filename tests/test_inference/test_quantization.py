@@ -0,0 +1,177 @@
+import numpy as np
+import torch
+import pandas as pd
+import pytest
+from torch import nn
+from sklearn.metrics import mean_squared_error
+
+from pytorch_widedeep.models import Wide, TabMlp, WideDeep, FTTransformer
+from pytorch_widedeep.inference import (
+    quantize_embeddings,
+    quantization_drift_report,
+)
+from pytorch_widedeep.preprocessing import TabPreprocessor, WidePreprocessor
+from pytorch_widedeep.models.tabular.embeddings_layers import (
+    QuantizedEmbedding,
+)
+
+n_rows = 200
+
+df = pd.DataFrame(
+    {
+        "col1": np.random.choice(500, n_rows),
+        "col2": np.random.choice(["a", "b", "c"], n_rows),
+        "col3": np.random.choice(500, n_rows),
+        "col4": np.random.rand(n_rows),
+    }
+)
+target = np.random.rand(n_rows)
+
+
+###############################################################################
+# Test the QuantizedEmbedding layer
+###############################################################################
+@pytest.mark.parametrize("dtype, tol", [("int8", 3e-2), ("float16", 5e-3)])
+def test_quantized_embedding(dtype, tol):
+    embed = nn.Embedding(50, 16, padding_idx=0)
+    q_embed = QuantizedEmbedding(embed.weight, dtype, padding_idx=0)
+
+    X = torch.randint(0, 50, (32, 4))
+    out = q_embed(X)
+    assert out.dtype == torch.float32
+    assert (out - embed(X)).abs().max() < tol
+    assert torch.all(out[X == 0] == 0)
+    assert (q_embed.dequantize() - embed.weight).abs().max() < tol
+
+
+@pytest.mark.parametrize("mode", ["sum", "mean"])
+def test_quantized_embedding_bag(mode):
+    embed = nn.EmbeddingBag(50, 16, mode=mode, padding_idx=0)
+    q_embed = QuantizedEmbedding(embed.weight, "float16", padding_idx=0, mode=mode)
+
+    X = torch.randint(0, 50, (32, 4))
+    X[:, -1] = 0
+    assert torch.allclose(q_embed(X), embed(X), atol=1e-2)
+
+
+@pytest.mark.parametrize(
+    "dtype, mode",
+    [("int4", None), ("int8", "max")],
+)
+def test_quantized_embedding_errors(dtype, mode):
+    with pytest.raises(ValueError):
+        QuantizedEmbedding(torch.rand(10, 8), dtype, mode=mode)
+
+
+###############################################################################
+# Test quantize_embeddings
+###############################################################################
+wide_preprocessor = WidePreprocessor(wide_cols=["col1", "col2"])
+X_wide = wide_preprocessor.fit_transform(df)
+
+tab_preprocessor = TabPreprocessor(
+    cat_embed_cols=[("col1", 16), ("col2", 4), ("col3", 16)],
+    continuous_cols=["col4"],
+    shared_vocab_cols=[["col1", "col3"]],
+)
+X_tab = tab_preprocessor.fit_transform(df)
+
+
+def _build_wide_deep():
+    wide = Wide(input_dim=wide_preprocessor.wide_dim, pred_dim=1)
+    tab_mlp = TabMlp(
+        column_idx=tab_preprocessor.column_idx,
+        cat_embed_input=tab_preprocessor.cat_embed_input,
+        continuous_cols=["col4"],
+        shared_vocab_cols=[["col1", "col3"]],
+        use_cat_bias=True,
+        mlp_hidden_dims=[16, 8],
+    )
+    return WideDeep(wide=wide, deeptabular=tab_mlp)
+
+
+@pytest.mark.parametrize("dtype", ["int8", "float16"])
+def test_quantize_wide_deep(dtype):
+    model = _build_wide_deep()
+    state_dict = {k: v.clone() for k, v in model.state_dict().items()}
+
+    q_model = quantize_embeddings(model, dtype)
+
+    # the original model is untouched
+    for k, v in model.state_dict().items():
+        assert torch.equal(v, state_dict[k])
+
+    cat_embed = q_model.deeptabular[0].cat_and_cont_embed.cat_embed
+    assert all(
+        isinstance(t, QuantizedEmbedding) for t in cat_embed.fused_embed.values()
+    )
+    # the wide tables are too "narrow" to benefit from int8
+    assert q_model.wide.wide_linear.dtype == "float16"
+
+    X = {
+        "wide": torch.from_numpy(X_wide),
+        "deeptabular": torch.from_numpy(X_tab).float(),
+    }
+    model.eval()
+    q_model.eval()
+    with torch.no_grad():
+        assert (model(X) - q_model(X)).abs().max() < 5e-2
+
+
+@pytest.mark.parametrize("shared_embed", [True, False])
+def test_quantize_transformer(shared_embed):
+    tab_preprocessor = TabPreprocessor(
+        cat_embed_cols=["col1", "col2"],
+        continuous_cols=["col4"],
+        with_attention=True,
+        shared_embed=shared_embed,
+    )
+    X_tab = tab_preprocessor.fit_transform(df)
+    model = FTTransformer(
+        column_idx=tab_preprocessor.column_idx,
+        cat_embed_input=tab_preprocessor.cat_embed_input,
+        continuous_cols=["col4"],
+        shared_embed=shared_embed,
+        n_blocks=1,
+    )
+
+    q_model = quantize_embeddings(model, inplace=True)
+    assert q_model is model
+    assert not any(isinstance(m, nn.Embedding) for m in model.modules())
+
+    out = q_model.eval()(torch.from_numpy(X_tab).float())
+    assert out.size() == (n_rows, q_model.output_dim)
+
+
+def test_quantize_embeddings_dtype_error():
+    with pytest.raises(ValueError):
+        quantize_embeddings(_build_wide_deep(), "int4")
+
+
+###############################################################################
+# Test quantization_drift_report
+###############################################################################
+def test_quantization_drift_report():
+    model = _build_wide_deep()
+    q_model = quantize_embeddings(model)
+
+    report = quantization_drift_report(
+        model,
+        q_model,
+        X_wide=X_wide,
+        X_tab=X_tab,
+        target=target,
+        metric=mean_squared_error,
+        batch_size=64,
+    )
+
+    assert report["max_abs_diff"] < 5e-2
+    assert report["compression"] > 1
+    assert np.isclose(
+        report["metric_diff"], report["quantized_metric"] - report["metric"]
+    )
+
+    with pytest.raises(ValueError):
+        quantization_drift_report(
+            model, q_model, X_wide=X_wide, X_tab=X_tab, metric=mean_squared_error
+        )
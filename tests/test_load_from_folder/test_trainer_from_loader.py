@@ -2,6 +2,7 @@
 # literally doing this in bursts of a few minutes...
 import os
 
+import torch
 import pandas as pd
 import pytest
 from torch.utils.data import DataLoader
@@ -238,6 +239,61 @@ def test_trainer_from_loader_basic_inputs(objective):
     assert len(trainer.history) > 0 and "train_loss" in trainer.history.keys()
 
 
+def test_trainer_from_loader_gradient_accumulation():
+    (
+        wide_preprocessor,
+        tab_preprocessor,
+        text_preprocessor,
+        img_preprocessor,
+    ) = _build_preprocessors()
+
+    (
+        wide_from_folder,
+        tab_from_folder,
+        text_from_folder,
+        img_from_folder,
+    ) = _build_data_mode_from_folder(
+        wide_preprocessor,
+        tab_preprocessor,
+        text_preprocessor,
+        img_preprocessor,
+        "target_binary",
+    )
+
+    dataset_from_folder = WideDeepDatasetFromFolder(
+        n_samples=data_size,
+        wide_from_folder=wide_from_folder,
+        tab_from_folder=tab_from_folder,
+        text_from_folder=text_from_folder,
+        img_from_folder=img_from_folder,
+    )
+
+    # 8 batches, i.e. 3 optimizer steps (3, 3 and 2 accumulated batches)
+    dataloader_from_folder = DataLoader(dataset_from_folder, batch_size=4)
+
+    model = _buid_model(wide_preprocessor, tab_preprocessor, text_preprocessor)
+    optimizer = torch.optim.SGD(model.parameters(), lr=0.01)
+    lr_scheduler = torch.optim.lr_scheduler.OneCycleLR(
+        optimizer, max_lr=0.1, steps_per_epoch=3, epochs=1
+    )
+
+    trainer = TrainerFromFolder(
+        model,
+        objective="binary",
+        optimizers=optimizer,
+        lr_schedulers=lr_scheduler,
+        verbose=0,
+    )
+
+    trainer.fit(
+        train_loader=dataloader_from_folder,
+        gradient_accumulation_steps=3,
+    )
+
+    assert lr_scheduler.last_epoch == 3
+    assert len(trainer.history["train_loss"]) == 1
+
+
 @pytest.mark.parametrize("pred_with_loader", [True, False])
 def test_trainer_from_loader_with_valid_and_test(pred_with_loader):
     (
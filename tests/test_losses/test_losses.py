@@ -403,3 +403,20 @@ def test_FocalR_losses_act_f(loss_f):
         except Exception:
             has_run = False
         assert has_run
+
+
+##############################################################################
+# Test that the numerically sensitive losses are computed in fp32 under
+# autocast
+##############################################################################
+@pytest.mark.parametrize("loss_f", [ZILNLoss, TweedieLoss])
+def test_fp32_losses_under_autocast(loss_f):
+    logits = torch.tensor([[0.1, 0.2, 0.3], [0.4, 0.5, 0.6]])
+    target = torch.tensor([[0.0], [1.5]])
+    if loss_f == TweedieLoss:
+        logits = logits[:, :1]
+    expected_loss = loss_f()(logits, target)
+    with torch.autocast(device_type="cpu", dtype=torch.bfloat16):
+        loss = loss_f()(logits.bfloat16(), target)
+    assert loss.dtype == torch.float32
+    assert torch.allclose(loss, expected_loss, atol=1e-2)
@@ -236,3 +236,30 @@ def test_r2_score():
     assert r2_score(y_true_reg_np, y_pred_reg_np) == R2Score()(
         y_pred_reg_pt, y_true_reg_pt
     )
+
+
+###############################################################################
+# test that accumulating the state of the metrics (update) and computing them
+# at the end (compute) is the same as computing them on every batch
+###############################################################################
+
+
+@pytest.mark.parametrize(
+    "metric_class, y_pred, y_true",
+    [
+        (Accuracy, y_pred_bin_pt, y_true_bin_pt),
+        (Precision, y_pred_bin_pt, y_true_bin_pt),
+        (Recall, y_pred_bin_pt, y_true_bin_pt),
+        (F1Score, y_pred_bin_pt, y_true_bin_pt),
+        (Accuracy, y_pred_multi_pt, y_true_multi_pt),
+        (Precision, y_pred_multi_pt, y_true_multi_pt),
+        (F1Score, y_pred_multi_pt, y_true_multi_pt),
+        (R2Score, y_pred_reg_pt, y_true_reg_pt),
+    ],
+)
+def test_update_and_compute(metric_class, y_pred, y_true):
+    called_metric, updated_metric = metric_class(), metric_class()
+    for idx in [[0, 1], [2], [3, 1]]:
+        res = called_metric(y_pred[idx], y_true[idx])
+        updated_metric.update(y_pred[idx], y_true[idx])
+    assert updated_metric.compute() == res
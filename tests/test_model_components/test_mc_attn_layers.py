@@ -1,11 +1,16 @@
 import copy
 import timeit
+import threading
 
 import torch
 import pytest
 
+from pytorch_widedeep.models import capture_attention
+from pytorch_widedeep.models.attention_capture import is_capturing_attention
 from pytorch_widedeep.models.tabular.transformers._attention_layers import (
+    AdditiveAttention,
     MultiHeadedAttention,
+    LinearAttentionLinformer,
 )
 
 torch.backends.cudnn.deterministic = True
@@ -56,22 +61,28 @@ for module in ["q_proj", "kv_proj", "out_proj"]:
 X = torch.randn(128, 100, input_dim).to(device)
 
 
+def _standard_attn(X):
+    # the attention weights are only materialised when captured
+    with capture_attention():
+        return standard_attn(X)
+
+
 @pytest.mark.skipif(not torch.cuda.is_available(), reason="requires CUDA to run")
 def test_flash_standard_shapes():
     # Check that shapes of output are the same
-    assert standard_attn(X).shape == flash_attn(X).shape
+    assert _standard_attn(X).shape == flash_attn(X).shape
 
 
 @pytest.mark.skipif(not torch.cuda.is_available(), reason="requires CUDA to run")
 def test_flash_standard_values():
     # Check output values match between both implementations
-    assert torch.allclose(standard_attn(X), flash_attn(X), atol=1e-7)
+    assert torch.allclose(_standard_attn(X), flash_attn(X), atol=1e-7)
 
 
 @pytest.mark.skipif(not torch.cuda.is_available(), reason="requires CUDA to run")
 def test_speedup_flash():
     # Check that iterations happen faster
-    standard_its = timeit.timeit(lambda: standard_attn(X), number=500)
+    standard_its = timeit.timeit(lambda: _standard_attn(X), number=500)
     flash_its = timeit.timeit(lambda: flash_attn(X), number=500)
 
     assert standard_its > flash_its
@@ -81,3 +92,49 @@ def test_speedup_flash():
 def test_flash_standard_vs_linear_shapes():
     # Check that shapes of output are the same
     assert standard_attn(X).shape == linear_attn(X).shape
+
+
+###############################################################################
+# Test the capture of the attention weights
+###############################################################################
+
+
+@pytest.mark.parametrize("attn_type", ["standard", "linformer", "additive"])
+def test_capture_attention(attn_type):
+    if attn_type == "standard":
+        attn = MultiHeadedAttention(input_dim, n_heads, use_bias=False, dropout=0.1)
+    elif attn_type == "linformer":
+        attn = LinearAttentionLinformer(
+            input_dim, 100, n_heads, False, 0.1, 0.5, kv_sharing=False
+        )
+    else:
+        attn = AdditiveAttention(input_dim, n_heads, False, 0.1, False)
+    attn = attn.to(device).eval()
+
+    out = attn(X)
+    assert attn.attn_weights is None
+
+    with capture_attention():
+        captured_out = attn(X)
+    assert attn.attn_weights is not None
+    assert torch.allclose(out, captured_out, atol=1e-5)
+
+    # the weights of the last captured forward pass are kept
+    with capture_attention(enabled=False):
+        attn(X[:10])
+    attn_weights = (
+        attn.attn_weights[0] if attn_type == "additive" else attn.attn_weights
+    )
+    assert attn_weights.shape[0] == X.shape[0]
+
+
+def test_capture_attention_is_thread_local():
+    res = []
+    with capture_attention():
+        thread = threading.Thread(target=lambda: res.append(is_capturing_attention()))
+        thread.start()
+        thread.join()
+        res.append(is_capturing_attention())
+    res.append(is_capturing_attention())
+
+    assert res == [False, True, False]
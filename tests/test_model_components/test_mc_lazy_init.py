@@ -0,0 +1,170 @@
+import os
+
+import torch
+import pytest
+
+from pytorch_widedeep import Trainer
+from pytorch_widedeep.models import (
+    Wide,
+    TabMlp,
+    TabNet,
+    WideDeep,
+    TabPerceiver,
+    FTTransformer,
+    lazy_init,
+    init_empty_model,
+    materialize_model,
+)
+from pytorch_widedeep.models.lazy_init import has_meta_parameters
+
+colnames = list("abcde")
+column_idx = {k: v for v, k in enumerate(colnames)}
+cat_embed_input = [(c, 10, 8) for c in colnames[:4]]
+attn_cat_embed_input = [(c, 10) for c in colnames[:4]]
+
+X_wide = torch.randint(0, 20, (16, 3))
+X_tab = torch.cat([torch.randint(0, 11, (16, 4)), torch.rand(16, 1)], 1)
+# global codes for the (non-shared) attention based models
+X_attn_tab = torch.cat(
+    [torch.randint(1, 11, (16, 4)) + torch.arange(4) * 10, torch.rand(16, 1)], 1
+)
+
+
+def _tab_mlp():
+    return TabMlp(
+        column_idx=column_idx,
+        cat_embed_input=cat_embed_input,
+        continuous_cols=["e"],
+        embed_continuous=True,
+        use_cat_bias=True,
+        mlp_hidden_dims=[16, 8],
+    )
+
+
+def _tabnet():
+    return TabNet(
+        column_idx=column_idx,
+        cat_embed_input=cat_embed_input,
+        continuous_cols=["e"],
+    )
+
+
+def _ft_transformer():
+    return FTTransformer(
+        column_idx=column_idx,
+        cat_embed_input=attn_cat_embed_input,
+        continuous_cols=["e"],
+        kv_sharing=True,
+        n_blocks=1,
+    )
+
+
+def _tab_perceiver():
+    return TabPerceiver(
+        column_idx=column_idx,
+        cat_embed_input=attn_cat_embed_input,
+        continuous_cols=["e"],
+        n_latents=4,
+        latent_dim=8,
+    )
+
+
+def _build(deeptabular):
+    return WideDeep(wide=Wide(20, 1), deeptabular=deeptabular())
+
+
+def _forward(model, X_deep):
+    out = model.eval()({"wide": X_wide, "deeptabular": X_deep})
+    return out[0] if isinstance(out, tuple) else out
+
+
+###############################################################################
+# Test that the lazy path loads the weights and initialises the rest
+###############################################################################
+@pytest.mark.parametrize(
+    "deeptabular, X_deep",
+    [
+        (_tab_mlp, X_tab),
+        (_tabnet, X_tab),
+        (_ft_transformer, X_attn_tab),
+        (_tab_perceiver, X_attn_tab),
+    ],
+)
+def test_materialize_from_state_dict(deeptabular, X_deep):
+    model = _build(deeptabular)
+
+    with init_empty_model():
+        lazy_model = _build(deeptabular)
+    assert all(p.is_meta for p in lazy_model.parameters())
+
+    materialize_model(lazy_model, model.state_dict())
+    assert not has_meta_parameters(lazy_model)
+    assert torch.allclose(_forward(model, X_deep), _forward(lazy_model, X_deep))
+
+
+def test_materialize_mmap_state_dict():
+    model = _build(_tab_mlp)
+    fname = "tests/test_model_components/lazy_model.pt"
+    torch.save(model.state_dict(), fname)
+
+    with init_empty_model():
+        lazy_model = _build(_tab_mlp)
+    materialize_model(lazy_model, torch.load(fname, mmap=True, weights_only=True))
+
+    assert torch.allclose(_forward(model, X_tab), _forward(lazy_model, X_tab))
+    os.remove(fname)
+
+
+def test_materialize_missing_parameters():
+    model = _build(_tab_mlp)
+    state_dict = {k: v for k, v in model.state_dict().items() if "wide" not in k}
+
+    with init_empty_model():
+        lazy_model = _build(_tab_mlp)
+    materialize_model(lazy_model, state_dict, strict=False)
+
+    for k, v in lazy_model.deeptabular.state_dict().items():
+        assert torch.equal(v, state_dict["deeptabular." + k])
+    # initialised as in 'Wide.reset_parameters', i.e. like a nn.Linear layer
+    # with 'fan_in' = 1
+    wide_weight = lazy_model.wide.wide_linear.weight
+    assert wide_weight.abs().max() <= 1 and wide_weight.std() > 0
+    assert lazy_model.wide.bias.abs().max() <= 1
+
+
+def test_materialize_without_assign(monkeypatch):
+    # torch < 2.1, where 'load_state_dict' does not support 'assign=True'
+    monkeypatch.setattr(lazy_init, "_CAN_ASSIGN", False)
+    model = _build(_tab_mlp)
+    state_dict = {k: v for k, v in model.state_dict().items() if "wide" not in k}
+
+    with init_empty_model():
+        lazy_model = _build(_tab_mlp)
+    materialize_model(lazy_model, state_dict, strict=False)
+
+    assert not has_meta_parameters(lazy_model)
+    for k, v in lazy_model.deeptabular.state_dict().items():
+        assert torch.equal(v, state_dict["deeptabular." + k])
+    assert lazy_model.wide.wide_linear.weight.std() > 0
+
+
+def test_materialize_without_state_dict():
+    with init_empty_model():
+        model = _build(_ft_transformer)
+    materialize_model(model)
+
+    assert not has_meta_parameters(model)
+    cat_embed = model.deeptabular[0].cat_and_cont_embed.cat_embed
+    # the padding row of the embeddings is (still) zero
+    assert torch.all(cat_embed.embed.weight[0] == 0)
+    # shared parameters remain shared
+    attn = model.deeptabular[0].encoder.fttransformer_block0.attn
+    assert attn.E is attn.F
+    assert attn.E.std() > 0
+
+
+def test_trainer_with_meta_parameters():
+    with init_empty_model():
+        model = _build(_tab_mlp)
+    with pytest.raises(ValueError):
+        Trainer(model, objective="binary", verbose=0)
@@ -1,3 +1,5 @@
+import os
+import shutil
 import string
 
 import numpy as np
@@ -7,6 +9,9 @@ import pytest
 from pytorch_widedeep.models import TabMlp, WideDeep
 from pytorch_widedeep.training import Trainer
 from pytorch_widedeep.models.tabular.embeddings_layers import (
+    MultiHotEmbeddings,
+    DiffSizeCatEmbeddings,
+    CompositionalEmbedding,
     DiffSizeCatAndContEmbeddings,
 )
 
@@ -191,6 +196,137 @@ def test_embedddings_class(
         )
 
 
+###############################################################################
+# Test the fused DiffSizeCatEmbeddings
+###############################################################################
+
+diff_size_embed_input = [("a", 5, 16), ("b", 5, 8), ("c", 5, 16), ("d", 5, 4)]
+
+
+@pytest.mark.parametrize("use_bias", [True, False])
+def test_fused_embeddings_state_dict(use_bias):
+    cat_embed = DiffSizeCatEmbeddings(
+        column_idx={k: v for v, k in enumerate(colnames)},
+        embed_input=diff_size_embed_input,
+        embed_dropout=0.0,
+        use_bias=use_bias,
+    )
+    state_dict = cat_embed.state_dict()
+
+    expected_keys = [
+        "embed_layers.emb_layer_" + col + ".weight"
+        for col, _, _ in diff_size_embed_input
+    ]
+    if use_bias:
+        expected_keys += ["biases.bias_" + col for col, _, _ in diff_size_embed_input]
+    assert list(state_dict.keys()) == expected_keys
+
+    new_cat_embed = DiffSizeCatEmbeddings(
+        column_idx={k: v for v, k in enumerate(colnames)},
+        embed_input=diff_size_embed_input,
+        embed_dropout=0.0,
+        use_bias=use_bias,
+    )
+    new_cat_embed.load_state_dict(state_dict)
+    assert torch.allclose(cat_embed(X_deep), new_cat_embed(X_deep))
+
+
+def test_fused_embeddings_output():
+    cat_embed = DiffSizeCatEmbeddings(
+        column_idx={k: v for v, k in enumerate(colnames)},
+        embed_input=diff_size_embed_input,
+        embed_dropout=0.0,
+        use_bias=True,
+    )
+    out = cat_embed(X_deep)
+
+    # per column lookups, as with one 'nn.Embedding' per column
+    state_dict = cat_embed.state_dict()
+    expected = torch.cat(
+        [
+            state_dict["embed_layers.emb_layer_" + col + ".weight"][X_deep[:, i].long()]
+            + state_dict["biases.bias_" + col]
+            for i, (col, _, _) in enumerate(diff_size_embed_input)
+        ],
+        1,
+    )
+    assert torch.allclose(out, expected)
+
+    out.sum().backward()
+    for k, v in cat_embed.embed_layers.items():
+        assert v.weight.size(0) == 6 and not torch.any(v.weight[0].bool())
+    # the padding rows of 'a' and 'c' get no gradients
+    grad = cat_embed.fused_embed["emb_layer_dim_16"].grad
+    assert not torch.any(grad[[0, 6]].bool())
+
+
+def test_fused_embeddings_non_zero_padding_rows():
+    # e.g. a state dict saved with one 'nn.Embedding' per column, whose
+    # padding rows were (re)initialised
+    cat_embed = DiffSizeCatEmbeddings(
+        column_idx={k: v for v, k in enumerate(colnames)},
+        embed_input=diff_size_embed_input,
+        embed_dropout=0.0,
+        use_bias=False,
+    )
+    state_dict = {
+        "embed_layers.emb_layer_" + col + ".weight": torch.randn(val + 1, dim)
+        for col, val, dim in diff_size_embed_input
+    }
+    cat_embed.load_state_dict(state_dict)
+
+    X = X_deep.clone()
+    X[:, :4] = 0
+    X[0, :4] = 1
+    expected = torch.cat(
+        [
+            state_dict["embed_layers.emb_layer_" + col + ".weight"][X[:, i].long()]
+            for i, (col, _, _) in enumerate(diff_size_embed_input)
+        ],
+        1,
+    )
+    out = cat_embed(X)
+    assert torch.allclose(out, expected)
+    for k, v in cat_embed.state_dict().items():
+        assert torch.equal(v, state_dict[k])
+
+    out.sum().backward()
+    grad = cat_embed.fused_embed["emb_layer_dim_16"].grad
+    assert not torch.any(grad[[0, 6]].bool()) and torch.all(grad[[1, 7]] == 1)
+
+
+def test_fused_embeddings_state_dict_keep_vars():
+    cat_embed = DiffSizeCatEmbeddings(
+        column_idx={k: v for v, k in enumerate(colnames)},
+        embed_input=diff_size_embed_input,
+        embed_dropout=0.0,
+        use_bias=True,
+    )
+    assert not any(v.requires_grad for v in cat_embed.state_dict().values())
+
+    state_dict = cat_embed.state_dict(keep_vars=True)
+    assert all(v.requires_grad for v in state_dict.values())
+    state_dict["embed_layers.emb_layer_a.weight"].sum().backward()
+    assert torch.all(cat_embed.fused_embed["emb_layer_dim_16"].grad[:6] == 1)
+
+
+def test_fused_embeddings_embed_layers_cache():
+    cat_embed = DiffSizeCatEmbeddings(
+        column_idx={k: v for v, k in enumerate(colnames)},
+        embed_input=diff_size_embed_input,
+        embed_dropout=0.0,
+        use_bias=False,
+    )
+    embed_layers = cat_embed.embed_layers
+    assert cat_embed.embed_layers is embed_layers
+    assert "embed_layers" not in dict(cat_embed.named_modules())
+
+    # replacing the fused tables invalidates the cached layers
+    cat_embed.double()
+    assert cat_embed.embed_layers is not embed_layers
+    assert cat_embed.embed_layers.emb_layer_a.weight.dtype == torch.float64
+
+
 ###############################################################################
 # Test Feature Dsitribution Smoothing
 ###############################################################################
@@ -221,3 +357,193 @@ def test_fds(with_lds):
 
     trainer.model.fds_layer.reset()
     assert float(trainer.model.fds_layer.num_samples_tracked.sum()) == 0
+
+
+###############################################################################
+# Test multi-hot embeddings
+###############################################################################
+
+
+def test_multi_hot_embeddings():
+    # 2 categorical columns followed by 2 multi-hot columns with max_len 3 and 2
+    X = torch.tensor([[1, 2, 1, 2, 0, 3, 1], [2, 1, 0, 0, 0, 2, 0]])
+    column_idx = {"a": 0, "b": 1, "c": 2, "d": 5}
+    multi_hot_embed_input = [("c", 3, 4, 3), ("d", 3, 6, 2)]
+    multi_hot_embed = MultiHotEmbeddings(column_idx, multi_hot_embed_input, 0.0)
+    out = multi_hot_embed(X)
+
+    assert out.size() == (2, 10)
+    weight_c = multi_hot_embed.embed_layers["emb_layer_c"].weight
+    weight_d = multi_hot_embed.embed_layers["emb_layer_d"].weight
+    # padding is ignored when averaging and empty rows are embedded as zeros
+    assert torch.allclose(out[0, :4], weight_c[[1, 2]].mean(0))
+    assert torch.allclose(out[0, 4:], weight_d[[3, 1]].mean(0))
+    assert torch.allclose(out[1, :4], torch.zeros(4))
+    assert torch.allclose(out[1, 4:], weight_d[2])
+
+    model = TabMlp(
+        column_idx=column_idx,
+        cat_embed_input=[("a", 2, 8), ("b", 2, 8)],
+        multi_hot_embed_input=multi_hot_embed_input,
+        mlp_hidden_dims=[8, 4],
+    )
+    assert model.cat_and_cont_embed.output_dim == 26
+    assert model(X).size() == (2, 4)
+
+
+###############################################################################
+# Test compositional embeddings
+###############################################################################
+
+
+@pytest.mark.parametrize("method", ["qr_mult", "qr_sum", "hash"])
+def test_compositional_embedding(method):
+    n_embed = 1001
+    comp_embed = CompositionalEmbedding(n_embed, 8, method=method, n_buckets=40)
+    X = torch.arange(n_embed)
+    out = comp_embed(X)
+
+    assert out.size() == (n_embed, 8)
+    assert torch.all(out[0] == 0)
+    assert sum([p.numel() for p in comp_embed.parameters()]) < n_embed * 8 / 10
+    if method != "hash":
+        # quotient-remainder embeddings are unique per category
+        assert torch.unique(out[1:], dim=0).size(0) == n_embed - 1
+
+
+def test_compositional_embedding_method_error():
+    with pytest.raises(ValueError):
+        CompositionalEmbedding(10, 4, method="qr")
+
+
+@pytest.mark.parametrize("use_bias", [True, False])
+def test_tab_mlp_compositional_embeddings(use_bias):
+    compositional_embed_input = {"b": "qr_sum", "d": {"method": "hash", "n_buckets": 3}}
+    cat_embed = DiffSizeCatEmbeddings(
+        {k: v for v, k in enumerate(colnames)},
+        [("a", 5, 4), ("b", 5, 8), ("c", 5, 4), ("d", 5, 6)],
+        0.0,
+        use_bias,
+        compositional_embed_input,
+    )
+    out = cat_embed(X_deep)
+
+    assert out.size() == (10, 22)
+    assert set(cat_embed.embed_layers.keys()) == {"emb_layer_a", "emb_layer_c"}
+    assert torch.allclose(
+        out[:, 4:12],
+        cat_embed.comp_embed["emb_layer_b"](X_deep[:, 1].long())
+        + (cat_embed.unfused_biases["bias_b"] if use_bias else 0),
+    )
+
+    model = TabMlp(
+        column_idx={k: v for v, k in enumerate(colnames)},
+        cat_embed_input=embed_input,
+        continuous_cols=continuous_cols,
+        compositional_embed_input=compositional_embed_input,
+        use_cat_bias=use_bias,
+        mlp_hidden_dims=[8, 4],
+    )
+    new_model = TabMlp(
+        column_idx={k: v for v, k in enumerate(colnames)},
+        cat_embed_input=embed_input,
+        continuous_cols=continuous_cols,
+        compositional_embed_input=compositional_embed_input,
+        use_cat_bias=use_bias,
+        mlp_hidden_dims=[8, 4],
+    )
+    new_model.load_state_dict(model.state_dict())
+    model.eval()
+    new_model.eval()
+    assert torch.allclose(model(X_deep), new_model(X_deep))
+
+
+###############################################################################
+# Test shared vocabularies
+###############################################################################
+
+
+def test_tab_mlp_shared_vocab():
+    shared_vocab_cols = [["a", "c", "d"]]
+    model = TabMlp(
+        column_idx={k: v for v, k in enumerate(colnames)},
+        cat_embed_input=embed_input,
+        continuous_cols=continuous_cols,
+        shared_vocab_cols=shared_vocab_cols,
+        mlp_hidden_dims=[8, 4],
+    )
+    cat_embed = model.cat_and_cont_embed.cat_embed
+
+    # a single table of 5 + 1 rows for 'a', 'c' and 'd'
+    assert cat_embed.fused_embed["emb_layer_dim_16"].size(0) == 3 * 6
+    assert set(cat_embed.embed_layers.keys()) == {
+        "emb_layer_a",
+        "emb_layer_b",
+        "emb_layer_e",
+    }
+    X = torch.tensor([[1, 2, 1, 3, 0]])
+    out = cat_embed.eval()(X)
+    assert torch.allclose(out[:, :16], out[:, 32:48])
+    assert torch.allclose(
+        out[:, 48:64], cat_embed.embed_layers["emb_layer_a"](torch.tensor([3]))
+    )
+
+    new_model = TabMlp(
+        column_idx={k: v for v, k in enumerate(colnames)},
+        cat_embed_input=embed_input,
+        continuous_cols=continuous_cols,
+        shared_vocab_cols=shared_vocab_cols,
+        mlp_hidden_dims=[8, 4],
+    )
+    new_model.load_state_dict(model.state_dict())
+    model.eval()
+    new_model.eval()
+    assert torch.allclose(model(X_deep), new_model(X_deep))
+
+
+@pytest.mark.parametrize(
+    "shared_vocab_cols, compositional_embed_input",
+    [([["a", "f"]], None), ([["a", "b"]], {"a": "qr_mult"})],
+)
+def test_shared_vocab_raise_error(shared_vocab_cols, compositional_embed_input):
+    with pytest.raises(ValueError):
+        DiffSizeCatEmbeddings(
+            {k: v for v, k in enumerate(colnames)},
+            embed_input,
+            0.0,
+            False,
+            compositional_embed_input,
+            shared_vocab_cols,
+        )
+
+
+###############################################################################
+# Test memory-mapped embeddings
+###############################################################################
+
+
+def test_tab_mlp_mmap_embeddings():
+    mmap_dir = "tests/test_model_components/mmap_tables"
+    mmap_embed_input = {"b": {"path": os.path.join(mmap_dir, "b.bin"), "cache_size": 6}}
+
+    model = TabMlp(
+        column_idx={k: v for v, k in enumerate(colnames)},
+        cat_embed_input=embed_input,
+        continuous_cols=continuous_cols,
+        mmap_embed_input=mmap_embed_input,
+        use_cat_bias=True,
+        mlp_hidden_dims=[8, 4],
+    )
+    cat_embed = model.cat_and_cont_embed.cat_embed.eval()
+    out = cat_embed(X_deep)
+
+    assert out.size() == (10, 16 * 5)
+    assert "emb_layer_b" not in cat_embed.embed_layers
+    table = torch.from_numpy(np.array(cat_embed.mmap_embed["emb_layer_b"].table))
+    idx = X_deep[:, 1].long()
+    assert torch.allclose(
+        out[:, 16:32],
+        table[idx] * (idx != 0).unsqueeze(1) + cat_embed.unfused_biases["bias_b"],
+    )
+
+    shutil.rmtree(mmap_dir)
@@ -11,11 +11,13 @@ from pytorch_widedeep.models import (
     FTTransformer,
     TabFastFormer,
     TabTransformer,
+    capture_attention,
 )
 from pytorch_widedeep.models.tabular.embeddings_layers import (
     ContEmbeddings,
     SharedEmbeddings,
     FullEmbeddingDropout,
+    SameSizeCatEmbeddings,
 )
 
 # I am going over test these models due to the number of components
@@ -378,7 +380,8 @@ def test_transformers_keep_attn(model_name):
 
     model = _build_model(model_name, params)
 
-    out = model(X_tab)
+    with capture_attention():
+        out = model(X_tab)
 
     res = [out.size(0) == 10]
     if model_name != "tabperceiver":
@@ -435,6 +438,146 @@ def test_transformers_keep_attn(model_name):
     assert all(res)
 
 
+###############################################################################
+# Test activation checkpointing
+###############################################################################
+
+
+def _first_block(model):
+    if isinstance(model, TabPerceiver):
+        return model.encoder["perceiver_block0"]["latent_transformer"]
+    return model.encoder[0]
+
+
+def _flatten(attn_weights):
+    if isinstance(attn_weights, torch.Tensor):
+        return [attn_weights]
+    return [aw for aws in attn_weights for aw in _flatten(aws)]
+
+
+@pytest.mark.parametrize(
+    "model_name",
+    [
+        "tabtransformer",
+        "saint",
+        "fttransformer",
+        "tabfastformer",
+        "tabperceiver",
+    ],
+)
+@pytest.mark.parametrize("checkpoint_every_n_blocks", [1, 2])
+def test_transformers_activation_checkpointing(model_name, checkpoint_every_n_blocks):
+    params = {
+        "column_idx": {k: v for v, k in enumerate(colnames)},
+        "cat_embed_input": embed_input,
+        "continuous_cols": colnames[n_cols:],
+    }
+
+    model = _build_model(model_name, params)
+    ckpt_model = _build_model(
+        model_name, {**params, "checkpoint_every_n_blocks": checkpoint_every_n_blocks}
+    )
+    ckpt_model.load_state_dict(model.state_dict())
+
+    # the blocks of the checkpointed model run twice: in the forward pass and
+    # when the activations are recomputed in the backward pass
+    n_calls = []
+    _first_block(ckpt_model).register_forward_pre_hook(lambda m, inp: n_calls.append(1))
+
+    outs, attn_weights = [], []
+    for m in [model, ckpt_model]:
+        torch.manual_seed(1)
+        with capture_attention():
+            out = m(X_tab)
+        out.sum().backward()
+        outs.append(out)
+        attn_weights.append(m.attention_weights)
+
+    assert len(n_calls) == 2
+    assert torch.allclose(outs[0], outs[1])
+    for (n, p), p_ckpt in zip(model.named_parameters(), ckpt_model.parameters()):
+        if p.grad is not None:
+            assert torch.allclose(p.grad, p_ckpt.grad, atol=1e-6), n
+    for aw, aw_ckpt in zip(_flatten(attn_weights[0]), _flatten(attn_weights[1])):
+        assert torch.allclose(aw, aw_ckpt)
+
+    # no recomputation at inference
+    ckpt_model.eval()
+    with torch.no_grad():
+        ckpt_model(X_tab)
+    assert len(n_calls) == 3
+
+
+@pytest.mark.parametrize("checkpoint_every_n_blocks", [0, 1.5])
+def test_transformers_wrong_checkpoint_every_n_blocks(checkpoint_every_n_blocks):
+    with pytest.raises(ValueError):
+        FTTransformer(
+            column_idx={k: v for v, k in enumerate(colnames)},
+            cat_embed_input=embed_input,
+            checkpoint_every_n_blocks=checkpoint_every_n_blocks,
+        )
+
+
+###############################################################################
+# Test SAINT chunked row attention
+###############################################################################
+
+
+def _saint(**kwargs):
+    return SAINT(
+        column_idx={k: v for v, k in enumerate(colnames)},
+        cat_embed_input=embed_input,
+        continuous_cols=colnames[n_cols:],
+        n_blocks=2,
+        n_heads=2,
+        **kwargs,
+    )
+
+
+def test_saint_chunked_row_attention():
+    model = _saint().eval()
+    chunked_model = _saint(row_attn_chunk_size=4).eval()
+    chunked_model.load_state_dict(model.state_dict())
+
+    # each row only attends to the rows in its chunk: [0-4), [4-8) and [8-10)
+    with capture_attention():
+        out = chunked_model(X_tab)
+    expected_out = torch.cat([model(X_tab[i : i + 4]) for i in range(0, 10, 4)])
+    assert torch.allclose(out, expected_out, atol=1e-5)
+
+    row_attn_weights = chunked_model.attention_weights[0][1]
+    assert list(row_attn_weights.shape) == [1, model.n_heads, 10, 10]
+    assert torch.all(row_attn_weights[..., :4, 4:] == 0)
+    assert torch.allclose(row_attn_weights.sum(-1), torch.ones(1, model.n_heads, 10))
+
+    # chunks larger than the batch are the same as no chunks
+    chunked_model.encoder[0].row_attn_eval_chunk_size = 16
+    chunked_model.encoder[1].row_attn_eval_chunk_size = 16
+    assert torch.allclose(chunked_model(X_tab), model(X_tab))
+
+
+def test_saint_row_attention_eval_chunk_size():
+    model = _saint(row_attn_chunk_size=4, row_attn_eval_chunk_size=1)
+    assert model.encoder[0].row_attn_chunk_size == 4
+
+    model.train()
+    out = model(X_tab)
+    out.sum().backward()
+    assert out.size(0) == 10
+
+    # with a chunk size of 1 the predictions do not depend on the other rows
+    model.eval()
+    assert torch.allclose(model(X_tab)[:3], model(X_tab[:3]), atol=1e-5)
+
+
+@pytest.mark.parametrize(
+    "params", [{"row_attn_chunk_size": 0}, {"row_attn_eval_chunk_size": 2.0}]
+)
+def test_saint_wrong_row_attn_chunk_size(params):
+    with pytest.raises(ValueError):
+        _saint(**params)
+
+
 ###############################################################################
 # Test transformers with only continuous cols
 ###############################################################################
@@ -464,3 +607,96 @@ def test_transformers_only_cont(model_name):
     out = model(X_tab_only_cont)
 
     assert out.size(0) == 10 and out.size(1) == model.output_dim
+
+
+###############################################################################
+# Test compositional embeddings
+###############################################################################
+
+
+@pytest.mark.parametrize("shared_embed", [True, False])
+def test_same_size_compositional_embeddings(shared_embed):
+    column_idx = {"a": 0, "b": 1, "c": 2}
+    embed_input = [("a", 4), ("b", 6), ("c", 3)]
+    cat_embed = SameSizeCatEmbeddings(
+        8,
+        column_idx,
+        embed_input,
+        0.0,
+        False,
+        False,
+        shared_embed,
+        False,
+        0.25,
+        {"b": "qr_mult"},
+    )
+    if shared_embed:
+        X = torch.tensor([[1, 0, 3], [4, 6, 1]])
+        comp_idx = X[:, 1]
+    else:
+        # without shared embeddings, the codes are global across columns
+        X = torch.tensor([[1, 0, 13], [4, 10, 11]])
+        comp_idx = torch.where(X[:, 1] > 0, X[:, 1] - 4, 0)
+        # the compositional column is not in the regular table
+        assert cat_embed.embed.weight.size(0) == 4 + 3 + 1
+        assert torch.allclose(cat_embed(X)[:, 2], cat_embed.embed(torch.tensor([7, 5])))
+    out = cat_embed(X)
+
+    comp_embed = (
+        cat_embed.embed["emb_layer_b"].embed
+        if shared_embed
+        else cat_embed.comp_embed["emb_layer_b"]
+    )
+    assert out.size() == (2, 3, 8)
+    if not shared_embed:
+        assert torch.all(out[0, 1] == 0)
+        assert torch.allclose(out[:, 1], comp_embed(comp_idx))
+
+
+def test_transformer_compositional_embeddings():
+    model = FTTransformer(
+        column_idx={k: v for v, k in enumerate(colnames)},
+        cat_embed_input=embed_input,
+        continuous_cols=colnames[n_cols:],
+        compositional_embed_input={"b": {"method": "hash", "n_buckets": 3}},
+    )
+    # the codes of the non-shared embeddings are global across columns
+    X = X_tab.clone()
+    X[:, 1] = torch.where(X[:, 1] > 0, X[:, 1] + n_embed, 0)
+    out = model(X)
+    assert out.size(0) == batch_size
+
+
+###############################################################################
+# Test shared vocabularies
+###############################################################################
+
+
+@pytest.mark.parametrize("shared_embed", [True, False])
+def test_same_size_shared_vocab(shared_embed):
+    column_idx = {"a": 0, "b": 1, "c": 2}
+    embed_input = [("a", 4), ("b", 6), ("c", 4)]
+    cat_embed = SameSizeCatEmbeddings(
+        8,
+        column_idx,
+        embed_input,
+        0.0,
+        False,
+        False,
+        shared_embed,
+        False,
+        0.25,
+        None,
+        [["a", "c"]],
+    )
+    if shared_embed:
+        assert (
+            cat_embed.embed["emb_layer_a"].embed is cat_embed.embed["emb_layer_c"].embed
+        )
+    else:
+        # 'c' is encoded with the codes of 'a'
+        assert cat_embed.embed.weight.size(0) == 4 + 6 + 1
+        X = torch.tensor([[2, 5, 2], [3, 10, 1]])
+        out = cat_embed(X)
+        assert torch.allclose(out[0, 0], out[0, 2])
+        assert torch.allclose(out[1, 2], cat_embed.embed.weight[1])
@@ -1,6 +1,12 @@
+import os
+import shutil
+
+import numpy as np
 import torch
+import pytest
 
 from pytorch_widedeep.models import Wide
+from pytorch_widedeep.models.tabular.embeddings_layers import MMapEmbedding
 
 inp = torch.rand(10, 10)
 model = Wide(10, 1)
@@ -12,3 +18,108 @@ model = Wide(10, 1)
 def test_wide():
     out = model(inp)
     assert out.size(0) == 10 and out.size(1) == 1
+
+
+def test_wide_padding_contributes():
+    # the default Wide sums the rows of an nn.Embedding, including that of
+    # the padding/unseen values (i.e. 0)
+    X = torch.randint(0, 11, (10, 5))
+    X[:, 0] = 0
+    expected = model.wide_linear.weight[X].sum(1) + model.bias
+    assert isinstance(model.wide_linear, torch.nn.Embedding)
+    assert torch.allclose(model(X), expected)
+
+
+###############################################################################
+# Test the sparse and multi-hot (EmbeddingBag based) Wide
+###############################################################################
+def test_sparse_wide():
+    sparse_model = Wide(10, 1, sparse=True)
+    sparse_model.load_state_dict(model.state_dict())
+
+    # the same model, including the padding/unseen values
+    X = torch.randint(0, 11, (10, 5))
+    X[:, 0] = 0
+    out = sparse_model(X)
+    assert torch.allclose(out, model(X))
+
+    out.sum().backward()
+    grad = sparse_model.wide_linear.weight.grad
+    assert grad.is_sparse
+    assert not torch.any(grad.to_dense()[0].bool())
+
+
+def test_multi_hot_wide():
+    multi_hot_model = Wide(10, 1, multi_hot=True)
+    multi_hot_model.load_state_dict(model.state_dict())
+
+    # padding values (i.e. 0) do not contribute to the output
+    X = torch.randint(0, 11, (10, 5))
+    X[:, -2:] = 0
+    out = multi_hot_model(X)
+    weight = model.wide_linear.weight
+    expected = (weight[X] * (X != 0).unsqueeze(-1)).sum(1) + model.bias
+    assert torch.allclose(out, expected)
+
+    out.sum().backward()
+    assert not multi_hot_model.wide_linear.weight.grad.is_sparse
+
+
+###############################################################################
+# Test the memory-mapped Wide
+###############################################################################
+mmap_dir = "tests/test_model_components/mmap_tables"
+
+
+def test_mmap_wide():
+    mmap_model = Wide(
+        10, 1, sparse=True, mmap_params={"path": os.path.join(mmap_dir, "wide.bin")}
+    )
+    X = torch.randint(0, 11, (10, 5))
+    out = mmap_model(X)
+
+    weight = torch.from_numpy(np.array(mmap_model.wide_linear.table))
+    expected = (weight[X] * (X != 0).unsqueeze(-1)).sum(1) + mmap_model.bias
+    assert torch.allclose(out, expected)
+
+    shutil.rmtree(mmap_dir)
+
+
+@pytest.mark.parametrize("sparse", [True, False])
+def test_mmap_embedding_lru_and_write_back(sparse):
+    path = os.path.join(mmap_dir, "table.bin")
+    embed = MMapEmbedding(100, 4, path, cache_size=4, sparse=sparse)
+    table = np.array(embed.table)
+
+    X = torch.tensor([[1, 2, 0], [2, 3, 3]])
+    out = embed(X)
+    assert torch.allclose(out[0, :2], torch.from_numpy(table[[1, 2]]))
+    assert torch.all(out[0, 2] == 0)
+
+    optimizer = torch.optim.SGD(embed.parameters(), lr=1.0)
+    out.sum().backward()
+    optimizer.step()
+
+    # 4 is loaded in the free slot and 5, 6 evict 1 and 3, the least
+    # recently used, which are written back to the file
+    embed(torch.tensor([[2, 4]]))
+    embed(torch.tensor([[5, 6]]))
+    assert sorted(embed.slot_ids.tolist()) == [2, 4, 5, 6]
+    assert np.allclose(np.array(embed.table)[[1, 3]], table[[1, 3]] - [[1], [2]])
+    # row 2 is still in the cache
+    assert np.allclose(np.array(embed.table)[2], table[2])
+
+    embed.flush()
+    assert np.allclose(np.array(embed.table)[2], table[2] - 2)
+
+    # a new (e.g. serving) instance reads the trained table
+    read_only_embed = MMapEmbedding(100, 4, path, cache_size=4, read_only=True)
+    assert torch.allclose(
+        read_only_embed(torch.tensor([1, 2, 3])),
+        torch.from_numpy(np.array(embed.table)[[1, 2, 3]]),
+    )
+
+    with pytest.raises(ValueError):
+        embed(torch.arange(1, 6))
+
+    shutil.rmtree(mmap_dir)
@@ -637,3 +637,52 @@ def test_model_checkpoint_restore_weights():
         new_model.state_dict()["deeptabular.0.encoder.mlp.dense_layer_1.1.weight"],
         model.state_dict()["deeptabular.0.encoder.mlp.dense_layer_1.1.weight"],
     )
+
+
+###############################################################################
+# Test restoring the best weights of models with memory-mapped tables
+###############################################################################
+
+
+def _mmap_model(path):
+    wide = Wide(np.unique(X_wide).shape[0], 1, mmap_params={"path": path})
+    deeptabular = TabMlp(
+        column_idx=column_idx,
+        cat_embed_input=embed_input,
+        continuous_cols=colnames[-5:],
+        mlp_hidden_dims=[16, 8],
+    )
+    return WideDeep(wide=wide, deeptabular=deeptabular)
+
+
+def test_early_stopping_restore_weights_mmap(tmp_path):
+    trainer = Trainer(
+        _mmap_model(str(tmp_path / "wide.bin")),
+        objective="binary",
+        callbacks=[EarlyStopping(restore_best_weights=True)],
+        verbose=0,
+    )
+    with pytest.raises(ValueError, match="memory-mapped"):
+        trainer.fit(
+            X_train={"X_wide": X_wide, "X_tab": X_tab, "target": target},
+            X_val={"X_wide": X_wide_val, "X_tab": X_tab_val, "target": target_val},
+            n_epochs=2,
+            batch_size=16,
+        )
+
+
+def test_model_checkpoint_restore_weights_mmap(tmp_path):
+    model = _mmap_model(str(tmp_path / "wide.bin"))
+    # with a large negative 'min_delta' every epoch is the best so far
+    model_checkpoint = ModelCheckpoint(save_best_only=True, min_delta=-1000)
+    trainer = Trainer(
+        model, objective="binary", callbacks=[model_checkpoint], verbose=0
+    )
+    with pytest.warns(UserWarning, match="memory-mapped"):
+        trainer.fit(
+            X_train={"X_wide": X_wide, "X_tab": X_tab, "target": target},
+            X_val={"X_wide": X_wide_val, "X_tab": X_tab_val, "target": target_val},
+            n_epochs=3,
+            batch_size=16,
+        )
+    assert model_checkpoint.best_epoch == 2
@@ -2,8 +2,10 @@ import string
 import warnings
 
 import numpy as np
+import torch
 import pytest
 from torch import nn
+from torchmetrics.classification import BinaryAUROC
 
 from pytorch_widedeep.models import (
     Wide,
@@ -12,9 +14,10 @@ from pytorch_widedeep.models import (
     WideDeep,
     TabTransformer,
 )
-from pytorch_widedeep.metrics import R2Score
+from pytorch_widedeep.metrics import F1Score, R2Score, Accuracy
 from pytorch_widedeep.training import Trainer
 from pytorch_widedeep.dataloaders import DataLoaderImbalanced
+from pytorch_widedeep.training._trainer_utils import compile_model
 
 # Wide array
 X_wide = np.random.choice(50, (32, 10))
@@ -250,6 +253,326 @@ def test_fit_with_regression_and_metric():
     assert "train_r2" in trainer.history.keys()
 
 
+##############################################################################
+# Test that the epoch level loss and metrics do not depend on how often they
+# are materialised
+##############################################################################
+
+
+@pytest.mark.parametrize("verbose", [0, 1])
+def test_fit_log_freq(verbose):
+    histories = []
+    for log_freq in [1, 3]:
+        torch.manual_seed(0)
+        wide = Wide(np.unique(X_wide).shape[0], 1)
+        deeptabular = TabMlp(
+            column_idx=column_idx,
+            cat_embed_input=embed_input,
+            continuous_cols=colnames[-5:],
+            mlp_hidden_dims=[32, 16],
+        )
+        model = WideDeep(wide=wide, deeptabular=deeptabular, pred_dim=1)
+        trainer = Trainer(
+            model,
+            objective="binary",
+            metrics=[Accuracy, F1Score, BinaryAUROC()],
+            verbose=verbose,
+            num_workers=0,
+        )
+        trainer.fit(
+            X_wide=X_wide,
+            X_tab=X_tab,
+            target=target_binary,
+            n_epochs=2,
+            batch_size=4,
+            val_split=0.25,
+            log_freq=log_freq,
+        )
+        histories.append(trainer.history)
+
+    assert histories[0] == histories[1]
+
+
+@pytest.mark.parametrize("log_freq", [0, -1, 1.5])
+def test_fit_log_freq_raise_error(log_freq):
+    wide = Wide(np.unique(X_wide).shape[0], 1)
+    model = WideDeep(wide=wide, pred_dim=1)
+    trainer = Trainer(model, objective="binary", verbose=1)
+    with pytest.raises(ValueError, match="log_freq"):
+        trainer.fit(
+            X_wide=X_wide,
+            target=target_binary,
+            n_epochs=1,
+            batch_size=4,
+            log_freq=log_freq,
+        )
+
+
+##############################################################################
+# Test mixed precision training and inference
+##############################################################################
+@pytest.mark.parametrize("precision", ["bf16", "fp16"])
+@pytest.mark.parametrize("finetune", [True, False])
+def test_fit_precision(precision, finetune):
+    wide = Wide(np.unique(X_wide).shape[0], 1)
+    deeptabular = TabMlp(
+        column_idx=column_idx,
+        cat_embed_input=embed_input,
+        continuous_cols=colnames[-5:],
+        mlp_hidden_dims=[32, 16],
+    )
+    model = WideDeep(wide=wide, deeptabular=deeptabular, pred_dim=1)
+    trainer = Trainer(
+        model,
+        objective="binary",
+        metrics=[Accuracy],
+        precision=precision,
+        verbose=0,
+    )
+    trainer.fit(
+        X_wide=X_wide,
+        X_tab=X_tab,
+        target=target_binary,
+        n_epochs=2,
+        batch_size=16,
+        val_split=0.25,
+        finetune=finetune,
+        finetune_epochs=1,
+    )
+    probs = trainer.predict_proba(X_wide=X_wide, X_tab=X_tab)
+
+    # the weights are kept in fp32
+    assert all(p.dtype == torch.float32 for p in model.parameters())
+    assert np.isfinite(probs).all()
+    assert np.allclose(probs.sum(1), 1.0)
+    assert np.isfinite(trainer.history["train_loss"]).all()
+
+
+def test_fit_precision_raise_error():
+    wide = Wide(np.unique(X_wide).shape[0], 1)
+    model = WideDeep(wide=wide)
+    with pytest.raises(ValueError):
+        Trainer(model, objective="binary", precision="fp8")
+
+
+##############################################################################
+# Test the compilation of the model
+##############################################################################
+def _failing_backend(gm, example_inputs):
+    raise RuntimeError("compilation failed")
+
+
+@pytest.mark.parametrize(
+    "compile, deeptabular_name",
+    [(True, "tabmlp"), ("components", "tabmlp"), ("components", "tabnet")],
+)
+def test_fit_compile(compile, deeptabular_name):
+    wide = Wide(np.unique(X_wide).shape[0], 1)
+    if deeptabular_name == "tabmlp":
+        deeptabular = TabMlp(
+            column_idx=column_idx,
+            cat_embed_input=embed_input,
+            continuous_cols=colnames[-5:],
+            mlp_hidden_dims=[32, 16],
+        )
+    else:
+        deeptabular = TabNet(
+            column_idx=column_idx,
+            cat_embed_input=embed_input,
+            continuous_cols=colnames[-5:],
+        )
+    model = WideDeep(wide=wide, deeptabular=deeptabular, pred_dim=1)
+    state_dict_keys = list(model.state_dict().keys())
+    trainer = Trainer(
+        model,
+        objective="binary",
+        compile=compile,
+        compile_kwargs={"backend": "eager"},
+        verbose=0,
+    )
+    trainer.fit(
+        X_wide=X_wide, X_tab=X_tab, target=target_binary, batch_size=16, val_split=0.2
+    )
+    preds = trainer.predict(X_wide=X_wide, X_tab=X_tab)
+
+    compiled_modules = [model] if compile is True else [model.wide, model.deeptabular]
+    assert all(m._compiled_call_impl is not None for m in compiled_modules)
+    assert list(model.state_dict().keys()) == state_dict_keys
+    assert preds.shape[0] == 32
+
+
+def test_fit_compile_fallback():
+    wide = Wide(np.unique(X_wide).shape[0], 1)
+    model = WideDeep(wide=wide, pred_dim=1)
+    trainer = Trainer(
+        model,
+        objective="binary",
+        compile=True,
+        compile_kwargs={"backend": _failing_backend},
+        verbose=0,
+    )
+    with pytest.warns(UserWarning, match="Falling back to eager mode"):
+        trainer.fit(X_wide=X_wide, target=target_binary, batch_size=16)
+
+    assert model._compiled_call_impl is None
+    assert len(trainer.history["train_loss"]) == 1
+
+
+class _CountingModule(nn.Module):
+    def __init__(self):
+        super().__init__()
+        self.n_calls = 0
+
+    def forward(self, X):
+        self.n_calls += 1
+        if X.size(0) == 3:
+            raise ValueError("wrong input")
+        return X * 2
+
+
+def test_compile_no_fallback_on_other_errors():
+    torch._dynamo.reset()
+    module = compile_model(_CountingModule(), True, {"backend": "eager"})
+    with pytest.raises(ValueError, match="wrong input"):
+        module(torch.ones(3, 2))
+
+    # the forward pass is not re-run in eager mode
+    assert module.n_calls == 1
+    assert module._compiled_call_impl is not None
+
+
+def test_compile_no_fallback_after_first_call():
+    n_compilations = [0]
+
+    def _failing_recompilation_backend(gm, example_inputs):
+        n_compilations[0] += 1
+        if n_compilations[0] > 1:
+            raise RuntimeError("compilation failed")
+        return gm.forward
+
+    torch._dynamo.reset()
+    module = compile_model(
+        _CountingModule(), True, {"backend": _failing_recompilation_backend}
+    )
+    module(torch.ones(2, 2))
+    # a new input shape triggers a recompilation
+    with pytest.raises(torch._dynamo.exc.BackendCompilerFailed):
+        module(torch.ones(4, 5))
+
+    assert module.n_calls == 1
+    assert module._compiled_call_impl is not None
+
+
+def test_fit_compile_raise_error():
+    wide = Wide(np.unique(X_wide).shape[0], 1)
+    model = WideDeep(wide=wide)
+    with pytest.raises(ValueError):
+        Trainer(model, objective="binary", compile="everything")
+
+
+##############################################################################
+# Test gradient accumulation
+##############################################################################
+def _accumulation_model():
+    wide = Wide(np.unique(X_wide).shape[0], 1)
+    deeptabular = TabMlp(
+        column_idx=column_idx,
+        cat_embed_input=embed_input,
+        continuous_cols=colnames[-5:],
+        mlp_hidden_dims=[32, 16],
+        cont_norm_layer=None,
+        cat_embed_dropout=0.0,
+        cont_embed_dropout=0.0,
+        mlp_dropout=0.0,
+    )
+    return WideDeep(wide=wide, deeptabular=deeptabular, pred_dim=1)
+
+
+def test_gradient_accumulation_equivalence():
+    # 4 accumulated batches of 4 rows are equivalent to a batch of 16 rows
+    state_dicts = []
+    for batch_size, accumulation_steps in [(16, 1), (4, 4)]:
+        torch.manual_seed(0)
+        model = _accumulation_model()
+        trainer = Trainer(
+            model,
+            objective="binary",
+            optimizers=torch.optim.SGD(model.parameters(), lr=0.1),
+            verbose=0,
+        )
+        torch.manual_seed(1)
+        trainer.fit(
+            X_wide=X_wide,
+            X_tab=X_tab,
+            target=target_binary,
+            n_epochs=2,
+            batch_size=batch_size,
+            gradient_accumulation_steps=accumulation_steps,
+        )
+        state_dicts.append(model.state_dict())
+
+    for k, v in state_dicts[0].items():
+        assert torch.allclose(v.float(), state_dicts[1][k].float(), atol=1e-5)
+
+
+def test_gradient_accumulation_lr_scheduler_and_history():
+    model = _accumulation_model()
+    optimizer = torch.optim.SGD(model.parameters(), lr=0.01)
+    # 32 rows in batches of 4 are 8 batches, i.e. 3 optimizer steps (3, 3
+    # and 2 accumulated batches) per epoch
+    lr_scheduler = torch.optim.lr_scheduler.OneCycleLR(
+        optimizer, max_lr=0.1, steps_per_epoch=3, epochs=2
+    )
+    trainer = Trainer(
+        model,
+        objective="binary",
+        optimizers=optimizer,
+        lr_schedulers=lr_scheduler,
+        metrics=[Accuracy],
+        verbose=0,
+    )
+    trainer.fit(
+        X_wide=X_wide,
+        X_tab=X_tab,
+        target=target_binary,
+        n_epochs=2,
+        batch_size=4,
+        gradient_accumulation_steps=3,
+    )
+
+    assert lr_scheduler.last_epoch == 6
+    assert len(trainer.history["train_loss"]) == 2
+    assert len(trainer.history["train_acc"]) == 2
+
+
+def test_gradient_accumulation_raise_error():
+    trainer = Trainer(_accumulation_model(), objective="binary", verbose=0)
+    with pytest.raises(ValueError):
+        trainer.fit(
+            X_wide=X_wide,
+            X_tab=X_tab,
+            target=target_binary,
+            gradient_accumulation_steps=0,
+        )
+
+
+def test_gradient_accumulation_mmap_embeddings_raise_error(tmp_path):
+    wide = Wide(
+        np.unique(X_wide).shape[0] + 1,
+        1,
+        sparse=True,
+        mmap_params={"path": str(tmp_path / "wide.bin")},
+    )
+    trainer = Trainer(WideDeep(wide=wide), objective="binary", verbose=0)
+    with pytest.raises(ValueError, match="memory-mapped"):
+        trainer.fit(
+            X_wide=X_wide,
+            X_tab=X_tab,
+            target=target_binary,
+            gradient_accumulation_steps=2,
+        )
+
+
 ##############################################################################
 # Test aliases
 ##############################################################################
@@ -321,3 +644,77 @@ def test_multiclass_warning():
 
     with pytest.raises(ValueError):
         trainer = Trainer(model, loss="multiclass", verbose=0)  # noqa: F841
+
+
+##############################################################################
+# Test that the sparse parameters get their own optimizer
+##############################################################################
+
+
+@pytest.mark.parametrize("with_optimizers", [True, False])
+@pytest.mark.parametrize("with_sparse_optimizer", [True, False])
+def test_fit_with_sparse_wide(with_optimizers, with_sparse_optimizer):
+    wide = Wide(np.unique(X_wide).shape[0], 1, sparse=True)
+    deeptabular = TabMlp(
+        column_idx=column_idx,
+        cat_embed_input=embed_input,
+        continuous_cols=colnames[-5:],
+        mlp_hidden_dims=[32, 16],
+    )
+    model = WideDeep(wide=wide, deeptabular=deeptabular)
+
+    if with_optimizers:
+        optimizers = {
+            "wide": torch.optim.Adam(model.wide.parameters()),
+            "deeptabular": torch.optim.AdamW(model.deeptabular.parameters()),
+        }
+    else:
+        optimizers = None
+    sparse_optimizer = (
+        torch.optim.SGD([model.wide.wide_linear.weight], lr=0.1)
+        if with_sparse_optimizer
+        else None
+    )
+
+    trainer = Trainer(
+        model,
+        objective="binary",
+        optimizers=optimizers,
+        sparse_optimizer=sparse_optimizer,
+        verbose=0,
+    )
+    wide_weight = model.wide.wide_linear.weight.detach().clone()
+    trainer.fit(X_wide=X_wide, X_tab=X_tab, target=target_binary, batch_size=16)
+
+    sparse_opt = trainer.optimizer._optimizers["sparse"]
+    assert sparse_opt.__class__.__name__ == (
+        "SGD" if with_sparse_optimizer else "SparseAdam"
+    )
+    # the optimizers passed to the Trainer are not modified
+    if with_optimizers:
+        assert len(optimizers["wide"].param_groups[0]["params"]) == 2
+    assert not torch.allclose(wide_weight, model.wide.wide_linear.weight)
+
+
+def test_fit_with_sparse_wide_lr_scheduler():
+    wide = Wide(np.unique(X_wide).shape[0], 1, sparse=True)
+    model = WideDeep(wide=wide)
+    optimizer = torch.optim.Adam(model.parameters(), lr=0.1)
+    lr_scheduler = torch.optim.lr_scheduler.StepLR(optimizer, step_size=1, gamma=0.5)
+
+    trainer = Trainer(
+        model,
+        objective="binary",
+        optimizers=optimizer,
+        lr_schedulers=lr_scheduler,
+        verbose=0,
+    )
+    trainer.fit(X_wide=X_wide, target=target_binary, n_epochs=2, batch_size=16)
+
+    # the lr of the (default) sparse optimizer follows that of the optimizer
+    # the sparse parameters are in
+    sparse_opt = trainer.optimizer._optimizers["sparse"]
+    assert optimizer.param_groups[0]["lr"] == 0.025
+    assert sparse_opt.param_groups[0]["lr"] == 0.05
+    trainer.optimizer.step()
+    assert sparse_opt.param_groups[0]["lr"] == 0.025
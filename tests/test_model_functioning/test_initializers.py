@@ -153,6 +153,27 @@ def test_initializers_with_pattern():
     assert torch.all(org_word_embed[0] == init_word_embed[0].cpu())
 
 
+def test_initializers_with_embedding_pattern():
+    # the per-column embeddings (fused into one table per embedding dim) are
+    # matched by their own names
+    deeptabular = TabMlp(
+        column_idx=column_idx,
+        cat_embed_input=embed_input,
+        continuous_cols=colnames[-5:],
+        mlp_hidden_dims=[32, 16],
+    )
+    model = WideDeep(deeptabular=deeptabular)
+    initializer = ConstantInitializer(value=1.0, pattern="emb_layer_a")
+    trainer = Trainer(
+        model, objective="binary", verbose=0, initializers={"deeptabular": initializer}
+    )
+
+    state_dict = trainer.model.state_dict()
+    prefix = "deeptabular.0.cat_and_cont_embed.cat_embed.embed_layers."
+    assert torch.all(state_dict[prefix + "emb_layer_a.weight"] == 1.0)
+    assert not torch.any(state_dict[prefix + "emb_layer_b.weight"] == 1.0)
+
+
 ###############################################################################
 # Test single initializer
 ###############################################################################
@@ -173,6 +173,35 @@ def test_enc_dec_trainer_method_name(method_name):
     assert len(ec_trainer.history["train_loss"]) == 2
 
 
+@pytest.mark.parametrize(
+    "precision",
+    ["bf16", "fp16"],
+)
+def test_enc_dec_trainer_precision(precision):
+    preprocessor = TabPreprocessor(
+        cat_embed_cols=["col1", "col2"],
+        continuous_cols=["col3", "col4"],
+    )
+    X_tab = preprocessor.fit_transform(test_df)
+
+    encoder = _build_enc_models(
+        "mlp",
+        preprocessor.column_idx,
+        preprocessor.cat_embed_input,
+        preprocessor.continuous_cols,
+    )
+
+    ec_trainer = EncoderDecoderTrainer(
+        encoder=encoder,
+        masked_prob=0.2,
+        precision=precision,
+        verbose=0,
+    )
+    ec_trainer.pretrain(X_tab, n_epochs=2, batch_size=16)
+
+    assert np.isfinite(ec_trainer.history["train_loss"]).all()
+
+
 ###############################################################################
 # Test simply that the ContrastiveDenoisingTrainer runs 'correctly'
 ###############################################################################
@@ -273,6 +302,33 @@ def test_cont_den_trainer_method_name(
     assert len(cd_trainer.history["train_loss"]) == 2
 
 
+def test_cont_den_trainer_precision():
+    preprocessor = TabPreprocessor(
+        cat_embed_cols=["col1", "col2"],
+        continuous_cols=["col3", "col4"],
+        with_attention=True,
+        with_cls_token=True,
+    )
+    X_tab = preprocessor.fit_transform(test_df)
+
+    tr_model = _build_transf_model(
+        "fttransformer",
+        preprocessor,
+        preprocessor.cat_embed_input,
+        preprocessor.continuous_cols,
+    )
+
+    cd_trainer = ContrastiveDenoisingTrainer(
+        model=tr_model,
+        preprocessor=preprocessor,
+        precision="bf16",
+        verbose=0,
+    )
+    cd_trainer.pretrain(X_tab, n_epochs=2, batch_size=16)
+
+    assert np.isfinite(cd_trainer.history["train_loss"]).all()
+
+
 ###############################################################################
 # Test that ContrastiveDenoisingTrainer with varying params
 ###############################################################################